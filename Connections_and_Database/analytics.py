@@ -0,0 +1,130 @@
+import json
+import os
+
+import numpy as np
+
+from analytics_snapshot import ANALYTICS_DIR, current_dir
+
+# =========================================================
+# Admin Analytics (over the columnar snapshot, no database)
+#   - Columns are np.memmap views of the snapshot files
+#     (zero-copy; pages come from the OS cache after the
+#     first query)
+#   - Group-bys are np.bincount / np.add.at over the
+#     dictionary codes, never Python loops over rows
+#   - Only needs NumPy + the snapshot directory, so it can
+#     run on a machine without database access
+#
+#   snap = AnalyticsSnapshot.open()
+#   snap.attendance_by_department()
+#   snap.grade_distribution_by_clearance()
+#
+# Masked groups (fewer than 3 contributing students) carry
+# zero measures: totals are over unmasked groups only.
+# =========================================================
+
+
+class AnalyticsSnapshot:
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.rows = self.meta["rows"]
+        self.cols = {}
+        for name, spec in self.meta["columns"].items():
+            shape = tuple(spec["shape"])
+            if self.rows == 0:
+                self.cols[name] = np.zeros(shape, dtype=spec["dtype"])   # mmap of an empty file fails
+            else:
+                self.cols[name] = np.memmap(
+                    os.path.join(path, name + ".bin"), dtype=spec["dtype"], mode="r", shape=shape
+                )
+
+        self.departments = self.meta["dictionaries"]["department_code"]
+        self.courses = self.meta["dictionaries"]["course_code"]
+        self._dept_index = {d: i for i, d in enumerate(self.departments)}
+        self._course_index = {c: i for i, c in enumerate(self.courses)}
+
+    @classmethod
+    def open(cls, root=ANALYTICS_DIR):
+        """The current build under `root` (FileNotFoundError if none)."""
+        path = current_dir(root)
+        if path is None:
+            raise FileNotFoundError(f"No analytics snapshot under {root}")
+        return cls(path)
+
+    # -----------------------------------------------------
+    # Filtering
+    # -----------------------------------------------------
+    def where(self, department=None, course=None, clearance=None):
+        """Boolean row mask; strings are matched through the dictionaries (one lookup each)."""
+        mask = np.ones(self.rows, dtype=bool)
+        if department is not None:
+            code = self._dept_index.get(department)
+            mask &= False if code is None else self.cols["department_code"] == code
+        if course is not None:
+            code = self._course_index.get(course)
+            mask &= False if code is None else self.cols["course_code"] == code
+        if clearance is not None:
+            mask &= self.cols["clearance"] == clearance
+        return mask
+
+    def _sum_by(self, codes, values, size, mask=None):
+        if mask is not None:
+            codes, values = codes[mask], values[mask]
+        return np.bincount(codes, weights=values, minlength=size)
+
+    # -----------------------------------------------------
+    # Queries
+    # -----------------------------------------------------
+    def attendance_by_department(self, mask=None):
+        """[(Department, sessions, present, rate %)] over unmasked groups."""
+        codes = self.cols["department_code"]
+        n = len(self.departments)
+        sessions = self._sum_by(codes, self.cols["sessions"], n, mask)
+        present = self._sum_by(codes, self.cols["present"], n, mask)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(sessions > 0, 100.0 * present / sessions, np.nan)
+        return [
+            (self.departments[i], int(sessions[i]), int(present[i]), None if np.isnan(rate[i]) else round(float(rate[i]), 1))
+            for i in range(n)
+        ]
+
+    def grade_distribution_by_clearance(self, mask=None):
+        """{clearance level: histogram (np.ndarray of bucket counts, 10-point buckets)}."""
+        levels = self.cols["clearance"]
+        hist = self.cols["grade_hist"]
+        if mask is not None:
+            levels, hist = levels[mask], hist[mask]
+        out = np.zeros((6, self.meta["hist_buckets"]), dtype=np.int64)
+        np.add.at(out, levels, hist)
+        return {level: out[level] for level in range(1, 6) if out[level].any()}
+
+    def grade_summary_by(self, key="department_code", mask=None):
+        """[(value, graded, mean, stdev)] grouped by a dictionary column."""
+        codes = self.cols[key]
+        labels = self.departments if key == "department_code" else self.courses
+        n = len(labels)
+        graded = self._sum_by(codes, self.cols["graded"], n, mask)
+        total = self._sum_by(codes, self.cols["grade_sum"], n, mask)
+        total_sq = self._sum_by(codes, self.cols["grade_sum_sq"], n, mask)
+
+        out = []
+        for i in range(n):
+            g = int(graded[i])
+            if g == 0:
+                out.append((labels[i], 0, None, None))
+                continue
+            mean = total[i] / g
+            var = (total_sq[i] - g * mean * mean) / (g - 1) if g > 1 else 0.0
+            out.append((labels[i], g, round(float(mean), 2), round(float(np.sqrt(max(var, 0.0))), 2)))
+        return out
+
+    def masked_groups(self):
+        """How many groups had grade / attendance measures masked at the source."""
+        return {
+            "grades": int(self.cols["grade_masked"].sum()),
+            "attendance": int(self.cols["attendance_masked"].sum()),
+        }
@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import sys
+import time
+from array import array
+
+from db import call_sp_rows, call_sp_result_sets
+
+# =========================================================
+# Analytics Snapshot Builder (columnar, on disk)
+#   - Facts from sp_Admin_GetAnalyticsFacts: inference-safe
+#     aggregates per (CourseID, Department, ClearanceLevel)
+#   - One raw little-endian file per column (typed arrays);
+#     Department / CourseName dictionary-encoded (sorted
+#     dictionary in meta.json + integer codes per row)
+#   - Each build goes to its own v<N>/ directory; CURRENT is
+#     switched atomically once the build is complete, so a
+#     reader never sees a half-written snapshot
+#   - No rebuild while the source DATA_VERSION counters are
+#     unchanged
+#
+# Read it with analytics.py (NumPy memory-mapped views; the
+# admin Analytics Snapshot screen shows its department
+# summary); the directory can be copied to any machine (no
+# database needed).
+#
+# Layout:
+#   <root>/CURRENT               "v3"
+#   <root>/v3/meta.json          rows, columns {name: dtype, shape}, dictionaries
+#   <root>/v3/<column>.bin       raw array
+#
+# Environment:
+#   SRMS_ANALYTICS_DIR=<dir>    snapshot root
+# =========================================================
+
+ANALYTICS_DIR = os.environ.get(
+    "SRMS_ANALYTICS_DIR",
+    os.path.join(os.path.expanduser("~"), ".srms", "analytics")
+)
+FORMAT_VERSION = 1
+KEEP_BUILDS = 2         # older builds are removed (readers may still map the previous one)
+HIST_BUCKETS = 10
+
+SOURCE_TABLES = ("STUDENT", "COURSE", "COURSE_STUDENT", "GRADES", "ATTENDANCE")
+
+# column -> (array typecode, NumPy dtype, fact field)
+COLUMNS = {
+    "course_id":         ("i", "<i4", "CourseID"),
+    "course_code":       (None, None, "CourseName"),     # dictionary code, typecode chosen per build
+    "department_code":   (None, None, "Department"),
+    "clearance":         ("B", "u1", "ClearanceLevel"),
+    "enrolled":          ("i", "<i4", "Enrolled"),
+    "graded":            ("i", "<i4", "Graded"),
+    "grade_sum":         ("d", "<f8", "GradeSum"),
+    "grade_sum_sq":      ("d", "<f8", "GradeSumSq"),
+    "grade_masked":      ("B", "u1", "GradeMasked"),
+    "sessions":          ("i", "<i4", "Sessions"),
+    "present":           ("i", "<i4", "Present"),
+    "attendance_masked": ("B", "u1", "AttendanceMasked"),
+}
+DICTIONARIES = {"course_code": "CourseName", "department_code": "Department"}
+
+
+def current_dir(root=ANALYTICS_DIR):
+    """Directory of the current build (None if nothing was built yet)."""
+    try:
+        with open(os.path.join(root, "CURRENT"), encoding="utf-8") as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    return os.path.join(root, name) if name else None
+
+
+def read_meta(root=ANALYTICS_DIR):
+    path = current_dir(root)
+    if path is None:
+        return None
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _code_type(n):
+    return ("B", "u1") if n <= 0xFF else ("H", "<u2") if n <= 0xFFFF else ("I", "<u4")
+
+
+def _write_array(path, typecode, values):
+    a = array(typecode, values)
+    if sys.byteorder == "big":
+        a.byteswap()        # files are always little-endian
+    with open(path, "wb") as f:
+        a.tofile(f)
+
+
+def _encode(values):
+    """Dictionary encoding: (sorted distinct values, code per value)."""
+    dictionary = sorted(set(values))
+    index = {v: i for i, v in enumerate(dictionary)}
+    return dictionary, [index[v] for v in values]
+
+
+def _write_build(path, facts, versions):
+    os.makedirs(path)
+    n = len(facts)
+    meta = {
+        "format": FORMAT_VERSION,
+        "built_at": time.time(),
+        "rows": n,
+        "source_versions": versions,
+        "hist_buckets": HIST_BUCKETS,
+        "columns": {},
+        "dictionaries": {},
+    }
+
+    for name, (typecode, dtype, field) in COLUMNS.items():
+        values = [r[field] for r in facts]
+        if name in DICTIONARIES:
+            dictionary, values = _encode(values)
+            typecode, dtype = _code_type(len(dictionary))
+            meta["dictionaries"][name] = dictionary
+        else:
+            values = [0 if v is None else (float(v) if typecode == "d" else int(v)) for v in values]
+        _write_array(os.path.join(path, name + ".bin"), typecode, values)
+        meta["columns"][name] = {"dtype": dtype, "shape": [n]}
+
+    # Histogram: one row of bucket counts per fact (row-major n x buckets)
+    hist = [int(r[f"H{b}"] or 0) for r in facts for b in range(HIST_BUCKETS)]
+    _write_array(os.path.join(path, "grade_hist.bin"), "I", hist)
+    meta["columns"]["grade_hist"] = {"dtype": "<u4", "shape": [n, HIST_BUCKETS]}
+
+    # meta.json last: a build without it is incomplete
+    with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return meta
+
+
+def _switch_current(root, name):
+    target = os.path.join(root, "CURRENT")
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(name)
+    os.replace(tmp, target)
+
+
+def _prune(root, keep):
+    builds = sorted(
+        (d for d in os.listdir(root) if d.startswith("v") and d[1:].isdigit()),
+        key=lambda d: int(d[1:])
+    )
+    for d in builds[:-keep]:
+        shutil.rmtree(os.path.join(root, d), ignore_errors=True)
+
+
+def build(username, root=ANALYTICS_DIR, force=False):
+    """
+    Build a new snapshot if the source data changed.
+    Returns (meta, rebuilt). Raises DbError / OSError.
+    """
+    os.makedirs(root, exist_ok=True)
+    meta = read_meta(root)
+
+    if meta is not None and not force:
+        current = {r["TableName"]: r["Version"] for r in call_sp_rows("sp_GetDataVersions", (username,))}
+        if {t: current.get(t) for t in SOURCE_TABLES} == meta.get("source_versions"):
+            return meta, False
+
+    result_sets = call_sp_result_sets("sp_Admin_GetAnalyticsFacts", (username,))
+    versions = {r["TableName"]: r["Version"] for r in result_sets[0]}
+    facts = result_sets[1] if len(result_sets) > 1 else []
+
+    existing = [int(d[1:]) for d in os.listdir(root) if d.startswith("v") and d[1:].isdigit()]
+    name = f"v{max(existing, default=0) + 1}"
+
+    meta = _write_build(os.path.join(root, name), facts, {t: versions.get(t) for t in SOURCE_TABLES})
+    _switch_current(root, name)
+    _prune(root, KEEP_BUILDS)
+    return meta, True
@@ -0,0 +1,78 @@
+from db import call_sp_result_sets, call_sp_single_row, call_sp_non_query
+
+# =========================================================
+# Archival (live tables -> *_HISTORY)
+#   - sp_Admin_ArchiveBatch moves at most batch_size rows per
+#     table in one short transaction; run_archival calls it
+#     until a batch moves nothing, so live tables never see a
+#     long lock
+#   - Moved: soft-deleted grades / attendance, every record
+#     of a deleted student or course, and records of students
+#     inactive for `inactive_years` (closed terms only);
+#     packed attendance bitmaps move whole
+#     (ATTENDANCE_BITMAP_HISTORY, counted as "Bitmaps")
+#   - STUDENT / COURSE rows stay live: nothing that references
+#     them breaks
+#   - Restores re-insert rows with new IDs and put the student
+#     on a one-year archive hold; archived bitmaps come back
+#     only with the whole student (restore_student)
+#
+# Kinds: "GRADES", "ATTENDANCE", "ENROLLMENTS"
+# =========================================================
+
+KINDS = ("GRADES", "ATTENDANCE", "ENROLLMENTS")
+BATCH_SIZE = 2000
+INACTIVE_YEARS = 2
+
+
+def run_archival(username, batch_size=BATCH_SIZE, inactive_years=INACTIVE_YEARS, progress=None, cancel=None):
+    """
+    Archive batch after batch until nothing is left.
+    Returns ({"Grades", "Attendance", "Bitmaps", "Enrollments", "Batches"}, finished);
+    finished=False when cancelled. progress(totals) is called after each
+    batch; cancel is a threading.Event checked between batches.
+    """
+    totals = {"Grades": 0, "Attendance": 0, "Bitmaps": 0, "Enrollments": 0, "Batches": 0}
+    while True:
+        if cancel is not None and cancel.is_set():
+            return totals, False
+
+        # Each batch commits inside the procedure
+        moved = call_sp_single_row(
+            "sp_Admin_ArchiveBatch", (username, batch_size, inactive_years), autocommit=True
+        ) or {}
+
+        count = 0
+        for key in ("Grades", "Attendance", "Bitmaps", "Enrollments"):
+            totals[key] += moved.get(key) or 0
+            count += moved.get(key) or 0
+        if count == 0:
+            return totals, True
+
+        totals["Batches"] += 1
+        if progress:
+            progress(dict(totals))
+
+
+def get_archive(username, kind, student_id=None, course_id=None, max_rows=500):
+    """(summary rows [{Kind, ArchiveReason, Total}], archived rows of `kind`, newest first)."""
+    result_sets = call_sp_result_sets(
+        "sp_Admin_GetArchive", (username, kind, student_id, course_id, max_rows)
+    )
+    summary = result_sets[0] if result_sets else []
+    rows = result_sets[1] if len(result_sets) > 1 else []
+    return summary, rows
+
+
+def restore_row(username, kind, history_id):
+    call_sp_non_query("sp_Admin_RestoreArchived", (username, kind, history_id))
+
+
+def restore_student(username, student_id):
+    """
+    Everything archived with the student.
+    Returns {"Grades", "Attendance", "Bitmaps", "Enrollments"}.
+    """
+    return call_sp_single_row(
+        "sp_Admin_RestoreStudentArchive", (username, student_id), autocommit=True
+    ) or {}
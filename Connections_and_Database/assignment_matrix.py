@@ -0,0 +1,131 @@
+from db import call_sp_rows, call_sp_single_row
+
+# =========================================================
+# Assignment Matrix (people x courses)
+#   - INSTRUCTOR_COURSE / TA_COURSE loaded once into a bitset
+#     (one int per person, bit j = course j)
+#   - Edits are local; save() sends only the cells that differ
+#     from the loaded state to sp_Admin_ApplyAssignmentChanges
+#     (one call, one transaction)
+#
+# kind: "INSTRUCTOR" (person key = InstructorID)
+#       "TA"         (person key = Username)
+# =========================================================
+
+KINDS = ("INSTRUCTOR", "TA")
+
+
+class AssignmentMatrix:
+
+    def __init__(self, username, kind):
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}")
+        self.username = username
+        self.kind = kind
+        self.people = []      # [(key, label)]
+        self.courses = []     # [(CourseID, CourseName)]
+        self._base = []       # bits as loaded
+        self._bits = []       # bits as edited
+
+    # -----------------------------------------------------
+    # Load
+    # -----------------------------------------------------
+    def load(self):
+        """Read people, courses and current assignments (one pass each)."""
+        courses = call_sp_rows("sp_Admin_GetCourses", (self.username,))
+        self.courses = [(r["CourseID"], r["CourseName"]) for r in courses]
+        col = {cid: j for j, (cid, _name) in enumerate(self.courses)}
+
+        if self.kind == "INSTRUCTOR":
+            people = call_sp_rows("sp_Admin_GetInstructors", (self.username,))
+            self.people = [(r["InstructorID"], r["FullName"]) for r in people]
+            links = call_sp_rows("sp_Admin_GetInstructorAssignments", (self.username,))
+            pairs = [(r["InstructorID"], r["CourseID"]) for r in links]
+        else:
+            people = call_sp_rows("sp_Admin_GetTAs", (self.username,))
+            self.people = [(r["Username"], r["Username"]) for r in people]
+            links = call_sp_rows("sp_Admin_GetTAAssignments", (self.username,))
+            pairs = [(r["TAUsername"], r["CourseID"]) for r in links]
+
+        row = {key: i for i, (key, _label) in enumerate(self.people)}
+        bits = [0] * len(self.people)
+        for key, cid in pairs:
+            # Assignments to deleted courses / people are not editable here
+            if key in row and cid in col:
+                bits[row[key]] |= 1 << col[cid]
+
+        self._base = bits
+        self._bits = list(bits)
+
+    # -----------------------------------------------------
+    # Cells
+    # -----------------------------------------------------
+    def is_set(self, i, j):
+        return bool(self._bits[i] >> j & 1)
+
+    def was_set(self, i, j):
+        return bool(self._base[i] >> j & 1)
+
+    def is_dirty(self, i, j):
+        return bool((self._bits[i] ^ self._base[i]) >> j & 1)
+
+    def toggle(self, i, j):
+        self._bits[i] ^= 1 << j
+        return self.is_set(i, j)
+
+    def set_cell(self, i, j, value):
+        if value:
+            self._bits[i] |= 1 << j
+        else:
+            self._bits[i] &= ~(1 << j)
+
+    def set_row(self, i, value):
+        self._bits[i] = (1 << len(self.courses)) - 1 if value else 0
+
+    def set_column(self, j, value):
+        for i in range(len(self.people)):
+            self.set_cell(i, j, value)
+
+    def row_count(self, i):
+        return bin(self._bits[i]).count("1")
+
+    # -----------------------------------------------------
+    # Diff / save
+    # -----------------------------------------------------
+    def changes(self):
+        """Changed cells as (person_key, course_id, assign)."""
+        out = []
+        for i, (key, _label) in enumerate(self.people):
+            diff = self._bits[i] ^ self._base[i]
+            j = 0
+            while diff:
+                if diff & 1:
+                    out.append((key, self.courses[j][0], self.is_set(i, j)))
+                diff >>= 1
+                j += 1
+        return out
+
+    def dirty_count(self):
+        return sum(bin(b ^ a).count("1") for a, b in zip(self._base, self._bits))
+
+    def discard(self):
+        self._bits = list(self._base)
+
+    def save(self):
+        """
+        Apply pending changes in one transaction.
+        Returns dict(Assigned, Unassigned); raises DbError (nothing applied).
+        """
+        tvp = [(str(key), cid, 1 if assign else 0) for key, cid, assign in self.changes()]
+        if not tvp:
+            return {"Assigned": 0, "Unassigned": 0}
+
+        # The procedure commits its own transaction
+        result = call_sp_single_row(
+            "sp_Admin_ApplyAssignmentChanges",
+            (self.username, self.kind, tvp),
+            autocommit=True
+        ) or {}
+
+        self._base = list(self._bits)
+        return {"Assigned": result.get("Assigned", 0), "Unassigned": result.get("Unassigned", 0)}
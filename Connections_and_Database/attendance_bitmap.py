@@ -0,0 +1,78 @@
+import numpy as np
+
+from db import call_sp_rows
+
+# =========================================================
+# Attendance Bitmaps (closed terms)
+#   - sp_Admin_PackAttendanceTerm (terms.pack_attendance)
+#     replaces the attendance rows of a read-only term by
+#     one row per (StudentID, CourseID, TermID): a Recorded
+#     and a Present bitmap over the days from StartDate
+#     (bit n = StartDate + n, least significant bit first in
+#     each byte, at most 512 days / 64 bytes)
+#   - Every attendance procedure still returns plain rows;
+#     reopening the term expands the bitmaps back
+#   - Here: NumPy decoding for bulk rate computation
+#     (np.unpackbits over all bitmaps at once, no per-day
+#     Python loops)
+#
+#   rows = get_bitmaps(username, 20253)
+#   recorded, present = decode_matrix(rows)     # (n, 512) bool
+#   rates(rows)                                 # {(StudentID, CourseID): rate %}
+# =========================================================
+
+MAX_DAYS = 512
+MAX_BYTES = MAX_DAYS // 8
+
+
+def get_bitmaps(username, term_id, course_id=None):
+    """
+    [{StudentID, CourseID, TermID, StartDate, Days, Recorded, Present,
+    Sessions, PresentCount, IsPacked}]. Terms not packed yet are packed
+    on the fly by the server, so every term reads the same way.
+    """
+    return call_sp_rows("sp_Admin_GetAttendanceBitmaps", (username, term_id, course_id))
+
+
+def decode(bitmap, days):
+    """One bitmap -> bool array of `days` entries (index n = StartDate + n)."""
+    bits = np.unpackbits(np.frombuffer(bytes(bitmap), dtype=np.uint8), bitorder="little")
+    out = np.zeros(days, dtype=bool)
+    out[:min(days, bits.size)] = bits[:days]
+    return out
+
+
+def _byte_matrix(bitmaps):
+    matrix = np.zeros((len(bitmaps), MAX_BYTES), dtype=np.uint8)
+    for i, b in enumerate(bitmaps):
+        b = bytes(b)[:MAX_BYTES]
+        matrix[i, :len(b)] = np.frombuffer(b, dtype=np.uint8)
+    return matrix
+
+
+def decode_matrix(rows):
+    """
+    (recorded, present): bool arrays of shape (len(rows), 512), one row
+    per bitmap row; days past each row's Days are False.
+    """
+    recorded = np.unpackbits(_byte_matrix([r["Recorded"] for r in rows]), axis=1, bitorder="little")
+    present = np.unpackbits(_byte_matrix([r["Present"] for r in rows]), axis=1, bitorder="little")
+
+    days = np.array([r["Days"] for r in rows], dtype=np.int32).reshape(-1, 1)
+    in_range = np.arange(MAX_DAYS) < days
+    return recorded.astype(bool) & in_range, present.astype(bool) & in_range
+
+
+def rates(rows):
+    """{(StudentID, CourseID): attendance rate % (None if nothing recorded)} from the bitmaps."""
+    if not rows:
+        return {}
+    recorded, present = decode_matrix(rows)
+    sessions = recorded.sum(axis=1)
+    attended = (present & recorded).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = np.where(sessions > 0, 100.0 * attended / sessions, np.nan)
+    return {
+        (r["StudentID"], r["CourseID"]): None if np.isnan(rate[i]) else round(float(rate[i]), 1)
+        for i, r in enumerate(rows)
+    }
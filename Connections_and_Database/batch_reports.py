@@ -0,0 +1,313 @@
+import hashlib
+import html
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from db import call_sp_rows, call_sp_result_sets
+
+# =========================================================
+# Batch Term Reports (student transcripts + course reports)
+#   - All source data in one call (sp_Admin_GetReportData:
+#     a few set-based queries, grades decrypted server-side)
+#   - Every report's source rows are fingerprinted; only
+#     reports whose fingerprint changed (or whose file is
+#     missing) are rendered again
+#   - Nothing changed since the last run (same DATA_VERSION
+#     counters) -> no bulk fetch at all
+#   - Rendering runs in a process pool sized to the cores
+#   - Output: <dir>/students/*.html, <dir>/courses/*.html,
+#     <dir>/manifest.json (versions + fingerprint per file)
+#
+# Environment:
+#   SRMS_REPORTS_DIR=<dir>      default output directory
+# =========================================================
+
+REPORTS_DIR = os.environ.get(
+    "SRMS_REPORTS_DIR",
+    os.path.join(os.path.expanduser("~"), ".srms", "reports")
+)
+MANIFEST = "manifest.json"
+
+SOURCE_TABLES = ("STUDENT", "COURSE", "INSTRUCTOR", "INSTRUCTOR_COURSE",
+                 "COURSE_STUDENT", "GRADES", "ATTENDANCE")
+MIN_STATS_GROUP = 3     # same query-set-size floor as the inference-safe views
+SERIAL_BELOW = 8        # fewer jobs than this: render in-process (pool start-up costs more)
+
+
+# ---------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------
+def load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {"versions": {}, "reports": {}}
+    manifest.setdefault("versions", {})
+    manifest.setdefault("reports", {})
+    return manifest
+
+
+def _save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _fingerprint(payload):
+    text = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _all_present(out_dir, manifest):
+    return all(os.path.exists(os.path.join(out_dir, rel)) for rel in manifest["reports"])
+
+
+# ---------------------------------------------------------
+# Source data -> one payload per report
+# ---------------------------------------------------------
+def _rate(present, sessions):
+    return round(100.0 * present / sessions, 1) if sessions else None
+
+
+def _num(v):
+    return float(v) if v is not None else None
+
+
+def build_payloads(result_sets):
+    """{relative path: (kind, payload)} from the sp_Admin_GetReportData result sets."""
+    _versions, students, courses, enrollments, grades, attendance = result_sets[:6]
+
+    grade_of = {(g["StudentID"], g["CourseID"]): _num(g["Grade"]) for g in grades}
+    att_of = {(a["StudentID"], a["CourseID"]): (a["Present"] or 0, a["Sessions"] or 0) for a in attendance}
+    student_by_id = {s["StudentID"]: s for s in students}
+    course_by_id = {c["CourseID"]: c for c in courses}
+
+    courses_of = {}
+    roster_of = {}
+    for e in enrollments:
+        courses_of.setdefault(e["StudentID"], []).append(e["CourseID"])
+        roster_of.setdefault(e["CourseID"], []).append(e["StudentID"])
+
+    def line(student_id, course_id):
+        present, sessions = att_of.get((student_id, course_id), (0, 0))
+        return {
+            "grade": grade_of.get((student_id, course_id)),
+            "present": present,
+            "sessions": sessions,
+            "rate": _rate(present, sessions),
+        }
+
+    payloads = {}
+    for s in students:
+        sid = s["StudentID"]
+        rows = []
+        for cid in courses_of.get(sid, []):
+            c = course_by_id.get(cid)
+            if c is not None:
+                rows.append(dict(line(sid, cid), course_id=cid, course=c["CourseName"]))
+        payloads[f"students/student_{sid}.html"] = ("student", {
+            "id": sid,
+            "name": s["FullName"],
+            "email": s["Email"],
+            "department": s["Department"],
+            "courses": rows,
+        })
+
+    for c in courses:
+        cid = c["CourseID"]
+        roster = []
+        for sid in roster_of.get(cid, []):
+            s = student_by_id.get(sid)
+            if s is not None:
+                roster.append(dict(line(sid, cid), student_id=sid, name=s["FullName"]))
+        payloads[f"courses/course_{cid}.html"] = ("course", {
+            "id": cid,
+            "name": c["CourseName"],
+            "instructors": c.get("Instructors") or "",
+            "roster": roster,
+        })
+    return payloads
+
+
+# ---------------------------------------------------------
+# Rendering (runs in worker processes: module-level, picklable)
+# ---------------------------------------------------------
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 32px; color: #2f3640; }}
+h1 {{ color: #273c75; }}
+table {{ border-collapse: collapse; margin-top: 12px; }}
+th, td {{ border: 1px solid #dcdde1; padding: 6px 12px; text-align: left; }}
+th {{ background: #f5f6fa; }}
+.meta, .foot {{ color: #718093; }}
+</style></head><body>
+<h1>{title}</h1>
+{body}
+<p class="foot">Generated {generated}</p>
+</body></html>
+"""
+
+
+def _fmt(v, suffix=""):
+    return "-" if v is None else f"{v:g}{suffix}" if isinstance(v, float) else f"{v}{suffix}"
+
+
+def _table(headers, rows):
+    head = "".join(f"<th>{html.escape(h)}</th>" for h in headers)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{html.escape(str(v))}</td>" for v in r) + "</tr>"
+        for r in rows
+    )
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+def grade_stats(grades):
+    """count / mean / median / min / max / stdev; None when below MIN_STATS_GROUP."""
+    grades = [g for g in grades if g is not None]
+    if len(grades) < MIN_STATS_GROUP:
+        return None
+    return {
+        "count": len(grades),
+        "mean": round(statistics.fmean(grades), 2),
+        "median": round(statistics.median(grades), 2),
+        "min": min(grades),
+        "max": max(grades),
+        "stdev": round(statistics.stdev(grades), 2),
+    }
+
+
+def _render_student(p):
+    rows = [
+        (c["course_id"], c["course"], _fmt(c["grade"]), f"{c['present']}/{c['sessions']}", _fmt(c["rate"], "%"))
+        for c in p["courses"]
+    ]
+    graded = [c["grade"] for c in p["courses"] if c["grade"] is not None]
+    average = round(statistics.fmean(graded), 2) if graded else None
+    body = (
+        f"<p class=\"meta\">Student {p['id']} · {html.escape(p['department'])} · {html.escape(p['email'])}</p>"
+        + _table(("Course ID", "Course", "Grade", "Present", "Attendance"), rows)
+        + f"<p>Average grade: <b>{_fmt(average)}</b> over {len(graded)} graded course(s)</p>"
+    )
+    return f"Transcript – {p['name']}", body
+
+
+def _render_course(p):
+    rows = [
+        (r["student_id"], r["name"], _fmt(r["grade"]), f"{r['present']}/{r['sessions']}", _fmt(r["rate"], "%"))
+        for r in p["roster"]
+    ]
+    stats = grade_stats([r["grade"] for r in p["roster"]])
+    if stats is None:
+        summary = f"<p>Grade statistics withheld (fewer than {MIN_STATS_GROUP} grades).</p>"
+    else:
+        summary = _table(("Graded", "Mean", "Median", "Min", "Max", "Std dev"),
+                         [[_fmt(stats[k]) for k in ("count", "mean", "median", "min", "max", "stdev")]])
+    body = (
+        f"<p class=\"meta\">Course {p['id']} · Instructors: {html.escape(p['instructors'] or '-')}"
+        f" · {len(p['roster'])} enrolled</p>"
+        + summary
+        + _table(("Student ID", "Name", "Grade", "Present", "Attendance"), rows)
+    )
+    return f"Course Report – {p['name']}", body
+
+
+_RENDERERS = {"student": _render_student, "course": _render_course}
+
+
+def render_report(job):
+    """job = (out_dir, relative path, kind, payload, generated). Writes the file atomically."""
+    out_dir, rel, kind, payload, generated = job
+    title, body = _RENDERERS[kind](payload)
+    page = _PAGE.format(title=html.escape(title), body=body, generated=generated)
+
+    path = os.path.join(out_dir, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(page)
+    os.replace(tmp, path)
+    return rel
+
+
+# ---------------------------------------------------------
+# Batch
+# ---------------------------------------------------------
+def generate(username, out_dir=REPORTS_DIR, force=False, workers=None, progress=None):
+    """
+    Bring every report in `out_dir` up to date.
+    Returns {"total", "generated", "unchanged", "removed", "seconds"}.
+    progress(done, total) is called as reports are written. Raises DbError / OSError.
+    """
+    started = time.monotonic()
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"versions": {}, "reports": {}} if force else load_manifest(out_dir)
+
+    def summary(total, generated, removed):
+        return {
+            "total": total, "generated": generated, "unchanged": total - generated,
+            "removed": removed, "seconds": round(time.monotonic() - started, 2),
+        }
+
+    # Cheap check first: same counters and every file present -> done
+    if manifest["versions"] and _all_present(out_dir, manifest):
+        current = {r["TableName"]: r["Version"] for r in call_sp_rows("sp_GetDataVersions", (username,))}
+        if {t: current.get(t) for t in SOURCE_TABLES} == manifest["versions"]:
+            return summary(len(manifest["reports"]), 0, 0)
+
+    result_sets = call_sp_result_sets("sp_Admin_GetReportData", (username,))
+    versions = {r["TableName"]: r["Version"] for r in result_sets[0]}
+    payloads = build_payloads(result_sets)
+
+    generated = datetime.now().isoformat(sep=" ", timespec="seconds")
+    old = manifest["reports"]
+    reports = {}
+    jobs = []
+    for rel, (kind, payload) in payloads.items():
+        fp = _fingerprint(payload)
+        entry = old.get(rel)
+        if entry and entry.get("fingerprint") == fp and os.path.exists(os.path.join(out_dir, rel)):
+            reports[rel] = entry
+            continue
+        reports[rel] = {"kind": kind, "id": payload["id"], "fingerprint": fp, "generated": generated}
+        jobs.append((out_dir, rel, kind, payload, generated))
+
+    done = 0
+    if len(jobs) < SERIAL_BELOW:
+        results = map(render_report, jobs)
+        pool = None
+    else:
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(render_report, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+    try:
+        for _rel in results:
+            done += 1
+            if progress:
+                progress(done, len(jobs))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Students / courses that no longer exist
+    removed = 0
+    for rel in set(old) - set(reports):
+        try:
+            os.remove(os.path.join(out_dir, rel))
+            removed += 1
+        except OSError:
+            pass
+
+    _save_manifest(out_dir, {
+        "versions": {t: versions.get(t) for t in SOURCE_TABLES},
+        "generated": generated,
+        "reports": reports,
+    })
+    return summary(len(reports), len(jobs), removed)
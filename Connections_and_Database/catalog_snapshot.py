@@ -0,0 +1,171 @@
+import bisect
+import json
+import os
+import re
+import time
+
+from db import call_sp_result_sets, DbError
+
+# =========================================================
+# Public Catalog Snapshot (guest traffic)
+#   - Public courses kept in a local JSON-lines file with the
+#     COURSE data version it was taken at
+#   - Server is asked at most once per CHECK_INTERVAL (shared
+#     by every guest session on this machine via the file);
+#     rows are only re-sent when COURSE actually changed
+#   - Server unreachable -> last snapshot is served
+#   - In-memory token index over name / description / info
+#
+# File layout (UTF-8, one JSON object per line):
+#   {"version": 12, "checked_at": 1760000000.0, "count": 40}
+#   {"CourseID": 300, "CourseName": "...", ...}
+#   ...
+#
+# Environment:
+#   SRMS_CATALOG_PATH=<file>    snapshot location
+#   SRMS_CATALOG_TTL=300        seconds between version checks
+# =========================================================
+
+CATALOG_PATH = os.environ.get(
+    "SRMS_CATALOG_PATH",
+    os.path.join(os.path.expanduser("~"), ".srms", "public_catalog.jsonl")
+)
+CHECK_INTERVAL = float(os.environ.get("SRMS_CATALOG_TTL", "300"))
+
+FIELDS = ("CourseID", "CourseName", "Description", "PublicInfo")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(text):
+    return _TOKEN.findall((text or "").lower())
+
+
+class CatalogSnapshot:
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self.version = None
+        self.checked_at = 0.0
+        self.courses = []
+        self._terms = []      # sorted tokens
+        self._postings = {}   # token -> set(row index)
+
+    # -----------------------------------------------------
+    # File
+    # -----------------------------------------------------
+    def load(self):
+        """Read the snapshot file; False if missing or unreadable."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                courses = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError):
+            return False
+
+        if header.get("count") != len(courses):
+            return False   # torn / partial file
+
+        self.version = header.get("version")
+        self.checked_at = header.get("checked_at", 0.0)
+        self._set_courses(courses)
+        return True
+
+    def save(self):
+        """Atomic rewrite (temp file + replace)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            header = {"version": self.version, "checked_at": self.checked_at, "count": len(self.courses)}
+            f.write(json.dumps(header) + "\n")
+            for c in self.courses:
+                f.write(json.dumps(c, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+    # -----------------------------------------------------
+    # Refresh
+    # -----------------------------------------------------
+    def is_fresh(self):
+        return self.version is not None and time.time() - self.checked_at < CHECK_INTERVAL
+
+    def refresh(self, username, force=False):
+        """
+        Make the snapshot current. No DB call while fresh.
+        Returns True if the courses changed.
+        Raises DbError only when there is no snapshot to fall back to.
+        """
+        if not force and self.is_fresh():
+            return False
+
+        # Another guest session may have refreshed the file meanwhile
+        if not force and self.load() and self.is_fresh():
+            return True
+
+        try:
+            result_sets = call_sp_result_sets("sp_Get_PublicCatalog", (username, self.version))
+        except DbError:
+            if self.version is None:
+                raise
+            return False
+
+        version = result_sets[0][0]["Version"] if result_sets and result_sets[0] else 0
+        changed = version != self.version
+        if changed:
+            rows = result_sets[1] if len(result_sets) > 1 else []
+            self._set_courses([{k: r.get(k) for k in FIELDS} for r in rows])
+            self.version = version
+
+        self.checked_at = time.time()
+        try:
+            self.save()
+        except OSError:
+            pass   # read-only profile: still served from memory
+        return changed
+
+    # -----------------------------------------------------
+    # Search index
+    # -----------------------------------------------------
+    def _set_courses(self, courses):
+        self.courses = courses
+        postings = {}
+        for i, c in enumerate(courses):
+            text = " ".join(str(c.get(k) or "") for k in FIELDS)
+            for tok in _tokens(text):
+                postings.setdefault(tok, set()).add(i)
+        self._postings = postings
+        self._terms = sorted(postings)
+
+    def _prefix_rows(self, prefix):
+        rows = set()
+        i = bisect.bisect_left(self._terms, prefix)
+        while i < len(self._terms) and self._terms[i].startswith(prefix):
+            rows |= self._postings[self._terms[i]]
+            i += 1
+        return rows
+
+    def search(self, query):
+        """Courses matching every word of `query` (word-prefix match), catalog order."""
+        words = _tokens(query)
+        if not words:
+            return list(self.courses)
+
+        rows = None
+        for w in words:
+            hits = self._prefix_rows(w)
+            rows = hits if rows is None else rows & hits
+            if not rows:
+                return []
+        return [self.courses[i] for i in sorted(rows)]
+
+
+_snapshot = None
+
+
+def get_catalog(username, force=False):
+    """Process-wide snapshot, refreshed only when due."""
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = CatalogSnapshot()
+        _snapshot.load()
+    _snapshot.refresh(username, force)
+    return _snapshot
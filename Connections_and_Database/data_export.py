@@ -0,0 +1,136 @@
+import csv
+import gzip
+import io
+import json
+import os
+from collections import namedtuple
+
+from db import call_sp_result_sets
+
+# =========================================================
+# Chunked Export (grades / attendance -> .csv.gz)
+#   - Server hands out key-ranged chunks (key > last key,
+#     TOP n, clustered PK order): each call is one short
+#     statement, no long-held locks, grades decrypted per chunk
+#   - Attendance is keyed by RowKey (AttendanceID for stored
+#     rows, then the days of packed closed-term bitmaps)
+#   - Every chunk is written as its own gzip member and
+#     fsync'ed; the file is always a valid .csv.gz up to the
+#     last finished chunk (gzip readers join the members)
+#   - Sidecar "<file>.progress" records the last key and the
+#     byte offset after that chunk; an interrupted export is
+#     resumed from there (a torn tail is truncated away)
+#   - Only one chunk is ever held in memory
+#
+# Meant to run on a worker thread: progress(rows, last_key,
+# max_key) is called after each chunk; cancel is a
+# threading.Event checked between chunks.
+# =========================================================
+
+Export = namedtuple("Export", "proc key columns chunk_size")
+
+EXPORTS = {
+    "grades": Export(
+        "sp_Admin_ExportGrades_Chunk", "GradeID",
+        ("GradeID", "StudentID", "StudentName", "CourseID", "CourseName", "TermID", "Grade", "DateEntered"),
+        5000,
+    ),
+    "attendance": Export(
+        "sp_Admin_ExportAttendance_Chunk", "RowKey",
+        ("AttendanceID", "StudentID", "CourseID", "CourseName", "TermID", "Status", "DateRecorded"),
+        20000,
+    ),
+}
+
+
+def progress_path(path):
+    return path + ".progress"
+
+
+def read_progress(path, kind):
+    """Saved progress of an interrupted export of `kind` into `path` (None if none / unusable)."""
+    try:
+        with open(progress_path(path), encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if state.get("kind") != kind:
+        return None
+    try:
+        if os.path.getsize(path) < state.get("offset", 0):
+            return None     # file shorter than recorded: not the same export
+    except OSError:
+        return None
+    return state
+
+
+def _write_progress(path, state):
+    target = progress_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, target)
+
+
+def _gzip_member(rows, columns, header):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    if header:
+        writer.writerow(columns)
+    for r in rows:
+        writer.writerow([r.get(c) for c in columns])
+    return gzip.compress(buf.getvalue().encode("utf-8"))
+
+
+def export(username, kind, path, resume=True, chunk_size=None, progress=None, cancel=None):
+    """
+    Export every live row of `kind` ("grades" / "attendance") to `path` (gzip CSV).
+    Returns (rows written, finished). finished=False when cancelled;
+    the saved progress lets the next call continue. Raises DbError / OSError.
+    """
+    spec = EXPORTS[kind]
+    chunk_size = chunk_size or spec.chunk_size
+
+    state = read_progress(path, kind) if resume else None
+    if state is None:
+        state = {"kind": kind, "last_key": 0, "rows": 0, "offset": 0}
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    mode = "r+b" if state["offset"] and os.path.exists(path) else "wb"
+
+    with open(path, mode) as f:
+        f.truncate(state["offset"])
+        f.seek(state["offset"])
+
+        while True:
+            if cancel is not None and cancel.is_set():
+                return state["rows"], False
+
+            result_sets = call_sp_result_sets(spec.proc, (username, state["last_key"], chunk_size))
+            rows = result_sets[0] if result_sets else []
+            max_key = result_sets[1][0]["MaxID"] if len(result_sets) > 1 and result_sets[1] else 0
+
+            if rows:
+                f.write(_gzip_member(rows, spec.columns, header=state["offset"] == 0))
+                f.flush()
+                os.fsync(f.fileno())
+
+                state["last_key"] = rows[-1][spec.key]
+                state["rows"] += len(rows)
+                state["offset"] = f.tell()
+                _write_progress(path, state)
+            elif state["offset"] == 0:
+                # Nothing to export: still leave a file with the header
+                f.write(_gzip_member([], spec.columns, header=True))
+
+            if progress:
+                progress(state["rows"], state["last_key"], max_key)
+
+            if not rows:
+                break       # an empty chunk ends it (the server may cap chunk_size)
+
+    try:
+        os.remove(progress_path(path))
+    except OSError:
+        pass
+    return state["rows"], True
@@ -1,213 +1,410 @@
-import pyodbc
-
-# =========================================================
-# Database configuration
-# =========================================================
-
-DRIVER = "ODBC Driver 17 for SQL Server"
-SERVER = r"LAPTOP-P881SO0E\MSSQLSERVER01"
-DATABASE = "SRMS_DB"
-
-CONNECTION_STRING = (
-    f"DRIVER={{{DRIVER}}};"
-    f"SERVER={SERVER};"
-    f"DATABASE={DATABASE};"
-    f"Trusted_Connection=yes;"
-)
-
-
-# =========================================================
-# Custom Exception
-# =========================================================
-
-class DbError(Exception):
-    """Clean database exception for UI handling."""
-    pass
-
-
-# =========================================================
-# Connection Helper
-# =========================================================
-
-def get_connection():
-    """
-    Create and return a SQL Server connection.
-    """
-    try:
-        return pyodbc.connect(CONNECTION_STRING)
-    except Exception as e:
-        raise DbError(f"Database connection failed: {e}") from e
-
-
-# =========================================================
-# Internal Helpers
-# =========================================================
-
-def _normalize_row(columns, row):
-    """
-    Convert pyodbc row → dict
-    Handles VARBINARY / memoryview safely.
-    """
-    result = {}
-    for i, col in enumerate(columns):
-        val = row[i]
-        if isinstance(val, memoryview):
-            val = val.tobytes()
-        result[col] = val
-    return result
-
-
-def _build_sp_exec(sp_name, param_count):
-    """
-    Build EXEC sp_name ?,?,? dynamically.
-    """
-    if param_count == 0:
-        return f"EXEC {sp_name}"
-    placeholders = ", ".join("?" for _ in range(param_count))
-    return f"EXEC {sp_name} {placeholders}"
-
-
-# =========================================================
-# SELECT Helpers
-# =========================================================
-
-def execute_query(query, params=None):
-    """
-    Execute SELECT returning multiple rows.
-    Returns list[dict]
-    """
-    conn = get_connection()
-    cursor = None
-
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params or ())
-        columns = [c[0] for c in cursor.description] if cursor.description else []
-        rows = cursor.fetchall()
-        return [_normalize_row(columns, r) for r in rows]
-
-    except Exception as e:
-        raise DbError(f"Query failed: {e}") from e
-
-    finally:
-        if cursor:
-            cursor.close()
-        conn.close()
-
-
-def execute_single_row(query, params=None):
-    """
-    Execute SELECT returning single row or None.
-    """
-    conn = get_connection()
-    cursor = None
-
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params or ())
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        columns = [c[0] for c in cursor.description] if cursor.description else []
-        return _normalize_row(columns, row)
-
-    except Exception as e:
-        raise DbError(f"Single-row query failed: {e}") from e
-
-    finally:
-        if cursor:
-            cursor.close()
-        conn.close()
-
-
-def execute_scalar(query, params=None):
-    """
-    Execute SELECT returning single scalar value.
-    """
-    conn = get_connection()
-    cursor = None
-
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params or ())
-        row = cursor.fetchone()
-        return row[0] if row else None
-
-    except Exception as e:
-        raise DbError(f"Scalar query failed: {e}") from e
-
-    finally:
-        if cursor:
-            cursor.close()
-        conn.close()
-
-
-# =========================================================
-# NON-QUERY Helper (INSERT / UPDATE / DELETE)
-# =========================================================
-
-def execute_non_query(query, params=None):
-    """
-    Execute non-select statement.
-    Returns affected row count.
-    """
-    conn = get_connection()
-    cursor = None
-
-    try:
-        cursor = conn.cursor()
-        cursor.execute(query, params or ())
-        affected = cursor.rowcount
-        conn.commit()
-        return affected
-
-    except Exception as e:
-        conn.rollback()
-        raise DbError(f"Non-query failed: {e}") from e
-
-    finally:
-        if cursor:
-            cursor.close()
-        conn.close()
-
-
-# =========================================================
-# STORED PROCEDURE HELPERS (MAIN API)
-# =========================================================
-
-def call_sp_rows(sp_name, params=None):
-    """
-    Call SP that returns multiple rows.
-    """
-    params = tuple(params or ())
-    query = _build_sp_exec(sp_name, len(params))
-    return execute_query(query, params)
-
-
-def call_sp_single_row(sp_name, params=None):
-    """
-    Call SP that returns single row.
-    """
-    params = tuple(params or ())
-    query = _build_sp_exec(sp_name, len(params))
-    return execute_single_row(query, params)
-
-
-def call_sp_scalar(sp_name, params=None):
-    """
-    Call SP that returns scalar value.
-    """
-    params = tuple(params or ())
-    query = _build_sp_exec(sp_name, len(params))
-    return execute_scalar(query, params)
-
-
-def call_sp_non_query(sp_name, params=None):
-    """
-    Call SP that performs INSERT / UPDATE / DELETE.
-    Returns affected rows count.
-    """
-    params = tuple(params or ())
-    query = _build_sp_exec(sp_name, len(params))
-    return execute_non_query(query, params)
+import threading
+
+import pyodbc
+
+import db_metrics
+
+# =========================================================
+# Database configuration
+# =========================================================
+
+DRIVER = "ODBC Driver 17 for SQL Server"
+SERVER = r"LAPTOP-P881SO0E\MSSQLSERVER01"
+DATABASE = "SRMS_DB"
+
+CONNECTION_STRING = (
+    f"DRIVER={{{DRIVER}}};"
+    f"SERVER={SERVER};"
+    f"DATABASE={DATABASE};"
+    f"Trusted_Connection=yes;"
+)
+
+
+# =========================================================
+# Custom Exception
+# =========================================================
+
+class DbError(Exception):
+    """Clean database exception for UI handling."""
+    pass
+
+
+class DbConnectionError(DbError):
+    """Server unreachable (lets offline-capable callers fall back)."""
+    pass
+
+
+# =========================================================
+# Connection Helper
+# =========================================================
+
+def get_connection(autocommit=False):
+    """
+    Create and return a SQL Server connection.
+    autocommit=True for procedures that manage their own
+    transactions (e.g. batched bulk imports).
+    """
+    try:
+        return pyodbc.connect(CONNECTION_STRING, autocommit=autocommit)
+    except Exception as e:
+        raise DbConnectionError(f"Database connection failed: {e}") from e
+
+
+# =========================================================
+# Internal Helpers
+# =========================================================
+
+def _normalize_row(columns, row):
+    """
+    Convert pyodbc row → dict
+    Handles VARBINARY / memoryview safely.
+    """
+    result = {}
+    for i, col in enumerate(columns):
+        val = row[i]
+        if isinstance(val, memoryview):
+            val = val.tobytes()
+        result[col] = val
+    return result
+
+
+def _build_sp_exec(sp_name, param_count):
+    """
+    Build EXEC sp_name ?,?,? dynamically.
+    """
+    if param_count == 0:
+        return f"EXEC {sp_name}"
+    placeholders = ", ".join("?" for _ in range(param_count))
+    return f"EXEC {sp_name} {placeholders}"
+
+
+def _commit_reads(conn, cursor, autocommit):
+    """
+    Read procedures write their audit rows (sp_LogAction) after
+    the result set: drain the batch so they run, then commit
+    (closing an open transaction would roll them back).
+    """
+    while cursor.nextset():
+        pass
+    if not autocommit:
+        conn.commit()
+
+
+# =========================================================
+# SELECT Helpers
+# =========================================================
+
+@db_metrics.instrument
+def execute_query(query, params=None, autocommit=False):
+    """
+    Execute SELECT returning multiple rows.
+    Returns list[dict]
+    """
+    conn = get_connection(autocommit)
+    cursor = None
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params or ())
+        columns = [c[0] for c in cursor.description] if cursor.description else []
+        rows = cursor.fetchall()
+        _commit_reads(conn, cursor, autocommit)
+        return [_normalize_row(columns, r) for r in rows]
+
+    except Exception as e:
+        raise DbError(f"Query failed: {e}") from e
+
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
+
+
+@db_metrics.instrument
+def execute_single_row(query, params=None, autocommit=False):
+    """
+    Execute SELECT returning single row or None.
+    """
+    conn = get_connection(autocommit)
+    cursor = None
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params or ())
+        row = cursor.fetchone()
+        columns = [c[0] for c in cursor.description] if cursor.description else []
+        _commit_reads(conn, cursor, autocommit)
+        if not row:
+            return None
+        return _normalize_row(columns, row)
+
+    except Exception as e:
+        raise DbError(f"Single-row query failed: {e}") from e
+
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
+
+
+@db_metrics.instrument
+def execute_result_sets(query, params=None, autocommit=False):
+    """
+    Execute a batch that returns several result sets.
+    Returns list[list[dict]] in server order (via nextset()).
+    """
+    conn = get_connection(autocommit)
+    cursor = None
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params or ())
+
+        result_sets = []
+        while True:
+            if cursor.description:
+                columns = [c[0] for c in cursor.description]
+                result_sets.append([_normalize_row(columns, r) for r in cursor.fetchall()])
+            if not cursor.nextset():
+                break
+        _commit_reads(conn, cursor, autocommit)
+        return result_sets
+
+    except Exception as e:
+        raise DbError(f"Multi-result query failed: {e}") from e
+
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
+
+
+@db_metrics.instrument
+def execute_scalar(query, params=None, autocommit=False):
+    """
+    Execute SELECT returning single scalar value.
+    """
+    conn = get_connection(autocommit)
+    cursor = None
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params or ())
+        row = cursor.fetchone()
+        _commit_reads(conn, cursor, autocommit)
+        return row[0] if row else None
+
+    except Exception as e:
+        raise DbError(f"Scalar query failed: {e}") from e
+
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
+
+
+# =========================================================
+# NON-QUERY Helper (INSERT / UPDATE / DELETE)
+# =========================================================
+
+@db_metrics.instrument
+def execute_non_query(query, params=None):
+    """
+    Execute non-select statement.
+    Returns affected row count.
+    """
+    conn = get_connection()
+    cursor = None
+
+    try:
+        cursor = conn.cursor()
+        cursor.execute(query, params or ())
+        affected = cursor.rowcount
+        conn.commit()
+        return affected
+
+    except Exception as e:
+        conn.rollback()
+        raise DbError(f"Non-query failed: {e}") from e
+
+    finally:
+        if cursor:
+            cursor.close()
+        conn.close()
+
+
+# =========================================================
+# STORED PROCEDURE HELPERS (MAIN API)
+# =========================================================
+
+def call_sp_rows(sp_name, params=None, autocommit=False):
+    """
+    Call SP that returns multiple rows.
+    """
+    params = tuple(params or ())
+    query = _build_sp_exec(sp_name, len(params))
+    return execute_query(query, params, autocommit=autocommit)
+
+
+def call_sp_single_row(sp_name, params=None, autocommit=False):
+    """
+    Call SP that returns single row.
+    """
+    params = tuple(params or ())
+    query = _build_sp_exec(sp_name, len(params))
+    return execute_single_row(query, params, autocommit=autocommit)
+
+
+def call_sp_result_sets(sp_name, params=None, autocommit=False):
+    """
+    Call SP that returns several result sets.
+    Returns list[list[dict]].
+    """
+    params = tuple(params or ())
+    query = _build_sp_exec(sp_name, len(params))
+    return execute_result_sets(query, params, autocommit=autocommit)
+
+
+def call_sp_scalar(sp_name, params=None, autocommit=False):
+    """
+    Call SP that returns scalar value.
+    """
+    params = tuple(params or ())
+    query = _build_sp_exec(sp_name, len(params))
+    return execute_scalar(query, params, autocommit=autocommit)
+
+
+def call_sp_non_query(sp_name, params=None):
+    """
+    Call SP that performs INSERT / UPDATE / DELETE.
+    Returns affected rows count.
+    """
+    params = tuple(params or ())
+    query = _build_sp_exec(sp_name, len(params))
+    return execute_non_query(query, params)
+
+
+# =========================================================
+# DATA VERSION POLLER (auto-refresh open screens)
+# =========================================================
+
+POLL_INTERVAL_MS = 3000
+FETCH_CHECK_MS = 50     # how often a tick checks its background version read
+
+_pollers = {}
+
+
+class DataVersionPoller:
+    """
+    Polls sp_GetDataVersions and re-runs a screen's loader
+    only when one of the tables it shows has changed.
+    Scheduling uses the watched widgets' Tk `after`; the
+    version read itself runs on a worker thread, so a slow
+    server never freezes the open screens.
+    """
+
+    def __init__(self, username, interval_ms=POLL_INTERVAL_MS):
+        self.username = username
+        self.interval_ms = interval_ms
+        self._watchers = []   # [widget, tables, callback, seen_versions]
+        self._anchor = None
+        self._after_id = None
+        self._pending = None  # (delay, fn) armed on the anchor
+        self._running = False # a tick is in progress (fetching or running callbacks)
+
+    def _fetch(self):
+        try:
+            rows = call_sp_rows("sp_GetDataVersions", (self.username,))
+        except DbError:
+            return None
+        return {r["TableName"]: r["Version"] for r in rows}
+
+    def watch(self, widget, tables, callback, versions=None):
+        """
+        Call `callback()` whenever any of `tables` changes,
+        until `widget` is destroyed. `versions` ({TableName: Version})
+        is the state the caller's data reflects; None reads it now.
+        """
+        tables = tuple(t.upper() for t in tables)
+        if versions is None:
+            versions = self._fetch() or {}
+        entry = [widget, tables, callback, {t: versions.get(t) for t in tables}]
+        self._watchers.append(entry)
+
+        def on_destroy(event):
+            if event.widget is widget:
+                self._unwatch(entry)
+
+        widget.bind("<Destroy>", on_destroy, add="+")
+
+        if self._after_id is None and not self._running:
+            self._arm(self.interval_ms, self._tick)
+
+    def _unwatch(self, entry):
+        if entry in self._watchers:
+            self._watchers.remove(entry)
+
+        # The timer dies with its widget: move it to another one.
+        # While callbacks run nothing is armed; _tick re-arms once at the end.
+        if self._anchor is entry[0] and self._after_id is not None:
+            try:
+                self._anchor.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+            self._arm(*self._pending)
+
+    def _arm(self, delay, fn):
+        self._pending = (delay, fn)
+        if not self._watchers:
+            self._anchor = None
+            self._after_id = None
+            return
+        self._anchor = self._watchers[0][0]
+        self._after_id = self._anchor.after(delay, fn)
+
+    def _tick(self):
+        self._after_id = None
+        self._running = True
+        box = {}
+        worker = threading.Thread(target=lambda: box.update(versions=self._fetch()), daemon=True)
+        worker.start()
+        self._await(worker, box)
+
+    def _await(self, worker, box):
+        self._after_id = None
+        if worker.is_alive():
+            self._arm(FETCH_CHECK_MS, lambda: self._await(worker, box))
+            if self._after_id is None:
+                self._running = False       # nothing left to watch
+            return
+
+        versions = box.get("versions")
+        try:
+            if versions is not None:
+                for entry in list(self._watchers):
+                    if entry not in self._watchers:
+                        continue    # unwatched by an earlier callback
+                    current = {t: versions.get(t) for t in entry[1]}
+                    if current != entry[3]:
+                        entry[3] = current
+                        try:
+                            entry[2]()
+                        except DbError:
+                            pass
+        finally:
+            self._running = False
+            self._arm(self.interval_ms, self._tick)
+
+
+def watch_data_versions(username, widget, tables, callback, versions=None):
+    """
+    Auto-refresh helper for screens:
+        watch_data_versions(Session.username, win, ["GRADES"], load_grades)
+    versions: counters the shown data was read at (e.g. cached rows);
+    a change since then triggers callback on the first tick.
+    """
+    poller = _pollers.get(username)
+    if poller is None:
+        poller = _pollers[username] = DataVersionPoller(username)
+    poller.watch(widget, tables, callback, versions)
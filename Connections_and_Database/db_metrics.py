@@ -0,0 +1,384 @@
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# =========================================================
+# DB Call Metrics (opt-in)
+#   - Per procedure: calls, errors, rows, bytes, latency histogram
+#   - Slow-call log (parameters redacted)
+#   - Prometheus text exporter + periodic JSON snapshot
+#
+# Environment:
+#   SRMS_DB_METRICS=1               enable collection
+#   SRMS_DB_SLOW_MS=500             slow-call threshold (ms)
+#   SRMS_DB_SLOW_LOG=<path>         slow-call log file
+#   SRMS_DB_METRICS_SNAPSHOT=<path> JSON snapshot file
+#   SRMS_DB_METRICS_INTERVAL=60     snapshot period (s)
+#   SRMS_DB_METRICS_PORT=<port>     serve /metrics (Prometheus)
+#
+# When disabled, an instrumented helper costs one global
+# lookup and one branch on top of the plain call.
+# =========================================================
+
+_METRICS_DIR = os.path.join(os.path.expanduser("~"), ".srms")
+
+ENABLED = os.environ.get("SRMS_DB_METRICS", "").lower() in ("1", "true", "yes", "on")
+SLOW_MS = float(os.environ.get("SRMS_DB_SLOW_MS", "500"))
+SLOW_LOG = os.environ.get("SRMS_DB_SLOW_LOG", os.path.join(_METRICS_DIR, "db_slow.log"))
+
+# Prometheus histogram boundaries (seconds)
+PROM_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_stats = {}
+
+
+# =========================================================
+# HDR-style histogram
+#   Log-linear buckets over integer microseconds:
+#   16 sub-buckets per power of two (~6% relative error),
+#   exact below 32 µs. Sparse dict, so memory follows the
+#   spread of observed latencies, not the value range.
+# =========================================================
+
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+
+
+def _bucket_index(us):
+    if us < 2 * _SUB_COUNT:
+        return us
+    shift = us.bit_length() - (_SUB_BITS + 1)
+    return shift * _SUB_COUNT + (us >> shift)
+
+
+def _bucket_upper(index):
+    """Highest microsecond value that falls into bucket `index`."""
+    if index < 2 * _SUB_COUNT:
+        return index
+    shift = index // _SUB_COUNT - 1
+    mantissa = index - shift * _SUB_COUNT
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Sparse log-linear latency histogram (microseconds)."""
+
+    __slots__ = ("counts", "total", "sum_us", "max_us")
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.sum_us = 0
+        self.max_us = 0
+
+    def record(self, us):
+        idx = _bucket_index(us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.total += 1
+        self.sum_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, p):
+        if not self.total:
+            return 0
+        target = max(1, int(round(self.total * p / 100.0)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= target:
+                return min(_bucket_upper(idx), self.max_us)
+        return self.max_us
+
+    def cumulative(self, bounds_us):
+        """Counts of observations <= each bound (for Prometheus `le`)."""
+        result = []
+        items = sorted(self.counts.items())
+        for bound in bounds_us:
+            result.append(sum(c for idx, c in items if _bucket_upper(idx) <= bound))
+        return result
+
+
+class ProcStats:
+    """Aggregated metrics for one procedure / statement."""
+
+    __slots__ = ("calls", "errors", "rows", "bytes", "latency")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+
+# =========================================================
+# Recording
+# =========================================================
+
+def _label(query):
+    """Procedure name for EXEC calls, else a shortened statement."""
+    text = " ".join(str(query).split())
+    if text.upper().startswith("EXEC "):
+        parts = text.split(" ", 2)
+        if len(parts) > 1:
+            return parts[1]
+    return text[:60]
+
+
+def _value_size(v):
+    if v is None:
+        return 0
+    if isinstance(v, (bytes, bytearray, str)):
+        return len(v)
+    return 8
+
+
+def _result_size(result):
+    """(rows, approx. bytes) for the shapes the db helpers return."""
+    if result is None:
+        return 0, 0
+    if isinstance(result, list):
+        if result and isinstance(result[0], list):
+            # execute_result_sets returns one list per result set
+            sizes = [_result_size(rs) for rs in result]
+            return sum(n for n, _b in sizes), sum(b for _n, b in sizes)
+        return len(result), sum(_value_size(v) for r in result for v in r.values())
+    if isinstance(result, dict):
+        return 1, sum(_value_size(v) for v in result.values())
+    if isinstance(result, int) and not isinstance(result, bool):
+        # execute_non_query returns the affected row count
+        return max(result, 0), 0
+    return 1, _value_size(result)
+
+
+def _redact(params):
+    """Keep only the shape of the parameters (no values in log files)."""
+    out = []
+    for p in params or ():
+        if p is None:
+            out.append("NULL")
+        elif isinstance(p, (str, bytes, bytearray)):
+            out.append(f"<{type(p).__name__}:{len(p)}>")
+        elif isinstance(p, (list, tuple)):
+            out.append(f"<{type(p).__name__}:{len(p)} rows>")
+        else:
+            out.append(f"<{type(p).__name__}>")
+    return "(" + ", ".join(out) + ")"
+
+
+def record(query, params, elapsed, result=None, error=None):
+    label = _label(query)
+    us = int(elapsed * 1_000_000)
+    rows, nbytes = _result_size(result) if error is None else (0, 0)
+
+    with _lock:
+        st = _stats.get(label)
+        if st is None:
+            st = _stats[label] = ProcStats()
+        st.calls += 1
+        st.rows += rows
+        st.bytes += nbytes
+        st.latency.record(us)
+        if error is not None:
+            st.errors += 1
+
+    if elapsed * 1000 >= SLOW_MS:
+        _write_slow(label, params, elapsed, rows, error)
+
+
+def _write_slow(label, params, elapsed, rows, error):
+    line = (
+        f"{datetime.now().isoformat(timespec='seconds')} "
+        f"{elapsed * 1000:.1f}ms {label} params={_redact(params)} rows={rows}"
+    )
+    if error is not None:
+        line += f" error={type(error).__name__}"
+    try:
+        os.makedirs(os.path.dirname(SLOW_LOG) or ".", exist_ok=True)
+        with open(SLOW_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError:
+        pass
+
+
+def instrument(fn):
+    """
+    Decorator for db.py helpers with signature (query, params=None, ...).
+    """
+    @functools.wraps(fn)
+    def wrapper(query, params=None, **kwargs):
+        if not ENABLED:
+            return fn(query, params, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            result = fn(query, params, **kwargs)
+        except Exception as e:
+            record(query, params, time.perf_counter() - start, error=e)
+            raise
+        record(query, params, time.perf_counter() - start, result)
+        return result
+
+    return wrapper
+
+
+# =========================================================
+# Reading / Exporting
+# =========================================================
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    """Plain dict of current metrics (per label)."""
+    with _lock:
+        items = list(_stats.items())
+        out = {}
+        for label, st in items:
+            h = st.latency
+            out[label] = {
+                "calls": st.calls,
+                "errors": st.errors,
+                "rows": st.rows,
+                "bytes": st.bytes,
+                "mean_ms": round(h.sum_us / h.total / 1000, 3) if h.total else 0,
+                "p50_ms": h.percentile(50) / 1000,
+                "p90_ms": h.percentile(90) / 1000,
+                "p99_ms": h.percentile(99) / 1000,
+                "max_ms": h.max_us / 1000,
+            }
+    return out
+
+
+def top(n=10, key="total"):
+    """Worst procedures by total time (default) or by p99."""
+    snap = snapshot()
+    if key == "p99":
+        order = sorted(snap.items(), key=lambda kv: kv[1]["p99_ms"], reverse=True)
+    else:
+        order = sorted(snap.items(), key=lambda kv: kv[1]["mean_ms"] * kv[1]["calls"], reverse=True)
+    return order[:n]
+
+
+def _escape(label):
+    return label.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text():
+    """Prometheus exposition format (text/plain; version=0.0.4)."""
+    bounds_us = [int(b * 1_000_000) for b in PROM_BUCKETS]
+    lines = [
+        "# HELP srms_db_calls_total Stored procedure / query calls.",
+        "# TYPE srms_db_calls_total counter",
+    ]
+
+    with _lock:
+        items = sorted(_stats.items())
+
+        for label, st in items:
+            lines.append(f'srms_db_calls_total{{proc="{_escape(label)}"}} {st.calls}')
+
+        lines += ["# HELP srms_db_errors_total Failed calls.", "# TYPE srms_db_errors_total counter"]
+        for label, st in items:
+            lines.append(f'srms_db_errors_total{{proc="{_escape(label)}"}} {st.errors}')
+
+        lines += ["# HELP srms_db_rows_total Rows returned or affected.", "# TYPE srms_db_rows_total counter"]
+        for label, st in items:
+            lines.append(f'srms_db_rows_total{{proc="{_escape(label)}"}} {st.rows}')
+
+        lines += ["# HELP srms_db_bytes_total Approximate bytes fetched.", "# TYPE srms_db_bytes_total counter"]
+        for label, st in items:
+            lines.append(f'srms_db_bytes_total{{proc="{_escape(label)}"}} {st.bytes}')
+
+        lines += [
+            "# HELP srms_db_latency_seconds Call latency.",
+            "# TYPE srms_db_latency_seconds histogram",
+        ]
+        for label, st in items:
+            name = _escape(label)
+            h = st.latency
+            for bound, count in zip(PROM_BUCKETS, h.cumulative(bounds_us)):
+                lines.append(f'srms_db_latency_seconds_bucket{{proc="{name}",le="{bound}"}} {count}')
+            lines.append(f'srms_db_latency_seconds_bucket{{proc="{name}",le="+Inf"}} {h.total}')
+            lines.append(f'srms_db_latency_seconds_sum{{proc="{name}"}} {h.sum_us / 1_000_000}')
+            lines.append(f'srms_db_latency_seconds_count{{proc="{name}"}} {h.total}')
+
+    return "\n".join(lines) + "\n"
+
+
+def write_snapshot(path):
+    """Write snapshot() as JSON (atomic replace)."""
+    data = {"generated_at": datetime.now().isoformat(timespec="seconds"), "procedures": snapshot()}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def start_snapshot_thread(path, interval=60.0):
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                write_snapshot(path)
+            except OSError:
+                pass
+
+    t = threading.Thread(target=loop, name="db-metrics-snapshot", daemon=True)
+    t.start()
+    return t
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """Serve /metrics on a daemon thread (localhost by default)."""
+    server = HTTPServer((host, port), _MetricsHandler)
+    t = threading.Thread(target=server.serve_forever, name="db-metrics-http", daemon=True)
+    t.start()
+    return server
+
+
+def enable(snapshot_path=None, interval=60.0, port=None):
+    global ENABLED
+    ENABLED = True
+    if snapshot_path:
+        start_snapshot_thread(snapshot_path, interval)
+    if port:
+        serve_prometheus(port)
+
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+
+if ENABLED:
+    enable(
+        snapshot_path=os.environ.get("SRMS_DB_METRICS_SNAPSHOT"),
+        interval=float(os.environ.get("SRMS_DB_METRICS_INTERVAL", "60")),
+        port=int(os.environ["SRMS_DB_METRICS_PORT"]) if os.environ.get("SRMS_DB_METRICS_PORT") else None,
+    )
@@ -0,0 +1,143 @@
+import csv
+import uuid
+
+from db import call_sp_rows, call_sp_single_row, call_sp_non_query
+
+# =========================================================
+# Bulk Enrollment Import (CSV)
+#   - Rows streamed to the server in chunks (TVP) and staged
+#   - sp_Admin_ImportEnrollments_Apply validates, diffs the
+#     desired roster against COURSE_STUDENT in one set
+#     operation and applies it in batched transactions
+#     (one audit row per batch)
+#   - Rejected rows (unparseable, deleted/unknown student or
+#     course, duplicates) are reported, never fatal
+#
+# CSV: StudentID,CourseID  (extra columns ignored; optional header:
+#      the first non-blank line, if it names a StudentID column)
+# =========================================================
+
+CHUNK_ROWS = 5000
+BATCH_SIZE = 5000
+
+_STUDENT_HEADERS = ("studentid", "student_id", "student")
+_COURSE_HEADERS = ("courseid", "course_id", "course")
+
+
+def _to_int(value):
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def read_roster(path):
+    """
+    Stream (row_num, student_id, course_id, error) from a roster CSV.
+    row_num is the line number in the file; error is None for valid rows.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        s_col, c_col = 0, 1
+        first = True
+
+        for row_num, row in enumerate(reader, start=1):
+            if not row or not any(cell.strip() for cell in row):
+                continue
+
+            if first:
+                # Header = first non-blank line (blank lines may precede it)
+                first = False
+                names = [cell.strip().lower() for cell in row]
+                if any(n in _STUDENT_HEADERS for n in names):
+                    s_col = next(i for i, n in enumerate(names) if n in _STUDENT_HEADERS)
+                    c_col = next((i for i, n in enumerate(names) if n in _COURSE_HEADERS), None)
+                    if c_col is None:
+                        raise ValueError("CSV header has no CourseID column.")
+                    continue
+
+            raw_student = row[s_col] if len(row) > s_col else ""
+            raw_course = row[c_col] if len(row) > c_col else ""
+            student_id = _to_int(raw_student)
+            course_id = _to_int(raw_course)
+
+            if student_id is None or course_id is None:
+                yield row_num, raw_student, raw_course, "Invalid StudentID / CourseID value."
+            else:
+                yield row_num, student_id, course_id, None
+
+
+def import_enrollments(username, path, remove_missing=False, batch_size=BATCH_SIZE, progress=None):
+    """
+    Import a roster CSV.
+      remove_missing=True  courses present in the file are replaced
+                           (enrollments not listed are removed)
+      progress(staged)     optional callback after each chunk
+
+    Returns dict(staged, enrolled, removed, batches, rejected=[...]);
+    each rejected row is dict(RowNum, StudentID, CourseID, Reason).
+    """
+    import_id = str(uuid.uuid4())
+    rejected = []
+    chunk = []
+    staged = 0
+
+    def flush():
+        nonlocal staged
+        call_sp_non_query("sp_Admin_ImportEnrollments_Stage", (username, import_id, chunk))
+        staged += len(chunk)
+        chunk.clear()
+        if progress:
+            progress(staged)
+
+    for row_num, student_id, course_id, error in read_roster(path):
+        if error:
+            rejected.append({
+                "RowNum": row_num,
+                "StudentID": student_id,
+                "CourseID": course_id,
+                "Reason": error,
+            })
+            continue
+
+        chunk.append((row_num, student_id, course_id))
+        if len(chunk) >= CHUNK_ROWS:
+            flush()
+
+    if chunk:
+        flush()
+
+    result = {"staged": staged, "enrolled": 0, "removed": 0, "batches": 0, "rejected": rejected}
+    if not staged:
+        return result
+
+    # Batches commit one by one inside the procedure
+    summary = call_sp_single_row(
+        "sp_Admin_ImportEnrollments_Apply",
+        (username, import_id, 1 if remove_missing else 0, batch_size),
+        autocommit=True
+    ) or {}
+
+    result["enrolled"] = summary.get("Enrolled", 0)
+    result["removed"] = summary.get("Removed", 0)
+    result["batches"] = summary.get("Batches", 0)
+
+    if summary.get("Rejected"):
+        for r in call_sp_rows("sp_Admin_ImportEnrollments_GetRejected", (username, import_id)):
+            rejected.append({
+                "RowNum": r["RowNum"],
+                "StudentID": r["StudentID"],
+                "CourseID": r["CourseID"],
+                "Reason": r["ReasonMessage"],
+            })
+        rejected.sort(key=lambda r: r["RowNum"])
+
+    return result
+
+
+def write_rejected_report(rejected, path):
+    """Write rejected rows as CSV (RowNum, StudentID, CourseID, Reason)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["RowNum", "StudentID", "CourseID", "Reason"])
+        writer.writeheader()
+        writer.writerows(rejected)
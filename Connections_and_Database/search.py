@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+
+from db import call_sp_rows
+
+# =========================================================
+# Type-ahead Search (server-side, ranked, TOP n)
+#   sp_Admin_SearchStudents / sp_Admin_SearchCourses /
+#   sp_Admin_SearchUsers
+#
+# Results are kept in a small LRU cache (per user + query)
+# so retyping / backspacing does not hit the server again.
+# Every search returns [(key, label)] for SearchPicker.
+# =========================================================
+
+LIMIT = 20
+CACHE_SIZE = 256
+CACHE_TTL = 60.0   # seconds; picks up new / renamed rows soon enough
+
+_cache = OrderedDict()   # (proc, username, query, limit) -> (stamp, results)
+
+
+def _search(proc, username, query, limit, to_item):
+    query = (query or "").strip()
+    if not query:
+        return []
+
+    key = (proc, username, query.lower(), limit)
+    hit = _cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < CACHE_TTL:
+        _cache.move_to_end(key)
+        return hit[1]
+
+    results = [to_item(r) for r in call_sp_rows(proc, (username, query, limit))]
+
+    _cache[key] = (time.monotonic(), results)
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return results
+
+
+def clear_cache():
+    """Drop cached results (after creating / renaming / deleting rows)."""
+    _cache.clear()
+
+
+def search_students(username, query, limit=LIMIT):
+    return _search(
+        "sp_Admin_SearchStudents", username, query, limit,
+        lambda r: (r["StudentID"], f"{r['StudentID']} - {r['FullName']} <{r['Email']}>")
+    )
+
+
+def search_courses(username, query, limit=LIMIT):
+    return _search(
+        "sp_Admin_SearchCourses", username, query, limit,
+        lambda r: (r["CourseID"], f"{r['CourseID']} - {r['CourseName']}")
+    )
+
+
+def search_users(username, query, limit=LIMIT):
+    return _search(
+        "sp_Admin_SearchUsers", username, query, limit,
+        lambda r: (r["Username"], f"{r['Username']} ({r['Role']})")
+    )
+
+
+def search_local(items, query, limit=LIMIT):
+    """Same contract over an in-memory [(key, label)] list (offline rosters)."""
+    q = (query or "").strip().lower()
+    if not q:
+        return list(items[:limit])
+    prefix = [it for it in items if it[1].lower().startswith(q)]
+    rest = [it for it in items if q in it[1].lower() and not it[1].lower().startswith(q)]
+    return (prefix + rest)[:limit]
@@ -0,0 +1,265 @@
+import json
+import os
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+from db import call_sp_rows
+
+# =========================================================
+# Security Event Detector (incremental, over LOGS)
+#   - Tails LOGS by LogID high-water mark (sp_Admin_GetLogsSince);
+#     each poll reads only rows it has not seen
+#   - Sliding-window counters per (rule, user); events weigh
+#     EventCount (aggregated read rows count every call)
+#   - Window time is the server LogTime, so a late poll
+#     judges events exactly as a live one would
+#   - Alerts -> in-memory list (admin screen) + JSONL file
+#
+# LogIDs may commit out of order (a long transaction holds a
+# lower ID): skipped IDs are re-read by ID (sp_Admin_GetLogsByID)
+# for GAP_TIMEOUT seconds, then given up (rolled-back inserts
+# never appear).
+#
+# Environment:
+#   SRMS_ALERTS_PATH=<file>     alert log (JSON lines)
+# =========================================================
+
+SRMS_DIR = os.path.join(os.path.expanduser("~"), ".srms")
+ALERTS_PATH = os.environ.get("SRMS_ALERTS_PATH", os.path.join(SRMS_DIR, "security_alerts.jsonl"))
+STATE_PATH = os.path.join(SRMS_DIR, "security_monitor_state.json")
+
+BATCH_ROWS = 5000
+GAP_TIMEOUT = 60.0
+MAX_GAP = 1000          # larger jumps (reseed, other database) are not tracked
+MAX_ALERTS = 500
+
+Rule = namedtuple("Rule", "name actions window threshold per_user severity message")
+
+# Actions that decrypt grades (sp_Key_Open + DecryptByKey)
+DECRYPT_READS = frozenset({
+    "STUDENT_VIEW_GRADES", "STUDENT_VIEW_OVERVIEW",
+    "INSTRUCTOR_GET_GRADE", "INSTRUCTOR_VIEW_GRADES_BY_COURSE",
+    "VIEW_AVG_GRADE_SAFE",
+})
+
+RULES = (
+    Rule("LOGIN_FAILURE_BURST", frozenset({"LOGIN_FAILED"}), 300, 5, True, "High",
+         "{count} failed logins for '{user}' in {minutes} min"),
+    Rule("LOGIN_FAILURE_SPRAY", frozenset({"LOGIN_FAILED"}), 300, 25, False, "High",
+         "{count} failed logins across all accounts in {minutes} min"),
+    Rule("MASS_GRADE_CHANGE", frozenset({"INSTRUCTOR_SAVE_GRADE", "INSTRUCTOR_DELETE_GRADE"}), 600, 40, True, "High",
+         "'{user}' changed {count} grades in {minutes} min"),
+    Rule("EXCESSIVE_DECRYPT_READS", DECRYPT_READS, 600, 200, True, "Medium",
+         "'{user}' ran {count} grade-decrypting reads in {minutes} min"),
+    Rule("MASS_ATTENDANCE_EDIT",
+         frozenset({"TA_RECORD_ATTENDANCE", "TA_UPDATE_ATTENDANCE", "TA_DELETE_ATTENDANCE"}), 600, 150, True, "Medium",
+         "'{user}' edited {count} attendance records in {minutes} min"),
+)
+
+
+class SlidingWindow:
+    """
+    Weighted event count over the `span` seconds up to the newest
+    timestamp seen (amortized O(1) per in-order event).
+
+    Events may arrive late: aggregated audit rows are flushed with
+    their older MinuteStart as LogTime. They are inserted in
+    timestamp order; one already older than the window is dropped.
+    """
+
+    __slots__ = ("span", "events", "total", "latest")
+
+    def __init__(self, span):
+        self.span = span
+        self.events = deque()   # (timestamp, weight), timestamp ascending
+        self.total = 0
+        self.latest = float("-inf")
+
+    def add(self, ts, weight=1):
+        if ts <= self.latest - self.span:
+            return self.total       # late and already outside the window
+
+        events = self.events
+        if not events or ts >= events[-1][0]:
+            events.append((ts, weight))
+        else:
+            # Late event: walk back from the newest (late rows are only minutes behind)
+            i = len(events)
+            while i and events[i - 1][0] > ts:
+                i -= 1
+            events.insert(i, (ts, weight))
+
+        self.total += weight
+        self.latest = max(self.latest, ts)
+        self.expire(self.latest)
+        return self.total
+
+    def expire(self, now):
+        events = self.events
+        while events and events[0][0] <= now - self.span:
+            self.total -= events.popleft()[1]
+
+
+class SecurityMonitor:
+
+    def __init__(self, username, rules=RULES, alerts_path=ALERTS_PATH, state_path=STATE_PATH):
+        self.username = username
+        self.rules = rules
+        self.alerts_path = alerts_path
+        self.state_path = state_path
+
+        self.high_water = None      # highest LogID processed
+        self.gaps = {}              # skipped LogID -> first noticed (monotonic)
+        self.alerts = deque(maxlen=MAX_ALERTS)
+        self.events_seen = 0
+
+        self._windows = {}          # (rule name, user) -> SlidingWindow
+        self._cooldown = {}         # (rule name, user) -> timestamp it may fire again
+        self._by_action = {}        # action -> [rules]
+        for rule in rules:
+            for action in rule.actions:
+                self._by_action.setdefault(action, []).append(rule)
+
+        self._load_state()
+
+    # -----------------------------------------------------
+    # State (high-water mark survives restarts)
+    # -----------------------------------------------------
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                self.high_water = json.load(f).get("high_water")
+        except (OSError, ValueError):
+            self.high_water = None
+
+    def _save_state(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+            tmp = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"high_water": self.high_water}, f)
+            os.replace(tmp, self.state_path)
+        except OSError:
+            pass
+
+    # -----------------------------------------------------
+    # Poll
+    # -----------------------------------------------------
+    def poll(self):
+        """
+        Read and evaluate new LOGS rows. Returns the new alerts.
+        Raises DbError (rows evaluated before the error are kept).
+        """
+        now = time.monotonic()
+        self.gaps = {i: t for i, t in self.gaps.items() if now - t < GAP_TIMEOUT}
+
+        new_alerts = []
+        if self.gaps:
+            # Only the skipped IDs; everything else up to high_water is done
+            rows = call_sp_rows("sp_Admin_GetLogsByID", (self.username, [(i,) for i in sorted(self.gaps)]))
+            for r in rows:
+                if self.gaps.pop(r["LogID"], None) is not None:
+                    new_alerts.extend(self._evaluate(r))
+                    self.events_seen += 1
+
+        after = self.high_water
+        while True:
+            rows = call_sp_rows("sp_Admin_GetLogsSince", (self.username, after, BATCH_ROWS))
+            for r in rows:
+                log_id = r["LogID"]
+                if self.high_water is not None and log_id - self.high_water <= MAX_GAP:
+                    for missing in range(self.high_water + 1, log_id):
+                        self.gaps[missing] = now
+                self.high_water = log_id
+                new_alerts.extend(self._evaluate(r))
+                self.events_seen += 1
+
+            if len(rows) < BATCH_ROWS:
+                break
+            after = rows[-1]["LogID"]
+
+        if self.high_water is None:
+            self.high_water = 0     # empty LOGS: start from the beginning
+
+        self._save_state()
+        if new_alerts:
+            self._write_alerts(new_alerts)
+        return new_alerts
+
+    # -----------------------------------------------------
+    # Rules
+    # -----------------------------------------------------
+    def _evaluate(self, r):
+        rules = self._by_action.get(r["Action"])
+        if not rules:
+            return []
+
+        ts = r["LogTime"].timestamp() if isinstance(r["LogTime"], datetime) else time.time()
+        weight = r.get("EventCount") or 1
+        user = r.get("Username") or ""
+
+        fired = []
+        for rule in rules:
+            key = (rule.name, user if rule.per_user else "*")
+            window = self._windows.get(key)
+            if window is None:
+                window = self._windows[key] = SlidingWindow(rule.window)
+
+            count = window.add(ts, weight)
+            if count < rule.threshold or ts < self._cooldown.get(key, 0):
+                continue
+
+            # One alert per window per key
+            self._cooldown[key] = ts + rule.window
+            fired.append(self._alert(rule, key[1], count, ts, r["LogID"]))
+        return fired
+
+    def _alert(self, rule, user, count, ts, log_id):
+        alert = {
+            "time": datetime.fromtimestamp(ts).isoformat(sep=" ", timespec="seconds"),
+            "rule": rule.name,
+            "severity": rule.severity,
+            "username": user if rule.per_user else None,
+            "count": count,
+            "window_s": rule.window,
+            "log_id": log_id,
+            "message": rule.message.format(count=count, user=user, minutes=rule.window // 60),
+        }
+        self.alerts.appendleft(alert)
+        return alert
+
+    def _write_alerts(self, alerts):
+        try:
+            os.makedirs(os.path.dirname(self.alerts_path) or ".", exist_ok=True)
+            with open(self.alerts_path, "a", encoding="utf-8") as f:
+                for a in alerts:
+                    f.write(json.dumps(a, ensure_ascii=False) + "\n")
+        except OSError:
+            pass    # screen still shows them
+
+    def load_alert_history(self, limit=MAX_ALERTS):
+        """Most recent alerts from the JSONL file (newest first)."""
+        try:
+            with open(self.alerts_path, encoding="utf-8") as f:
+                lines = deque(f, maxlen=limit)
+        except OSError:
+            return []
+        out = []
+        for line in reversed(lines):
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                continue
+        return out
+
+
+_monitors = {}
+
+
+def get_monitor(username):
+    """Process-wide monitor per admin (keeps windows between screen openings)."""
+    monitor = _monitors.get(username)
+    if monitor is None:
+        monitor = _monitors[username] = SecurityMonitor(username)
+    return monitor
@@ -0,0 +1,429 @@
+import os
+import sqlite3
+import time
+from datetime import date
+
+from db import call_sp_rows, call_sp_non_query, DbError, DbConnectionError
+
+# =========================================================
+# TA Offline Replica (SQLite)
+#   - Local copy of the TA's courses, rosters and attendance
+#   - Delta pull via sp_TA_GetAttendanceChanges, one ROWVERSION
+#     watermark per course: a newly assigned course starts with a
+#     full snapshot; courses no longer assigned are purged on the
+#     roster refresh
+#   - Offline writes kept on the row (PendingOp) and replayed in order
+#   - Packed closed-term days (ATTENDANCE_BITMAP) are not pulled:
+#     a new course's snapshot holds row-stored days only, and rows
+#     already here stay when their term is packed (it is read-only)
+#   - Server rejections / conflicts land in the conflict table
+#   - After a connection failure, syncs are skipped for
+#     OFFLINE_BACKOFF_SECONDS (each attempt would block the caller
+#     for the full ODBC login timeout); force=True retries now
+# =========================================================
+
+REPLICA_DIR = os.environ.get(
+    "SRMS_REPLICA_DIR",
+    os.path.join(os.path.expanduser("~"), ".srms")
+)
+
+ROSTER_TTL_SECONDS = 600
+OFFLINE_BACKOFF_SECONDS = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    Key   TEXT PRIMARY KEY,
+    Value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS course (
+    CourseID   INTEGER PRIMARY KEY,
+    CourseName TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS roster (
+    StudentID  INTEGER NOT NULL,
+    CourseID   INTEGER NOT NULL,
+    FullName   TEXT,
+    Email      TEXT,
+    Department TEXT,
+    PRIMARY KEY (StudentID, CourseID)
+);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    LocalID      INTEGER PRIMARY KEY AUTOINCREMENT,
+    AttendanceID INTEGER UNIQUE,
+    StudentID    INTEGER NOT NULL,
+    CourseID     INTEGER NOT NULL,
+    CourseName   TEXT,
+    Status       INTEGER NOT NULL,
+    ServerStatus INTEGER,
+    DateRecorded TEXT NOT NULL,
+    RowVer       BLOB,
+    PendingOp    TEXT CHECK (PendingOp IN ('record', 'update', 'delete')),
+    PendingSeq   INTEGER,
+    UNIQUE (StudentID, CourseID, DateRecorded)
+);
+
+CREATE INDEX IF NOT EXISTS IX_attendance_Date ON attendance (DateRecorded);
+
+CREATE TABLE IF NOT EXISTS conflict (
+    ConflictID   INTEGER PRIMARY KEY AUTOINCREMENT,
+    LoggedAt     TEXT NOT NULL,
+    AttendanceID INTEGER,
+    StudentID    INTEGER,
+    CourseID     INTEGER,
+    DateRecorded TEXT,
+    Op           TEXT,
+    Reason       TEXT
+);
+"""
+
+
+class TAReplica:
+    """SQLite replica of one TA's attendance data."""
+
+    def __init__(self, username, path=None):
+        self.username = username
+        self.online = False
+        self._retry_at = 0.0        # monotonic time of the next sync attempt while offline
+
+        if path is None:
+            os.makedirs(REPLICA_DIR, exist_ok=True)
+            path = os.path.join(REPLICA_DIR, f"ta_{username}.sqlite3")
+
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # =====================================================
+    # Meta
+    # =====================================================
+    def _get_meta(self, key):
+        row = self.conn.execute("SELECT Value FROM meta WHERE Key = ?", (key,)).fetchone()
+        return row["Value"] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (Key, Value) VALUES (?, ?)",
+            (key, value)
+        )
+
+    def _watermark(self, course_id):
+        value = self._get_meta(f"watermark:{course_id}")
+        return bytes.fromhex(value) if value else None
+
+    def _course_ids(self):
+        return [r["CourseID"] for r in self.conn.execute("SELECT CourseID FROM course")]
+
+    def _next_seq(self):
+        row = self.conn.execute("SELECT COALESCE(MAX(PendingSeq), 0) + 1 FROM attendance").fetchone()
+        return row[0]
+
+    # =====================================================
+    # Sync (push pending → refresh rosters → pull delta)
+    # =====================================================
+    def sync(self, force_roster=False, force=False):
+        """
+        Bring the replica up to date.
+        Returns dict(online, pushed, pulled, rejected, error).
+        Offline (DbConnectionError) is reported in the result; any
+        other DbError is raised. Within the offline backoff nothing
+        is attempted unless force=True.
+        """
+        result = dict(online=False, pushed=0, pulled=0, rejected=0, error=None)
+
+        wait = self._retry_at - time.monotonic()
+        if not force and wait > 0:
+            result["error"] = f"Offline - next attempt in {int(wait) + 1} s"
+            return result
+
+        try:
+            result["pushed"], result["rejected"] = self._push()
+
+            # Rosters first: the pull covers exactly the assigned courses
+            synced_at = float(self._get_meta("roster_synced_at") or 0)
+            if force_roster or not self._course_ids() or time.time() - synced_at > ROSTER_TTL_SECONDS:
+                self._refresh_roster()
+
+            result["pulled"] = self._pull()
+
+            result["online"] = True
+        except DbConnectionError as e:
+            result["error"] = str(e)
+            self._retry_at = time.monotonic() + OFFLINE_BACKOFF_SECONDS
+        finally:
+            self.conn.commit()
+
+        if result["online"]:
+            self._retry_at = 0.0
+        self.online = result["online"]
+        return result
+
+    def _push(self):
+        pending = self.conn.execute(
+            "SELECT * FROM attendance WHERE PendingOp IS NOT NULL ORDER BY PendingSeq"
+        ).fetchall()
+
+        pushed = rejected = 0
+
+        for r in pending:
+            row_base = r["RowVer"] or self._watermark(r["CourseID"])
+            try:
+                if r["PendingOp"] == "record":
+                    call_sp_non_query(
+                        "sp_TA_RecordAttendance",
+                        (self.username, r["StudentID"], r["CourseID"], r["Status"],
+                         date.fromisoformat(r["DateRecorded"]), row_base)
+                    )
+                elif r["PendingOp"] == "update":
+                    call_sp_non_query(
+                        "sp_TA_UpdateAttendance",
+                        (self.username, r["AttendanceID"], r["Status"], row_base)
+                    )
+                else:
+                    call_sp_non_query(
+                        "sp_TA_DeleteAttendance",
+                        (self.username, r["AttendanceID"], row_base)
+                    )
+            except DbConnectionError:
+                self.conn.commit()
+                raise
+            except DbError as e:
+                self._reject(r, str(e))
+                rejected += 1
+                continue
+
+            if r["PendingOp"] == "delete":
+                self.conn.execute("DELETE FROM attendance WHERE LocalID = ?", (r["LocalID"],))
+            else:
+                self.conn.execute(
+                    "UPDATE attendance SET ServerStatus = Status, PendingOp = NULL, PendingSeq = NULL "
+                    "WHERE LocalID = ?",
+                    (r["LocalID"],)
+                )
+            pushed += 1
+
+        return pushed, rejected
+
+    def _reject(self, r, reason):
+        """Record the rejected op and fall back to the server's version of the row."""
+        self.conn.execute(
+            "INSERT INTO conflict (LoggedAt, AttendanceID, StudentID, CourseID, DateRecorded, Op, Reason) "
+            "VALUES (datetime('now'), ?, ?, ?, ?, ?, ?)",
+            (r["AttendanceID"], r["StudentID"], r["CourseID"], r["DateRecorded"],
+             r["PendingOp"], reason)
+        )
+
+        if r["AttendanceID"] is None:
+            self.conn.execute("DELETE FROM attendance WHERE LocalID = ?", (r["LocalID"],))
+        else:
+            self.conn.execute(
+                "UPDATE attendance SET Status = ServerStatus, PendingOp = NULL, PendingSeq = NULL "
+                "WHERE LocalID = ?",
+                (r["LocalID"],)
+            )
+
+    def _pull(self):
+        pulled = 0
+        for course_id in self._course_ids():
+            pulled += self._pull_course(course_id)
+        return pulled
+
+    def _pull_course(self, course_id):
+        since = self._watermark(course_id)
+        changes = call_sp_rows("sp_TA_GetAttendanceChanges", (self.username, since, course_id))
+
+        if since is None:
+            # Course not seen before (or newly assigned): snapshot replaces local rows
+            self.conn.execute(
+                "DELETE FROM attendance WHERE CourseID = ? AND PendingOp IS NULL", (course_id,)
+            )
+
+        for c in changes:
+            day = _iso_date(c["DateRecorded"])
+            local = self.conn.execute(
+                "SELECT LocalID, PendingOp FROM attendance "
+                "WHERE AttendanceID = ? OR (StudentID = ? AND CourseID = ? AND DateRecorded = ?)",
+                (c["AttendanceID"], c["StudentID"], c["CourseID"], day)
+            ).fetchone()
+
+            if c["IsDeleted"]:
+                if local and local["PendingOp"] is None:
+                    self.conn.execute("DELETE FROM attendance WHERE LocalID = ?", (local["LocalID"],))
+                elif local:
+                    # Keep the local edit; the replay will hit the conflict check.
+                    self.conn.execute(
+                        "UPDATE attendance SET AttendanceID = ?, RowVer = ? WHERE LocalID = ?",
+                        (c["AttendanceID"], c["RowVer"], local["LocalID"])
+                    )
+                continue
+
+            status = 1 if c["Status"] else 0
+
+            if local is None:
+                self.conn.execute(
+                    "INSERT INTO attendance "
+                    "(AttendanceID, StudentID, CourseID, CourseName, Status, ServerStatus, DateRecorded, RowVer) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (c["AttendanceID"], c["StudentID"], c["CourseID"], c["CourseName"],
+                     status, status, day, c["RowVer"])
+                )
+            elif local["PendingOp"] is None:
+                self.conn.execute(
+                    "UPDATE attendance SET AttendanceID = ?, CourseName = ?, Status = ?, ServerStatus = ?, "
+                    "DateRecorded = ?, RowVer = ? WHERE LocalID = ?",
+                    (c["AttendanceID"], c["CourseName"], status, status, day,
+                     c["RowVer"], local["LocalID"])
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE attendance SET AttendanceID = ?, CourseName = ?, ServerStatus = ?, RowVer = ? "
+                    "WHERE LocalID = ?",
+                    (c["AttendanceID"], c["CourseName"], status, c["RowVer"], local["LocalID"])
+                )
+
+        if changes:
+            self._set_meta(f"watermark:{course_id}", max(c["RowVer"] for c in changes).hex())
+
+        return len(changes)
+
+    def _refresh_roster(self):
+        courses = call_sp_rows("sp_TA_ViewCourses", (self.username,))
+        students = call_sp_rows("sp_TA_ViewStudentsByCourse", (self.username,))
+
+        self.conn.execute("DELETE FROM course")
+        self.conn.execute("DELETE FROM roster")
+        self.conn.executemany(
+            "INSERT INTO course (CourseID, CourseName) VALUES (?, ?)",
+            [(c["CourseID"], c["CourseName"]) for c in courses]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO roster (StudentID, CourseID, FullName, Email, Department) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(s["StudentID"], s["CourseID"], s["FullName"], s["Email"], s["Department"])
+             for s in students]
+        )
+
+        # Courses no longer assigned: drop their rows and watermarks
+        # (pending edits were pushed just before; the server would reject them now)
+        self.conn.execute("DELETE FROM attendance WHERE CourseID NOT IN (SELECT CourseID FROM course)")
+        self.conn.execute(
+            "DELETE FROM meta WHERE Key = 'watermark' OR (Key LIKE 'watermark:%' "
+            "AND CAST(substr(Key, 11) AS INTEGER) NOT IN (SELECT CourseID FROM course))"
+        )
+        self._set_meta("roster_synced_at", str(time.time()))
+
+    # =====================================================
+    # Reads (always served from the replica)
+    # =====================================================
+    def courses(self):
+        rows = self.conn.execute("SELECT CourseID, CourseName FROM course ORDER BY CourseName")
+        return [dict(r) for r in rows]
+
+    def students(self, course_id=None):
+        rows = self.conn.execute(
+            "SELECT R.StudentID, R.FullName, R.Email, R.Department, R.CourseID, C.CourseName "
+            "FROM roster R JOIN course C ON C.CourseID = R.CourseID "
+            "WHERE ? IS NULL OR R.CourseID = ? "
+            "ORDER BY C.CourseName, R.FullName",
+            (course_id, course_id)
+        )
+        return [dict(r) for r in rows]
+
+    def attendance(self, from_date=None, to_date=None):
+        """Live rows, newest first; optionally only from_date..to_date (inclusive)."""
+        rows = self.conn.execute(
+            "SELECT LocalID, AttendanceID, StudentID, CourseID, CourseName, Status, DateRecorded, "
+            "PendingOp FROM attendance "
+            "WHERE (PendingOp IS NULL OR PendingOp <> 'delete') "
+            "AND (:first IS NULL OR DateRecorded >= :first) AND (:last IS NULL OR DateRecorded <= :last) "
+            "ORDER BY DateRecorded DESC, CourseName, StudentID",
+            {
+                "first": _iso_date(from_date) if from_date else None,
+                "last": _iso_date(to_date) if to_date else None,
+            }
+        )
+        result = []
+        for r in rows:
+            a = dict(r)
+            a["StatusText"] = "Present" if a["Status"] else "Absent"
+            result.append(a)
+        return result
+
+    def pending_count(self):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM attendance WHERE PendingOp IS NOT NULL"
+        ).fetchone()[0]
+
+    def conflicts(self, limit=50):
+        rows = self.conn.execute(
+            "SELECT * FROM conflict ORDER BY ConflictID DESC LIMIT ?", (limit,)
+        )
+        return [dict(r) for r in rows]
+
+    # =====================================================
+    # Local writes (queued until the next sync)
+    # =====================================================
+    def record(self, student_id, course_id, status, day=None):
+        day = _iso_date(day or date.today())
+        existing = self.conn.execute(
+            "SELECT LocalID, AttendanceID, PendingOp FROM attendance "
+            "WHERE StudentID = ? AND CourseID = ? AND DateRecorded = ?",
+            (student_id, course_id, day)
+        ).fetchone()
+
+        if existing:
+            op = "record" if existing["PendingOp"] == "record" or existing["AttendanceID"] is None else "update"
+            self.conn.execute(
+                "UPDATE attendance SET Status = ?, PendingOp = ?, PendingSeq = ? WHERE LocalID = ?",
+                (int(status), op, self._next_seq(), existing["LocalID"])
+            )
+        else:
+            course = self.conn.execute(
+                "SELECT CourseName FROM course WHERE CourseID = ?", (course_id,)
+            ).fetchone()
+            self.conn.execute(
+                "INSERT INTO attendance "
+                "(StudentID, CourseID, CourseName, Status, DateRecorded, PendingOp, PendingSeq) "
+                "VALUES (?, ?, ?, ?, ?, 'record', ?)",
+                (student_id, course_id, course["CourseName"] if course else None,
+                 int(status), day, self._next_seq())
+            )
+        self.conn.commit()
+
+    def update(self, local_id, status):
+        row = self._get(local_id)
+        op = "record" if row["PendingOp"] == "record" else "update"
+        self.conn.execute(
+            "UPDATE attendance SET Status = ?, PendingOp = ?, PendingSeq = ? WHERE LocalID = ?",
+            (int(status), op, self._next_seq(), local_id)
+        )
+        self.conn.commit()
+
+    def delete(self, local_id):
+        row = self._get(local_id)
+        if row["AttendanceID"] is None:
+            self.conn.execute("DELETE FROM attendance WHERE LocalID = ?", (local_id,))
+        else:
+            self.conn.execute(
+                "UPDATE attendance SET PendingOp = 'delete', PendingSeq = ? WHERE LocalID = ?",
+                (self._next_seq(), local_id)
+            )
+        self.conn.commit()
+
+    def _get(self, local_id):
+        row = self.conn.execute("SELECT * FROM attendance WHERE LocalID = ?", (local_id,)).fetchone()
+        if row is None:
+            raise DbError("Attendance record not found in local replica.")
+        return row
+
+
+def _iso_date(value):
+    if hasattr(value, "date") and callable(value.date):
+        value = value.date()
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)[:10]
@@ -0,0 +1,67 @@
+import time
+
+from db import call_sp_rows, call_sp_single_row, call_sp_non_query
+
+# =========================================================
+# Terms (academic calendar)
+#   sp_GetTerms -> every term, newest first, with the server's
+#   view of the current term. Kept for CACHE_TTL seconds so
+#   every term picker does not ask again; admin changes clear it.
+#
+# TermID = Year * 10 + Season (1 Spring, 2 Summer, 3 Fall)
+# =========================================================
+
+CACHE_TTL = 300.0
+SEASONS = {1: "Spring", 2: "Summer", 3: "Fall"}
+
+_cache = {}   # username -> (stamp, rows)
+
+
+def get_terms(username):
+    """[{TermID, TermName, StartDate, EndDate, IsCurrent, IsReadOnly}], newest first."""
+    hit = _cache.get(username)
+    if hit is not None and time.monotonic() - hit[0] < CACHE_TTL:
+        return hit[1]
+    rows = call_sp_rows("sp_GetTerms", (username,))
+    _cache[username] = (time.monotonic(), rows)
+    return rows
+
+
+def current_term(username):
+    return next((t for t in get_terms(username) if t["IsCurrent"]), None)
+
+
+def clear_cache():
+    _cache.clear()
+
+
+# ---------------------------------------------------------
+# Admin
+# ---------------------------------------------------------
+def create_term(username, term_id, name, start_date, end_date):
+    call_sp_non_query("sp_Admin_CreateTerm", (username, term_id, name, start_date, end_date))
+    clear_cache()
+
+
+def set_current_term(username, term_id=None):
+    """term_id None: the current term follows the calendar again."""
+    call_sp_non_query("sp_Admin_SetCurrentTerm", (username, term_id))
+    clear_cache()
+
+
+def set_read_only(username, term_id, read_only=True):
+    """Reopening a packed term expands its attendance bitmaps back into rows."""
+    call_sp_non_query("sp_Admin_SetTermReadOnly", (username, term_id, 1 if read_only else 0))
+    clear_cache()
+
+
+def pack_attendance(username, term_id):
+    """
+    Store a closed term's attendance as per-student bitmaps
+    (attendance_bitmap.py decodes them).
+    Returns {"Courses", "RecordsPacked", "Bitmaps"}.
+    """
+    # One transaction per course inside the procedure
+    return call_sp_single_row(
+        "sp_Admin_PackAttendanceTerm", (username, term_id), autocommit=True
+    ) or {}
@@ -0,0 +1,150 @@
+import csv
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from db import call_sp_rows
+from security import hash_password
+
+# =========================================================
+# Bulk User Provisioning (roster CSV)
+#   - Passwords hashed client-side (security.hash_password
+#     == HASHBYTES('SHA2_256', NVARCHAR)) in a process pool
+#   - USERS + STUDENT / INSTRUCTOR / TA rows created
+#     set-based: one sp_Admin_BulkCreateUsers call per batch
+#   - Rejected rows reported per row, never fatal
+#
+# CSV columns (header required, case-insensitive):
+#   Username, Password, Role, FullName, Email, Phone, DOB, Department
+#   Empty Password -> generated (returned in `credentials`)
+#   DOB as YYYY-MM-DD
+# =========================================================
+
+BATCH_SIZE = 2000
+HASH_CHUNK = 1000
+POOL_MIN_ROWS = 5000   # below this, pool start-up costs more than the hashing
+
+ROLES = ("Admin", "Instructor", "TA", "Student", "Guestrole")
+COLUMNS = ("Username", "Password", "Role", "FullName", "Email", "Phone", "DOB", "Department")
+
+
+def _hash_chunk(passwords):
+    return [hash_password(p) for p in passwords]
+
+
+def hash_passwords(passwords, workers=None):
+    """SHA-256 (UTF-16LE) of each password, order preserved."""
+    if len(passwords) < POOL_MIN_ROWS:
+        return _hash_chunk(passwords)
+
+    chunks = [passwords[i:i + HASH_CHUNK] for i in range(0, len(passwords), HASH_CHUNK)]
+    hashes = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for part in pool.map(_hash_chunk, chunks):
+            hashes.extend(part)
+    return hashes
+
+
+def read_users(path):
+    """
+    Read a roster CSV -> (rows, rejected).
+    rows: dicts with RowNum + COLUMNS (DOB parsed); rejected: dict(RowNum, Username, Reason).
+    """
+    rows, rejected = [], []
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        lookup = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+        missing = [c for c in ("Username", "Role") if c.lower() not in lookup]
+        if missing:
+            raise ValueError(f"CSV header is missing: {', '.join(missing)}")
+
+        for row_num, raw in enumerate(reader, start=2):
+            row = {"RowNum": row_num}
+            for col in COLUMNS:
+                key = lookup.get(col.lower())
+                value = (raw.get(key) or "").strip() if key else ""
+                row[col] = value or None
+
+            if not any(row[c] for c in COLUMNS):
+                continue
+
+            role = next((r for r in ROLES if row["Role"] and r.lower() == row["Role"].lower()), None)
+            if role is None:
+                rejected.append({"RowNum": row_num, "Username": row["Username"], "Reason": "Invalid role."})
+                continue
+            row["Role"] = role
+
+            if row["DOB"]:
+                try:
+                    row["DOB"] = datetime.strptime(row["DOB"], "%Y-%m-%d").date()
+                except ValueError:
+                    rejected.append({"RowNum": row_num, "Username": row["Username"], "Reason": "Invalid DOB (YYYY-MM-DD)."})
+                    continue
+
+            rows.append(row)
+
+    return rows, rejected
+
+
+def provision_users(username, path, batch_size=BATCH_SIZE, progress=None, workers=None):
+    """
+    Create all users in a roster CSV.
+      progress(done, total)  optional callback after each batch
+
+    Returns dict(created, rejected=[...], credentials=[...]);
+    credentials lists (Username, Password) for generated passwords
+    of users that were actually created.
+    """
+    rows, rejected = read_users(path)
+
+    generated = {}
+    for row in rows:
+        if not row["Password"]:
+            row["Password"] = secrets.token_urlsafe(9)
+            generated[row["RowNum"]] = row["Password"]
+
+    hashes = hash_passwords([row["Password"] for row in rows], workers)
+
+    created = 0
+    failed = set()
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        tvp = [
+            (
+                row["RowNum"], row["Username"], digest, row["Role"],
+                row["FullName"], row["Email"], row["Phone"], row["DOB"], row["Department"]
+            )
+            for row, digest in zip(batch, hashes[start:start + batch_size])
+        ]
+
+        # The procedure commits its own transaction
+        bad = call_sp_rows("sp_Admin_BulkCreateUsers", (username, tvp), autocommit=True)
+
+        for r in bad:
+            failed.add(r["RowNum"])
+            rejected.append({"RowNum": r["RowNum"], "Username": r["Username"], "Reason": r["Reason"]})
+        created += len(batch) - len(bad)
+
+        if progress:
+            progress(min(start + batch_size, len(rows)), len(rows))
+
+    credentials = [
+        {"Username": row["Username"], "Password": generated[row["RowNum"]]}
+        for row in rows
+        if row["RowNum"] in generated and row["RowNum"] not in failed
+    ]
+    rejected.sort(key=lambda r: r["RowNum"])
+
+    return {"created": created, "rejected": rejected, "credentials": credentials}
+
+
+def write_report(rows, path):
+    """Write a list of dicts (rejected rows or credentials) as CSV."""
+    if not rows:
+        return
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
@@ -1,1077 +1,2442 @@
-# =========================================================
-# Admin Dashboard
-# =========================================================
-# Role: Admin only
-# Uses ONLY:
-#   - Stored Procedures (CRUD, Assignments, Role Requests)
-#   - Read-only Admin Views
-# =========================================================
-
-import tkinter as tk
-from tkinter import messagebox, ttk
-
-from session import Session
-from db import call_sp_rows, call_sp_non_query, execute_query, DbError
-
-# ---------------------------------------------------------
-# UI Colors
-# ---------------------------------------------------------
-BG = "#f5f6fa"
-CARD = "#ffffff"
-PRIMARY = "#2f3640"
-ACCENT = "#487eb0"
-
-
-# =========================================================
-# Main Admin Window
-# =========================================================
-def open():
-    if not Session.is_logged_in() or Session.role != "Admin":
-        messagebox.showerror("Access Denied", "Admin only.")
-        return
-
-    win = tk.Tk()
-    win.title("Admin Dashboard")
-    win.geometry("760x560")
-    win.configure(bg=BG)
-    win.resizable(False, False)
-
-    tk.Label(
-        win,
-        text=f"Admin Dashboard – {Session.username}",
-        font=("Arial", 20, "bold"),
-        bg=ACCENT,
-        fg="white"
-    ).pack(fill="x")
-
-    card = tk.Frame(win, bg=CARD)
-    card.place(relx=0.5, rely=0.55, anchor="center", width=640, height=460)
-
-    btn = dict(width=35, height=2, bg=ACCENT, fg="white", relief="flat")
-
-    tk.Button(card, text="Manage Users", command=open_manage_users, **btn).pack(pady=6)
-    tk.Button(card, text="Role Requests", command=open_role_requests, **btn).pack(pady=6)
-    tk.Button(card, text="Manage Courses", command=open_manage_courses, **btn).pack(pady=6)
-    tk.Button(card, text="Assignments (Instructor / TA / Student)", command=open_assignments, **btn).pack(pady=6)
-    tk.Button(card, text="View Logs (Read Only)", command=open_logs, **btn).pack(pady=6)
-
-    tk.Button(
-        win, text="Logout",
-        bg="#e84118", fg="white", width=12, relief="flat",
-        command=lambda: (Session.clear(), win.destroy(), __import__("login"))
-    ).place(x=630, y=10)
-
-    win.mainloop()
-
-
-# =========================================================
-# USERS
-# =========================================================
-def open_manage_users():
-    win = tk.Toplevel()
-    win.title("Users")
-    win.geometry("700x420")
-    win.configure(bg=BG)
-
-    tk.Label(
-        win,
-        text="System Users",
-        font=("Arial", 16, "bold"),
-        bg=BG
-    ).pack(pady=10)
-
-    try:
-        users = call_sp_rows("sp_User_GetAll", (Session.username,))
-    except DbError as e:
-        messagebox.showerror("Error", str(e))
-        return
-
-    # ===== Scrollable Area =====
-    canvas = tk.Canvas(win, bg=BG, highlightthickness=0)
-    scrollbar = tk.Scrollbar(win, orient="vertical", command=canvas.yview)
-
-    scrollable_frame = tk.Frame(canvas, bg=BG)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    frame = scrollable_frame
-    # ==========================
-
-    headers = ["Username", "Role", "ClearanceLevel"]
-    for i, h in enumerate(headers):
-        tk.Label(
-            frame,
-            text=h,
-            width=20,
-            bg=ACCENT,
-            fg="white"
-        ).grid(row=0, column=i)
-
-    for r, u in enumerate(users, start=1):
-        tk.Label(frame, text=u["Username"], width=20, bg=CARD).grid(row=r, column=0)
-        tk.Label(frame, text=u["Role"], width=20, bg=CARD).grid(row=r, column=1)
-        tk.Label(frame, text=u["ClearanceLevel"], width=20, bg=CARD).grid(row=r, column=2)
-
-    tk.Button(win, text="Add User", bg=ACCENT, fg="white", command=open_add_user).pack(pady=5)
-    tk.Button(win, text="Change User Role", bg=ACCENT, fg="white", command=open_edit_user).pack(pady=5)
-    tk.Button(win, text="Delete User", bg=ACCENT, fg="white", command=open_delete_user).pack(pady=5)
-
-def open_add_user():
-    win = tk.Toplevel()
-    win.title("Add User")
-    win.geometry("450x520")
-    win.configure(bg=BG)
-
-    tk.Label(
-        win,
-        text="Register User",
-        font=("Arial", 16, "bold"),
-        bg=BG
-    ).pack(pady=10)
-
-    # =========================
-    # Common Fields
-    # =========================
-    tk.Label(win, text="Username", bg=BG).pack()
-    e_username = tk.Entry(win, width=35)
-    e_username.pack(pady=3)
-
-    tk.Label(win, text="Password", bg=BG).pack()
-    e_password = tk.Entry(win, width=35, show="*")
-    e_password.pack(pady=3)
-
-    # =========================
-    # Role Dropdown
-    # =========================
-    tk.Label(win, text="Role", bg=BG).pack()
-    role_var = tk.StringVar()
-    cb_role = ttk.Combobox(
-        win,
-        textvariable=role_var,
-        state="readonly",
-        values=["Admin", "Instructor", "TA", "Student", "Guestrole"],
-        width=32
-    )
-    cb_role.pack(pady=4)
-
-    # =========================
-    # Extra Fields Frame
-    # =========================
-    extra_frame = tk.Frame(win, bg=BG)
-    extra_frame.pack(pady=10, fill="x")
-
-    def clear_extra():
-        for w in extra_frame.winfo_children():
-            w.destroy()
-
-    # =========================
-    # Dynamic Fields by Role
-    # =========================
-    def on_role_change(event=None):
-        clear_extra()
-        role = role_var.get()
-
-        if role in ("Student", "Instructor", "TA"):
-            tk.Label(extra_frame, text="Full Name", bg=BG).pack()
-            e_fullname = tk.Entry(extra_frame, width=35)
-            e_fullname.pack(pady=3)
-
-            tk.Label(extra_frame, text="Email", bg=BG).pack()
-            e_email = tk.Entry(extra_frame, width=35)
-            e_email.pack(pady=3)
-
-            if role == "Student":
-                tk.Label(extra_frame, text="Phone", bg=BG).pack()
-                e_phone = tk.Entry(extra_frame, width=35)
-                e_phone.pack(pady=3)
-
-                tk.Label(extra_frame, text="Date of Birth (YYYY-MM-DD)", bg=BG).pack()
-                e_dob = tk.Entry(extra_frame, width=35)
-                e_dob.pack(pady=3)
-
-                tk.Label(extra_frame, text="Department", bg=BG).pack()
-                e_dept = tk.Entry(extra_frame, width=35)
-                e_dept.pack(pady=3)
-
-                extra_frame.entries = {
-                    "FullName": e_fullname,
-                    "Email": e_email,
-                    "Phone": e_phone,
-                    "DOB": e_dob,
-                    "Department": e_dept
-                }
-            else:
-                extra_frame.entries = {
-                    "FullName": e_fullname,
-                    "Email": e_email
-                }
-        else:
-            extra_frame.entries = {}
-
-    cb_role.bind("<<ComboboxSelected>>", on_role_change)
-
-    # =========================
-    # Register Logic
-    # =========================
-    def register():
-        try:
-            role = role_var.get()
-
-            if not role:
-                messagebox.showerror("Error", "Please select a role")
-                return
-
-            # -------------------------
-            # Admin → sp_Admin_CreateUser
-            # -------------------------
-            if role == "Admin":
-                call_sp_non_query(
-                    "sp_Admin_CreateUser",
-                    (
-                        Session.username,
-                        e_username.get().strip(),
-                        e_password.get().strip(),
-                        role
-                    )
-                )
-
-            # -------------------------
-            # Others → sp_User_Register
-            # -------------------------
-            else:
-                data = extra_frame.entries
-
-                call_sp_non_query(
-                    "sp_User_Register",
-                    (
-                        e_username.get().strip(),
-                        e_password.get().strip(),
-                        role,
-                        data.get("FullName").get().strip() if "FullName" in data else None,
-                        data.get("Email").get().strip() if "Email" in data else None,
-                        data.get("Phone").get().strip() if "Phone" in data else None,
-                        data.get("DOB").get().strip() if "DOB" in data else None,
-                        data.get("Department").get().strip() if "Department" in data else None,
-                    )
-                )
-
-            messagebox.showinfo("Success", "User created successfully")
-            win.destroy()
-
-        except DbError as e:
-            messagebox.showerror("Error", str(e))
-
-    tk.Button(
-        win,
-        text="Create User",
-        bg=ACCENT,
-        fg="white",
-        width=20,
-        command=register
-    ).pack(pady=15)
-def open_edit_user():
-    win = tk.Toplevel()
-    win.title("Change Role")
-    win.geometry("350x260")
-    win.configure(bg=BG)
-
-    tk.Label(
-        win,
-        text="Change User Role",
-        font=("Arial", 14, "bold"),
-        bg=BG
-    ).pack(pady=10)
-
-    tk.Label(win, text="Username", bg=BG).pack()
-    e_user = tk.Entry(win, width=30)
-    e_user.pack()
-
-    tk.Label(win, text="New Role", bg=BG).pack()
-    e_role = tk.Entry(win, width=30)
-    e_role.pack()
-
-    def update():
-        try:
-            call_sp_non_query(
-                "sp_User_UpdateRole",
-                (Session.username, e_user.get().strip(), e_role.get().strip())
-            )
-            messagebox.showinfo("Success", "Role updated successfully")
-            win.destroy()
-        except DbError as e:
-            messagebox.showerror("Error", str(e))
-
-    tk.Button(
-        win,
-        text="Update",
-        bg=ACCENT,
-        fg="white",
-        command=update
-    ).pack(pady=15)
-def open_delete_user():
-    win = tk.Toplevel()
-    win.title("Delete User")
-    win.geometry("300x200")
-    win.configure(bg=BG)
-
-    tk.Label(
-        win,
-        text="Delete User",
-        font=("Arial", 14, "bold"),
-        bg=BG
-    ).pack(pady=10)
-
-    entry_user = tk.Entry(win, width=30)
-    entry_user.pack(pady=5)
-
-    def delete():
-        try:
-            call_sp_non_query(
-                "sp_User_Delete",
-                (Session.username, entry_user.get().strip())
-            )
-            messagebox.showinfo("Deleted", "User removed successfully")
-            win.destroy()
-        except DbError as err:
-            messagebox.showerror("Error", str(err))
-
-    tk.Button(
-        win,
-        text="Delete",
-        bg="#e84118",
-        fg="white",
-        command=delete
-    ).pack(pady=15)
-
-# =========================================================
-# MANAGE COURSES (ADMIN) – BUTTONS INSIDE
-# =========================================================
-def open_manage_courses():
-    win = tk.Toplevel()
-    win.title("Manage Courses")
-    win.geometry("1050x520")
-    win.configure(bg=BG)
-
-    tk.Label(win, text="Manage Courses", font=("Arial", 16, "bold"), bg=BG)\
-        .pack(pady=10)
-
-    selected_course = {}
-
-    # ===============================
-    # Table + Scrollbar
-    # ===============================
-    table_frame = tk.Frame(win, bg=BG)
-    table_frame.pack(fill="both", expand=True, padx=10)
-
-    canvas = tk.Canvas(table_frame, bg=BG)
-    scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=canvas.yview)
-    scrollable = tk.Frame(canvas, bg=BG)
-
-    scrollable.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-
-    canvas.create_window((0, 0), window=scrollable, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    headers = [
-        "CourseID", "CourseName", "Description",
-        "PublicInfo", "ClearanceLevel", "IsDeleted"
-    ]
-
-    def load_courses():
-        for w in scrollable.winfo_children():
-            w.destroy()
-
-        for c, h in enumerate(headers):
-            tk.Label(scrollable, text=h, width=18, bg=ACCENT, fg="white")\
-                .grid(row=0, column=c)
-
-        courses = call_sp_rows("sp_Admin_GetCourses", (Session.username,))
-
-        for r, course in enumerate(courses, start=1):
-            for c, key in enumerate(headers):
-                lbl = tk.Label(
-                    scrollable,
-                    text=course[key],
-                    width=18,
-                    bg=CARD
-                )
-                lbl.grid(row=r, column=c)
-
-                lbl.bind(
-                    "<Button-1>",
-                    lambda e, cr=course: select_course(cr)
-                )
-
-    def select_course(course):
-        selected_course.clear()
-        selected_course.update(course)
-        info_label.config(
-            text=f"Selected Course: {course['CourseID']} - {course['CourseName']}"
-        )
-
-    load_courses()
-
-    info_label = tk.Label(
-        win,
-        text="No course selected",
-        bg=BG,
-        fg="black",
-        font=("Arial", 10, "italic")
-    )
-    info_label.pack(pady=5)
-    # ===============================
-    # Buttons (INSIDE SAME SCREEN)
-    # ===============================
-    btn_frame = tk.Frame(win, bg=BG)
-    btn_frame.pack(pady=15)
-
-    tk.Button(
-        btn_frame,
-        text="Add Course",
-        width=18,
-        bg=ACCENT,
-        fg="white",
-        command=lambda: add_course(load_courses)
-    ).grid(row=0, column=0, padx=8)
-
-    tk.Button(
-        btn_frame,
-        text="Edit Selected",
-        width=18,
-        bg=ACCENT,
-        fg="white",
-        command=lambda: edit_selected_course(selected_course, load_courses)
-    ).grid(row=0, column=1, padx=8)
-
-    tk.Button(
-        btn_frame,
-        text="Delete Selected",
-        width=18,
-        bg="#e84118",
-        fg="white",
-        command=lambda: delete_selected_course(selected_course, load_courses)
-    ).grid(row=0, column=2, padx=8)
-    
-    
-    
-    
-    
-def add_course(refresh):
-    win = tk.Toplevel()
-    win.title("Add Course")
-    win.geometry("420x350")
-    win.configure(bg=BG)
-
-    tk.Label(win, text="Add Course", font=("Arial", 14, "bold"), bg=BG).pack(pady=10)
-
-    fields = {}
-    for lbl in ["Course Name", "Description", "Public Info"]:
-        tk.Label(win, text=lbl, bg=BG).pack()
-        e = tk.Entry(win, width=40)
-        e.pack(pady=5)
-        fields[lbl] = e
-
-    def save():
-        call_sp_non_query(
-            "sp_Admin_CreateCourse",
-            (
-                Session.username,
-                fields["Course Name"].get().strip(),
-                fields["Description"].get().strip() or None,
-                fields["Public Info"].get().strip() or None
-            )
-        )
-        messagebox.showinfo("Success", "Course added successfully")
-        win.destroy()
-        refresh()
-
-    tk.Button(win, text="Save", bg=ACCENT, fg="white", command=save)\
-        .pack(pady=15)
-def edit_selected_course(course, refresh):
-    if not course:
-        messagebox.showwarning("Select Course", "Please select a course first.")
-        return
-
-    win = tk.Toplevel()
-    win.title("Edit Course")
-    win.geometry("420x360")
-    win.configure(bg=BG)
-
-    tk.Label(win, text="Edit Course", font=("Arial", 14, "bold"), bg=BG).pack(pady=10)
-
-    e_name = tk.Entry(win, width=40)
-    e_name.insert(0, course["CourseName"])
-    e_name.pack(pady=5)
-
-    e_desc = tk.Entry(win, width=40)
-    e_desc.insert(0, course["Description"] or "")
-    e_desc.pack(pady=5)
-
-    e_info = tk.Entry(win, width=40)
-    e_info.insert(0, course["PublicInfo"] or "")
-    e_info.pack(pady=5)
-
-    def update():
-        call_sp_non_query(
-            "sp_Admin_UpdateCourse",
-            (
-                Session.username,
-                course["CourseID"],
-                e_name.get().strip(),
-                e_desc.get().strip() or None,
-                e_info.get().strip() or None
-            )
-        )
-        messagebox.showinfo("Success", "Course updated successfully")
-        win.destroy()
-        refresh()
-
-    tk.Button(win, text="Update", bg=ACCENT, fg="white", command=update)\
-        .pack(pady=15)
-def delete_selected_course(course, refresh):
-    if not course:
-        messagebox.showwarning("Select Course", "Please select a course first.")
-        return
-
-    if not messagebox.askyesno(
-        "Confirm Delete",
-        f"Delete course '{course['CourseName']}'?"
-    ):
-        return
-
-    call_sp_non_query(
-        "sp_Admin_DeleteCourse",
-        (
-            Session.username,
-            course["CourseID"]
-        )
-    )
-
-    messagebox.showinfo("Deleted", "Course deleted successfully")
-    refresh()
-
-# =========================================================
-# ASSIGNMENTS
-# =========================================================
-import tkinter as tk
-from tkinter import ttk, messagebox
-
-# =========================================================
-# ASSIGNMENTS (MAIN WINDOW)
-# =========================================================
-def open_assignments():
-    win = tk.Toplevel()
-    win.title("Assignments")
-    win.geometry("520x260")
-    win.configure(bg=BG)
-
-    tk.Label(
-        win, text="Assignments Management",
-        font=("Arial", 16, "bold"), bg=BG
-    ).pack(pady=15)
-
-    btn_frame = tk.Frame(win, bg=BG)
-    btn_frame.pack(pady=10)
-
-    tk.Button(
-        btn_frame, text="Assign / Unassign Instructor",
-        width=30, bg=ACCENT, fg="white",
-        command=open_instructor_assignments
-    ).grid(row=0, column=0, padx=10, pady=8)
-
-    tk.Button(
-        btn_frame, text="Assign / Unassign TA",
-        width=30, bg=ACCENT, fg="white",
-        command=open_ta_assignments
-    ).grid(row=1, column=0, padx=10, pady=8)
-
-    tk.Button(
-        btn_frame, text="Enroll / Remove Student",
-        width=30, bg=ACCENT, fg="white",
-        command=open_enrollment_management
-    ).grid(row=2, column=0, padx=10, pady=8)
-
-
-# -----------------------------
-# Helpers
-# -----------------------------
-def _friendly_db_error(e: Exception) -> str:
-    """
-    يحاول يطلع message واضح من DbError بدل الشكل الطويل.
-    """
-    msg = str(e)
-    # غالباً DbError بيكون: "Non-query failed: (... SQL Server]MESSAGE (50000) ...)"
-    # هنحاول نطلع الجزء اللي قبل (50000) لو موجود
-    if "]" in msg:
-        # خدي آخر جزء بعد آخر ]
-        msg2 = msg.split("]")[-1].strip()
-        if msg2:
-            msg = msg2
-    return msg
-
-
-def _load_courses():
-    rows = call_sp_rows("sp_Admin_GetCourses", (Session.username,))
-    # E7 بيرجع CourseID, CourseName
-    return [(r["CourseID"], r["CourseName"]) for r in rows]
-
-
-def _load_instructors():
-    rows = call_sp_rows("sp_Admin_GetInstructors", (Session.username,))
-    # E9 بيرجع InstructorID, FullName
-    return [(r["InstructorID"], r["FullName"]) for r in rows]
-
-
-def _load_tas():
-    rows = call_sp_rows("sp_Admin_GetTAs", (Session.username,))
-    # E10 بيرجع Username
-    return [r["Username"] for r in rows]
-
-
-def _load_students():
-    rows = call_sp_rows("sp_Admin_GetStudents", (Session.username,))
-    # E8 بيرجع StudentID, FullName
-    return [(r["StudentID"], r["FullName"]) for r in rows]
-
-
-def _combo_set_values(combo: ttk.Combobox, values):
-    combo["values"] = values
-    if values:
-        combo.current(0)
-
-
-# =========================================================
-# Instructor Assignments Window
-# =========================================================
-def open_instructor_assignments():
-    win = tk.Toplevel()
-    win.title("Instructor Assignments")
-    win.geometry("760x520")
-    win.configure(bg=BG)
-
-    tk.Label(win, text="Assign / Unassign Instructor", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
-
-    # Top form
-    top = tk.Frame(win, bg=BG)
-    top.pack(fill="x", padx=12, pady=6)
-
-    tk.Label(top, text="Instructor", bg=BG).grid(row=0, column=0, sticky="w")
-    cb_instructor = ttk.Combobox(top, state="readonly", width=35)
-    cb_instructor.grid(row=1, column=0, padx=(0, 14), pady=4)
-
-    tk.Label(top, text="Course", bg=BG).grid(row=0, column=1, sticky="w")
-    cb_course = ttk.Combobox(top, state="readonly", width=35)
-    cb_course.grid(row=1, column=1, pady=4)
-
-    # Table
-    table_frame = tk.Frame(win, bg=BG)
-    table_frame.pack(fill="both", expand=True, padx=12, pady=10)
-
-    cols = ("InstructorID", "InstructorName", "CourseID", "CourseName")
-    tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=12)
-
-    for c in cols:
-        tree.heading(c, text=c)
-        tree.column(c, width=160 if c in ("InstructorName", "CourseName") else 110, anchor="center")
-
-    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
-    tree.configure(yscrollcommand=vsb.set)
-
-    tree.grid(row=0, column=0, sticky="nsew")
-    vsb.grid(row=0, column=1, sticky="ns")
-
-    table_frame.grid_rowconfigure(0, weight=1)
-    table_frame.grid_columnconfigure(0, weight=1)
-
-    # Buttons
-    btns = tk.Frame(win, bg=BG)
-    btns.pack(pady=8)
-
-    def refresh():
-        # Load dropdowns
-        try:
-            instructors = _load_instructors()
-            courses = _load_courses()
-
-            _combo_set_values(cb_instructor, [f"{iid} - {name}" for iid, name in instructors])
-            _combo_set_values(cb_course, [f"{cid} - {cname}" for cid, cname in courses])
-
-            # Load table
-            for item in tree.get_children():
-                tree.delete(item)
-
-            assignments = call_sp_rows("sp_Admin_GetInstructorAssignments", (Session.username,))
-            for a in assignments:
-                tree.insert(
-                    "", "end",
-                    values=(a["InstructorID"], a["InstructorName"], a["CourseID"], a["CourseName"])
-                )
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-
-    def assign():
-        try:
-            if not cb_instructor.get() or not cb_course.get():
-                messagebox.showerror("Error", "Please select instructor and course.")
-                return
-
-            instructor_id = int(cb_instructor.get().split("-")[0].strip())
-            course_id = int(cb_course.get().split("-")[0].strip())
-
-            call_sp_non_query(
-                "sp_Admin_AssignInstructorToCourse",
-                (Session.username, instructor_id, course_id)
-            )
-            messagebox.showinfo("Success", "Instructor assigned successfully.")
-            refresh()
-
-        except DbError as e:
-            # هنا بالذات لو already assigned هتظهر كرسالة بدل crash
-            messagebox.showerror("Error", _friendly_db_error(e))
-        except ValueError:
-            messagebox.showerror("Error", "Invalid selection values.")
-
-    def unassign_selected():
-        try:
-            sel = tree.selection()
-            if not sel:
-                messagebox.showerror("Error", "Select an assignment row first.")
-                return
-
-            vals = tree.item(sel[0], "values")
-            instructor_id = int(vals[0])
-            course_id = int(vals[2])
-
-            call_sp_non_query(
-                "sp_Admin_UnassignInstructorFromCourse",
-                (Session.username, instructor_id, course_id)
-            )
-            messagebox.showinfo("Success", "Instructor unassigned successfully.")
-            refresh()
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-
-    tk.Button(btns, text="Assign", bg=ACCENT, fg="white", width=16, command=assign).grid(row=0, column=0, padx=8)
-    tk.Button(btns, text="Unassign (Selected)", bg="#e84118", fg="white", width=16, command=unassign_selected).grid(row=0, column=1, padx=8)
-    tk.Button(btns, text="Refresh", bg="#353b48", fg="white", width=16, command=refresh).grid(row=0, column=2, padx=8)
-
-    refresh()
-
-
-# =========================================================
-# TA Assignments Window
-# =========================================================
-def open_ta_assignments():
-    win = tk.Toplevel()
-    win.title("TA Assignments")
-    win.geometry("720x520")
-    win.configure(bg=BG)
-
-    tk.Label(win, text="Assign / Unassign TA", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
-
-    top = tk.Frame(win, bg=BG)
-    top.pack(fill="x", padx=12, pady=6)
-
-    tk.Label(top, text="TA Username", bg=BG).grid(row=0, column=0, sticky="w")
-    cb_ta = ttk.Combobox(top, state="readonly", width=35)
-    cb_ta.grid(row=1, column=0, padx=(0, 14), pady=4)
-
-    tk.Label(top, text="Course", bg=BG).grid(row=0, column=1, sticky="w")
-    cb_course = ttk.Combobox(top, state="readonly", width=35)
-    cb_course.grid(row=1, column=1, pady=4)
-
-    table_frame = tk.Frame(win, bg=BG)
-    table_frame.pack(fill="both", expand=True, padx=12, pady=10)
-
-    cols = ("TAUsername", "CourseID", "CourseName")
-    tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=12)
-    for c in cols:
-        tree.heading(c, text=c)
-        tree.column(c, width=220 if c in ("TAUsername", "CourseName") else 110, anchor="center")
-
-    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
-    tree.configure(yscrollcommand=vsb.set)
-
-    tree.grid(row=0, column=0, sticky="nsew")
-    vsb.grid(row=0, column=1, sticky="ns")
-    table_frame.grid_rowconfigure(0, weight=1)
-    table_frame.grid_columnconfigure(0, weight=1)
-
-    btns = tk.Frame(win, bg=BG)
-    btns.pack(pady=8)
-
-    def refresh():
-        try:
-            tas = _load_tas()
-            courses = _load_courses()
-
-            _combo_set_values(cb_ta, tas)
-            _combo_set_values(cb_course, [f"{cid} - {cname}" for cid, cname in courses])
-
-            for item in tree.get_children():
-                tree.delete(item)
-
-            assignments = call_sp_rows("sp_Admin_GetTAAssignments", (Session.username,))
-            for a in assignments:
-                tree.insert("", "end", values=(a["TAUsername"], a["CourseID"], a["CourseName"]))
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-
-    def assign():
-        try:
-            if not cb_ta.get() or not cb_course.get():
-                messagebox.showerror("Error", "Please select TA and course.")
-                return
-
-            ta_username = cb_ta.get().strip()
-            course_id = int(cb_course.get().split("-")[0].strip())
-
-            call_sp_non_query(
-                "sp_Admin_AssignTAtoCourse",
-                (Session.username, ta_username, course_id)
-            )
-            messagebox.showinfo("Success", "TA assigned successfully.")
-            refresh()
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-        except ValueError:
-            messagebox.showerror("Error", "Invalid course selection.")
-
-    def unassign_selected():
-        try:
-            sel = tree.selection()
-            if not sel:
-                messagebox.showerror("Error", "Select an assignment row first.")
-                return
-
-            vals = tree.item(sel[0], "values")
-            ta_username = str(vals[0])
-            course_id = int(vals[1])
-
-            call_sp_non_query(
-                "sp_Admin_UnassignTAFromCourse",
-                (Session.username, ta_username, course_id)
-            )
-            messagebox.showinfo("Success", "TA unassigned successfully.")
-            refresh()
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-
-    tk.Button(btns, text="Assign", bg=ACCENT, fg="white", width=16, command=assign).grid(row=0, column=0, padx=8)
-    tk.Button(btns, text="Unassign (Selected)", bg="#e84118", fg="white", width=16, command=unassign_selected).grid(row=0, column=1, padx=8)
-    tk.Button(btns, text="Refresh", bg="#353b48", fg="white", width=16, command=refresh).grid(row=0, column=2, padx=8)
-
-    refresh()
-
-
-# =========================================================
-# Enrollment Management Window (Dropdowns)
-# =========================================================
-def open_enrollment_management():
-    win = tk.Toplevel()
-    win.title("Enrollment Management")
-    win.geometry("620x320")
-    win.configure(bg=BG)
-
-    tk.Label(win, text="Enroll / Remove Student", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
-
-    box = tk.Frame(win, bg=BG)
-    box.pack(padx=12, pady=10, fill="x")
-
-    tk.Label(box, text="Student", bg=BG).grid(row=0, column=0, sticky="w")
-    cb_student = ttk.Combobox(box, state="readonly", width=40)
-    cb_student.grid(row=1, column=0, padx=(0, 14), pady=6)
-
-    tk.Label(box, text="Course", bg=BG).grid(row=0, column=1, sticky="w")
-    cb_course = ttk.Combobox(box, state="readonly", width=40)
-    cb_course.grid(row=1, column=1, pady=6)
-
-    btns = tk.Frame(win, bg=BG)
-    btns.pack(pady=14)
-
-    def refresh():
-        try:
-            students = _load_students()
-            courses = _load_courses()
-            _combo_set_values(cb_student, [f"{sid} - {name}" for sid, name in students])
-            _combo_set_values(cb_course, [f"{cid} - {cname}" for cid, cname in courses])
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-
-    def enroll():
-        try:
-            if not cb_student.get() or not cb_course.get():
-                messagebox.showerror("Error", "Please select student and course.")
-                return
-
-            student_id = int(cb_student.get().split("-")[0].strip())
-            course_id = int(cb_course.get().split("-")[0].strip())
-
-            call_sp_non_query(
-                "sp_Admin_EnrollStudentInCourse",
-                (Session.username, student_id, course_id)
-            )
-            messagebox.showinfo("Success", "Student enrolled successfully.")
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-        except ValueError:
-            messagebox.showerror("Error", "Invalid selection values.")
-
-    def remove():
-        try:
-            if not cb_student.get() or not cb_course.get():
-                messagebox.showerror("Error", "Please select student and course.")
-                return
-
-            student_id = int(cb_student.get().split("-")[0].strip())
-            course_id = int(cb_course.get().split("-")[0].strip())
-
-            call_sp_non_query(
-                "sp_Admin_RemoveEnrollment",
-                (Session.username, student_id, course_id)
-            )
-            messagebox.showinfo("Success", "Enrollment removed successfully.")
-
-        except DbError as e:
-            messagebox.showerror("Error", _friendly_db_error(e))
-        except ValueError:
-            messagebox.showerror("Error", "Invalid selection values.")
-
-    tk.Button(btns, text="Enroll", bg=ACCENT, fg="white", width=18, command=enroll).grid(row=0, column=0, padx=10)
-    tk.Button(btns, text="Remove", bg="#e84118", fg="white", width=18, command=remove).grid(row=0, column=1, padx=10)
-    tk.Button(btns, text="Refresh", bg="#353b48", fg="white", width=18, command=refresh).grid(row=0, column=2, padx=10)
-
-    refresh()
-
-
-# =========================================================
-# ROLE REQUESTS
-# =========================================================
-def open_role_requests():
-    win = tk.Toplevel()
-    win.title("Role Requests")
-    win.geometry("720x420")
-    win.configure(bg=BG)
-
-    try:
-        reqs = call_sp_rows("sp_RoleRequest_GetPending", (Session.username,))
-    except DbError as e:
-        messagebox.showerror("Error", str(e))
-        return
-
-    frame = tk.Frame(win, bg=BG)
-    frame.pack(pady=10)
-
-    headers = ["RequestID", "Username", "CurrentRole", "RequestedRole"]
-    for i, h in enumerate(headers):
-        tk.Label(
-            frame,
-            text=h,
-            width=18,
-            bg=ACCENT,
-            fg="white"
-        ).grid(row=0, column=i)
-
-    # ---------------------------------------------
-    # Approve / Deny handlers (NO logic change)
-    # ---------------------------------------------
-    def approve(request_id):
-        try:
-            call_sp_non_query(
-                "dbo.sp_RoleRequest_Approve",
-                (Session.username, request_id)
-            )
-            messagebox.showinfo("Success", "Request approved successfully")
-            win.destroy()
-            open_role_requests()   # refresh
-        except DbError as e:
-            messagebox.showerror("Error", str(e))
-
-    def deny(request_id):
-        try:
-            call_sp_non_query(
-                "sp_RoleRequest_Deny",
-                (Session.username, request_id)
-            )
-            messagebox.showinfo("Success", "Request denied successfully")
-            win.destroy()
-            open_role_requests()   # refresh
-        except DbError as e:
-            messagebox.showerror("Error", str(e))
-
-    # ---------------------------------------------
-    # Rows
-    # ---------------------------------------------
-    for r, req in enumerate(reqs, start=1):
-        tk.Label(frame, text=req["RequestID"], width=18, bg=CARD)\
-            .grid(row=r, column=0)
-        tk.Label(frame, text=req["Username"], width=18, bg=CARD)\
-            .grid(row=r, column=1)
-        tk.Label(frame, text=req["CurrentRole"], width=18, bg=CARD)\
-            .grid(row=r, column=2)
-        tk.Label(frame, text=req["RequestedRole"], width=18, bg=CARD)\
-            .grid(row=r, column=3)
-
-        tk.Button(
-            frame,
-            text="Approve",
-            bg="#44bd32",
-            fg="white",
-            command=lambda i=req["RequestID"]: approve(i)
-        ).grid(row=r, column=4, padx=5)
-
-        tk.Button(
-            frame,
-            text="Deny",
-            bg="#e84118",
-            fg="white",
-            command=lambda i=req["RequestID"]: deny(i)
-        ).grid(row=r, column=5, padx=5)
-
-
-# =========================================================
-# LOGS (READ ONLY)
-# =========================================================
-def open_logs():
-    win = tk.Toplevel()
-    win.title("System Logs")
-    win.geometry("900x450")
-    win.configure(bg=BG)
-
-    logs = execute_query("SELECT * FROM vw_Admin_Logs")
-
-    frame = tk.Frame(win, bg=BG)
-    frame.pack()
-
-    headers = logs[0].keys() if logs else []
-    for i, h in enumerate(headers):
-        tk.Label(frame, text=h, width=18, bg=ACCENT, fg="white").grid(row=0, column=i)
-
-    for r, log in enumerate(logs, start=1):
-        for i, h in enumerate(headers):
-            tk.Label(frame, text=log[h], width=18, bg=CARD).grid(row=r, column=i)
+# =========================================================
+# Admin Dashboard
+# =========================================================
+# Role: Admin only
+# Uses ONLY:
+#   - Stored Procedures (CRUD, Assignments, Role Requests)
+#   - Read-only Admin Views
+# =========================================================
+
+import os
+import threading
+import tkinter as tk
+from datetime import datetime
+from tkinter import filedialog, messagebox, ttk
+
+from session import Session
+from db import call_sp_rows, call_sp_non_query, execute_query, watch_data_versions, DbError
+from enrollment_import import import_enrollments, write_rejected_report
+from user_provisioning import provision_users, write_report
+from assignment_matrix import AssignmentMatrix
+from search import search_students, search_courses, search_users, clear_cache
+from search_picker import SearchPicker
+from grid_view import GridView, filter_bar
+from security_monitor import get_monitor
+from data_export import export, read_progress
+from batch_reports import generate as generate_reports, REPORTS_DIR
+from analytics_snapshot import build as build_analytics, read_meta as analytics_meta, ANALYTICS_DIR
+from terms import get_terms, create_term, set_current_term, set_read_only, pack_attendance
+from archive import (run_archival, get_archive, restore_row, restore_student,
+                     KINDS as ARCHIVE_KINDS, BATCH_SIZE as ARCHIVE_BATCH_SIZE,
+                     INACTIVE_YEARS as ARCHIVE_INACTIVE_YEARS)
+
+# ---------------------------------------------------------
+# UI Colors
+# ---------------------------------------------------------
+BG = "#f5f6fa"
+CARD = "#ffffff"
+PRIMARY = "#2f3640"
+ACCENT = "#487eb0"
+
+
+# =========================================================
+# Main Admin Window
+# =========================================================
+def open():
+    if not Session.is_logged_in() or Session.role != "Admin":
+        messagebox.showerror("Access Denied", "Admin only.")
+        return
+
+    win = tk.Tk()
+    win.title("Admin Dashboard")
+    win.geometry("760x610")
+    win.configure(bg=BG)
+    win.resizable(False, False)
+
+    tk.Label(
+        win,
+        text=f"Admin Dashboard – {Session.username}",
+        font=("Arial", 20, "bold"),
+        bg=ACCENT,
+        fg="white"
+    ).pack(fill="x")
+
+    card = tk.Frame(win, bg=CARD)
+    card.place(relx=0.5, rely=0.55, anchor="center", width=640, height=510)
+
+    btn = dict(width=35, height=2, bg=ACCENT, fg="white", relief="flat")
+
+    tk.Button(card, text="Manage Users", command=open_manage_users, **btn).pack(pady=4)
+    tk.Button(card, text="Role Requests", command=open_role_requests, **btn).pack(pady=4)
+    tk.Button(card, text="Manage Courses", command=open_manage_courses, **btn).pack(pady=4)
+    tk.Button(card, text="Assignments (Instructor / TA / Student)", command=open_assignments, **btn).pack(pady=4)
+    tk.Button(card, text="View Logs (Read Only)", command=open_logs, **btn).pack(pady=4)
+    tk.Button(card, text="Security Alerts", command=open_security_alerts, **btn).pack(pady=4)
+    tk.Button(card, text="Export Grades / Attendance", command=open_export, **btn).pack(pady=4)
+    tk.Button(card, text="Term Reports", command=open_term_reports, **btn).pack(pady=4)
+    tk.Button(card, text="Analytics Snapshot", command=open_analytics_snapshot, **btn).pack(pady=4)
+    tk.Button(card, text="Archive (History)", command=open_archive, **btn).pack(pady=4)
+
+    tk.Button(
+        win, text="Logout",
+        bg="#e84118", fg="white", width=12, relief="flat",
+        command=lambda: (Session.clear(), win.destroy(), __import__("login"))
+    ).place(x=630, y=10)
+
+    win.mainloop()
+
+
+# =========================================================
+# USERS
+# =========================================================
+def _build_grid(parent, columns, width=140, height=12):
+    """Sortable / filterable Treeview; columns = [(key, title)]. Returns its GridView."""
+    frame = tk.Frame(parent, bg=BG)
+    frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+    tree = ttk.Treeview(frame, columns=[k for k, _t in columns], show="headings", height=height)
+    vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    hsb = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
+    tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+
+    for key, title in columns:
+        tree.heading(key, text=title)
+        tree.column(key, width=width, anchor="center")
+
+    view = GridView(tree, [k for k, _t in columns])
+    filter_bar(frame, view, bg=BG, column_titles=dict(columns)).grid(
+        row=0, column=0, columnspan=2, sticky="ew", pady=(0, 6)
+    )
+    tree.grid(row=1, column=0, sticky="nsew")
+    vsb.grid(row=1, column=1, sticky="ns")
+    hsb.grid(row=2, column=0, sticky="ew")
+    frame.grid_rowconfigure(1, weight=1)
+    frame.grid_columnconfigure(0, weight=1)
+    return view
+
+
+def open_manage_users():
+    win = tk.Toplevel()
+    win.title("Users")
+    win.geometry("700x560")
+    win.configure(bg=BG)
+
+    tk.Label(
+        win,
+        text="System Users",
+        font=("Arial", 16, "bold"),
+        bg=BG
+    ).pack(pady=10)
+
+    try:
+        users = call_sp_rows("sp_User_GetAll", (Session.username,))
+    except DbError as e:
+        messagebox.showerror("Error", str(e))
+        return
+
+    # One Treeview item per user; sort / filter never re-query
+    view = _build_grid(
+        win,
+        [("Username", "Username"), ("Role", "Role"), ("ClearanceLevel", "ClearanceLevel")],
+        width=200,
+        height=10
+    )
+    view.set_rows(users)
+
+    tk.Button(win, text="Add User", bg=ACCENT, fg="white", command=open_add_user).pack(pady=5)
+    tk.Button(win, text="Bulk Provision (CSV)", bg=ACCENT, fg="white", command=open_bulk_provision).pack(pady=5)
+    tk.Button(win, text="Change User Role", bg=ACCENT, fg="white", command=open_edit_user).pack(pady=5)
+    tk.Button(win, text="Delete User", bg=ACCENT, fg="white", command=open_delete_user).pack(pady=5)
+
+def open_add_user():
+    win = tk.Toplevel()
+    win.title("Add User")
+    win.geometry("450x520")
+    win.configure(bg=BG)
+
+    tk.Label(
+        win,
+        text="Register User",
+        font=("Arial", 16, "bold"),
+        bg=BG
+    ).pack(pady=10)
+
+    # =========================
+    # Common Fields
+    # =========================
+    tk.Label(win, text="Username", bg=BG).pack()
+    e_username = tk.Entry(win, width=35)
+    e_username.pack(pady=3)
+
+    tk.Label(win, text="Password", bg=BG).pack()
+    e_password = tk.Entry(win, width=35, show="*")
+    e_password.pack(pady=3)
+
+    # =========================
+    # Role Dropdown
+    # =========================
+    tk.Label(win, text="Role", bg=BG).pack()
+    role_var = tk.StringVar()
+    cb_role = ttk.Combobox(
+        win,
+        textvariable=role_var,
+        state="readonly",
+        values=["Admin", "Instructor", "TA", "Student", "Guestrole"],
+        width=32
+    )
+    cb_role.pack(pady=4)
+
+    # =========================
+    # Extra Fields Frame
+    # =========================
+    extra_frame = tk.Frame(win, bg=BG)
+    extra_frame.pack(pady=10, fill="x")
+
+    def clear_extra():
+        for w in extra_frame.winfo_children():
+            w.destroy()
+
+    # =========================
+    # Dynamic Fields by Role
+    # =========================
+    def on_role_change(event=None):
+        clear_extra()
+        role = role_var.get()
+
+        if role in ("Student", "Instructor", "TA"):
+            tk.Label(extra_frame, text="Full Name", bg=BG).pack()
+            e_fullname = tk.Entry(extra_frame, width=35)
+            e_fullname.pack(pady=3)
+
+            tk.Label(extra_frame, text="Email", bg=BG).pack()
+            e_email = tk.Entry(extra_frame, width=35)
+            e_email.pack(pady=3)
+
+            if role == "Student":
+                tk.Label(extra_frame, text="Phone", bg=BG).pack()
+                e_phone = tk.Entry(extra_frame, width=35)
+                e_phone.pack(pady=3)
+
+                tk.Label(extra_frame, text="Date of Birth (YYYY-MM-DD)", bg=BG).pack()
+                e_dob = tk.Entry(extra_frame, width=35)
+                e_dob.pack(pady=3)
+
+                tk.Label(extra_frame, text="Department", bg=BG).pack()
+                e_dept = tk.Entry(extra_frame, width=35)
+                e_dept.pack(pady=3)
+
+                extra_frame.entries = {
+                    "FullName": e_fullname,
+                    "Email": e_email,
+                    "Phone": e_phone,
+                    "DOB": e_dob,
+                    "Department": e_dept
+                }
+            else:
+                extra_frame.entries = {
+                    "FullName": e_fullname,
+                    "Email": e_email
+                }
+        else:
+            extra_frame.entries = {}
+
+    cb_role.bind("<<ComboboxSelected>>", on_role_change)
+
+    # =========================
+    # Register Logic
+    # =========================
+    def register():
+        try:
+            role = role_var.get()
+
+            if not role:
+                messagebox.showerror("Error", "Please select a role")
+                return
+
+            # -------------------------
+            # Admin → sp_Admin_CreateUser
+            # -------------------------
+            if role == "Admin":
+                call_sp_non_query(
+                    "sp_Admin_CreateUser",
+                    (
+                        Session.username,
+                        e_username.get().strip(),
+                        e_password.get().strip(),
+                        role
+                    )
+                )
+
+            # -------------------------
+            # Others → sp_User_Register
+            # -------------------------
+            else:
+                data = extra_frame.entries
+
+                call_sp_non_query(
+                    "sp_User_Register",
+                    (
+                        e_username.get().strip(),
+                        e_password.get().strip(),
+                        role,
+                        data.get("FullName").get().strip() if "FullName" in data else None,
+                        data.get("Email").get().strip() if "Email" in data else None,
+                        data.get("Phone").get().strip() if "Phone" in data else None,
+                        data.get("DOB").get().strip() if "DOB" in data else None,
+                        data.get("Department").get().strip() if "Department" in data else None,
+                    )
+                )
+
+            clear_cache()
+            messagebox.showinfo("Success", "User created successfully")
+            win.destroy()
+
+        except DbError as e:
+            messagebox.showerror("Error", str(e))
+
+    tk.Button(
+        win,
+        text="Create User",
+        bg=ACCENT,
+        fg="white",
+        width=20,
+        command=register
+    ).pack(pady=15)
+
+
+def open_bulk_provision():
+    """
+    Roster CSV -> users + profiles in set-based batches.
+    Columns: Username, Password, Role, FullName, Email, Phone, DOB, Department
+    """
+    path = filedialog.askopenfilename(
+        title="User Roster (CSV)",
+        filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+    )
+    if not path:
+        return
+
+    win = tk.Toplevel()
+    win.title("Bulk Provisioning")
+    win.geometry("420x140")
+    win.configure(bg=BG)
+
+    status = tk.Label(win, text="Reading roster...", bg=BG, font=("Arial", 11))
+    status.pack(pady=30)
+
+    outcome = {}
+
+    def work():
+        try:
+            outcome["result"] = provision_users(
+                Session.username, path,
+                progress=lambda done, total: outcome.__setitem__("progress", (done, total))
+            )
+        except (DbError, OSError, ValueError) as e:
+            outcome["error"] = e
+
+    worker = threading.Thread(target=work, daemon=True)
+    worker.start()
+
+    def save(rows, title, initial):
+        out = filedialog.asksaveasfilename(
+            parent=win,
+            title=title,
+            defaultextension=".csv",
+            initialfile=initial,
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if out:
+            try:
+                write_report(rows, out)
+            except OSError as e:
+                messagebox.showerror("Error", str(e), parent=win)
+
+    def poll():
+        if worker.is_alive():
+            if "progress" in outcome:
+                done, total = outcome["progress"]
+                status.config(text=f"Creating users... {done} / {total}")
+            win.after(200, poll)
+            return
+
+        if "error" in outcome:
+            e = outcome["error"]
+            messagebox.showerror("Provisioning Failed", _friendly_db_error(e) if isinstance(e, DbError) else str(e), parent=win)
+            win.destroy()
+            return
+
+        r = outcome["result"]
+        clear_cache()
+        status.config(text=f"Created: {r['created']}    Rejected: {len(r['rejected'])}")
+
+        if r["credentials"]:
+            messagebox.showinfo(
+                "Generated Passwords",
+                f"{len(r['credentials'])} users got a generated password.\n"
+                "Save them now - they are not stored anywhere else.",
+                parent=win
+            )
+            save(r["credentials"], "Save Generated Passwords", "new_user_passwords.csv")
+
+        if r["rejected"] and messagebox.askyesno("Rejected Rows", "Save the rejected rows report?", parent=win):
+            save(r["rejected"], "Save Rejected Rows", "users_rejected.csv")
+
+    poll()
+
+
+def open_edit_user():
+    win = tk.Toplevel()
+    win.title("Change Role")
+    win.geometry("350x340")
+    win.configure(bg=BG)
+
+    tk.Label(
+        win,
+        text="Change User Role",
+        font=("Arial", 14, "bold"),
+        bg=BG
+    ).pack(pady=10)
+
+    tk.Label(win, text="Username", bg=BG).pack()
+    e_user = SearchPicker(win, lambda q: search_users(Session.username, q), width=30, rows=4, bg=BG)
+    e_user.pack()
+
+    tk.Label(win, text="New Role", bg=BG).pack()
+    e_role = tk.Entry(win, width=30)
+    e_role.pack()
+
+    def update():
+        try:
+            call_sp_non_query(
+                "sp_User_UpdateRole",
+                (Session.username, e_user.get() or e_user.text(), e_role.get().strip())
+            )
+            clear_cache()
+            messagebox.showinfo("Success", "Role updated successfully")
+            win.destroy()
+        except DbError as e:
+            messagebox.showerror("Error", str(e))
+
+    tk.Button(
+        win,
+        text="Update",
+        bg=ACCENT,
+        fg="white",
+        command=update
+    ).pack(pady=15)
+def open_delete_user():
+    win = tk.Toplevel()
+    win.title("Delete User")
+    win.geometry("300x280")
+    win.configure(bg=BG)
+
+    tk.Label(
+        win,
+        text="Delete User",
+        font=("Arial", 14, "bold"),
+        bg=BG
+    ).pack(pady=10)
+
+    entry_user = SearchPicker(win, lambda q: search_users(Session.username, q), width=30, rows=4, bg=BG)
+    entry_user.pack(pady=5)
+
+    def delete():
+        try:
+            call_sp_non_query(
+                "sp_User_Delete",
+                (Session.username, entry_user.get() or entry_user.text())
+            )
+            clear_cache()
+            messagebox.showinfo("Deleted", "User removed successfully")
+            win.destroy()
+        except DbError as err:
+            messagebox.showerror("Error", str(err))
+
+    tk.Button(
+        win,
+        text="Delete",
+        bg="#e84118",
+        fg="white",
+        command=delete
+    ).pack(pady=15)
+
+# =========================================================
+# MANAGE COURSES (ADMIN) – BUTTONS INSIDE
+# =========================================================
+def open_manage_courses():
+    win = tk.Toplevel()
+    win.title("Manage Courses")
+    win.geometry("1050x520")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Manage Courses", font=("Arial", 16, "bold"), bg=BG)\
+        .pack(pady=10)
+
+    selected_course = {}
+
+    # ===============================
+    # Table + Scrollbar
+    # ===============================
+    table_frame = tk.Frame(win, bg=BG)
+    table_frame.pack(fill="both", expand=True, padx=10)
+
+    canvas = tk.Canvas(table_frame, bg=BG)
+    scrollbar = tk.Scrollbar(table_frame, orient="vertical", command=canvas.yview)
+    scrollable = tk.Frame(canvas, bg=BG)
+
+    scrollable.bind(
+        "<Configure>",
+        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
+    )
+
+    canvas.create_window((0, 0), window=scrollable, anchor="nw")
+    canvas.configure(yscrollcommand=scrollbar.set)
+
+    canvas.pack(side="left", fill="both", expand=True)
+    scrollbar.pack(side="right", fill="y")
+
+    headers = [
+        "CourseID", "CourseName", "Description",
+        "PublicInfo", "ClearanceLevel", "IsDeleted"
+    ]
+
+    def load_courses():
+        for w in scrollable.winfo_children():
+            w.destroy()
+
+        for c, h in enumerate(headers):
+            tk.Label(scrollable, text=h, width=18, bg=ACCENT, fg="white")\
+                .grid(row=0, column=c)
+
+        courses = call_sp_rows("sp_Admin_GetCourses", (Session.username,))
+
+        for r, course in enumerate(courses, start=1):
+            for c, key in enumerate(headers):
+                lbl = tk.Label(
+                    scrollable,
+                    text=course[key],
+                    width=18,
+                    bg=CARD
+                )
+                lbl.grid(row=r, column=c)
+
+                lbl.bind(
+                    "<Button-1>",
+                    lambda e, cr=course: select_course(cr)
+                )
+
+    def select_course(course):
+        selected_course.clear()
+        selected_course.update(course)
+        info_label.config(
+            text=f"Selected Course: {course['CourseID']} - {course['CourseName']}"
+        )
+
+    load_courses()
+
+    info_label = tk.Label(
+        win,
+        text="No course selected",
+        bg=BG,
+        fg="black",
+        font=("Arial", 10, "italic")
+    )
+    info_label.pack(pady=5)
+    # ===============================
+    # Buttons (INSIDE SAME SCREEN)
+    # ===============================
+    btn_frame = tk.Frame(win, bg=BG)
+    btn_frame.pack(pady=15)
+
+    tk.Button(
+        btn_frame,
+        text="Add Course",
+        width=18,
+        bg=ACCENT,
+        fg="white",
+        command=lambda: add_course(load_courses)
+    ).grid(row=0, column=0, padx=8)
+
+    tk.Button(
+        btn_frame,
+        text="Edit Selected",
+        width=18,
+        bg=ACCENT,
+        fg="white",
+        command=lambda: edit_selected_course(selected_course, load_courses)
+    ).grid(row=0, column=1, padx=8)
+
+    tk.Button(
+        btn_frame,
+        text="Delete Selected",
+        width=18,
+        bg="#e84118",
+        fg="white",
+        command=lambda: delete_selected_course(selected_course, load_courses)
+    ).grid(row=0, column=2, padx=8)
+
+    tk.Button(
+        btn_frame,
+        text="Academic Terms",
+        width=18,
+        bg=ACCENT,
+        fg="white",
+        command=open_terms
+    ).grid(row=0, column=3, padx=8)
+    
+    
+    
+    
+    
+def add_course(refresh):
+    win = tk.Toplevel()
+    win.title("Add Course")
+    win.geometry("420x350")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Add Course", font=("Arial", 14, "bold"), bg=BG).pack(pady=10)
+
+    fields = {}
+    for lbl in ["Course Name", "Description", "Public Info"]:
+        tk.Label(win, text=lbl, bg=BG).pack()
+        e = tk.Entry(win, width=40)
+        e.pack(pady=5)
+        fields[lbl] = e
+
+    def save():
+        call_sp_non_query(
+            "sp_Admin_CreateCourse",
+            (
+                Session.username,
+                fields["Course Name"].get().strip(),
+                fields["Description"].get().strip() or None,
+                fields["Public Info"].get().strip() or None
+            )
+        )
+        clear_cache()
+        messagebox.showinfo("Success", "Course added successfully")
+        win.destroy()
+        refresh()
+
+    tk.Button(win, text="Save", bg=ACCENT, fg="white", command=save)\
+        .pack(pady=15)
+def edit_selected_course(course, refresh):
+    if not course:
+        messagebox.showwarning("Select Course", "Please select a course first.")
+        return
+
+    win = tk.Toplevel()
+    win.title("Edit Course")
+    win.geometry("420x360")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Edit Course", font=("Arial", 14, "bold"), bg=BG).pack(pady=10)
+
+    e_name = tk.Entry(win, width=40)
+    e_name.insert(0, course["CourseName"])
+    e_name.pack(pady=5)
+
+    e_desc = tk.Entry(win, width=40)
+    e_desc.insert(0, course["Description"] or "")
+    e_desc.pack(pady=5)
+
+    e_info = tk.Entry(win, width=40)
+    e_info.insert(0, course["PublicInfo"] or "")
+    e_info.pack(pady=5)
+
+    def update():
+        call_sp_non_query(
+            "sp_Admin_UpdateCourse",
+            (
+                Session.username,
+                course["CourseID"],
+                e_name.get().strip(),
+                e_desc.get().strip() or None,
+                e_info.get().strip() or None
+            )
+        )
+        clear_cache()
+        messagebox.showinfo("Success", "Course updated successfully")
+        win.destroy()
+        refresh()
+
+    tk.Button(win, text="Update", bg=ACCENT, fg="white", command=update)\
+        .pack(pady=15)
+def delete_selected_course(course, refresh):
+    if not course:
+        messagebox.showwarning("Select Course", "Please select a course first.")
+        return
+
+    if not messagebox.askyesno(
+        "Confirm Delete",
+        f"Delete course '{course['CourseName']}'?"
+    ):
+        return
+
+    call_sp_non_query(
+        "sp_Admin_DeleteCourse",
+        (
+            Session.username,
+            course["CourseID"]
+        )
+    )
+
+    clear_cache()
+    messagebox.showinfo("Deleted", "Course deleted successfully")
+    refresh()
+
+
+# =========================================================
+# ACADEMIC TERMS (calendar, current term, closing a term)
+# =========================================================
+def open_terms():
+    win = tk.Toplevel()
+    win.title("Academic Terms")
+    win.geometry("720x530")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Academic Terms", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+    tk.Label(
+        win,
+        text="Closed (read-only) terms reject grade and attendance changes.\n"
+             "Packing stores a closed term's attendance as compact bitmaps (reopening unpacks it).\n"
+             "TermID = Year * 10 + Season (1 Spring, 2 Summer, 3 Fall).",
+        bg=BG
+    ).pack()
+
+    columns = ("TermID", "TermName", "StartDate", "EndDate", "IsCurrent", "IsReadOnly")
+    tree = ttk.Treeview(win, columns=columns, show="headings", height=9)
+    for key in columns:
+        tree.heading(key, text=key)
+        tree.column(key, width=110, anchor="center")
+    tree.pack(fill="both", expand=True, padx=10, pady=8)
+
+    form = tk.Frame(win, bg=BG)
+    form.pack(pady=4)
+    entries = {}
+    for col, (label, width) in enumerate((("TermID", 8), ("Name", 16), ("Start (YYYY-MM-DD)", 12), ("End", 12))):
+        tk.Label(form, text=label, bg=BG).grid(row=0, column=col, padx=4)
+        entries[label] = tk.Entry(form, width=width)
+        entries[label].grid(row=1, column=col, padx=4)
+
+    def load():
+        try:
+            rows = get_terms(Session.username)
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        tree.delete(*tree.get_children())
+        for r in rows:
+            tree.insert("", "end", iid=str(r["TermID"]), values=(
+                r["TermID"], r["TermName"], r["StartDate"], r["EndDate"],
+                "Yes" if r["IsCurrent"] else "", "Yes" if r["IsReadOnly"] else ""
+            ))
+
+    def selected_term():
+        sel = tree.selection()
+        if not sel:
+            messagebox.showerror("Error", "Select a term", parent=win)
+            return None
+        return int(sel[0])
+
+    def run(action, *args):
+        try:
+            action(Session.username, *args)
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        load()
+
+    def create():
+        try:
+            term_id = int(entries["TermID"].get())
+            start = datetime.strptime(entries["Start (YYYY-MM-DD)"].get().strip(), "%Y-%m-%d").date()
+            end = datetime.strptime(entries["End"].get().strip(), "%Y-%m-%d").date()
+        except ValueError:
+            messagebox.showerror("Error", "TermID must be a number, dates YYYY-MM-DD", parent=win)
+            return
+        run(create_term, term_id, entries["Name"].get().strip(), start, end)
+
+    def make_current():
+        term_id = selected_term()
+        if term_id is not None:
+            run(set_current_term, term_id)
+
+    def set_closed(read_only):
+        term_id = selected_term()
+        if term_id is None:
+            return
+        if read_only and not messagebox.askyesno(
+            "Close Term", f"Close term {term_id}? Its grades and attendance become read-only.", parent=win
+        ):
+            return
+        run(set_read_only, term_id, read_only)
+
+    def pack():
+        term_id = selected_term()
+        if term_id is None:
+            return
+        if not messagebox.askyesno(
+            "Pack Attendance", f"Pack the attendance of term {term_id} into bitmaps?", parent=win
+        ):
+            return
+
+        outcome = {}
+
+        def work():
+            try:
+                outcome["result"] = pack_attendance(Session.username, term_id)
+            except DbError as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        pack_btn.config(state="disabled", text="Packing...")
+
+        def poll():
+            if worker.is_alive():
+                win.after(200, poll)
+                return
+
+            pack_btn.config(state="normal", text="Pack Attendance")
+            if "error" in outcome:
+                messagebox.showerror("Error", _friendly_db_error(outcome["error"]), parent=win)
+                return
+
+            r = outcome["result"]
+            messagebox.showinfo(
+                "Pack Attendance",
+                f"Courses: {r.get('Courses', 0)}\n"
+                f"Records packed: {r.get('RecordsPacked', 0)}\n"
+                f"Bitmaps: {r.get('Bitmaps', 0)}",
+                parent=win
+            )
+
+        win.after(200, poll)
+
+    tk.Button(form, text="Add Term", bg=ACCENT, fg="white", width=12, command=create).grid(row=1, column=4, padx=6)
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(pady=8)
+    tk.Button(buttons, text="Make Current", bg=ACCENT, fg="white", width=14,
+              command=make_current).grid(row=0, column=0, padx=5)
+    tk.Button(buttons, text="Follow Calendar", bg=ACCENT, fg="white", width=14,
+              command=lambda: run(set_current_term, None)).grid(row=0, column=1, padx=5)
+    tk.Button(buttons, text="Close Term", bg="#e84118", fg="white", width=14,
+              command=lambda: set_closed(True)).grid(row=0, column=2, padx=5)
+    tk.Button(buttons, text="Reopen Term", bg=ACCENT, fg="white", width=14,
+              command=lambda: set_closed(False)).grid(row=0, column=3, padx=5)
+    pack_btn = tk.Button(buttons, text="Pack Attendance", bg=ACCENT, fg="white", width=14, command=pack)
+    pack_btn.grid(row=1, column=0, columnspan=4, pady=(6, 0))
+
+    load()
+
+
+# =========================================================
+# ASSIGNMENTS
+# =========================================================
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# =========================================================
+# ASSIGNMENTS (MAIN WINDOW)
+# =========================================================
+def open_assignments():
+    win = tk.Toplevel()
+    win.title("Assignments")
+    win.geometry("520x360")
+    win.configure(bg=BG)
+
+    tk.Label(
+        win, text="Assignments Management",
+        font=("Arial", 16, "bold"), bg=BG
+    ).pack(pady=15)
+
+    btn_frame = tk.Frame(win, bg=BG)
+    btn_frame.pack(pady=10)
+
+    tk.Button(
+        btn_frame, text="Assign / Unassign Instructor",
+        width=30, bg=ACCENT, fg="white",
+        command=open_instructor_assignments
+    ).grid(row=0, column=0, padx=10, pady=8)
+
+    tk.Button(
+        btn_frame, text="Assign / Unassign TA",
+        width=30, bg=ACCENT, fg="white",
+        command=open_ta_assignments
+    ).grid(row=1, column=0, padx=10, pady=8)
+
+    tk.Button(
+        btn_frame, text="Enroll / Remove Student",
+        width=30, bg=ACCENT, fg="white",
+        command=open_enrollment_management
+    ).grid(row=2, column=0, padx=10, pady=8)
+
+    tk.Button(
+        btn_frame, text="Instructor Matrix (Bulk Edit)",
+        width=30, bg="#353b48", fg="white",
+        command=lambda: open_assignment_matrix("INSTRUCTOR")
+    ).grid(row=3, column=0, padx=10, pady=8)
+
+    tk.Button(
+        btn_frame, text="TA Matrix (Bulk Edit)",
+        width=30, bg="#353b48", fg="white",
+        command=lambda: open_assignment_matrix("TA")
+    ).grid(row=4, column=0, padx=10, pady=8)
+
+
+# -----------------------------
+# Helpers
+# -----------------------------
+def _friendly_db_error(e: Exception) -> str:
+    """
+    يحاول يطلع message واضح من DbError بدل الشكل الطويل.
+    """
+    msg = str(e)
+    # غالباً DbError بيكون: "Non-query failed: (... SQL Server]MESSAGE (50000) ...)"
+    # هنحاول نطلع الجزء اللي قبل (50000) لو موجود
+    if "]" in msg:
+        # خدي آخر جزء بعد آخر ]
+        msg2 = msg.split("]")[-1].strip()
+        if msg2:
+            msg = msg2
+    return msg
+
+
+def _load_instructors():
+    rows = call_sp_rows("sp_Admin_GetInstructors", (Session.username,))
+    # E9 بيرجع InstructorID, FullName
+    return [(r["InstructorID"], r["FullName"]) for r in rows]
+
+
+def _load_tas():
+    rows = call_sp_rows("sp_Admin_GetTAs", (Session.username,))
+    # E10 بيرجع Username
+    return [r["Username"] for r in rows]
+
+
+def _combo_set_values(combo: ttk.Combobox, values):
+    combo["values"] = values
+    if values:
+        combo.current(0)
+
+
+# =========================================================
+# Instructor Assignments Window
+# =========================================================
+def open_instructor_assignments():
+    win = tk.Toplevel()
+    win.title("Instructor Assignments")
+    win.geometry("760x520")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Assign / Unassign Instructor", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+
+    # Top form
+    top = tk.Frame(win, bg=BG)
+    top.pack(fill="x", padx=12, pady=6)
+
+    tk.Label(top, text="Instructor", bg=BG).grid(row=0, column=0, sticky="w")
+    cb_instructor = ttk.Combobox(top, state="readonly", width=35)
+    cb_instructor.grid(row=1, column=0, padx=(0, 14), pady=4)
+
+    tk.Label(top, text="Course (type to search)", bg=BG).grid(row=0, column=1, sticky="w")
+    cb_course = SearchPicker(top, lambda q: search_courses(Session.username, q), width=35, rows=4, bg=BG)
+    cb_course.grid(row=1, column=1, pady=4, sticky="n")
+
+    # Table
+    table_frame = tk.Frame(win, bg=BG)
+    table_frame.pack(fill="both", expand=True, padx=12, pady=10)
+
+    cols = ("InstructorID", "InstructorName", "CourseID", "CourseName")
+    tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=12)
+
+    for c in cols:
+        tree.heading(c, text=c)
+        tree.column(c, width=160 if c in ("InstructorName", "CourseName") else 110, anchor="center")
+
+    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=vsb.set)
+
+    tree.grid(row=0, column=0, sticky="nsew")
+    vsb.grid(row=0, column=1, sticky="ns")
+
+    table_frame.grid_rowconfigure(0, weight=1)
+    table_frame.grid_columnconfigure(0, weight=1)
+
+    # Buttons
+    btns = tk.Frame(win, bg=BG)
+    btns.pack(pady=8)
+
+    def load_assignments():
+        try:
+            for item in tree.get_children():
+                tree.delete(item)
+
+            assignments = call_sp_rows("sp_Admin_GetInstructorAssignments", (Session.username,))
+            for a in assignments:
+                tree.insert(
+                    "", "end",
+                    values=(a["InstructorID"], a["InstructorName"], a["CourseID"], a["CourseName"])
+                )
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+
+    def refresh():
+        # Load dropdowns
+        try:
+            instructors = _load_instructors()
+            _combo_set_values(cb_instructor, [f"{iid} - {name}" for iid, name in instructors])
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+            return
+
+        # Load table
+        load_assignments()
+
+    def assign():
+        try:
+            if not cb_instructor.get() or cb_course.get() is None:
+                messagebox.showerror("Error", "Please select instructor and course.")
+                return
+
+            instructor_id = int(cb_instructor.get().split("-")[0].strip())
+            course_id = cb_course.get()
+
+            call_sp_non_query(
+                "sp_Admin_AssignInstructorToCourse",
+                (Session.username, instructor_id, course_id)
+            )
+            messagebox.showinfo("Success", "Instructor assigned successfully.")
+            refresh()
+
+        except DbError as e:
+            # هنا بالذات لو already assigned هتظهر كرسالة بدل crash
+            messagebox.showerror("Error", _friendly_db_error(e))
+        except ValueError:
+            messagebox.showerror("Error", "Invalid selection values.")
+
+    def unassign_selected():
+        try:
+            sel = tree.selection()
+            if not sel:
+                messagebox.showerror("Error", "Select an assignment row first.")
+                return
+
+            vals = tree.item(sel[0], "values")
+            instructor_id = int(vals[0])
+            course_id = int(vals[2])
+
+            call_sp_non_query(
+                "sp_Admin_UnassignInstructorFromCourse",
+                (Session.username, instructor_id, course_id)
+            )
+            messagebox.showinfo("Success", "Instructor unassigned successfully.")
+            refresh()
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    tk.Button(btns, text="Assign", bg=ACCENT, fg="white", width=16, command=assign).grid(row=0, column=0, padx=8)
+    tk.Button(btns, text="Unassign (Selected)", bg="#e84118", fg="white", width=16, command=unassign_selected).grid(row=0, column=1, padx=8)
+    tk.Button(btns, text="Refresh", bg="#353b48", fg="white", width=16, command=refresh).grid(row=0, column=2, padx=8)
+
+    refresh()
+
+    # Auto-refresh the table when assignments change elsewhere
+    watch_data_versions(Session.username, win, ["INSTRUCTOR_COURSE", "COURSE", "INSTRUCTOR"], load_assignments)
+
+
+# =========================================================
+# TA Assignments Window
+# =========================================================
+def open_ta_assignments():
+    win = tk.Toplevel()
+    win.title("TA Assignments")
+    win.geometry("720x520")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Assign / Unassign TA", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+
+    top = tk.Frame(win, bg=BG)
+    top.pack(fill="x", padx=12, pady=6)
+
+    tk.Label(top, text="TA Username", bg=BG).grid(row=0, column=0, sticky="w")
+    cb_ta = ttk.Combobox(top, state="readonly", width=35)
+    cb_ta.grid(row=1, column=0, padx=(0, 14), pady=4)
+
+    tk.Label(top, text="Course (type to search)", bg=BG).grid(row=0, column=1, sticky="w")
+    cb_course = SearchPicker(top, lambda q: search_courses(Session.username, q), width=35, rows=4, bg=BG)
+    cb_course.grid(row=1, column=1, pady=4, sticky="n")
+
+    table_frame = tk.Frame(win, bg=BG)
+    table_frame.pack(fill="both", expand=True, padx=12, pady=10)
+
+    cols = ("TAUsername", "CourseID", "CourseName")
+    tree = ttk.Treeview(table_frame, columns=cols, show="headings", height=12)
+    for c in cols:
+        tree.heading(c, text=c)
+        tree.column(c, width=220 if c in ("TAUsername", "CourseName") else 110, anchor="center")
+
+    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=vsb.set)
+
+    tree.grid(row=0, column=0, sticky="nsew")
+    vsb.grid(row=0, column=1, sticky="ns")
+    table_frame.grid_rowconfigure(0, weight=1)
+    table_frame.grid_columnconfigure(0, weight=1)
+
+    btns = tk.Frame(win, bg=BG)
+    btns.pack(pady=8)
+
+    def refresh():
+        try:
+            tas = _load_tas()
+            _combo_set_values(cb_ta, tas)
+
+            for item in tree.get_children():
+                tree.delete(item)
+
+            assignments = call_sp_rows("sp_Admin_GetTAAssignments", (Session.username,))
+            for a in assignments:
+                tree.insert("", "end", values=(a["TAUsername"], a["CourseID"], a["CourseName"]))
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+
+    def assign():
+        try:
+            if not cb_ta.get() or cb_course.get() is None:
+                messagebox.showerror("Error", "Please select TA and course.")
+                return
+
+            ta_username = cb_ta.get().strip()
+            course_id = cb_course.get()
+
+            call_sp_non_query(
+                "sp_Admin_AssignTAtoCourse",
+                (Session.username, ta_username, course_id)
+            )
+            messagebox.showinfo("Success", "TA assigned successfully.")
+            refresh()
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+        except ValueError:
+            messagebox.showerror("Error", "Invalid course selection.")
+
+    def unassign_selected():
+        try:
+            sel = tree.selection()
+            if not sel:
+                messagebox.showerror("Error", "Select an assignment row first.")
+                return
+
+            vals = tree.item(sel[0], "values")
+            ta_username = str(vals[0])
+            course_id = int(vals[1])
+
+            call_sp_non_query(
+                "sp_Admin_UnassignTAFromCourse",
+                (Session.username, ta_username, course_id)
+            )
+            messagebox.showinfo("Success", "TA unassigned successfully.")
+            refresh()
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    tk.Button(btns, text="Assign", bg=ACCENT, fg="white", width=16, command=assign).grid(row=0, column=0, padx=8)
+    tk.Button(btns, text="Unassign (Selected)", bg="#e84118", fg="white", width=16, command=unassign_selected).grid(row=0, column=1, padx=8)
+    tk.Button(btns, text="Refresh", bg="#353b48", fg="white", width=16, command=refresh).grid(row=0, column=2, padx=8)
+
+    refresh()
+
+
+# =========================================================
+# Assignment Matrix Window (people x courses)
+# =========================================================
+MARK_ON = "\u25a0"        # assigned
+MARK_ADD = "+"             # pending assign
+MARK_REMOVE = "\u2212"     # pending unassign
+
+
+def open_assignment_matrix(kind):
+    matrix = AssignmentMatrix(Session.username, kind)
+    title = "Instructor" if kind == "INSTRUCTOR" else "TA"
+
+    win = tk.Toplevel()
+    win.title(f"{title} Assignment Matrix")
+    win.geometry("980x560")
+    win.configure(bg=BG)
+
+    tk.Label(win, text=f"{title} x Course Matrix", font=("Arial", 16, "bold"), bg=BG).pack(pady=(10, 2))
+    tk.Label(
+        win, bg=BG, fg="#353b48",
+        text=f"Click a cell to toggle.  {MARK_ON} assigned   {MARK_ADD} to assign   {MARK_REMOVE} to unassign"
+    ).pack()
+
+    table_frame = tk.Frame(win, bg=BG)
+    table_frame.pack(fill="both", expand=True, padx=12, pady=8)
+
+    tree = ttk.Treeview(table_frame, show="headings", selectmode="none")
+    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    hsb = ttk.Scrollbar(table_frame, orient="horizontal", command=tree.xview)
+    tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+
+    tree.grid(row=0, column=0, sticky="nsew")
+    vsb.grid(row=0, column=1, sticky="ns")
+    hsb.grid(row=1, column=0, sticky="ew")
+    table_frame.grid_rowconfigure(0, weight=1)
+    table_frame.grid_columnconfigure(0, weight=1)
+
+    btns = tk.Frame(win, bg=BG)
+    btns.pack(pady=8)
+
+    def cell_text(i, j):
+        if matrix.is_dirty(i, j):
+            return MARK_ADD if matrix.is_set(i, j) else MARK_REMOVE
+        return MARK_ON if matrix.is_set(i, j) else ""
+
+    def row_values(i):
+        key, label = matrix.people[i]
+        name = label if kind == "TA" else f"{key} - {label}"
+        return [name, matrix.row_count(i)] + [cell_text(i, j) for j in range(len(matrix.courses))]
+
+    def update_status():
+        n = matrix.dirty_count()
+        save_btn.config(text=f"Save ({n} changes)", state="normal" if n else "disabled")
+        discard_btn.config(state="normal" if n else "disabled")
+
+    def render():
+        cols = ["Person", "Count"] + [f"c{cid}" for cid, _name in matrix.courses]
+        tree.delete(*tree.get_children())
+        tree["columns"] = cols
+
+        tree.heading("Person", text=title)
+        tree.column("Person", width=200, anchor="w", stretch=False)
+        tree.heading("Count", text="#")
+        tree.column("Count", width=40, anchor="center", stretch=False)
+        for j, (cid, cname) in enumerate(matrix.courses):
+            tree.heading(f"c{cid}", text=f"{cid} {cname[:10]}",
+                         command=lambda j=j: toggle_column(j))
+            tree.column(f"c{cid}", width=90, anchor="center", stretch=False)
+
+        for i in range(len(matrix.people)):
+            tree.insert("", "end", iid=str(i), values=row_values(i))
+        update_status()
+
+    def refresh_row(i):
+        tree.item(str(i), values=row_values(i))
+
+    def on_click(event):
+        if tree.identify_region(event.x, event.y) != "cell":
+            return
+        item = tree.identify_row(event.y)
+        col = tree.identify_column(event.x)      # "#1" based
+        if not item or not col:
+            return
+        i = int(item)
+        j = int(col[1:]) - 3
+        if j < 0:
+            # Person / count column toggles the whole row
+            matrix.set_row(i, matrix.row_count(i) < len(matrix.courses))
+        else:
+            matrix.toggle(i, j)
+        refresh_row(i)
+        update_status()
+
+    def toggle_column(j):
+        assign = not all(matrix.is_set(i, j) for i in range(len(matrix.people)))
+        matrix.set_column(j, assign)
+        for i in range(len(matrix.people)):
+            refresh_row(i)
+        update_status()
+
+    def load():
+        if matrix.dirty_count() and not messagebox.askyesno(
+            "Reload", "Discard unsaved changes and reload?", parent=win
+        ):
+            return
+        try:
+            matrix.load()
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        render()
+
+    def save():
+        try:
+            result = matrix.save()
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        for i in range(len(matrix.people)):
+            refresh_row(i)
+        update_status()
+        messagebox.showinfo(
+            "Saved",
+            f"Assigned: {result['Assigned']}\nUnassigned: {result['Unassigned']}",
+            parent=win
+        )
+
+    def discard():
+        matrix.discard()
+        for i in range(len(matrix.people)):
+            refresh_row(i)
+        update_status()
+
+    def on_close():
+        if matrix.dirty_count() and not messagebox.askyesno(
+            "Unsaved Changes", "Close and discard unsaved changes?", parent=win
+        ):
+            return
+        win.destroy()
+
+    save_btn = tk.Button(btns, text="Save", bg=ACCENT, fg="white", width=18, command=save)
+    save_btn.grid(row=0, column=0, padx=8)
+    discard_btn = tk.Button(btns, text="Discard", bg="#e84118", fg="white", width=16, command=discard)
+    discard_btn.grid(row=0, column=1, padx=8)
+    tk.Button(btns, text="Reload", bg="#353b48", fg="white", width=16, command=load).grid(row=0, column=2, padx=8)
+
+    tree.bind("<Button-1>", on_click)
+    win.protocol("WM_DELETE_WINDOW", on_close)
+
+    load()
+
+
+# =========================================================
+# Enrollment Management Window (Dropdowns)
+# =========================================================
+def open_enrollment_management():
+    win = tk.Toplevel()
+    win.title("Enrollment Management")
+    win.geometry("680x460")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Enroll / Remove Student", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+
+    box = tk.Frame(win, bg=BG)
+    box.pack(padx=12, pady=10, fill="x")
+
+    tk.Label(box, text="Student (ID, name or email)", bg=BG).grid(row=0, column=0, sticky="w")
+    cb_student = SearchPicker(box, lambda q: search_students(Session.username, q), width=40, rows=5, bg=BG)
+    cb_student.grid(row=1, column=0, padx=(0, 14), pady=6, sticky="n")
+
+    tk.Label(box, text="Course (ID or name)", bg=BG).grid(row=0, column=1, sticky="w")
+    cb_course = SearchPicker(box, lambda q: search_courses(Session.username, q), width=40, rows=5, bg=BG)
+    cb_course.grid(row=1, column=1, pady=6, sticky="n")
+
+    btns = tk.Frame(win, bg=BG)
+    btns.pack(pady=14)
+
+    def enroll():
+        try:
+            if cb_student.get() is None or cb_course.get() is None:
+                messagebox.showerror("Error", "Please select student and course.")
+                return
+
+            student_id = cb_student.get()
+            course_id = cb_course.get()
+
+            call_sp_non_query(
+                "sp_Admin_EnrollStudentInCourse",
+                (Session.username, student_id, course_id)
+            )
+            messagebox.showinfo("Success", "Student enrolled successfully.")
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+        except ValueError:
+            messagebox.showerror("Error", "Invalid selection values.")
+
+    def remove():
+        try:
+            if cb_student.get() is None or cb_course.get() is None:
+                messagebox.showerror("Error", "Please select student and course.")
+                return
+
+            student_id = cb_student.get()
+            course_id = cb_course.get()
+
+            call_sp_non_query(
+                "sp_Admin_RemoveEnrollment",
+                (Session.username, student_id, course_id)
+            )
+            messagebox.showinfo("Success", "Enrollment removed successfully.")
+
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e))
+        except ValueError:
+            messagebox.showerror("Error", "Invalid selection values.")
+
+    # ---------------------------------------------
+    # Bulk import (CSV: StudentID,CourseID)
+    # ---------------------------------------------
+    status = tk.Label(win, text="", bg=BG, fg="#353b48")
+
+    def import_csv():
+        path = filedialog.askopenfilename(
+            parent=win,
+            title="Enrollment Roster (CSV: StudentID,CourseID)",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        remove_missing = messagebox.askyesnocancel(
+            "Import Mode",
+            "Replace the rosters of the courses in this file?\n\n"
+            "Yes: also remove enrollments not listed in the file\n"
+            "No: only add new enrollments",
+            parent=win
+        )
+        if remove_missing is None:
+            return
+
+        outcome = {}
+
+        def work():
+            try:
+                outcome["result"] = import_enrollments(
+                    Session.username, path, remove_missing,
+                    progress=lambda n: outcome.__setitem__("staged", n)
+                )
+            except (DbError, OSError, ValueError) as e:
+                outcome["error"] = e
+
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        import_btn.config(state="disabled")
+
+        def poll():
+            if worker.is_alive():
+                status.config(text=f"Importing... {outcome.get('staged', 0)} rows staged")
+                win.after(200, poll)
+                return
+
+            import_btn.config(state="normal")
+            status.config(text="")
+
+            if "error" in outcome:
+                e = outcome["error"]
+                messagebox.showerror("Import Failed", _friendly_db_error(e) if isinstance(e, DbError) else str(e), parent=win)
+                return
+
+            r = outcome["result"]
+            rejected = r["rejected"]
+            messagebox.showinfo(
+                "Import Complete",
+                f"Rows staged: {r['staged']}\n"
+                f"Enrolled: {r['enrolled']}\n"
+                f"Removed: {r['removed']}\n"
+                f"Batches: {r['batches']}\n"
+                f"Rejected: {len(rejected)}",
+                parent=win
+            )
+
+            if rejected and messagebox.askyesno("Rejected Rows", "Save the rejected rows report?", parent=win):
+                out = filedialog.asksaveasfilename(
+                    parent=win,
+                    defaultextension=".csv",
+                    initialfile="enrollment_rejected.csv",
+                    filetypes=[("CSV files", "*.csv")]
+                )
+                if out:
+                    try:
+                        write_rejected_report(rejected, out)
+                    except OSError as e:
+                        messagebox.showerror("Error", str(e), parent=win)
+
+        poll()
+
+    def clear():
+        clear_cache()
+        cb_student.clear()
+        cb_course.clear()
+
+    tk.Button(btns, text="Enroll", bg=ACCENT, fg="white", width=18, command=enroll).grid(row=0, column=0, padx=10)
+    tk.Button(btns, text="Remove", bg="#e84118", fg="white", width=18, command=remove).grid(row=0, column=1, padx=10)
+    tk.Button(btns, text="Clear", bg="#353b48", fg="white", width=18, command=clear).grid(row=0, column=2, padx=10)
+    import_btn = tk.Button(btns, text="Import CSV...", bg="#44bd32", fg="white", width=18, command=import_csv)
+    import_btn.grid(row=1, column=0, columnspan=3, pady=(12, 0))
+    status.pack()
+
+
+# =========================================================
+# ROLE REQUESTS
+# =========================================================
+def open_role_requests():
+    win = tk.Toplevel()
+    win.title("Role Requests")
+    win.geometry("900x520")
+    win.configure(bg=BG)
+
+    page_size = 200
+    state = {"after": 0, "stack": [], "last": 0}
+
+    # ---------------------------------------------
+    # Filters
+    # ---------------------------------------------
+    top = tk.Frame(win, bg=BG)
+    top.pack(fill="x", padx=12, pady=8)
+
+    tk.Label(top, text="Status", bg=BG).grid(row=0, column=0, sticky="w")
+    cb_status = ttk.Combobox(top, state="readonly", width=12, values=["Pending", "Approved", "Denied"])
+    cb_status.current(0)
+    cb_status.grid(row=1, column=0, padx=(0, 10))
+
+    tk.Label(top, text="Requested Role", bg=BG).grid(row=0, column=1, sticky="w")
+    cb_role = ttk.Combobox(top, state="readonly", width=12, values=["(any)", "TA", "Instructor"])
+    cb_role.current(0)
+    cb_role.grid(row=1, column=1, padx=(0, 10))
+
+    tk.Label(top, text="Username starts with", bg=BG).grid(row=0, column=2, sticky="w")
+    ent_prefix = tk.Entry(top, width=20)
+    ent_prefix.grid(row=1, column=2, padx=(0, 10))
+
+    # ---------------------------------------------
+    # Queue
+    # ---------------------------------------------
+    table_frame = tk.Frame(win, bg=BG)
+    table_frame.pack(fill="both", expand=True, padx=12)
+
+    cols = ("RequestID", "Username", "CurrentRole", "RequestedRole", "DateSubmitted", "Reason")
+    tree = ttk.Treeview(table_frame, columns=cols, show="headings", selectmode="extended")
+    for c in cols:
+        tree.heading(c, text=c)
+        tree.column(c, width=260 if c == "Reason" else 110, anchor="w" if c == "Reason" else "center")
+
+    vsb = ttk.Scrollbar(table_frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=vsb.set)
+    tree.grid(row=0, column=0, sticky="nsew")
+    vsb.grid(row=0, column=1, sticky="ns")
+    table_frame.grid_rowconfigure(0, weight=1)
+    table_frame.grid_columnconfigure(0, weight=1)
+
+    status = tk.Label(win, text="", bg=BG, fg="#353b48")
+    status.pack(pady=(4, 0))
+
+    btns = tk.Frame(win, bg=BG)
+    btns.pack(pady=8)
+
+    # ---------------------------------------------
+    # Loading (keyset paging)
+    # ---------------------------------------------
+    def load_page(after):
+        role = cb_role.get()
+        try:
+            reqs = call_sp_rows(
+                "sp_RoleRequest_GetPage",
+                (
+                    Session.username,
+                    cb_status.get(),
+                    None if role == "(any)" else role,
+                    ent_prefix.get().strip() or None,
+                    after,
+                    page_size,
+                )
+            )
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+
+        state["after"] = after
+        state["last"] = reqs[-1]["RequestID"] if reqs else after
+
+        tree.delete(*tree.get_children())
+        for req in reqs:
+            tree.insert("", "end", iid=str(req["RequestID"]), values=(
+                req["RequestID"], req["Username"], req["CurrentRole"], req["RequestedRole"],
+                req["DateSubmitted"].strftime("%Y-%m-%d %H:%M") if req["DateSubmitted"] else "",
+                req["Reason"] or "",
+            ))
+
+        page = len(state["stack"]) + 1
+        status.config(text=f"Page {page}  \u2022  {len(reqs)} request(s)")
+        prev_btn.config(state="normal" if state["stack"] else "disabled")
+        next_btn.config(state="normal" if len(reqs) == page_size else "disabled")
+        pending = cb_status.get() == "Pending"
+        approve_btn.config(state="normal" if pending else "disabled")
+        deny_btn.config(state="normal" if pending else "disabled")
+
+    def apply_filters(event=None):
+        state["stack"].clear()
+        load_page(0)
+
+    def next_page():
+        state["stack"].append(state["after"])
+        load_page(state["last"])
+
+    def prev_page():
+        if state["stack"]:
+            load_page(state["stack"].pop())
+
+    def reload_current():
+        load_page(state["after"])
+
+    # ---------------------------------------------
+    # Bulk decisions
+    # ---------------------------------------------
+    def decide(decision):
+        ids = [int(i) for i in tree.selection()]
+        if not ids:
+            messagebox.showerror("Error", "Select one or more requests first.", parent=win)
+            return
+        if not messagebox.askyesno(
+            "Confirm", f"{decision} {len(ids)} selected request(s)?", parent=win
+        ):
+            return
+
+        try:
+            # The procedure commits its own transaction
+            rejected = call_sp_rows(
+                "sp_RoleRequest_DecideBulk",
+                (Session.username, decision, [(i,) for i in ids]),
+                autocommit=True
+            )
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+
+        msg = f"{'Approved' if decision == 'Approve' else 'Denied'}: {len(ids) - len(rejected)}"
+        if rejected:
+            lines = [f"#{r['RequestID']} {r['Username'] or ''}: {r['Reason']}" for r in rejected[:15]]
+            more = f"\n... and {len(rejected) - 15} more" if len(rejected) > 15 else ""
+            msg += f"\nSkipped: {len(rejected)}\n\n" + "\n".join(lines) + more
+        messagebox.showinfo("Role Requests", msg, parent=win)
+        reload_current()
+
+    def select_all():
+        tree.selection_set(tree.get_children())
+
+    tk.Button(top, text="Apply", bg=ACCENT, fg="white", width=10, command=apply_filters)\
+        .grid(row=1, column=3, padx=(0, 10))
+    ent_prefix.bind("<Return>", apply_filters)
+    cb_status.bind("<<ComboboxSelected>>", apply_filters)
+    cb_role.bind("<<ComboboxSelected>>", apply_filters)
+
+    prev_btn = tk.Button(btns, text="< Prev", bg="#353b48", fg="white", width=10, command=prev_page)
+    prev_btn.grid(row=0, column=0, padx=5)
+    next_btn = tk.Button(btns, text="Next >", bg="#353b48", fg="white", width=10, command=next_page)
+    next_btn.grid(row=0, column=1, padx=5)
+    tk.Button(btns, text="Select Page", bg="#353b48", fg="white", width=12, command=select_all)\
+        .grid(row=0, column=2, padx=(20, 5))
+    approve_btn = tk.Button(btns, text="Approve Selected", bg="#44bd32", fg="white", width=16,
+                            command=lambda: decide("Approve"))
+    approve_btn.grid(row=0, column=3, padx=5)
+    deny_btn = tk.Button(btns, text="Deny Selected", bg="#e84118", fg="white", width=16,
+                         command=lambda: decide("Deny"))
+    deny_btn.grid(row=0, column=4, padx=5)
+
+    load_page(0)
+
+    # New / decided requests show up without pressing anything
+    watch_data_versions(Session.username, win, ["ROLE_REQUESTS"], reload_current)
+
+
+# =========================================================
+# LOGS (READ ONLY)
+# =========================================================
+def open_logs():
+    win = tk.Toplevel()
+    win.title("System Logs")
+    win.geometry("900x450")
+    win.configure(bg=BG)
+
+    logs = execute_query("SELECT * FROM vw_Admin_Logs")
+
+    # EventCount > 1: aggregated read counter (one row per user / action / minute)
+    headers = list(logs[0].keys()) if logs else []
+    view = _build_grid(win, [(h, h) for h in headers], width=160, height=16)
+    view.set_rows(logs)
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(pady=6)
+    tk.Button(buttons, text="Entity History", bg=ACCENT, fg="white", width=16,
+              command=open_entity_history).grid(row=0, column=0, padx=5)
+    tk.Button(buttons, text="Audit Levels", bg=ACCENT, fg="white", width=16,
+              command=open_audit_policy).grid(row=0, column=1, padx=5)
+
+
+# =========================================================
+# SECURITY ALERTS (incremental detector over LOGS)
+# =========================================================
+ALERT_POLL_MS = 5000
+
+
+def open_security_alerts():
+    win = tk.Toplevel()
+    win.title("Security Alerts")
+    win.geometry("1000x520")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Security Alerts", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+    status = tk.Label(win, text="Starting...", bg=BG)
+    status.pack()
+
+    monitor = get_monitor(Session.username)
+    columns = [
+        ("time", "Time"), ("severity", "Severity"), ("rule", "Rule"),
+        ("username", "User"), ("count", "Count"), ("message", "Message"),
+    ]
+    view = _build_grid(win, columns, width=130, height=14)
+    view.tree.column("message", width=360, anchor="w")
+
+    # Alerts from earlier sessions first; the detector adds new ones on top
+    history = monitor.load_alert_history()
+    state = {"worker": None, "outcome": {}, "after": None}
+
+    def show():
+        # History also holds this session's alerts once they are written
+        seen = set()
+        alerts = []
+        for a in list(monitor.alerts) + history:
+            key = (a.get("rule"), a.get("log_id"), a.get("username"))
+            if key not in seen:
+                seen.add(key)
+                alerts.append(a)
+        alerts.sort(key=lambda a: a.get("time") or "", reverse=True)
+        view.set_rows(alerts)
+        status.config(
+            text=f"Watching LOGS · last LogID {monitor.high_water} · "
+                 f"{monitor.events_seen} events checked · {len(alerts)} alerts"
+        )
+
+    def check():
+        if state["worker"] is not None:
+            return
+        if state["after"] is not None:
+            win.after_cancel(state["after"])
+            state["after"] = None
+        outcome = state["outcome"] = {}
+
+        def work():
+            try:
+                outcome["result"] = monitor.poll()
+            except Exception as e:
+                outcome["error"] = e
+
+        state["worker"] = threading.Thread(target=work, daemon=True)
+        state["worker"].start()
+        win.after(200, wait)
+
+    def wait():
+        if not win.winfo_exists():
+            return
+        if state["worker"].is_alive():
+            win.after(200, wait)
+            return
+        state["worker"] = None
+        outcome = state["outcome"]
+
+        if "error" in outcome:
+            e = outcome["error"]
+            status.config(text=f"Detector paused: {_friendly_db_error(e) if isinstance(e, DbError) else e}")
+        else:
+            if outcome["result"]:
+                win.bell()
+            show()
+        state["after"] = win.after(ALERT_POLL_MS, check)
+
+    def on_close():
+        if state["after"] is not None:
+            win.after_cancel(state["after"])
+        win.destroy()
+
+    tk.Button(win, text="Check Now", bg=ACCENT, fg="white", width=14, command=check).pack(pady=6)
+    win.protocol("WM_DELETE_WINDOW", on_close)
+
+    show()
+    check()
+
+
+# =========================================================
+# ENTITY HISTORY (who touched a student / course / ...)
+# =========================================================
+ENTITY_TYPES = ["STUDENT", "COURSE", "INSTRUCTOR", "TA", "ATTENDANCE", "ROLE_REQUEST"]
+
+
+def open_entity_history():
+    win = tk.Toplevel()
+    win.title("Entity History")
+    win.geometry("1000x520")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Entity Access History", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+
+    form = tk.Frame(win, bg=BG)
+    form.pack(pady=5)
+    tk.Label(form, text="Entity", bg=BG).grid(row=0, column=0, padx=4)
+    type_cb = ttk.Combobox(form, values=ENTITY_TYPES, state="readonly", width=14)
+    type_cb.current(0)
+    type_cb.grid(row=0, column=1, padx=4)
+    tk.Label(form, text="ID", bg=BG).grid(row=0, column=2, padx=4)
+    id_entry = tk.Entry(form, width=12)
+    id_entry.grid(row=0, column=3, padx=4)
+    scope_var = tk.IntVar(value=1)
+    tk.Checkbutton(form, text="Include course-wide reads", variable=scope_var, bg=BG).grid(row=0, column=4, padx=4)
+
+    columns = ["LogID", "LogTime", "Username", "Action", "Scope", "EventCount", "CourseID", "Details"]
+    view = _build_grid(win, [(c, c) for c in columns], width=115, height=14)
+
+    def load():
+        entity_id = id_entry.get().strip()
+        if not entity_id.isdigit():
+            messagebox.showerror("Error", "Enter a numeric ID", parent=win)
+            return
+        try:
+            rows = call_sp_rows(
+                "sp_Admin_GetEntityHistory",
+                (Session.username, type_cb.get(), int(entity_id), None, None, scope_var.get())
+            )
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        view.set_rows(rows)
+
+    tk.Button(form, text="Search", bg=ACCENT, fg="white", width=10, command=load).grid(row=0, column=5, padx=6)
+    id_entry.bind("<Return>", lambda _e: load())
+
+
+# =========================================================
+# AUDIT POLICY (itemized vs aggregated per action class)
+# =========================================================
+AUDIT_LEVELS = ["ITEMIZED", "AGGREGATED"]
+
+
+def open_audit_policy():
+    win = tk.Toplevel()
+    win.title("Audit Levels")
+    win.geometry("560x460")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Audit Levels", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+    tk.Label(
+        win,
+        text="Action patterns use SQL LIKE syntax; the longest match wins.\n"
+             "Unmatched actions are itemized. AGGREGATED = counted per user / minute.",
+        bg=BG
+    ).pack()
+
+    tree = ttk.Treeview(win, columns=("ActionPattern", "AuditLevel", "UpdatedAt"), show="headings", height=8)
+    for key, width in (("ActionPattern", 200), ("AuditLevel", 120), ("UpdatedAt", 160)):
+        tree.heading(key, text=key)
+        tree.column(key, width=width, anchor="center")
+    tree.pack(fill="both", expand=True, padx=10, pady=8)
+
+    form = tk.Frame(win, bg=BG)
+    form.pack(pady=5)
+    tk.Label(form, text="Pattern", bg=BG).grid(row=0, column=0, padx=4)
+    pattern_entry = tk.Entry(form, width=28)
+    pattern_entry.grid(row=0, column=1, padx=4)
+    level_cb = ttk.Combobox(form, values=AUDIT_LEVELS, state="readonly", width=14)
+    level_cb.grid(row=0, column=2, padx=4)
+
+    def load():
+        try:
+            rows = call_sp_rows("sp_Admin_GetAuditPolicy", (Session.username,))
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        tree.delete(*tree.get_children())
+        for r in rows:
+            tree.insert("", "end", values=(r["ActionPattern"], r["AuditLevel"], r["UpdatedAt"]))
+
+    def on_select(_event=None):
+        sel = tree.selection()
+        if sel:
+            pattern, level, _updated = tree.item(sel[0], "values")
+            pattern_entry.delete(0, "end")
+            pattern_entry.insert(0, pattern)
+            level_cb.set(level)
+
+    def apply(level):
+        pattern = pattern_entry.get().strip()
+        if not pattern:
+            messagebox.showerror("Error", "Enter an action pattern", parent=win)
+            return
+        try:
+            call_sp_non_query("sp_Admin_SetAuditLevel", (Session.username, pattern, level))
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        load()
+
+    def save():
+        if not level_cb.get():
+            messagebox.showerror("Error", "Select a level", parent=win)
+            return
+        apply(level_cb.get())
+
+    tree.bind("<<TreeviewSelect>>", on_select)
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(pady=8)
+    tk.Button(buttons, text="Save Rule", bg=ACCENT, fg="white", width=14, command=save).grid(row=0, column=0, padx=5)
+    tk.Button(buttons, text="Remove Rule", bg=ACCENT, fg="white", width=14,
+              command=lambda: apply(None)).grid(row=0, column=1, padx=5)
+
+    load()
+
+
+# =========================================================
+# EXPORT (chunked, resumable .csv.gz; runs off the Tk thread)
+# =========================================================
+EXPORT_KINDS = {"Grades": "grades", "Attendance": "attendance"}
+
+
+def open_export():
+    win = tk.Toplevel()
+    win.title("Export Data")
+    win.geometry("520x300")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Export Grades / Attendance", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+
+    form = tk.Frame(win, bg=BG)
+    form.pack(pady=4)
+    tk.Label(form, text="Data", bg=BG).grid(row=0, column=0, sticky="w")
+    kind_cb = ttk.Combobox(form, values=list(EXPORT_KINDS), state="readonly", width=20)
+    kind_cb.current(0)
+    kind_cb.grid(row=0, column=1, padx=6, pady=3, sticky="w")
+
+    tk.Label(form, text="File", bg=BG).grid(row=1, column=0, sticky="w")
+    path_var = tk.StringVar()
+    tk.Entry(form, textvariable=path_var, width=36, state="readonly").grid(row=1, column=1, padx=6, pady=3)
+
+    bar = ttk.Progressbar(win, length=440, mode="determinate", maximum=1000)
+    bar.pack(pady=10)
+    status = tk.Label(win, text="Choose a file", bg=BG)
+    status.pack()
+
+    state = {"worker": None, "cancel": None, "outcome": {}}
+
+    def kind():
+        return EXPORT_KINDS[kind_cb.get()]
+
+    def describe():
+        path = path_var.get()
+        if not path:
+            return
+        saved = read_progress(path, kind())
+        if saved:
+            status.config(text=f"Interrupted export found: {saved['rows']} rows written, resumes after key {saved['last_key']}")
+            start_btn.config(text="Resume")
+        else:
+            status.config(text="Ready")
+            start_btn.config(text="Start")
+
+    def choose():
+        path = filedialog.asksaveasfilename(
+            parent=win,
+            title="Export to",
+            defaultextension=".csv.gz",
+            initialfile=f"{kind()}_export.csv.gz",
+            filetypes=[("Gzip CSV", "*.csv.gz")],
+            confirmoverwrite=False
+        )
+        if path:
+            path_var.set(path)
+            describe()
+
+    def start():
+        if state["worker"] is not None:
+            return
+        path = path_var.get()
+        if not path:
+            messagebox.showerror("Error", "Choose a file first", parent=win)
+            return
+        if os.path.exists(path) and not read_progress(path, kind()):
+            if not messagebox.askyesno("Overwrite", "File exists. Overwrite it?", parent=win):
+                return
+
+        what = kind()
+        cancel = state["cancel"] = threading.Event()
+        outcome = state["outcome"] = {"rows": 0, "last_key": 0, "max_key": 0}
+
+        def on_progress(rows, last_key, max_key):
+            outcome.update(rows=rows, last_key=last_key, max_key=max_key)
+
+        def work():
+            try:
+                outcome["result"] = export(Session.username, what, path, progress=on_progress, cancel=cancel)
+            except Exception as e:
+                outcome["error"] = e
+
+        state["worker"] = threading.Thread(target=work, daemon=True)
+        state["worker"].start()
+        start_btn.config(state="disabled")
+        kind_cb.config(state="disabled")
+        cancel_btn.config(state="normal")
+        status.config(text="Exporting...")
+        win.after(200, poll)
+
+    def poll():
+        if not win.winfo_exists():
+            return
+        outcome = state["outcome"]
+        if outcome["max_key"]:
+            bar["value"] = min(1000, 1000 * outcome["last_key"] // outcome["max_key"])
+
+        if state["worker"].is_alive():
+            status.config(text=f"Exporting... {outcome['rows']} rows (key {outcome['last_key']} of ~{outcome['max_key']})")
+            win.after(200, poll)
+            return
+
+        state["worker"] = None
+        start_btn.config(state="normal")
+        kind_cb.config(state="readonly")
+        cancel_btn.config(state="disabled")
+
+        if "error" in outcome:
+            e = outcome["error"]
+            messagebox.showerror("Error", _friendly_db_error(e) if isinstance(e, DbError) else str(e), parent=win)
+            describe()
+            return
+
+        rows, finished = outcome["result"]
+        if finished:
+            bar["value"] = 1000
+            status.config(text=f"Done: {rows} rows written")
+            start_btn.config(text="Start")
+        else:
+            describe()
+
+    def on_close():
+        if state["worker"] is not None:
+            state["cancel"].set()   # stops after the current chunk; progress is kept
+        win.destroy()
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(pady=10)
+    tk.Button(buttons, text="Choose File", bg=ACCENT, fg="white", width=12, command=choose).grid(row=0, column=0, padx=5)
+    start_btn = tk.Button(buttons, text="Start", bg=ACCENT, fg="white", width=12, command=start)
+    start_btn.grid(row=0, column=1, padx=5)
+    cancel_btn = tk.Button(buttons, text="Cancel", bg="#e84118", fg="white", width=12, state="disabled",
+                           command=lambda: state["cancel"].set())
+    cancel_btn.grid(row=0, column=2, padx=5)
+
+    kind_cb.bind("<<ComboboxSelected>>", lambda _e: describe())
+    win.protocol("WM_DELETE_WINDOW", on_close)
+
+
+# =========================================================
+# TERM REPORTS (batch transcripts + course reports)
+# =========================================================
+def open_term_reports():
+    win = tk.Toplevel()
+    win.title("Term Reports")
+    win.geometry("560x300")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Term Reports", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+    tk.Label(win, text="One transcript per student and one report per course.\n"
+                       "Only reports whose data changed since the last run are rebuilt.", bg=BG).pack()
+
+    form = tk.Frame(win, bg=BG)
+    form.pack(pady=8)
+    tk.Label(form, text="Folder", bg=BG).grid(row=0, column=0, sticky="w")
+    dir_var = tk.StringVar(value=REPORTS_DIR)
+    tk.Entry(form, textvariable=dir_var, width=40, state="readonly").grid(row=0, column=1, padx=6)
+
+    def choose():
+        path = filedialog.askdirectory(parent=win, initialdir=dir_var.get(), title="Reports folder")
+        if path:
+            dir_var.set(path)
+
+    tk.Button(form, text="...", width=3, command=choose).grid(row=0, column=2)
+    force_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(form, text="Rebuild all", variable=force_var, bg=BG).grid(row=1, column=1, sticky="w")
+
+    bar = ttk.Progressbar(win, length=460, mode="determinate")
+    bar.pack(pady=8)
+    status = tk.Label(win, text="", bg=BG)
+    status.pack()
+
+    state = {"worker": None, "outcome": {}}
+
+    def run():
+        if state["worker"] is not None:
+            return
+        out_dir, force = dir_var.get(), force_var.get()
+        outcome = state["outcome"] = {"done": 0, "total": 0}
+
+        def on_progress(done, total):
+            outcome.update(done=done, total=total)
+
+        def work():
+            try:
+                outcome["result"] = generate_reports(Session.username, out_dir, force=force, progress=on_progress)
+            except Exception as e:
+                outcome["error"] = e
+
+        state["worker"] = threading.Thread(target=work, daemon=True)
+        state["worker"].start()
+        run_btn.config(state="disabled")
+        bar["value"] = 0
+        status.config(text="Fetching data...")
+        win.after(200, poll)
+
+    def poll():
+        if not win.winfo_exists():
+            return
+        outcome = state["outcome"]
+        if outcome["total"]:
+            bar["maximum"] = outcome["total"]
+            bar["value"] = outcome["done"]
+            status.config(text=f"Rendering {outcome['done']} / {outcome['total']}")
+
+        if state["worker"].is_alive():
+            win.after(200, poll)
+            return
+
+        state["worker"] = None
+        run_btn.config(state="normal")
+        if "error" in outcome:
+            e = outcome["error"]
+            status.config(text="Failed")
+            messagebox.showerror("Error", _friendly_db_error(e) if isinstance(e, DbError) else str(e), parent=win)
+            return
+
+        r = outcome["result"]
+        bar["maximum"], bar["value"] = 1, 1
+        status.config(
+            text=f"{r['total']} reports · {r['generated']} rebuilt · {r['unchanged']} unchanged · "
+                 f"{r['removed']} removed · {r['seconds']}s"
+        )
+
+    run_btn = tk.Button(win, text="Generate", bg=ACCENT, fg="white", width=14, command=run)
+    run_btn.pack(pady=8)
+
+
+# =========================================================
+# ANALYTICS SNAPSHOT (columnar, read offline by analytics.py)
+# =========================================================
+def _department_summary():
+    """Per-department attendance + grade rows read from the current snapshot."""
+    from analytics import AnalyticsSnapshot     # NumPy is only needed here
+
+    snap = AnalyticsSnapshot.open()
+    grades = {row[0]: row[1:] for row in snap.grade_summary_by("department_code")}
+    rows = []
+    for dept, sessions, present, rate in snap.attendance_by_department():
+        graded, mean, stdev = grades.get(dept, (0, None, None))
+        rows.append({
+            "Department": dept, "Sessions": sessions, "Present": present, "Rate": rate,
+            "Graded": graded, "Mean": mean, "Stdev": stdev,
+        })
+    return rows
+
+
+def open_analytics_snapshot():
+    win = tk.Toplevel()
+    win.title("Analytics Snapshot")
+    win.geometry("820x520")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Analytics Snapshot", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+    tk.Label(win, text=f"Folder: {ANALYTICS_DIR}", bg=BG).pack()
+    info = tk.Label(win, text="", bg=BG, justify="left")
+    info.pack(pady=10)
+
+    state = {"worker": None, "outcome": {}}
+
+    def show(meta, note=""):
+        if meta is None:
+            info.config(text="No snapshot built yet")
+            summary.set_rows([])
+            return
+        built = datetime.fromtimestamp(meta["built_at"]).strftime("%Y-%m-%d %H:%M:%S")
+        info.config(text=f"{note}Built {built} · {meta['rows']} fact rows · "
+                         f"{len(meta['dictionaries']['department_code'])} departments · "
+                         f"{len(meta['dictionaries']['course_code'])} courses")
+        try:
+            summary.set_rows(_department_summary())
+            summary_note.config(text="")
+        except ImportError:
+            summary.set_rows([])
+            summary_note.config(text="Install NumPy to see the department summary.")
+        except (OSError, ValueError, KeyError) as e:
+            summary.set_rows([])
+            summary_note.config(text=f"Snapshot could not be read: {e}")
+
+    def run(force=False):
+        if state["worker"] is not None:
+            return
+        outcome = state["outcome"] = {}
+
+        def work():
+            try:
+                outcome["result"] = build_analytics(Session.username, force=force)
+            except Exception as e:
+                outcome["error"] = e
+
+        state["worker"] = threading.Thread(target=work, daemon=True)
+        state["worker"].start()
+        info.config(text="Building...")
+        win.after(200, wait)
+
+    def wait():
+        if not win.winfo_exists():
+            return
+        if state["worker"].is_alive():
+            win.after(200, wait)
+            return
+        state["worker"] = None
+        outcome = state["outcome"]
+        if "error" in outcome:
+            e = outcome["error"]
+            show(analytics_meta())
+            messagebox.showerror("Error", _friendly_db_error(e) if isinstance(e, DbError) else str(e), parent=win)
+            return
+        meta, rebuilt = outcome["result"]
+        show(meta, "" if rebuilt else "Source data unchanged. ")
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(pady=8)
+    tk.Button(buttons, text="Build", bg=ACCENT, fg="white", width=14, command=run).grid(row=0, column=0, padx=5)
+    tk.Button(buttons, text="Rebuild", bg=ACCENT, fg="white", width=14,
+              command=lambda: run(force=True)).grid(row=0, column=1, padx=5)
+
+    summary_note = tk.Label(win, text="", bg=BG)
+    summary_note.pack()
+    summary = _build_grid(win, [
+        ("Department", "Department"), ("Sessions", "Sessions"), ("Present", "Present"),
+        ("Rate", "Attendance %"), ("Graded", "Graded"), ("Mean", "Mean"), ("Stdev", "Std Dev"),
+    ], width=100, height=10)
+
+    show(analytics_meta())
+
+
+# =========================================================
+# ARCHIVE (history tables: run archival, browse, restore)
+# =========================================================
+ARCHIVE_COLUMNS = {
+    "GRADES": ("HistoryID", "StudentID", "FullName", "CourseName", "TermID", "Grade", "ArchiveReason", "ArchivedAt"),
+    "ATTENDANCE": ("HistoryID", "StudentID", "FullName", "CourseName", "TermID", "StatusText", "DateRecorded",
+                   "ArchiveReason", "ArchivedAt"),
+    "ENROLLMENTS": ("HistoryID", "StudentID", "FullName", "CourseName", "TermID", "ArchiveReason", "ArchivedAt"),
+}
+
+
+def open_archive():
+    win = tk.Toplevel()
+    win.title("Archive")
+    win.geometry("1000x580")
+    win.configure(bg=BG)
+
+    tk.Label(win, text="Archive (History)", font=("Arial", 16, "bold"), bg=BG).pack(pady=10)
+
+    # ---- Run archival ----
+    run_frame = tk.Frame(win, bg=BG)
+    run_frame.pack(pady=4)
+    tk.Label(run_frame, text="Batch size", bg=BG).grid(row=0, column=0, padx=4)
+    batch_entry = tk.Entry(run_frame, width=8)
+    batch_entry.insert(0, str(ARCHIVE_BATCH_SIZE))
+    batch_entry.grid(row=0, column=1, padx=4)
+    tk.Label(run_frame, text="Inactive after (years)", bg=BG).grid(row=0, column=2, padx=4)
+    years_entry = tk.Entry(run_frame, width=5)
+    years_entry.insert(0, str(ARCHIVE_INACTIVE_YEARS))
+    years_entry.grid(row=0, column=3, padx=4)
+    run_status = tk.Label(win, text="", bg=BG)
+    run_status.pack()
+
+    # ---- Browse ----
+    top = tk.Frame(win, bg=BG)
+    top.pack(pady=4)
+    tk.Label(top, text="Show", bg=BG).grid(row=0, column=0, padx=4)
+    kind_cb = ttk.Combobox(top, values=list(ARCHIVE_KINDS), state="readonly", width=14)
+    kind_cb.current(0)
+    kind_cb.grid(row=0, column=1, padx=4)
+    tk.Label(top, text="StudentID", bg=BG).grid(row=0, column=2, padx=4)
+    student_entry = tk.Entry(top, width=8)
+    student_entry.grid(row=0, column=3, padx=4)
+    tk.Label(top, text="CourseID", bg=BG).grid(row=0, column=4, padx=4)
+    course_entry = tk.Entry(top, width=8)
+    course_entry.grid(row=0, column=5, padx=4)
+
+    summary = tk.Label(win, text="", bg=BG, justify="left")
+    summary.pack()
+
+    frame = tk.Frame(win, bg=BG)
+    frame.pack(fill="both", expand=True, padx=10, pady=5)
+    tree = ttk.Treeview(frame, show="headings", height=12)
+    vsb = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+    tree.configure(yscrollcommand=vsb.set)
+    tree.pack(side="left", fill="both", expand=True)
+    vsb.pack(side="right", fill="y")
+
+    state = {"worker": None, "cancel": None, "outcome": {}, "kind": None}
+
+    def optional_id(entry):
+        text = entry.get().strip()
+        return int(text) if text else None
+
+    def load(event=None):
+        try:
+            student_id, course_id = optional_id(student_entry), optional_id(course_entry)
+        except ValueError:
+            messagebox.showerror("Error", "IDs must be numbers", parent=win)
+            return
+        kind = kind_cb.get()
+        try:
+            counts, rows = get_archive(Session.username, kind, student_id, course_id)
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+
+        summary.config(text="   ".join(
+            f"{c['Kind'].title()} / {c['ArchiveReason']}: {c['Total']}" for c in counts
+        ) or "Archive is empty")
+
+        columns = ARCHIVE_COLUMNS[kind]
+        state["kind"] = kind
+        tree.delete(*tree.get_children())
+        tree.configure(columns=columns)
+        for key in columns:
+            tree.heading(key, text=key)
+            tree.column(key, width=100 if key not in ("FullName", "CourseName", "ArchivedAt") else 150, anchor="center")
+        for r in rows:
+            tree.insert("", "end", iid=str(r["HistoryID"]), values=[
+                "" if r.get(k) is None else r.get(k) for k in columns
+            ])
+
+    def restore_selected():
+        sel = tree.selection()
+        if not sel:
+            messagebox.showerror("Error", "Select archived rows", parent=win)
+            return
+        if not messagebox.askyesno("Restore", f"Restore {len(sel)} row(s) to the live tables?", parent=win):
+            return
+        failed = []
+        for iid in sel:
+            try:
+                restore_row(Session.username, state["kind"], int(iid))
+            except DbError as e:
+                failed.append(f"{iid}: {_friendly_db_error(e)}")
+        if failed:
+            messagebox.showerror("Error", "Not restored:\n" + "\n".join(failed[:10]), parent=win)
+        load()
+
+    def restore_whole_student():
+        try:
+            student_id = optional_id(student_entry)
+        except ValueError:
+            student_id = None
+        if student_id is None:
+            messagebox.showerror("Error", "Enter a StudentID", parent=win)
+            return
+        if not messagebox.askyesno(
+            "Restore Student",
+            f"Restore everything archived with student {student_id}?\n"
+            "The student is then kept out of inactive archival for a year.",
+            parent=win
+        ):
+            return
+        try:
+            r = restore_student(Session.username, student_id)
+        except DbError as e:
+            messagebox.showerror("Error", _friendly_db_error(e), parent=win)
+            return
+        messagebox.showinfo(
+            "Restored",
+            f"Grades: {r.get('Grades', 0)}, Attendance: {r.get('Attendance', 0)}, "
+            f"Attendance bitmaps: {r.get('Bitmaps', 0)}, Enrollments: {r.get('Enrollments', 0)}",
+            parent=win
+        )
+        load()
+
+    def run():
+        if state["worker"] is not None:
+            return
+        try:
+            batch_size, years = int(batch_entry.get()), int(years_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Batch size and years must be numbers", parent=win)
+            return
+        if not messagebox.askyesno(
+            "Run Archival",
+            f"Move deleted records, and records of students inactive for {years} year(s), to history?",
+            parent=win
+        ):
+            return
+
+        cancel = state["cancel"] = threading.Event()
+        outcome = state["outcome"] = {"totals": {}}
+
+        def on_progress(totals):
+            outcome["totals"] = totals
+
+        def work():
+            try:
+                outcome["result"] = run_archival(Session.username, batch_size, years,
+                                                 progress=on_progress, cancel=cancel)
+            except Exception as e:
+                outcome["error"] = e
+
+        state["worker"] = threading.Thread(target=work, daemon=True)
+        state["worker"].start()
+        run_btn.config(state="disabled")
+        stop_btn.config(state="normal")
+        run_status.config(text="Archiving...")
+        win.after(200, poll)
+
+    def describe(totals):
+        return (f"{totals.get('Batches', 0)} batch(es) · grades {totals.get('Grades', 0)} · "
+                f"attendance {totals.get('Attendance', 0)} · bitmaps {totals.get('Bitmaps', 0)} · "
+                f"enrollments {totals.get('Enrollments', 0)}")
+
+    def poll():
+        if not win.winfo_exists():
+            return
+        outcome = state["outcome"]
+        if state["worker"].is_alive():
+            if outcome["totals"]:
+                run_status.config(text="Archiving... " + describe(outcome["totals"]))
+            win.after(200, poll)
+            return
+
+        state["worker"] = None
+        run_btn.config(state="normal")
+        stop_btn.config(state="disabled")
+        if "error" in outcome:
+            e = outcome["error"]
+            run_status.config(text="Failed (finished batches are kept)")
+            messagebox.showerror("Error", _friendly_db_error(e) if isinstance(e, DbError) else str(e), parent=win)
+        else:
+            totals, finished = outcome["result"]
+            run_status.config(text=("Done: " if finished else "Stopped: ") + describe(totals))
+        load()
+
+    def on_close():
+        if state["worker"] is not None:
+            state["cancel"].set()   # stops after the current batch
+        win.destroy()
+
+    run_btn = tk.Button(run_frame, text="Run Archival", bg=ACCENT, fg="white", width=14, command=run)
+    run_btn.grid(row=0, column=4, padx=6)
+    stop_btn = tk.Button(run_frame, text="Stop", bg="#e84118", fg="white", width=10, state="disabled",
+                         command=lambda: state["cancel"].set())
+    stop_btn.grid(row=0, column=5, padx=4)
+
+    tk.Button(top, text="Show", bg=ACCENT, fg="white", width=10, command=load).grid(row=0, column=6, padx=6)
+
+    buttons = tk.Frame(win, bg=BG)
+    buttons.pack(pady=8)
+    tk.Button(buttons, text="Restore Selected", bg=ACCENT, fg="white", width=18,
+              command=restore_selected).grid(row=0, column=0, padx=5)
+    tk.Button(buttons, text="Restore Student", bg=ACCENT, fg="white", width=18,
+              command=restore_whole_student).grid(row=0, column=1, padx=5)
+
+    kind_cb.bind("<<ComboboxSelected>>", load)
+    win.protocol("WM_DELETE_WINDOW", on_close)
+    load()
@@ -0,0 +1,96 @@
+import tkinter as tk
+from datetime import date, timedelta
+from tkinter import ttk
+
+# =========================================================
+# DateWindow
+#   Week / month navigator: ◀ [label] ▶  [Week|Month]  Today.
+#   Moving it calls on_change(from_date, to_date); screens
+#   pass the window to the attendance procedures
+#   (@FromDate / @ToDate) so only the visible days are fetched.
+#
+#   nav.get()             (from_date, to_date), both inclusive
+#   nav.go_to(day)        window holding `day`
+#   nav.clamp_to(term)    keep the window inside a term row
+#                         (StartDate / EndDate), e.g. on term change
+# =========================================================
+
+UNITS = ("Week", "Month")
+
+
+def window_of(day, unit):
+    """(first, last) day of the week (Monday first) or month holding `day`."""
+    if unit == "Week":
+        first = day - timedelta(days=day.weekday())
+        return first, first + timedelta(days=6)
+    first = day.replace(day=1)
+    following = (first + timedelta(days=32)).replace(day=1)
+    return first, following - timedelta(days=1)
+
+
+def window_label(first, last, unit):
+    if unit == "Month":
+        return first.strftime("%B %Y")
+    return f"{first:%d %b} – {last:%d %b %Y}"
+
+
+def as_date(value):
+    """date from a DATE / DATETIME column value (datetime -> its date)."""
+    return value.date() if hasattr(value, "date") and callable(value.date) else value
+
+
+class DateWindow(tk.Frame):
+
+    def __init__(self, master, on_change=None, unit="Week", **kwargs):
+        super().__init__(master, **kwargs)
+        self._on_change = on_change
+        self._unit = unit
+        self._first, self._last = window_of(date.today(), unit)
+
+        bg = kwargs.get("bg")
+        tk.Button(self, text="◀", width=3, command=lambda: self.shift(-1)).pack(side="left")
+        self.label = tk.Label(self, width=24, bg=bg)
+        self.label.pack(side="left", padx=4)
+        tk.Button(self, text="▶", width=3, command=lambda: self.shift(1)).pack(side="left")
+
+        self.combo = ttk.Combobox(self, values=UNITS, state="readonly", width=7)
+        self.combo.set(unit)
+        self.combo.pack(side="left", padx=(8, 4))
+        self.combo.bind("<<ComboboxSelected>>", self._unit_changed)
+        tk.Button(self, text="Today", width=6, command=self.today).pack(side="left")
+
+        self._show()
+
+    def get(self):
+        return self._first, self._last
+
+    def shift(self, step):
+        # A day just outside the window lands in the neighbouring one
+        day = self._last + timedelta(days=1) if step > 0 else self._first - timedelta(days=1)
+        self.go_to(day)
+
+    def today(self):
+        self.go_to(date.today())
+
+    def clamp_to(self, term, notify=False):
+        """Today's window if it falls in the term, else the term's first / last one."""
+        if term is None:
+            return
+        start, end = as_date(term["StartDate"]), as_date(term["EndDate"])
+        self.go_to(min(max(date.today(), start), end), notify)
+
+    def go_to(self, day, notify=True):
+        window = window_of(day, self._unit)
+        if window == (self._first, self._last):
+            return
+        self._first, self._last = window
+        self._show()
+        if notify and self._on_change:
+            self._on_change(self._first, self._last)
+
+    def _unit_changed(self, _event=None):
+        self._unit = self.combo.get()
+        self.go_to(self._first)
+
+    def _show(self):
+        self.label.config(text=window_label(self._first, self._last, self._unit))
@@ -0,0 +1,266 @@
+import tkinter as tk
+from datetime import date, datetime, time
+from decimal import Decimal
+from tkinter import ttk
+
+# =========================================================
+# Grid View (client-side sort + filter for Treeviews)
+#   - Rows held column-wise (ColumnStore); per column a rank
+#     array is computed once, so any sort is an integer sort
+#   - Stable multi-column sort: click a heading to sort,
+#     click again to reverse, Shift+click to add a column
+#   - Filtering narrows the previous match list while the
+#     user keeps typing (refinements never rescan all rows)
+#   - The Treeview is filled once per load; sort / filter
+#     only reorders / detaches items (one set_children call)
+#
+# No database access: re-sorting never re-queries.
+# =========================================================
+
+ARROW_UP = " ▲"
+ARROW_DOWN = " ▼"
+
+_NUMERIC = (int, float, Decimal)
+_TEMPORAL = (datetime, date, time)
+
+
+def _sort_value_fn(values):
+    """Typed sort value for one column: numbers / dates natively, else case-insensitive text."""
+    kinds = {type(v) for v in values if v is not None}
+    if kinds and all(issubclass(k, _NUMERIC) and k is not bool for k in kinds):
+        return None
+    if len(kinds) == 1 and issubclass(next(iter(kinds)), _TEMPORAL):
+        return None
+    return lambda v: str(v).lower()
+
+
+def _display(v):
+    if v is None:
+        return ""
+    if isinstance(v, datetime):
+        return v.strftime("%Y-%m-%d %H:%M:%S")
+    return v
+
+
+class ColumnStore:
+    """Column-wise rows with lazily precomputed sort ranks and filter text."""
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self.load([])
+
+    def load(self, rows):
+        self.n = len(rows)
+        self.cols = {k: [r.get(k) for r in rows] for k in self.keys}
+        self._rank = {}
+        self._text = {}
+        self._all_text = None
+
+    def rank(self, key, descending=False):
+        """
+        rank[i] = position of row i in ascending (or descending) order of
+        `key`; ties share a rank and None sorts last either way.
+        """
+        r = self._rank.get((key, descending))
+        if r is None and descending:
+            col = self.cols[key]
+            last = self.n - col.count(None)      # the shared None rank
+            r = [x if x == last else last - 1 - x for x in self.rank(key)]
+            self._rank[(key, True)] = r
+        elif r is None:
+            col = self.cols[key]
+            conv = _sort_value_fn(col)
+            present = [i for i, v in enumerate(col) if v is not None]
+            vals = [col[i] for i in present] if conv is None else [conv(col[i]) for i in present]
+
+            # None sorts last, in one shared rank
+            r = [len(present)] * self.n
+            order = sorted(range(len(present)), key=vals.__getitem__)
+            current = 0
+            for pos, j in enumerate(order):
+                if pos and vals[j] != vals[order[pos - 1]]:
+                    current = pos
+                r[present[j]] = current
+            self._rank[(key, False)] = r
+        return r
+
+    def text(self, key):
+        """Lower-cased display text of a column (key=None: all columns joined)."""
+        if key is None:
+            if self._all_text is None:
+                cols = [self.text(k) for k in self.keys]
+                self._all_text = ["\x1f".join(parts) for parts in zip(*cols)] if cols else []
+            return self._all_text
+        t = self._text.get(key)
+        if t is None:
+            t = self._text[key] = [str(_display(v)).lower() for v in self.cols[key]]
+        return t
+
+    def sort(self, spec):
+        """Row indices ordered by spec = [(key, descending), ...] (stable)."""
+        if not spec:
+            return list(range(self.n))
+        if len(spec) == 1:
+            key, desc = spec[0]
+            return sorted(range(self.n), key=self.rank(key, desc).__getitem__)
+
+        # Fold the ranks into one integer key per row
+        n = max(self.n, 1)
+        composite = [0] * self.n
+        for key, desc in spec:
+            composite = [c * n + x for c, x in zip(composite, self.rank(key, desc))]
+        return sorted(range(self.n), key=composite.__getitem__)
+
+    def match(self, filters, candidates=None):
+        """Indices (ascending) whose column text contains every filter value."""
+        rows = range(self.n) if candidates is None else candidates
+        for key, needle in filters.items():
+            col = self.text(key)
+            rows = [i for i in rows if needle in col[i]]
+        return list(rows)
+
+
+class GridView:
+    """Binds a ColumnStore to a ttk.Treeview (headings sort, filters hide rows)."""
+
+    def __init__(self, tree, keys, on_change=None):
+        self.tree = tree
+        self.keys = list(keys)
+        self.store = ColumnStore(self.keys)
+        self.on_change = on_change
+        self.sort_spec = []
+        self.filters = {}           # key (None = any column) -> text
+        self._order = None          # sorted indices (all rows)
+        self._matched = None        # (filters, indices) of the last filter pass
+        self._add_sort = False
+        self._titles = {k: tree.heading(k, "text") or k for k in self.keys}
+
+        for k in self.keys:
+            tree.heading(k, command=lambda k=k: self.sort_by(k, self._add_sort))
+        tree.bind("<Shift-Button-1>", lambda _e: self._set_add(True), add="+")
+        tree.bind("<Button-1>", lambda _e: self._set_add(False), add="+")
+
+    def _set_add(self, value):
+        self._add_sort = value
+
+    # -----------------------------------------------------
+    # Data
+    # -----------------------------------------------------
+    def set_rows(self, rows, formatters=None):
+        """Load rows (dicts). formatters: {key: fn(value) -> display}."""
+        formatters = formatters or {}
+        tree = self.tree
+        tree.delete(*tree.get_children())
+        self.store.load(rows)
+        for i, r in enumerate(rows):
+            values = [
+                formatters[k](r.get(k)) if k in formatters else _display(r.get(k))
+                for k in self.keys
+            ]
+            tree.insert("", "end", iid=str(i), values=values)
+
+        self._order = None
+        self._matched = None
+        self.apply()
+
+    def row_count(self):
+        return self.store.n
+
+    # -----------------------------------------------------
+    # Sort / filter
+    # -----------------------------------------------------
+    def sort_by(self, key, add=False):
+        spec = self.sort_spec
+        current = next((i for i, (k, _d) in enumerate(spec) if k == key), None)
+        if add:
+            if current is None:
+                spec.append((key, False))
+            else:
+                spec[current] = (key, not spec[current][1])
+        elif current == 0 and len(spec) == 1:
+            spec[0] = (key, not spec[0][1])
+        else:
+            self.sort_spec = [(key, False)]
+
+        self._add_sort = False
+        self._order = None
+        self.apply()
+
+    def set_filter(self, key, text):
+        self.filters[key] = (text or "").strip().lower()
+        self.apply()
+
+    def _visible(self):
+        active = {k: t for k, t in self.filters.items() if t}
+        if not active:
+            self._matched = None
+            return self._order
+
+        candidates = None
+        if self._matched is not None:
+            prev, rows = self._matched
+            # Every previous filter only got longer -> refine the last result
+            if all(k in active and v in active[k] for k, v in prev.items()):
+                candidates = rows
+
+        rows = self.store.match(active, candidates)
+        self._matched = (active, rows)
+
+        mask = bytearray(self.store.n)
+        for i in rows:
+            mask[i] = 1
+        return [i for i in self._order if mask[i]]
+
+    def apply(self):
+        if self._order is None:
+            self._order = self.store.sort(self.sort_spec)
+
+        visible = self._visible()
+        self.tree.set_children("", *[str(i) for i in visible])
+
+        for pos, (k, desc) in enumerate(self.sort_spec):
+            mark = ARROW_DOWN if desc else ARROW_UP
+            prefix = f"{pos + 1}" if len(self.sort_spec) > 1 else ""
+            self.tree.heading(k, text=self._titles[k] + mark + prefix)
+        sorted_keys = {k for k, _d in self.sort_spec}
+        for k in self.keys:
+            if k not in sorted_keys:
+                self.tree.heading(k, text=self._titles[k])
+
+        if self.on_change:
+            self.on_change(len(visible), self.store.n)
+
+
+def filter_bar(parent, view, bg=None, column_titles=None):
+    """
+    Filter entry (+ optional column chooser) wired to a GridView.
+    column_titles: {key: title}; omitted -> filter across all columns only.
+    """
+    bar = tk.Frame(parent, bg=bg)
+    tk.Label(bar, text="Filter", bg=bg).pack(side="left")
+
+    text_var = tk.StringVar()
+    tk.Entry(bar, textvariable=text_var, width=30).pack(side="left", padx=6)
+
+    choices = {"All columns": None}
+    if column_titles:
+        choices.update({title: key for key, title in column_titles.items()})
+    column_cb = ttk.Combobox(bar, values=list(choices), state="readonly", width=16)
+    column_cb.current(0)
+    if column_titles:
+        column_cb.pack(side="left")
+
+    count = tk.Label(bar, text="", bg=bg, fg="#353b48")
+    count.pack(side="right")
+
+    def update(*_args):
+        view.filters.clear()
+        view.set_filter(choices[column_cb.get()], text_var.get())
+
+    def on_change(shown, total):
+        count.config(text=f"{shown} of {total}" if shown != total else f"{total} rows")
+
+    text_var.trace_add("write", update)
+    column_cb.bind("<<ComboboxSelected>>", update)
+    view.on_change = on_change
+    return bar
@@ -0,0 +1,138 @@
+import tkinter as tk
+
+# =========================================================
+# SearchPicker
+#   Entry + result list replacing "load everything" Comboboxes.
+#   search(text) -> [(key, label)] runs once typing pauses
+#   for DEBOUNCE_MS; results come from search.py (server
+#   TOP n + LRU cache) or an in-memory list.
+#
+#   picker.get()   selected key (None until a row is chosen)
+#   picker.text()  raw entry text
+# =========================================================
+
+DEBOUNCE_MS = 200
+_NAV_KEYS = {"Up", "Down", "Return", "Escape", "Tab", "Shift_L", "Shift_R",
+             "Control_L", "Control_R", "Alt_L", "Alt_R", "Left", "Right"}
+
+
+class SearchPicker(tk.Frame):
+
+    def __init__(self, master, search, width=40, rows=6, on_select=None,
+                 debounce_ms=DEBOUNCE_MS, min_chars=1, **kwargs):
+        super().__init__(master, **kwargs)
+        self._search = search
+        self._on_select = on_select
+        self._debounce_ms = debounce_ms
+        self._min_chars = min_chars
+        self._after_id = None
+        self._items = []
+        self._key = None
+
+        self.entry = tk.Entry(self, width=width)
+        self.entry.pack(fill="x")
+        self.listbox = tk.Listbox(self, width=width, height=rows, exportselection=False)
+
+        self.entry.bind("<KeyRelease>", self._on_key)
+        self.entry.bind("<Down>", self._focus_list)
+        self.entry.bind("<Return>", self._pick_first)
+        self.entry.bind("<Escape>", lambda _e: self._hide())
+        self.listbox.bind("<Return>", self._pick)
+        self.listbox.bind("<Double-Button-1>", self._pick)
+        self.listbox.bind("<ButtonRelease-1>", self._pick)
+        self.listbox.bind("<Escape>", lambda _e: (self._hide(), self.entry.focus_set()))
+        self.bind("<Destroy>", self._cancel, add="+")
+
+    # -----------------------------------------------------
+    # Public
+    # -----------------------------------------------------
+    def get(self):
+        return self._key
+
+    def text(self):
+        return self.entry.get().strip()
+
+    def set(self, key, label):
+        self._key = key
+        self.entry.delete(0, "end")
+        self.entry.insert(0, label)
+        self._hide()
+
+    def clear(self):
+        self._key = None
+        self.entry.delete(0, "end")
+        self._hide()
+
+    # -----------------------------------------------------
+    # Debounced search
+    # -----------------------------------------------------
+    def _cancel(self, _event=None):
+        if self._after_id is not None:
+            try:
+                self.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+
+    def _on_key(self, event):
+        if event.keysym in _NAV_KEYS:
+            return
+        self._key = None
+        self._cancel()
+        self._after_id = self.after(self._debounce_ms, self._run)
+
+    def _run(self):
+        self._after_id = None
+        text = self.text()
+        if len(text) < self._min_chars:
+            self._hide()
+            return
+        try:
+            self._items = self._search(text)
+        except Exception:
+            # Errors surface when the caller validates the selection
+            self._items = []
+        self._show()
+
+    # -----------------------------------------------------
+    # Result list
+    # -----------------------------------------------------
+    def _show(self):
+        self.listbox.delete(0, "end")
+        for _key, label in self._items:
+            self.listbox.insert("end", label)
+        if not self._items:
+            self.listbox.insert("end", "(no matches)")
+        if not self.listbox.winfo_ismapped():
+            self.listbox.pack(fill="x")
+
+    def _hide(self):
+        if self.listbox.winfo_ismapped():
+            self.listbox.pack_forget()
+
+    def _focus_list(self, _event=None):
+        if self._items and self.listbox.winfo_ismapped():
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, "end")
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+
+    def _choose(self, index):
+        if 0 <= index < len(self._items):
+            key, label = self._items[index]
+            self.set(key, label)
+            self.entry.focus_set()
+            if self._on_select:
+                self._on_select(key)
+
+    def _pick(self, _event=None):
+        sel = self.listbox.curselection()
+        if sel:
+            self._choose(sel[0])
+
+    def _pick_first(self, _event=None):
+        # Enter while typing: flush the pending search, take the top hit
+        if self._after_id is not None:
+            self._cancel()
+            self._run()
+        self._choose(0)
@@ -0,0 +1,67 @@
+import tkinter as tk
+from tkinter import ttk
+
+from db import DbError
+from terms import get_terms
+
+# =========================================================
+# TermPicker
+#   Read-only Combobox over the academic terms (newest first),
+#   preselecting the current term. Changing it calls
+#   on_change(term_id).
+#
+#   picker.get()   TermID of the selection (None = current term,
+#                  also when the terms could not be loaded)
+#   picker.term()  the selected term row (None if none loaded)
+# =========================================================
+
+
+def term_label(t):
+    label = t["TermName"]
+    if t["IsCurrent"]:
+        label += " (current)"
+    elif t["IsReadOnly"]:
+        label += " (read-only)"
+    return label
+
+
+class TermPicker(tk.Frame):
+
+    def __init__(self, master, username, on_change=None, width=24, **kwargs):
+        super().__init__(master, **kwargs)
+        self._on_change = on_change
+
+        try:
+            terms = get_terms(username)
+        except DbError:
+            terms = []      # procedures fall back to the current term
+
+        self._terms = terms
+        self._ids = [t["TermID"] for t in terms]
+        self._current = next((t["TermID"] for t in terms if t["IsCurrent"]), None)
+
+        tk.Label(self, text="Term:", bg=kwargs.get("bg")).pack(side="left", padx=(0, 4))
+        self.combo = ttk.Combobox(self, values=[term_label(t) for t in terms], state="readonly", width=width)
+        self.combo.pack(side="left")
+
+        if self._current in self._ids:
+            self.combo.current(self._ids.index(self._current))
+        elif self._ids:
+            self.combo.current(0)
+
+        self.combo.bind("<<ComboboxSelected>>", self._changed)
+
+    def get(self):
+        i = self.combo.current()
+        return self._ids[i] if i >= 0 else None
+
+    def term(self):
+        i = self.combo.current()
+        return self._terms[i] if i >= 0 else None
+
+    def is_current(self):
+        return self.get() in (None, self._current)
+
+    def _changed(self, _event=None):
+        if self._on_change:
+            self._on_change(self.get())
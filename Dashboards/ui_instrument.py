@@ -0,0 +1,327 @@
+import atexit
+import os
+import sys
+import threading
+import time
+import traceback
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from tkinter import commondialog
+
+# =========================================================
+# UI Instrumentation (opt-in)
+#   - Times every Tk -> Python callback (button commands,
+#     bindings, `after` callbacks) and counts widgets created
+#   - Watchdog thread dumps the main-thread stack when the
+#     event loop stops servicing its heartbeat
+#   - Rolling report of the worst UI actions
+#
+# Environment:
+#   SRMS_UI_WATCHDOG=1         enable
+#   SRMS_UI_STALL_MS=500       stall threshold (ms)
+#   SRMS_UI_REPORT=<path>      rolling report file
+#   SRMS_UI_STALL_LOG=<path>   stack dumps
+# =========================================================
+
+_UI_DIR = os.path.join(os.path.expanduser("~"), ".srms")
+
+HEARTBEAT_MS = 100
+REPORT_INTERVAL = 30.0
+WINDOW_SIZE = 1000
+
+_hooks_installed = False
+_watchdog_running = False
+_stall_seconds = 0.5
+_report_path = os.path.join(_UI_DIR, "ui_report.txt")
+_stall_log = os.path.join(_UI_DIR, "ui_stalls.log")
+
+_main_thread_id = threading.main_thread().ident
+_widgets_created = 0
+_action_stack = []              # [name, start, paused_seconds]
+_events = deque(maxlen=WINDOW_SIZE)
+_totals = {}                    # name -> [calls, total_s, max_s, max_widgets]
+_last_beat = time.perf_counter()
+_dialog_depth = 0
+_stall_dumped = False
+_listeners = []
+
+_orig_call = tk.CallWrapper.__call__
+_orig_setup = tk.BaseWidget._setup
+_orig_tk_init = tk.Tk.__init__
+_orig_mainloop = tk.Misc.mainloop
+_orig_wait_window = tk.Misc.wait_window
+_orig_wait_variable = tk.Misc.wait_variable
+_orig_dialog_show = commondialog.Dialog.show
+
+
+# =========================================================
+# Naming
+# =========================================================
+def _unwrap(func):
+    """Return the user callback behind tkinter's `after` wrapper."""
+    if getattr(func, "__qualname__", "").endswith("after.<locals>.callit") and func.__closure__:
+        for cell in func.__closure__:
+            inner = cell.cell_contents
+            if callable(inner) and not isinstance(inner, tk.Misc):
+                return inner, True
+    return func, False
+
+
+def _describe(func):
+    """Readable name for a Tk callback (`after:` prefix for timers)."""
+    func, is_after = _unwrap(func)
+
+    if hasattr(func, "__self__") and hasattr(func, "__func__"):
+        func = func.__func__
+
+    module = getattr(func, "__module__", None) or "?"
+    qualname = getattr(func, "__qualname__", None) or repr(func)
+    return ("after:" if is_after else "") + f"{module}.{qualname}"
+
+
+# =========================================================
+# Patched hooks
+# =========================================================
+def _instrumented_call(self, *args):
+    if getattr(_unwrap(self.func)[0], "_srms_skip", False):
+        return _orig_call(self, *args)
+
+    name = _describe(self.func)
+    frame = [name, time.perf_counter(), 0.0]
+    widgets_before = _widgets_created
+    _action_stack.append(frame)
+    for listener in _listeners:
+        listener.on_enter(name)
+
+    try:
+        return _orig_call(self, *args)
+    finally:
+        _action_stack.pop()
+        elapsed = time.perf_counter() - frame[1] - frame[2]
+        widgets = _widgets_created - widgets_before
+        _record(name, elapsed, widgets)
+        for listener in reversed(_listeners):
+            listener.on_exit(name, elapsed, widgets)
+
+
+def _instrumented_setup(self, master, cnf):
+    global _widgets_created
+    _widgets_created += 1
+    result = _orig_setup(self, master, cnf)
+    for listener in _listeners:
+        on_widget = getattr(listener, "on_widget", None)
+        if on_widget:
+            on_widget(self)
+    return result
+
+
+def _instrumented_tk_init(self, *args, **kwargs):
+    _orig_tk_init(self, *args, **kwargs)
+    if _watchdog_running:
+        _start_heartbeat(self)
+
+
+def _paused(orig):
+    """Nested event loops (mainloop / wait_*) don't count as callback time."""
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        for listener in _listeners:
+            if hasattr(listener, "on_pause"):
+                listener.on_pause()
+        try:
+            return orig(self, *args, **kwargs)
+        finally:
+            for listener in reversed(_listeners):
+                if hasattr(listener, "on_resume"):
+                    listener.on_resume()
+            if _action_stack:
+                _action_stack[-1][2] += time.perf_counter() - start
+    return wrapper
+
+
+def _instrumented_dialog_show(self, **options):
+    # Native dialogs may not service Tcl timers: suspend stall checks
+    global _dialog_depth
+    _dialog_depth += 1
+    try:
+        return _paused(_orig_dialog_show)(self, **options)
+    finally:
+        _dialog_depth -= 1
+        _beat()
+
+
+# =========================================================
+# Recording + report
+# =========================================================
+def _record(name, elapsed, widgets):
+    _events.append((time.time(), name, elapsed, widgets))
+    t = _totals.get(name)
+    if t is None:
+        t = _totals[name] = [0, 0.0, 0.0, 0]
+    t[0] += 1
+    t[1] += elapsed
+    t[2] = max(t[2], elapsed)
+    t[3] = max(t[3], widgets)
+
+
+def worst_actions(n=15):
+    """Worst actions in the rolling window: (name, max_s, calls, max_widgets)."""
+    agg = {}
+    for _ts, name, elapsed, widgets in list(_events):
+        a = agg.setdefault(name, [0.0, 0, 0])
+        a[0] = max(a[0], elapsed)
+        a[1] += 1
+        a[2] = max(a[2], widgets)
+    order = sorted(agg.items(), key=lambda kv: kv[1][0], reverse=True)
+    return [(name, a[0], a[1], a[2]) for name, a in order[:n]]
+
+
+def report(n=15):
+    lines = [
+        f"SRMS UI report — {datetime.now().isoformat(timespec='seconds')}",
+        f"Window: last {len(_events)} callbacks, widgets created total: {_widgets_created}",
+        "",
+        f"{'max ms':>9} {'calls':>6} {'widgets':>8}  action",
+    ]
+    for name, max_s, calls, widgets in worst_actions(n):
+        lines.append(f"{max_s * 1000:9.1f} {calls:6d} {widgets:8d}  {name}")
+
+    lines += ["", "All-time totals (by total time):", f"{'total ms':>10} {'calls':>6} {'max ms':>9}  action"]
+    for name, t in sorted(_totals.items(), key=lambda kv: kv[1][1], reverse=True)[:n]:
+        lines.append(f"{t[1] * 1000:10.1f} {t[0]:6d} {t[2] * 1000:9.1f}  {name}")
+    return "\n".join(lines) + "\n"
+
+
+def write_report(path=None):
+    path = path or _report_path
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report())
+    except OSError:
+        pass
+
+
+# =========================================================
+# Heartbeat + watchdog
+# =========================================================
+def _beat():
+    global _last_beat, _stall_dumped
+    _last_beat = time.perf_counter()
+    _stall_dumped = False
+
+
+def _start_heartbeat(root):
+    state = {"id": None}
+
+    def tick():
+        _beat()
+        try:
+            state["id"] = root.after(HEARTBEAT_MS, tick)
+        except tk.TclError:
+            state["id"] = None
+
+    tick._srms_skip = True
+
+    def on_destroy(event):
+        if event.widget is root and state["id"] is not None:
+            try:
+                root.after_cancel(state["id"])
+            except tk.TclError:
+                pass
+            state["id"] = None
+
+    root.bind("<Destroy>", on_destroy, add="+")
+    state["id"] = root.after(HEARTBEAT_MS, tick)
+
+
+def _dump_stall(blocked):
+    frame = sys._current_frames().get(_main_thread_id)
+    actions = " > ".join(a[0] for a in list(_action_stack)) or "(outside callbacks)"
+    lines = [
+        f"=== UI stall {datetime.now().isoformat(timespec='seconds')} "
+        f"blocked {blocked * 1000:.0f} ms in: {actions}"
+    ]
+    if frame is not None:
+        lines.append("".join(traceback.format_stack(frame)))
+    try:
+        os.makedirs(os.path.dirname(_stall_log) or ".", exist_ok=True)
+        with open(_stall_log, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    except OSError:
+        pass
+
+
+def _watchdog():
+    global _stall_dumped
+    next_report = time.monotonic() + REPORT_INTERVAL
+    while True:
+        time.sleep(max(_stall_seconds / 4, 0.02))
+
+        blocked = time.perf_counter() - _last_beat
+        if blocked > _stall_seconds and not _stall_dumped and not _dialog_depth:
+            _stall_dumped = True
+            _dump_stall(blocked)
+
+        if time.monotonic() >= next_report:
+            next_report = time.monotonic() + REPORT_INTERVAL
+            write_report()
+
+
+# =========================================================
+# Public API
+# =========================================================
+def add_listener(listener):
+    """
+    Listener with on_enter(name) / on_exit(name, elapsed, widgets);
+    optional on_pause() / on_resume() around nested event loops
+    and on_widget(widget) for every widget created.
+    """
+    _listeners.append(listener)
+
+
+def current_actions():
+    """Names of the callbacks currently running (outermost first)."""
+    return [a[0] for a in _action_stack]
+
+
+def install_hooks():
+    """Patch tkinter once (callback timing + widget counting only)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+
+    tk.CallWrapper.__call__ = _instrumented_call
+    tk.BaseWidget._setup = _instrumented_setup
+    tk.Tk.__init__ = _instrumented_tk_init
+    tk.Misc.mainloop = _paused(_orig_mainloop)
+    tk.Misc.wait_window = _paused(_orig_wait_window)
+    tk.Misc.wait_variable = _paused(_orig_wait_variable)
+    commondialog.Dialog.show = _instrumented_dialog_show
+
+
+def install(stall_ms=500, report_path=None, stall_log=None):
+    """Hooks + stall watchdog + rolling report; safe to call more than once."""
+    global _watchdog_running, _stall_seconds, _report_path, _stall_log
+    _stall_seconds = stall_ms / 1000.0
+    _report_path = report_path or _report_path
+    _stall_log = stall_log or _stall_log
+
+    install_hooks()
+    if _watchdog_running:
+        return
+    _watchdog_running = True
+
+    threading.Thread(target=_watchdog, name="ui-watchdog", daemon=True).start()
+    atexit.register(write_report)
+
+
+def install_from_env():
+    if os.environ.get("SRMS_UI_WATCHDOG", "").lower() in ("1", "true", "yes", "on"):
+        install(
+            stall_ms=float(os.environ.get("SRMS_UI_STALL_MS", "500")),
+            report_path=os.environ.get("SRMS_UI_REPORT"),
+            stall_log=os.environ.get("SRMS_UI_STALL_LOG"),
+        )
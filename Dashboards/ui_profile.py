@@ -0,0 +1,234 @@
+import atexit
+import cProfile
+import gc
+import io
+import os
+import pstats
+import re
+import time
+import tracemalloc
+import weakref
+import tkinter as tk
+from datetime import datetime
+
+import ui_instrument
+
+# =========================================================
+# Profiling Mode (opt-in)
+#   cProfile + tracemalloc around each top-level UI action
+#   (a Tk callback that is not nested inside another one,
+#    e.g. open_manage_courses, load_grades, view_attendance)
+#
+#   Per action, written to SRMS_PROFILE_DIR:
+#     <time>_<action>.prof   raw cProfile stats (snakeviz / pstats)
+#     <time>_<action>.txt    top-N functions, top-N allocations,
+#                            leaked windows / widgets
+#
+# Environment:
+#   SRMS_PROFILE=1              enable
+#   SRMS_PROFILE_DIR=<dir>      output directory
+#   SRMS_PROFILE_TOP=25         N for the summaries
+#   SRMS_PROFILE_MIN_MS=50      skip actions faster than this
+# =========================================================
+
+_PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".srms", "profiles")
+
+TRACEMALLOC_FRAMES = 10
+OPEN_TOPLEVEL_LIMIT = 5   # same action leaving more windows open => leak suspect
+
+# Allocations made by the profiler itself
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "*/pstats.py"),
+    tracemalloc.Filter(False, "*/cProfile.py"),
+)
+
+
+class _Session:
+    __slots__ = ("name", "profiler", "snapshot", "started", "depth", "paused")
+
+    def __init__(self, name):
+        self.name = name
+        self.profiler = cProfile.Profile()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.started = time.perf_counter()
+        self.depth = 0
+        self.paused = False
+
+
+class ActionProfiler:
+    """ui_instrument listener that profiles top-level actions."""
+
+    def __init__(self, out_dir=None, top_n=25, min_ms=50):
+        self.out_dir = out_dir or _PROFILE_DIR
+        self.top_n = top_n
+        self.min_seconds = min_ms / 1000.0
+        self._sessions = []
+        self._widgets = {}       # id -> (weakref, class, created_by)
+        self._reported = set()
+
+    # -----------------------------------------------------
+    # ui_instrument hooks
+    # -----------------------------------------------------
+    def on_enter(self, name):
+        if self._sessions and not self._sessions[-1].paused:
+            self._sessions[-1].depth += 1
+            return
+
+        if self._sessions:
+            self._sessions[-1].profiler.disable()
+        session = _Session(name)
+        self._sessions.append(session)
+        session.profiler.enable()
+
+    def on_exit(self, name, elapsed, widgets):
+        if not self._sessions:
+            return
+        session = self._sessions[-1]
+        if session.depth:
+            session.depth -= 1
+            return
+
+        session.profiler.disable()
+        self._sessions.pop()
+        if self._sessions and not self._sessions[-1].paused:
+            self._sessions[-1].profiler.enable()
+
+        if elapsed >= self.min_seconds:
+            self._dump(session, elapsed, widgets)
+
+    def on_pause(self):
+        if self._sessions and not self._sessions[-1].paused:
+            self._sessions[-1].paused = True
+            self._sessions[-1].profiler.disable()
+
+    def on_resume(self):
+        if self._sessions and self._sessions[-1].paused:
+            self._sessions[-1].paused = False
+            self._sessions[-1].profiler.enable()
+
+    def on_widget(self, widget):
+        actions = ui_instrument.current_actions()
+        created_by = actions[-1] if actions else "(startup)"
+        key = id(widget)
+        self._widgets[key] = (
+            weakref.ref(widget, lambda _r, k=key: self._widgets.pop(k, None)),
+            type(widget).__name__,
+            created_by,
+        )
+
+    # -----------------------------------------------------
+    # Leak detection
+    # -----------------------------------------------------
+    @staticmethod
+    def _is_destroyed(widget):
+        master = getattr(widget, "master", None)
+        if master is None:
+            return False
+        if master.children.get(widget._name) is not widget:
+            return True
+        return ActionProfiler._is_destroyed(master)
+
+    def find_leaks(self):
+        """
+        Returns (survivors, open_windows):
+          survivors    — widgets destroyed in Tk but still referenced in Python
+          open_windows — Toplevels still open, grouped by the action that opened them
+        """
+        gc.collect()
+        survivors = {}
+        open_windows = {}
+
+        for key, (ref, cls, created_by) in list(self._widgets.items()):
+            w = ref()
+            if w is None:
+                continue
+            if self._is_destroyed(w):
+                if key not in self._reported:
+                    self._reported.add(key)
+                    survivors[(cls, created_by)] = survivors.get((cls, created_by), 0) + 1
+            elif isinstance(w, tk.Toplevel):
+                open_windows[created_by] = open_windows.get(created_by, 0) + 1
+
+        return survivors, open_windows
+
+    def _leak_lines(self):
+        survivors, open_windows = self.find_leaks()
+        lines = []
+        for (cls, created_by), count in sorted(survivors.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  survived destroy: {count:5d} x {cls:<12} created by {created_by}")
+        for created_by, count in sorted(open_windows.items(), key=lambda kv: -kv[1]):
+            if count > OPEN_TOPLEVEL_LIMIT:
+                lines.append(f"  open Toplevels:   {count:5d} opened by {created_by}")
+        return lines
+
+    # -----------------------------------------------------
+    # Output
+    # -----------------------------------------------------
+    def _dump(self, session, elapsed, widgets):
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", session.name)[-80:]
+        base = os.path.join(self.out_dir, f"{stamp}_{slug}")
+
+        after = tracemalloc.take_snapshot().filter_traces(_NOISE)
+        diffs = after.compare_to(session.snapshot.filter_traces(_NOISE), "lineno")[:self.top_n]
+
+        session.profiler.dump_stats(base + ".prof")
+
+        buf = io.StringIO()
+        stats = pstats.Stats(session.profiler, stream=buf)
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+
+        lines = [
+            f"Action:  {session.name}",
+            f"Elapsed: {elapsed * 1000:.1f} ms (nested event loops excluded)",
+            f"Widgets created: {widgets}",
+            "",
+            f"Top {self.top_n} allocations (tracemalloc, by line):",
+        ]
+        lines += [f"  {d}" for d in diffs]
+
+        leaks = self._leak_lines()
+        lines += ["", "Leaks:"] + (leaks or ["  none detected"])
+        lines += ["", "cProfile (cumulative):", buf.getvalue()]
+
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+
+    def write_exit_report(self):
+        leaks = self._leak_lines()
+        if not leaks:
+            return
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, datetime.now().strftime("%Y%m%d_%H%M%S") + "_exit_leaks.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("Leaks at exit:\n" + "\n".join(leaks) + "\n")
+
+
+_profiler = None
+
+
+def install(out_dir=None, top_n=25, min_ms=50):
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    ui_instrument.install_hooks()
+    _profiler = ActionProfiler(out_dir, top_n, min_ms)
+    ui_instrument.add_listener(_profiler)
+    atexit.register(_profiler.write_exit_report)
+    return _profiler
+
+
+def install_from_env():
+    if os.environ.get("SRMS_PROFILE", "").lower() in ("1", "true", "yes", "on"):
+        install(
+            out_dir=os.environ.get("SRMS_PROFILE_DIR"),
+            top_n=int(os.environ.get("SRMS_PROFILE_TOP", "25")),
+            min_ms=float(os.environ.get("SRMS_PROFILE_MIN_MS", "50")),
+        )
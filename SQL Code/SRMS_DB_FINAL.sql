@@ -1,4777 +1,9415 @@
-/* =========================================================
-   SRMS_DB — Term Project (FINAL) — Part 1
-   Database + Core Tables (Schema Only)
-
-   Roles:
-     Admin, Instructor, TA, Student, Guestrole
-
-   MLS Clearance Levels:
-     1 = Unclassified (Public)
-     2 = Confidential (Student data)
-     3 = Secret (Grades / Attendance)
-     4 = Instructor / Auth
-     5 = Admin
-   ========================================================= */
-
----------------------------------------------------------
--- 1.0 DROP + CREATE DATABASE
----------------------------------------------------------
-IF DB_ID('SRMS_DB') IS NOT NULL
-BEGIN
-    ALTER DATABASE SRMS_DB SET SINGLE_USER WITH ROLLBACK IMMEDIATE;
-    DROP DATABASE SRMS_DB;
-END
-GO
-
-CREATE DATABASE SRMS_DB;
-GO
-USE SRMS_DB;
-GO
-
----------------------------------------------------------
--- 1.1 DROP TABLES (Safe Order)
----------------------------------------------------------
-DROP TABLE IF EXISTS dbo.ATTENDANCE;
-DROP TABLE IF EXISTS dbo.GRADES;
-DROP TABLE IF EXISTS dbo.COURSE_STUDENT;
-DROP TABLE IF EXISTS dbo.TA_COURSE;
-DROP TABLE IF EXISTS dbo.INSTRUCTOR_COURSE;
-DROP TABLE IF EXISTS dbo.ROLE_REQUESTS;
-DROP TABLE IF EXISTS dbo.USERS;
-DROP TABLE IF EXISTS dbo.TA;
-DROP TABLE IF EXISTS dbo.INSTRUCTOR;
-DROP TABLE IF EXISTS dbo.STUDENT;
-DROP TABLE IF EXISTS dbo.COURSE;
-DROP TABLE IF EXISTS dbo.LOGS;
-GO
-
----------------------------------------------------------
--- 1.2 CORE TABLES
----------------------------------------------------------
-
-/* STUDENT — Confidential */
-CREATE TABLE dbo.STUDENT (
-    StudentID       INT IDENTITY(100,1) PRIMARY KEY,
-    FullName        NVARCHAR(100) NOT NULL,
-    Email           NVARCHAR(100) NOT NULL,
-    DOB             DATE NOT NULL,
-    Department      NVARCHAR(50) NOT NULL,
-
-    ClearanceLevel  INT NOT NULL DEFAULT 2,
-    EncryptedPhone  VARBINARY(MAX) NULL,
-
-    IsDeleted       BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT CK_STUDENT_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
-    CONSTRAINT UQ_STUDENT_Email UNIQUE (Email)
-);
-GO
-
-/* INSTRUCTOR — Level 4 */
-CREATE TABLE dbo.INSTRUCTOR (
-    InstructorID    INT IDENTITY(200,1) PRIMARY KEY,
-    FullName        NVARCHAR(100) NOT NULL,
-    Email           NVARCHAR(100) NOT NULL,
-
-    ClearanceLevel  INT NOT NULL DEFAULT 4,
-    IsDeleted       BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT CK_INSTRUCTOR_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
-    CONSTRAINT UQ_INSTRUCTOR_Email UNIQUE (Email)
-);
-GO
-
-/* TA — Level 3 */
-CREATE TABLE dbo.TA (
-    TAID            INT IDENTITY(3000,1) PRIMARY KEY,
-    FullName        NVARCHAR(100) NOT NULL,
-    Email           NVARCHAR(100) NOT NULL,
-
-    ClearanceLevel  INT NOT NULL DEFAULT 3,
-    IsDeleted       BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT CK_TA_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
-    CONSTRAINT UQ_TA_Email UNIQUE (Email)
-);
-GO
-
-/* COURSE — Unclassified */
-CREATE TABLE dbo.COURSE (
-    CourseID        INT IDENTITY(300,1) PRIMARY KEY,
-    CourseName      NVARCHAR(100) NOT NULL,
-    Description     NVARCHAR(MAX) NULL,
-    PublicInfo      NVARCHAR(MAX) NULL,
-
-    ClearanceLevel  INT NOT NULL DEFAULT 1,
-    IsDeleted       BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT CK_COURSE_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
-    CONSTRAINT UQ_COURSE_Name UNIQUE (CourseName)
-);
-GO
-
-/* USERS — Authentication + RBAC + MLS */
-CREATE TABLE dbo.USERS (
-    Username          NVARCHAR(50) PRIMARY KEY,
-    Password          VARBINARY(MAX) NOT NULL,
-    Role              NVARCHAR(20) NOT NULL,
-    ClearanceLevel    INT NOT NULL,
-
-    StudentID         INT NULL,
-    InstructorID      INT NULL,
-    TAID              INT NULL,
-
-    EncryptedUsername VARBINARY(MAX) NULL,
-    IsDeleted         BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT CK_USERS_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
-    CONSTRAINT CK_USERS_Role CHECK (Role IN ('Admin','Instructor','TA','Student','Guestrole')),
-
-    CONSTRAINT FK_USERS_STUDENT    FOREIGN KEY (StudentID)    REFERENCES dbo.STUDENT(StudentID),
-    CONSTRAINT FK_USERS_INSTRUCTOR FOREIGN KEY (InstructorID) REFERENCES dbo.INSTRUCTOR(InstructorID),
-    CONSTRAINT FK_USERS_TA         FOREIGN KEY (TAID)         REFERENCES dbo.TA(TAID),
-
-    CONSTRAINT CK_USERS_ROLE_LINK CHECK (
-        (Role IN ('Admin','Guestrole') AND StudentID IS NULL AND InstructorID IS NULL AND TAID IS NULL)
-        OR (Role = 'Student'    AND StudentID IS NOT NULL)
-        OR (Role = 'Instructor' AND InstructorID IS NOT NULL)
-        OR (Role = 'TA'         AND TAID IS NOT NULL)
-    )
-);
-GO
-
-
-
-
-/* GRADES — Secret */
-CREATE TABLE dbo.GRADES (
-    GradeID             INT IDENTITY(400,1) PRIMARY KEY,
-    StudentID           INT NOT NULL,
-    CourseID            INT NOT NULL,
-    DateEntered         DATETIME NOT NULL DEFAULT GETDATE(),
-
-    EncryptedGradeValue VARBINARY(MAX) NOT NULL,
-    IsDeleted           BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT FK_GRADES_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID),
-    CONSTRAINT FK_GRADES_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
-    CONSTRAINT UQ_GRADES UNIQUE (StudentID, CourseID)
-);
-GO
-
-/* ATTENDANCE — Secret */
-CREATE TABLE dbo.ATTENDANCE (
-    AttendanceID   INT IDENTITY(500,1) PRIMARY KEY,
-    StudentID      INT NOT NULL,
-    CourseID       INT NOT NULL,
-    Status         BIT NOT NULL,
-    DateRecorded DATE NOT NULL DEFAULT CAST(GETDATE() AS DATE),
-
-    IsDeleted      BIT NOT NULL DEFAULT 0,
-
-    CONSTRAINT FK_ATT_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID),
-    CONSTRAINT FK_ATT_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
-    CONSTRAINT UQ_ATT UNIQUE (StudentID, CourseID, DateRecorded)
-);
-GO
-
-/* ROLE REQUESTS — Part B */
-CREATE TABLE dbo.ROLE_REQUESTS (
-    RequestID     INT IDENTITY(1,1) PRIMARY KEY,
-    Username      NVARCHAR(50) NOT NULL,
-    CurrentRole   NVARCHAR(20) NOT NULL,
-    RequestedRole NVARCHAR(20) NOT NULL,
-    Reason        NVARCHAR(300) NOT NULL,
-    Comments      NVARCHAR(300) NULL,
-    Status        NVARCHAR(20) NOT NULL DEFAULT 'Pending',
-    DateSubmitted DATETIME NOT NULL DEFAULT GETDATE(),
-
-    CONSTRAINT FK_ROLE_REQ_USER FOREIGN KEY (Username) REFERENCES dbo.USERS(Username),
-    CONSTRAINT CK_ROLE_REQ_STATUS CHECK (Status IN ('Pending','Approved','Denied'))
-);
-GO
-
----------------------------------------------------------
--- 1.3 MAPPING TABLES
----------------------------------------------------------
-CREATE TABLE dbo.INSTRUCTOR_COURSE (
-    InstructorID INT NOT NULL,
-    CourseID     INT NOT NULL,
-    CONSTRAINT PK_INSTRUCTOR_COURSE PRIMARY KEY (InstructorID, CourseID),
-    CONSTRAINT FK_IC_INSTRUCTOR FOREIGN KEY (InstructorID) REFERENCES dbo.INSTRUCTOR(InstructorID),
-    CONSTRAINT FK_IC_COURSE     FOREIGN KEY (CourseID)     REFERENCES dbo.COURSE(CourseID)
-);
-GO
-
-CREATE TABLE dbo.TA_COURSE (
-    TAUsername NVARCHAR(50) NOT NULL,
-    CourseID   INT NOT NULL,
-    CONSTRAINT PK_TA_COURSE PRIMARY KEY (TAUsername, CourseID),
-    CONSTRAINT FK_TC_USER   FOREIGN KEY (TAUsername) REFERENCES dbo.USERS(Username),
-    CONSTRAINT FK_TC_COURSE FOREIGN KEY (CourseID)   REFERENCES dbo.COURSE(CourseID)
-);
-GO
-
-CREATE TABLE dbo.COURSE_STUDENT (
-    CourseID  INT NOT NULL,
-    StudentID INT NOT NULL,
-    CONSTRAINT PK_COURSE_STUDENT PRIMARY KEY (CourseID, StudentID),
-    CONSTRAINT FK_CS_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
-    CONSTRAINT FK_CS_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID)
-);
-GO
-
----------------------------------------------------------
--- 1.4 LOGS
----------------------------------------------------------
-CREATE TABLE dbo.LOGS (
-    LogID    INT IDENTITY(1,1) PRIMARY KEY,
-    Username NVARCHAR(50) NULL,
-    Action   NVARCHAR(200) NOT NULL,
-    Details  NVARCHAR(4000) NULL,
-    LogTime  DATETIME NOT NULL DEFAULT GETDATE()
-);
-GO
-
----------------------------------------------------------
--- 1.5 INDEXES
----------------------------------------------------------
-CREATE INDEX IX_STUDENT_Email   ON dbo.STUDENT(Email);
-CREATE INDEX IX_USERS_Role      ON dbo.USERS(Role);
-CREATE INDEX IX_USERS_Clearance ON dbo.USERS(ClearanceLevel);
-CREATE INDEX IX_GRADES_Student  ON dbo.GRADES(StudentID);
-CREATE INDEX IX_ATT_Student     ON dbo.ATTENDANCE(StudentID);
-GO
-
-/* =========================
-   END OF PART 1
-   ========================= */
-
-
-
-
-
-
-
-/* =========================================================
-   SRMS_DB — Term Project (FINAL) — Part 2 [FINAL]
-   Roles, RBAC & Security Infrastructure
-
-   Depends on:
-     - Part 1 (Database + Core Tables)
-
-   Guarantees:
-     - EXECUTE-ONLY access model
-     - No direct SELECT/INSERT/UPDATE/DELETE on tables
-     - Clear RBAC hierarchy via RBAC_RANK
-     - Idempotent (safe re-run)
-   ========================================================= */
-
----------------------------------------------------------
--- Part 2.1 — CREATE DATABASE ROLES (Idempotent)
----------------------------------------------------------
-IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Admin' AND type = 'R')
-    CREATE ROLE [Admin];
-GO
-
-IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Instructor' AND type = 'R')
-    CREATE ROLE [Instructor];
-GO
-
-IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'TA' AND type = 'R')
-    CREATE ROLE [TA];
-GO
-
-IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Student' AND type = 'R')
-    CREATE ROLE [Student];
-GO
-
-IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Guestrole' AND type = 'R')
-    CREATE ROLE [Guestrole];
-GO
-
----------------------------------------------------------
--- Part 2.2 — DENY ALL DIRECT TABLE ACCESS
--- Defense-in-depth: even Admin uses stored procedures only
----------------------------------------------------------
-
--- Core tables
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.STUDENT        TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.INSTRUCTOR     TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.TA             TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.COURSE         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.USERS          TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.GRADES         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ATTENDANCE     TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ROLE_REQUESTS  TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-
--- Mapping tables
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.INSTRUCTOR_COURSE TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.TA_COURSE         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.COURSE_STUDENT    TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-
--- Logs
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.LOGS           TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-GO
-
----------------------------------------------------------
--- Part 2.3 — GRANT EXECUTE ONLY
--- All operations go through Stored Procedures
----------------------------------------------------------
-GRANT EXECUTE TO [Admin];
-GRANT EXECUTE TO [Instructor];
-GRANT EXECUTE TO [TA];
-GRANT EXECUTE TO [Student];
-GRANT EXECUTE TO [Guestrole];
-GO
-
----------------------------------------------------------
--- Part 2.4 — RBAC_RANK TABLE (Role Hierarchy)
--- Used by sp_CheckAccess later
--- Idempotent: Create-if-not-exists + reset content
----------------------------------------------------------
-IF OBJECT_ID('dbo.RBAC_RANK', 'U') IS NULL
-BEGIN
-    CREATE TABLE dbo.RBAC_RANK (
-        RoleName NVARCHAR(20) NOT NULL PRIMARY KEY,
-        Rank     INT NOT NULL
-    );
-END
-GO
-
--- Reset & seed (idempotent)
-DELETE FROM dbo.RBAC_RANK;
-GO
-
-INSERT INTO dbo.RBAC_RANK (RoleName, Rank) VALUES
-('Guestrole', 1),
-('Student',   2),
-('TA',        3),
-('Instructor',4),
-('Admin',     5);
-GO
-
----------------------------------------------------------
--- (Optional Hardening) DENY direct table access to RBAC_RANK too
--- Keeps "no direct access" consistent
----------------------------------------------------------
-DENY SELECT, INSERT, UPDATE, DELETE ON dbo.RBAC_RANK TO [Admin], [Instructor], [TA], [Student], [Guestrole];
-GO
-
----------------------------------------------------------
--- Part 2.5 — SECURITY/PERFORMANCE INDEXES (Idempotent)
----------------------------------------------------------
-
--- USERS (RBAC / MLS lookups)
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_USERS_Role_RBAC' AND object_id = OBJECT_ID('dbo.USERS'))
-    CREATE INDEX IX_USERS_Role_RBAC ON dbo.USERS(Role);
-
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_USERS_Clearance_RBAC' AND object_id = OBJECT_ID('dbo.USERS'))
-    CREATE INDEX IX_USERS_Clearance_RBAC ON dbo.USERS(ClearanceLevel);
-
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_USERS_Role_Clearance' AND object_id = OBJECT_ID('dbo.USERS'))
-    CREATE INDEX IX_USERS_Role_Clearance ON dbo.USERS(Role, ClearanceLevel);
-
--- ROLE_REQUESTS (Part B workflow)
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ROLE_REQUESTS_Status_RBAC' AND object_id = OBJECT_ID('dbo.ROLE_REQUESTS'))
-    CREATE INDEX IX_ROLE_REQUESTS_Status_RBAC ON dbo.ROLE_REQUESTS(Status);
-
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ROLE_REQUESTS_User_RBAC' AND object_id = OBJECT_ID('dbo.ROLE_REQUESTS'))
-    CREATE INDEX IX_ROLE_REQUESTS_User_RBAC ON dbo.ROLE_REQUESTS(Username);
-
--- Mappings (authorization checks)
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_IC_Instructor' AND object_id = OBJECT_ID('dbo.INSTRUCTOR_COURSE'))
-    CREATE INDEX IX_IC_Instructor ON dbo.INSTRUCTOR_COURSE(InstructorID);
-
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TC_TAUsername' AND object_id = OBJECT_ID('dbo.TA_COURSE'))
-    CREATE INDEX IX_TC_TAUsername ON dbo.TA_COURSE(TAUsername);
-
-IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_CS_Enrollment' AND object_id = OBJECT_ID('dbo.COURSE_STUDENT'))
-    CREATE INDEX IX_CS_Enrollment ON dbo.COURSE_STUDENT(StudentID, CourseID);
-GO
-
-/* ===========================
-   END OF PART 2 (FINAL)
-   =========================== */
-
-
-
-
-
-
-
-
-
-
-
-
-/* =========================================================
-   SRMS_DB — Term Project (FINAL) — Part 3 (FINAL)
-   Encryption + Core Security Procedures
-
-   Depends on:
-     - Part 1 (DB + Tables)
-     - Part 2 (Roles + RBAC_RANK + EXECUTE-only model)
-
-   Includes:
-   - Master Key
-   - Certificate
-   - Symmetric Key (AES-256)
-   - sp_Key_Open / sp_Key_Close
-   - sp_LogAction
-   - sp_CheckAccess (RBAC + MLS Bell–LaPadula)
-     ✅ No Read Up
-     ✅ No Write Down
-   ========================================================= */
-
----------------------------------------------------------
--- Part 3.1 — MASTER KEY (Root of Encryption) [Idempotent]
----------------------------------------------------------
-IF NOT EXISTS (
-    SELECT 1 FROM sys.symmetric_keys
-    WHERE name = '##MS_DatabaseMasterKey##'
-)
-BEGIN
-    CREATE MASTER KEY
-    ENCRYPTION BY PASSWORD = 'SRMS_MasterKey_StrongPassword_2025!';
-END
-GO
-
----------------------------------------------------------
--- Part 3.2 — CERTIFICATE (Protects Symmetric Key) [Idempotent]
----------------------------------------------------------
-IF NOT EXISTS (
-    SELECT 1 FROM sys.certificates
-    WHERE name = 'SRMSCert'
-)
-BEGIN
-    CREATE CERTIFICATE SRMSCert
-    WITH SUBJECT = 'SRMS Encryption Certificate';
-END
-GO
-
----------------------------------------------------------
--- Part 3.3 — SYMMETRIC KEY (AES-256) [Idempotent]
----------------------------------------------------------
-IF NOT EXISTS (
-    SELECT 1 FROM sys.symmetric_keys
-    WHERE name = 'SRMSSymmetricKey'
-)
-BEGIN
-    CREATE SYMMETRIC KEY SRMSSymmetricKey
-    WITH ALGORITHM = AES_256
-    ENCRYPTION BY CERTIFICATE SRMSCert;
-END
-GO
-
----------------------------------------------------------
--- Part 3.4 — HELPER: OPEN SYMMETRIC KEY (Safe)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Key_Open', 'P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Key_Open;
-GO
-
-CREATE PROCEDURE dbo.sp_Key_Open
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    BEGIN TRY
-        OPEN SYMMETRIC KEY SRMSSymmetricKey
-            DECRYPTION BY CERTIFICATE SRMSCert;
-    END TRY
-    BEGIN CATCH
-        -- Ignore "already open" error; rethrow anything else
-        IF ERROR_NUMBER() <> 15315
-            THROW;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- Part 3.5 — HELPER: CLOSE SYMMETRIC KEY (Safe)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Key_Close', 'P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Key_Close;
-GO
-
-CREATE PROCEDURE dbo.sp_Key_Close
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    BEGIN TRY
-        CLOSE SYMMETRIC KEY SRMSSymmetricKey;
-    END TRY
-    BEGIN CATCH
-        -- If key isn't open, CLOSE may error; ignore that case
-        -- Re-throw anything unexpected
-        IF ERROR_NUMBER() NOT IN (15313, 15315)
-            THROW;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- Part 3.6 — CENTRAL LOGGING PROCEDURE
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_LogAction', 'P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_LogAction;
-GO
-
-CREATE PROCEDURE dbo.sp_LogAction
-(
-    @Username NVARCHAR(50),
-    @Action   NVARCHAR(200),
-    @Details  NVARCHAR(4000) = NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    INSERT INTO dbo.LOGS (Username, Action, Details)
-    VALUES (@Username, @Action, @Details);
-END
-GO
-
----------------------------------------------------------
--- Part 3.7 — CENTRAL ACCESS CHECK (RBAC + MLS) [FINAL]
--- Bell–LaPadula Enforcement:
---   ✅ No Read Up    (READ:  user clearance >= object clearance)
---   ✅ No Write Down (WRITE: user clearance <= object clearance)
---
--- RBAC:
---   - If @RequiredRole contains comma => Allow-list (exact roles)
---   - Else => Minimum-role (hierarchy rank via RBAC_RANK)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_CheckAccess', 'P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_CheckAccess;
-GO
-
-CREATE PROCEDURE dbo.sp_CheckAccess
-(
-    @CurrentUsername   NVARCHAR(50),
-    @RequiredRole      NVARCHAR(200),  -- 'Instructor' OR 'TA,Instructor' OR 'Instructor,Admin'
-    @RequiredClearance INT,            -- object classification level (1..5)
-    @Mode              NVARCHAR(10)    -- 'READ' / 'WRITE'
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -----------------------------------------------------
-    -- Normalize + validate inputs
-    -----------------------------------------------------
-    SET @CurrentUsername = LTRIM(RTRIM(@CurrentUsername));
-    SET @RequiredRole    = LTRIM(RTRIM(@RequiredRole));
-    SET @Mode            = UPPER(LTRIM(RTRIM(@Mode)));
-
-    IF @CurrentUsername IS NULL OR @CurrentUsername = ''
-    BEGIN
-        RAISERROR('Access Denied: Missing username.', 16, 1);
-        RETURN;
-    END
-
-    IF @RequiredRole IS NULL OR @RequiredRole = ''
-    BEGIN
-        RAISERROR('Access Denied: Missing required role.', 16, 1);
-        RETURN;
-    END
-
-    IF @Mode NOT IN ('READ','WRITE')
-    BEGIN
-        RAISERROR('Invalid Mode. Use READ or WRITE.', 16, 1);
-        RETURN;
-    END
-
-    IF @RequiredClearance IS NULL OR @RequiredClearance NOT BETWEEN 1 AND 5
-    BEGIN
-        RAISERROR('Invalid RequiredClearance. Use 1..5.', 16, 1);
-        RETURN;
-    END
-
-    -----------------------------------------------------
-    -- Load current user role + clearance
-    -----------------------------------------------------
-    DECLARE @UserRole NVARCHAR(20);
-    DECLARE @UserClearance INT;
-
-    SELECT
-        @UserRole      = Role,
-        @UserClearance = ClearanceLevel
-    FROM dbo.USERS
-    WHERE Username = @CurrentUsername
-      AND IsDeleted = 0;
-
-    IF @UserRole IS NULL
-    BEGIN
-        RAISERROR('Access Denied: Unknown user.', 16, 1);
-        RETURN;
-    END
-
-    -----------------------------------------------------
-    -- Admin bypass (RBAC + MLS) for management operations
-    -- NOTE: Still no direct table access due to DENY policy (Part 2).
-    -----------------------------------------------------
-    IF @UserRole = 'Admin'
-        RETURN;
-
-    -----------------------------------------------------
-    -- RBAC Check
-    -----------------------------------------------------
-    DECLARE @UserRank INT;
-    SELECT @UserRank = Rank
-    FROM dbo.RBAC_RANK
-    WHERE RoleName = @UserRole;
-
-    IF @UserRank IS NULL
-    BEGIN
-        RAISERROR('Access Denied: Role rank missing (RBAC_RANK).', 16, 1);
-        RETURN;
-    END
-
-    -- Case A: Allow-list CSV (exact roles) e.g. 'TA,Instructor'
-    IF CHARINDEX(',', @RequiredRole) > 0
-    BEGIN
-        IF NOT EXISTS (
-            SELECT 1
-            FROM string_split(@RequiredRole, ',') s
-            WHERE LTRIM(RTRIM(s.value)) = @UserRole
-        )
-        BEGIN
-            RAISERROR('Access Denied: Role not permitted.', 16, 1);
-            RETURN;
-        END
-    END
-    ELSE
-    BEGIN
-        -- Case B: Minimum-role (hierarchy) e.g. RequiredRole='Instructor'
-        DECLARE @RequiredRank INT;
-
-        SELECT @RequiredRank = Rank
-        FROM dbo.RBAC_RANK
-        WHERE RoleName = @RequiredRole;
-
-        IF @RequiredRank IS NULL
-        BEGIN
-            RAISERROR('Access Denied: Required role rank missing (RBAC_RANK).', 16, 1);
-            RETURN;
-        END
-
-        IF @UserRank < @RequiredRank
-        BEGIN
-            RAISERROR('Access Denied: Role not permitted.', 16, 1);
-            RETURN;
-        END
-    END
-
-    -----------------------------------------------------
-    -- MLS: Bell–LaPadula
-    -----------------------------------------------------
-    -- ✅ No Read Up
-    IF @Mode = 'READ' AND @UserClearance < @RequiredClearance
-    BEGIN
-        RAISERROR('MLS Violation: No Read Up.', 16, 1);
-        RETURN;
-    END
-
-    -- ✅ No Write Down
-    IF @Mode = 'WRITE' AND @UserClearance > @RequiredClearance
-    BEGIN
-        RAISERROR('MLS Violation: No Write Down.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
-/* ===========================
-   END OF PART 3 (FINAL)
-   =========================== */
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-/* =========================================================
-   SRMS_DB — Term Project (FINAL) — Part 4
-   Views (By Role) + Inference Control Views (No Decrypt Here)
-
-   Depends on:
-     - Part 1 (Tables)
-     - Part 2 (DENY direct table access)
-     - Part 3 (encryption infra for later SPs)
-
-   IMPORTANT:
-     - Do NOT decrypt inside views.
-       Decryption happens in Stored Procedures (Part 5) after sp_Key_Open.
-
-   CRITICAL (Compatibility with Part 2):
-     - Since Part 2 DENY SELECT on tables for all roles,
-       users must be granted SELECT on VIEWS ONLY.
-   ========================================================= */
-
----------------------------------------------------------
--- Part 4.1 — PUBLIC VIEWS (Guestrole)
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_Course_Public', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Course_Public;
-GO
-
-CREATE VIEW dbo.vw_Course_Public
-AS
-SELECT
-    CourseID,
-    CourseName,
-    Description,
-    PublicInfo
-FROM dbo.COURSE
-WHERE IsDeleted = 0
-  AND ClearanceLevel = 1;
-GO
-
----------------------------------------------------------
--- Part 4.2 — ADMIN VIEWS
--- Admin typically needs full visibility (including deleted),
--- but you can add filters if you prefer.
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_Admin_Students', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_Students;
-GO
-
-CREATE VIEW dbo.vw_Admin_Students
-AS
-SELECT
-    StudentID,
-    FullName,
-    Email,
-    DOB,
-    Department,
-    ClearanceLevel,
-    IsDeleted
-FROM dbo.STUDENT;
-GO
-
-IF OBJECT_ID('dbo.vw_Admin_Instructors', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_Instructors;
-GO
-
-CREATE VIEW dbo.vw_Admin_Instructors
-AS
-SELECT
-    InstructorID,
-    FullName,
-    Email,
-    ClearanceLevel,
-    IsDeleted
-FROM dbo.INSTRUCTOR;
-GO
-
-IF OBJECT_ID('dbo.vw_Admin_TAs', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_TAs;
-GO
-
-CREATE VIEW dbo.vw_Admin_TAs
-AS
-SELECT
-    TAID,
-    FullName,
-    Email,
-    ClearanceLevel,
-    IsDeleted
-FROM dbo.TA;
-GO
-
-IF OBJECT_ID('dbo.vw_Admin_Courses', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_Courses;
-GO
-
-CREATE VIEW dbo.vw_Admin_Courses
-AS
-SELECT
-    CourseID,
-    CourseName,
-    Description,
-    PublicInfo,
-    ClearanceLevel,
-    IsDeleted
-FROM dbo.COURSE;
-GO
-
-IF OBJECT_ID('dbo.vw_Admin_Users', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_Users;
-GO
-
-CREATE VIEW dbo.vw_Admin_Users
-AS
-SELECT
-    Username,
-    Role,
-    ClearanceLevel,
-    StudentID,
-    InstructorID,
-    TAID,
-    IsDeleted
-FROM dbo.USERS;
-GO
-
-IF OBJECT_ID('dbo.vw_Admin_RoleRequests', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_RoleRequests;
-GO
-
-CREATE VIEW dbo.vw_Admin_RoleRequests
-AS
-SELECT
-    RequestID,
-    Username,
-    CurrentRole,
-    RequestedRole,
-    Reason,
-    Comments,
-    Status,
-    DateSubmitted
-FROM dbo.ROLE_REQUESTS;
-GO
-
-IF OBJECT_ID('dbo.vw_Admin_Logs', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Admin_Logs;
-GO
-
-CREATE VIEW dbo.vw_Admin_Logs
-AS
-SELECT
-    LogID,
-    Username,
-    Action,
-    Details,
-    LogTime
-FROM dbo.LOGS;
-GO
-
----------------------------------------------------------
--- Part 4.3 — INSTRUCTOR VIEWS (scoped by Username)
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_Instructor_Courses', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Instructor_Courses;
-GO
-
-CREATE VIEW dbo.vw_Instructor_Courses
-AS
-SELECT
-    U.Username,
-    IC.InstructorID,
-    C.CourseID,
-    C.CourseName,
-    C.Description,
-    C.PublicInfo,
-    C.ClearanceLevel
-FROM dbo.INSTRUCTOR_COURSE IC
-JOIN dbo.USERS U
-    ON U.InstructorID = IC.InstructorID
-JOIN dbo.COURSE C
-    ON C.CourseID = IC.CourseID
-WHERE U.IsDeleted = 0
-  AND C.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_Instructor_Students', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Instructor_Students;
-GO
-
-CREATE VIEW dbo.vw_Instructor_Students
-AS
-SELECT DISTINCT
-    U.Username,
-    IC.InstructorID,
-    CS.CourseID,
-    S.StudentID,
-    S.FullName,
-    S.Email,
-    S.Department
-FROM dbo.INSTRUCTOR_COURSE IC
-JOIN dbo.USERS U
-    ON U.InstructorID = IC.InstructorID
-JOIN dbo.COURSE_STUDENT CS
-    ON CS.CourseID = IC.CourseID
-JOIN dbo.STUDENT S
-    ON S.StudentID = CS.StudentID
-WHERE U.IsDeleted = 0
-  AND S.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_Instructor_Grades', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Instructor_Grades;
-GO
-
-CREATE VIEW dbo.vw_Instructor_Grades
-AS
-SELECT
-    U.Username,
-    IC.InstructorID,
-    G.GradeID,
-    G.StudentID,
-    G.CourseID,
-    G.DateEntered,
-    G.EncryptedGradeValue
-FROM dbo.INSTRUCTOR_COURSE IC
-JOIN dbo.USERS U
-    ON U.InstructorID = IC.InstructorID
-JOIN dbo.GRADES G
-    ON G.CourseID = IC.CourseID
-WHERE U.IsDeleted = 0
-  AND G.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_Instructor_Attendance', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Instructor_Attendance;
-GO
-
-CREATE VIEW dbo.vw_Instructor_Attendance
-AS
-SELECT
-    U.Username,
-    IC.InstructorID,
-    A.AttendanceID,
-    A.StudentID,
-    A.CourseID,
-    A.Status,
-    A.DateRecorded
-FROM dbo.INSTRUCTOR_COURSE IC
-JOIN dbo.USERS U
-    ON U.InstructorID = IC.InstructorID
-JOIN dbo.ATTENDANCE A
-    ON A.CourseID = IC.CourseID
-WHERE U.IsDeleted = 0
-  AND A.IsDeleted = 0;
-GO
-
----------------------------------------------------------
--- Part 4.4 — TA VIEWS (scoped by TAUsername)
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_TA_Courses', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_TA_Courses;
-GO
-
-CREATE VIEW dbo.vw_TA_Courses
-AS
-SELECT
-    TC.TAUsername,
-    TC.CourseID,
-    C.CourseName,
-    C.Description,
-    C.PublicInfo,
-    C.ClearanceLevel
-FROM dbo.TA_COURSE TC
-JOIN dbo.COURSE C
-    ON C.CourseID = TC.CourseID
-JOIN dbo.USERS U
-    ON U.Username = TC.TAUsername
-WHERE U.IsDeleted = 0
-  AND C.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_TA_Students', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_TA_Students;
-GO
-
-CREATE VIEW dbo.vw_TA_Students
-AS
-SELECT DISTINCT
-    TC.TAUsername,
-    CS.CourseID,
-    S.StudentID,
-    S.FullName,
-    S.Email,
-    S.Department
-FROM dbo.TA_COURSE TC
-JOIN dbo.USERS U
-    ON U.Username = TC.TAUsername
-JOIN dbo.COURSE_STUDENT CS
-    ON CS.CourseID = TC.CourseID
-JOIN dbo.STUDENT S
-    ON S.StudentID = CS.StudentID
-WHERE U.IsDeleted = 0
-  AND S.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_TA_Attendance', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_TA_Attendance;
-GO
-
-CREATE VIEW dbo.vw_TA_Attendance
-AS
-SELECT
-    TC.TAUsername,
-    A.AttendanceID,
-    A.StudentID,
-    A.CourseID,
-    A.Status,
-    A.DateRecorded
-FROM dbo.TA_COURSE TC
-JOIN dbo.USERS U
-    ON U.Username = TC.TAUsername
-JOIN dbo.ATTENDANCE A
-    ON A.CourseID = TC.CourseID
-WHERE U.IsDeleted = 0
-  AND A.IsDeleted = 0;
-GO
-
----------------------------------------------------------
--- Part 4.5 — STUDENT VIEWS (self scoped by Username)
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_Student_Self', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Student_Self;
-GO
-
-CREATE VIEW dbo.vw_Student_Self
-AS
-SELECT
-    U.Username,
-    S.StudentID,
-    S.FullName,
-    S.Email,
-    S.DOB,
-    S.Department,
-    S.EncryptedPhone
-FROM dbo.USERS U
-JOIN dbo.STUDENT S
-    ON S.StudentID = U.StudentID
-WHERE U.IsDeleted = 0
-  AND S.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_Student_Courses', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Student_Courses;
-GO
-
-CREATE VIEW dbo.vw_Student_Courses
-AS
-SELECT
-    U.Username,
-    CS.StudentID,
-    C.CourseID,
-    C.CourseName,
-    C.Description,
-    C.PublicInfo,
-    C.ClearanceLevel
-FROM dbo.USERS U
-JOIN dbo.COURSE_STUDENT CS
-    ON CS.StudentID = U.StudentID
-JOIN dbo.COURSE C
-    ON C.CourseID = CS.CourseID
-WHERE U.IsDeleted = 0
-  AND C.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_Student_Grades', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Student_Grades;
-GO
-
-CREATE VIEW dbo.vw_Student_Grades
-AS
-SELECT
-    U.Username,
-    G.GradeID,
-    G.StudentID,
-    G.CourseID,
-    G.DateEntered,
-    G.EncryptedGradeValue
-FROM dbo.USERS U
-JOIN dbo.GRADES G
-    ON G.StudentID = U.StudentID
-WHERE U.IsDeleted = 0
-  AND G.IsDeleted = 0;
-GO
-
-IF OBJECT_ID('dbo.vw_Student_Attendance', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Student_Attendance;
-GO
-
-CREATE VIEW dbo.vw_Student_Attendance
-AS
-SELECT
-    U.Username,
-    A.AttendanceID,
-    A.StudentID,
-    A.CourseID,
-    A.Status,
-    A.DateRecorded
-FROM dbo.USERS U
-JOIN dbo.ATTENDANCE A
-    ON A.StudentID = U.StudentID
-WHERE U.IsDeleted = 0
-  AND A.IsDeleted = 0;
-GO
-
----------------------------------------------------------
--- Part 4.6 — INFERENCE CONTROL (Query Set Size ≥ 3)
--- IMPORTANT: No Decrypt in views.
--- We'll implement AvgGrade in SP in Part 5 (open key + decrypt + HAVING >=3).
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_Grades_GroupSize_Safe', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Grades_GroupSize_Safe;
-GO
-
-CREATE VIEW dbo.vw_Grades_GroupSize_Safe
-AS
-SELECT
-    CourseID,
-    COUNT(*) AS StudentCount
-FROM dbo.GRADES
-WHERE IsDeleted = 0
-GROUP BY CourseID
-HAVING COUNT(*) >= 3;
-GO
-
-IF OBJECT_ID('dbo.vw_Attendance_Aggregate_Safe', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Attendance_Aggregate_Safe;
-GO
-
-CREATE VIEW dbo.vw_Attendance_Aggregate_Safe
-AS
-SELECT
-    CourseID,
-    COUNT(*) AS TotalRecords,
-    SUM(CASE WHEN Status = 1 THEN 1 ELSE 0 END) AS PresentCount
-FROM dbo.ATTENDANCE
-WHERE IsDeleted = 0
-GROUP BY CourseID
-HAVING COUNT(*) >= 3;
-GO
-
----------------------------------------------------------
--- Part 4.7 — GRANT SELECT ON VIEWS (Required with Part 2 DENY)
----------------------------------------------------------
-
--- Guestrole (public)
-GRANT SELECT ON dbo.vw_Course_Public TO [Guestrole];
-
--- Admin (full admin views)
-GRANT SELECT ON dbo.vw_Admin_Students      TO [Admin];
-GRANT SELECT ON dbo.vw_Admin_Instructors   TO [Admin];
-GRANT SELECT ON dbo.vw_Admin_TAs           TO [Admin];
-GRANT SELECT ON dbo.vw_Admin_Courses       TO [Admin];
-GRANT SELECT ON dbo.vw_Admin_Users         TO [Admin];
-GRANT SELECT ON dbo.vw_Admin_RoleRequests  TO [Admin];
-GRANT SELECT ON dbo.vw_Admin_Logs          TO [Admin];
-
--- Instructor
-GRANT SELECT ON dbo.vw_Instructor_Courses     TO [Instructor];
-GRANT SELECT ON dbo.vw_Instructor_Students    TO [Instructor];
-GRANT SELECT ON dbo.vw_Instructor_Grades      TO [Instructor];
-GRANT SELECT ON dbo.vw_Instructor_Attendance  TO [Instructor];
-
--- TA
-GRANT SELECT ON dbo.vw_TA_Courses     TO [TA];
-GRANT SELECT ON dbo.vw_TA_Students    TO [TA];
-GRANT SELECT ON dbo.vw_TA_Attendance  TO [TA];
-
--- Student
-GRANT SELECT ON dbo.vw_Student_Self        TO [Student];
-GRANT SELECT ON dbo.vw_Student_Courses     TO [Student];
-GRANT SELECT ON dbo.vw_Student_Grades      TO [Student];
-GRANT SELECT ON dbo.vw_Student_Attendance  TO [Student];
-
--- Safe aggregate (optional, if you want to expose safely)
--- You can grant these to Instructor/TA/Admin depending on requirements:
-GRANT SELECT ON dbo.vw_Grades_GroupSize_Safe      TO [Instructor];
-GRANT SELECT ON dbo.vw_Attendance_Aggregate_Safe  TO [Instructor];
-
-GRANT SELECT ON dbo.vw_Grades_GroupSize_Safe      TO [Admin];
-GRANT SELECT ON dbo.vw_Attendance_Aggregate_Safe  TO [Admin];
-GO
-
-/* ===========================
-   END OF PART 4 (FINAL)
-   =========================== */
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-/* =========================================================
-   SRMS_DB — Term Project (FINAL)
-   Part 5A — Shared Helpers + Student Procedures (FINAL)
-
-   Depends on:
-     - Part 1 (Schema + Tables)
-     - Part 2 (EXECUTE-only + DENY table access)
-     - Part 3 (Encryption infra + sp_Key_Open/sp_Key_Close + sp_LogAction + sp_CheckAccess)
-     - Part 4 (Views without decrypt)
-
-   Notes:
-     - All reads/writes via Stored Procedures only.
-     - Decrypt happens ONLY inside SPs after sp_Key_Open.
-   ========================================================= */
-
-/* =========================================================
-   SHARED HELPERS (Common validations)
-   ========================================================= */
-
----------------------------------------------------------
--- Helper: Ensure Course exists and is active
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureCourseActive','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__EnsureCourseActive;
-GO
-CREATE PROCEDURE dbo.sp__EnsureCourseActive
-(
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF @CourseID IS NULL
-    BEGIN
-        RAISERROR('CourseID is required.', 16, 1);
-        RETURN;
-    END
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.COURSE
-        WHERE CourseID = @CourseID
-          AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('Course not found or deleted.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
----------------------------------------------------------
--- Helper: Ensure Student exists and is active
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureStudentActive','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__EnsureStudentActive;
-GO
-CREATE PROCEDURE dbo.sp__EnsureStudentActive
-(
-    @StudentID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF @StudentID IS NULL
-    BEGIN
-        RAISERROR('StudentID is required.', 16, 1);
-        RETURN;
-    END
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.STUDENT
-        WHERE StudentID = @StudentID
-          AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('Student not found or deleted.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
----------------------------------------------------------
--- Helper: Resolve current StudentID for a Student user (active linkage)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__GetCurrentStudentID','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__GetCurrentStudentID;
-GO
-CREATE PROCEDURE dbo.sp__GetCurrentStudentID
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID INT OUTPUT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    SET @CurrentUsername = LTRIM(RTRIM(@CurrentUsername));
-
-    IF @CurrentUsername IS NULL OR @CurrentUsername = ''
-    BEGIN
-        RAISERROR('Missing username.', 16, 1);
-        RETURN;
-    END
-
-    SELECT @StudentID = U.StudentID
-    FROM dbo.USERS U
-    WHERE U.Username = @CurrentUsername
-      AND U.IsDeleted = 0
-      AND U.Role = 'Student';
-
-    IF @StudentID IS NULL
-    BEGIN
-        RAISERROR('Student linkage not found or user is not an active Student.', 16, 1);
-        RETURN;
-    END
-
-    -- Ensure underlying student row is active
-    IF NOT EXISTS (SELECT 1 FROM dbo.STUDENT WHERE StudentID = @StudentID AND IsDeleted = 0)
-    BEGIN
-        RAISERROR('Linked student record not found or deleted.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
-
-/* =========================================================
-   SECTION A — STUDENT PROCEDURES
-   ========================================================= */
-
----------------------------------------------------------
--- A1. Student: View Own Profile (Decrypt Phone)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Student_ViewProfile','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Student_ViewProfile;
-GO
-CREATE PROCEDURE dbo.sp_Student_ViewProfile
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Student',
-        @RequiredClearance = 2,
-        @Mode              = 'READ';
-
-    DECLARE @StudentID INT;
-    EXEC dbo.sp__GetCurrentStudentID
-        @CurrentUsername = @CurrentUsername,
-        @StudentID = @StudentID OUTPUT;
-
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        SELECT
-            S.StudentID,
-            S.FullName,
-            S.Email,
-            S.DOB,
-            S.Department,
-            CONVERT(NVARCHAR(20), DecryptByKey(S.EncryptedPhone)) AS Phone
-        FROM dbo.STUDENT S
-        WHERE S.StudentID = @StudentID
-          AND S.IsDeleted = 0;
-
-        EXEC dbo.sp_Key_Close;
-
-        DECLARE @Details NVARCHAR(4000);
-        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
-
-        EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'STUDENT_VIEW_PROFILE',
-        @Details  = @Details;
-
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
-
----------------------------------------------------------
--- A2. Student: Update Own Phone (Encrypt)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Student_UpdateOwnPhone','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Student_UpdateOwnPhone;
-GO
-CREATE PROCEDURE dbo.sp_Student_UpdateOwnPhone
-(
-    @CurrentUsername NVARCHAR(50),
-    @NewPhone        NVARCHAR(20)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Student',
-        @RequiredClearance = 2,
-        @Mode              = 'WRITE';
-
-    SET @NewPhone = LTRIM(RTRIM(@NewPhone));
-    IF @NewPhone IS NULL OR @NewPhone = ''
-    BEGIN
-        RAISERROR('NewPhone is required.', 16, 1);
-        RETURN;
-    END
-
-    DECLARE @StudentID INT;
-    EXEC dbo.sp__GetCurrentStudentID
-        @CurrentUsername = @CurrentUsername,
-        @StudentID = @StudentID OUTPUT;
-
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        UPDATE dbo.STUDENT
-        SET EncryptedPhone = EncryptByKey(Key_GUID('SRMSSymmetricKey'), @NewPhone)
-        WHERE StudentID = @StudentID
-          AND IsDeleted = 0;
-
-        EXEC dbo.sp_Key_Close;
-
-		DECLARE @Details NVARCHAR(4000);
-        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'STUDENT_UPDATE_PHONE',
-            @Details = @Details ;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-
-END
-GO
-
-
----------------------------------------------------------
--- A3. Student: View Own Courses
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Student_ViewCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Student_ViewCourses;
-GO
-CREATE PROCEDURE dbo.sp_Student_ViewCourses
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Student',
-        @RequiredClearance = 1,
-        @Mode              = 'READ';
-
-    DECLARE @StudentID INT;
-    EXEC dbo.sp__GetCurrentStudentID
-        @CurrentUsername = @CurrentUsername,
-        @StudentID = @StudentID OUTPUT;
-
-    SELECT
-        C.CourseID,
-        C.CourseName,
-        C.Description,
-        C.PublicInfo
-    FROM dbo.COURSE_STUDENT CS
-    JOIN dbo.COURSE C ON C.CourseID = CS.CourseID
-    WHERE CS.StudentID = @StudentID
-      AND C.IsDeleted = 0;
-
-	  DECLARE @Details NVARCHAR(4000);
-        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'STUDENT_VIEW_COURSES',
-        @Details  = @Details;
-END
-GO
-
-
----------------------------------------------------------
--- A4. Student: View Own Grades (Decrypt)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Student_ViewGrades','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Student_ViewGrades;
-GO
-
-CREATE PROCEDURE dbo.sp_Student_ViewGrades
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -------------------------------------------------
-    -- Student only (Clearance = 2)
-    -------------------------------------------------
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Student',
-        @RequiredClearance = 2,
-        @Mode              = 'READ';
-
-    -------------------------------------------------
-    -- Get StudentID safely
-    -------------------------------------------------
-    DECLARE @StudentID INT;
-    EXEC dbo.sp__GetCurrentStudentID
-        @CurrentUsername = @CurrentUsername,
-        @StudentID = @StudentID OUTPUT;
-
-    IF @StudentID IS NULL
-        RAISERROR('Student profile not found.',16,1);
-
-    -------------------------------------------------
-    -- View Grades (MLS SAFE)
-    -------------------------------------------------
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        SELECT
-            G.GradeID,
-            G.CourseID,
-            C.CourseName,
-            TRY_CONVERT(
-                DECIMAL(10,2),
-                CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))
-            ) AS Grade,
-            G.DateEntered
-        FROM dbo.GRADES G
-        JOIN dbo.COURSE C
-            ON C.CourseID = G.CourseID
-        WHERE G.StudentID = @StudentID
-          AND G.IsDeleted = 0
-          AND C.IsDeleted = 0
-          AND C.ClearanceLevel <= 2   -- ✅ MLS FILTER
-          AND G.EncryptedGradeValue IS NOT NULL;
-
-        EXEC dbo.sp_Key_Close;
-
-        -------------------------------------------------
-        -- Audit
-        -------------------------------------------------
-        DECLARE @Details NVARCHAR(4000);
-        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
-
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'STUDENT_VIEW_GRADES',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-        DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-        RAISERROR(@Err, 16, 1);
-        RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- A5. Student: View Own Attendance (SAFE - MLS)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Student_ViewAttendance','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Student_ViewAttendance;
-GO
-
-CREATE PROCEDURE dbo.sp_Student_ViewAttendance
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -------------------------------------------------
-    -- Student only (CLEARANCE = 2)
-    -------------------------------------------------
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Student',
-        @RequiredClearance = 2,
-        @Mode              = 'READ';
-
-    -------------------------------------------------
-    -- Get StudentID safely
-    -------------------------------------------------
-    DECLARE @StudentID INT;
-    EXEC dbo.sp__GetCurrentStudentID
-        @CurrentUsername = @CurrentUsername,
-        @StudentID       = @StudentID OUTPUT;
-
-    IF @StudentID IS NULL
-        RAISERROR('Student profile not found.',16,1);
-
-    -------------------------------------------------
-    -- SAFE MLS QUERY
-    -------------------------------------------------
-    SELECT
-        A.AttendanceID,
-        C.CourseName,
-        CASE A.Status
-            WHEN 1 THEN 'Present'
-            WHEN 0 THEN 'Absent'
-            ELSE 'Unknown'
-        END AS StatusText,
-        A.DateRecorded
-    FROM dbo.ATTENDANCE A
-    JOIN dbo.COURSE C
-        ON A.CourseID = C.CourseID
-    WHERE A.StudentID = @StudentID
-      AND A.IsDeleted = 0
-      AND C.IsDeleted = 0
-      AND C.ClearanceLevel <= 2;   -- 🔐 MLS FILTER
-
-    -------------------------------------------------
-    -- Audit log
-    -------------------------------------------------
-    DECLARE @Details NVARCHAR(4000);
-    SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'STUDENT_VIEW_ATTENDANCE',
-        @Details  = @Details;
-END
-GO
-
-
-
-
-/* ===========================
-   END OF PART 5A
-   =========================== */
-
-
-
-
-
-
-
-
-
-
-
-
-/* =========================================================
-   SRMS_DB — Term Project (FINAL)
-   Part 5B — Instructor Procedures
-
-   Depends on:
-     Part 1, Part 2, Part 3, Part 4
-   Requires Part 5A helpers:
-     - sp__EnsureCourseActive
-     - sp__EnsureStudentActive
-   ========================================================= */
-
-USE SRMS_DB;
-GO
-
-/* =========================================================
-   SHARED (Instructor Ownership Helper)
-   ========================================================= */
-
----------------------------------------------------------
--- Helper: Ensure Instructor owns the course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureInstructorOwnsCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__EnsureInstructorOwnsCourse;
-GO
-CREATE PROCEDURE dbo.sp__EnsureInstructorOwnsCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.USERS U
-        JOIN dbo.INSTRUCTOR_COURSE IC ON IC.InstructorID = U.InstructorID
-        WHERE U.Username = @CurrentUsername
-          AND U.IsDeleted = 0
-          AND IC.CourseID = @CourseID
-    )
-    BEGIN
-        RAISERROR('Access Denied: Course not assigned to this instructor.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
-/* =========================================================
-   SECTION B — INSTRUCTOR PROCEDURES
-   ========================================================= */
-
----------------------------------------------------------
--- B1. Instructor: View Courses
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_ViewCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_ViewCourses;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_ViewCourses
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 1,
-        @Mode              = 'READ';
-
-    SELECT
-        C.CourseID,
-        C.CourseName,
-        C.Description,
-        C.PublicInfo
-    FROM dbo.USERS U
-    JOIN dbo.INSTRUCTOR_COURSE IC ON IC.InstructorID = U.InstructorID
-    JOIN dbo.COURSE C ON C.CourseID = IC.CourseID
-    WHERE U.Username = @CurrentUsername
-      AND U.IsDeleted = 0
-      AND C.IsDeleted = 0;
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_VIEW_COURSES',
-        @Details  = NULL;
-END
-GO
-
----------------------------------------------------------
--- B2. Instructor: View Students By Course (owned course)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_ViewStudentsByCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_ViewStudentsByCourse;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_ViewStudentsByCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 2,
-        @Mode              = 'READ';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    SELECT
-        S.StudentID,
-        S.FullName,
-        S.Email,
-        S.Department
-    FROM dbo.COURSE_STUDENT CS
-    JOIN dbo.STUDENT S ON S.StudentID = CS.StudentID
-    WHERE CS.CourseID = @CourseID
-      AND S.IsDeleted = 0;
-
-	  DECLARE @Details NVARCHAR(4000);
-      SET @Details = N'CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_VIEW_STUDENTS_BY_COURSE',
-        @Details  = @CourseID ;
-END
-GO
-
----------------------------------------------------------
--- B3. Instructor: Insert/Update Grade (Encrypt)  [Create/Update]
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_SaveGrade','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_SaveGrade;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_SaveGrade
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID INT,
-    @CourseID  INT,
-    @Grade     DECIMAL(5,2)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -- WRITE at Instructor level to avoid MLS "No Write Down" false blocks
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 4,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive  @CourseID;
-    EXEC dbo.sp__EnsureStudentActive @StudentID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    -- Enrollment validation
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.COURSE_STUDENT
-        WHERE CourseID = @CourseID
-          AND StudentID = @StudentID
-    )
-    BEGIN
-        RAISERROR('Student is not enrolled in this course.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        MERGE dbo.GRADES AS tgt
-        USING (SELECT @StudentID AS StudentID, @CourseID AS CourseID) src
-        ON (tgt.StudentID = src.StudentID AND tgt.CourseID = src.CourseID)
-        WHEN MATCHED THEN
-            UPDATE SET
-                EncryptedGradeValue =
-                    EncryptByKey(Key_GUID('SRMSSymmetricKey'), CAST(@Grade AS NVARCHAR(20))),
-                DateEntered = GETDATE(),
-                IsDeleted = 0
-        WHEN NOT MATCHED THEN
-            INSERT (StudentID, CourseID, EncryptedGradeValue)
-            VALUES (
-                @StudentID,
-                @CourseID,
-                EncryptByKey(Key_GUID('SRMSSymmetricKey'), CAST(@Grade AS NVARCHAR(20)))
-            );
-
-        EXEC dbo.sp_Key_Close;
-
-        DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
-           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-
-        EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_SAVE_GRADE',
-        @Details  = @Details;
-
-    END TRY
-    BEGIN CATCH
-        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
-        THROW;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- B4. Instructor: Get Grade (by student+course) [Read]
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_GetGrade','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_GetGrade;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_GetGrade
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID INT,
-    @CourseID  INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 3,
-        @Mode              = 'READ';
-
-    EXEC dbo.sp__EnsureCourseActive  @CourseID;
-    EXEC dbo.sp__EnsureStudentActive @StudentID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        SELECT
-            G.GradeID,
-            G.StudentID,
-            G.CourseID,
-            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))) AS Grade,
-            G.DateEntered,
-            G.IsDeleted
-        FROM dbo.GRADES G
-        WHERE G.StudentID = @StudentID
-          AND G.CourseID  = @CourseID;
-
-        EXEC dbo.sp_Key_Close;
-
-        DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
-           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-
-        EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_GET_GRADE',
-        @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
-        THROW;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- B5. Instructor: View Grades By Course (owned course) [Read]
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_ViewGradesByCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_ViewGradesByCourse;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_ViewGradesByCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 3,
-        @Mode              = 'READ';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        SELECT
-            G.GradeID,
-            G.StudentID,
-            S.FullName,
-            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))) AS Grade,
-            G.DateEntered
-        FROM dbo.GRADES G
-        JOIN dbo.STUDENT S ON S.StudentID = G.StudentID
-        WHERE G.CourseID = @CourseID
-          AND G.IsDeleted = 0
-          AND S.IsDeleted = 0
-          AND G.EncryptedGradeValue IS NOT NULL;
-
-        EXEC dbo.sp_Key_Close;
-
-		
-        DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-
-
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'INSTRUCTOR_VIEW_GRADES_BY_COURSE',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
-        THROW;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- B6. Instructor: Delete Grade (soft delete) [Delete]
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_DeleteGrade','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_DeleteGrade;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_DeleteGrade
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID INT,
-    @CourseID  INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -- WRITE at Instructor level to avoid MLS false blocks
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 4,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive  @CourseID;
-    EXEC dbo.sp__EnsureStudentActive @StudentID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    UPDATE dbo.GRADES
-    SET IsDeleted = 1
-    WHERE StudentID = @StudentID
-      AND CourseID  = @CourseID;
-
-	DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
-           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_DELETE_GRADE',
-        @Details  = @Details;
-END
-GO
-
----------------------------------------------------------
--- B7. Instructor: View Attendance By Course (owned course) [Read]
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_ViewAttendanceByCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_ViewAttendanceByCourse;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_ViewAttendanceByCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor',
-        @RequiredClearance = 3,
-        @Mode              = 'READ';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    SELECT
-        A.AttendanceID,
-        A.StudentID,
-        S.FullName,
-        A.Status,
-        A.DateRecorded
-    FROM dbo.ATTENDANCE A
-    JOIN dbo.STUDENT S ON S.StudentID = A.StudentID
-    WHERE A.CourseID = @CourseID
-      AND A.IsDeleted = 0
-      AND S.IsDeleted = 0;
-
-	DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_VIEW_ATTENDANCE_BY_COURSE',
-        @Details  = @Details;
-END
-GO
-
-
----------------------------------------------------------
--- B8. Instructor
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_ViewProfile','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_ViewProfile;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_ViewProfile
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Instructor',4,'READ';
-
-    SELECT
-        I.InstructorID,
-        I.FullName,
-        I.Email,
-        I.ClearanceLevel
-    FROM dbo.USERS U
-    JOIN dbo.INSTRUCTOR I
-        ON I.InstructorID = U.InstructorID
-    WHERE U.Username = @CurrentUsername
-      AND U.IsDeleted = 0
-      AND I.IsDeleted = 0;
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_VIEW_PROFILE',
-        @Details  = NULL;
-END
-GO
-
----------------------------------------------------------
--- B9. Instructor
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_UpdateProfile','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_UpdateProfile;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_UpdateProfile
-(
-    @CurrentUsername NVARCHAR(50),
-    @FullName NVARCHAR(100) = NULL,
-    @Email    NVARCHAR(100) = NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Instructor',4,'WRITE';
-
-    UPDATE I
-    SET
-        FullName = COALESCE(NULLIF(LTRIM(RTRIM(@FullName)),''), FullName),
-        Email    = COALESCE(NULLIF(LTRIM(RTRIM(@Email)),''), Email)
-    FROM dbo.INSTRUCTOR I
-    JOIN dbo.USERS U ON U.InstructorID = I.InstructorID
-    WHERE U.Username = @CurrentUsername
-      AND U.IsDeleted = 0
-      AND I.IsDeleted = 0;
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'INSTRUCTOR_UPDATE_PROFILE',
-        @Details  = NULL;
-END
-GO
-
----------------------------------------------------------
--- B10. Instructor
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_GetMyCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_GetMyCourses;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_GetMyCourses
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Instructor',1,'READ';
-
-    SELECT
-        C.CourseID,
-        C.CourseName
-    FROM dbo.USERS U
-    JOIN dbo.INSTRUCTOR_COURSE IC ON IC.InstructorID = U.InstructorID
-    JOIN dbo.COURSE C ON C.CourseID = IC.CourseID
-    WHERE U.Username = @CurrentUsername
-      AND U.IsDeleted = 0
-      AND C.IsDeleted = 0
-    ORDER BY C.CourseName;
-END
-GO
-
----------------------------------------------------------
--- B11. Instructor
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_GetMyStudentsByCourse_UI','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_GetMyStudentsByCourse_UI;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_GetMyStudentsByCourse_UI
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Instructor',2,'READ';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    SELECT
-        S.StudentID,
-        S.FullName
-    FROM dbo.COURSE_STUDENT CS
-    JOIN dbo.STUDENT S ON S.StudentID = CS.StudentID
-    WHERE CS.CourseID = @CourseID
-      AND S.IsDeleted = 0
-    ORDER BY S.FullName;
-END
-GO
-
-
----------------------------------------------------------
--- B12. Instructor
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Instructor_GetMyTAsByCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Instructor_GetMyTAsByCourse;
-GO
-CREATE PROCEDURE dbo.sp_Instructor_GetMyTAsByCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Instructor',3,'READ';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    SELECT
-        TC.TAUsername
-    FROM dbo.TA_COURSE TC
-    WHERE TC.CourseID = @CourseID
-    ORDER BY TC.TAUsername;
-END
-GO
-
-
-
-/* ===========================
-   END OF PART 5B
-   =========================== */
-
-
-
-
-
-
-
-   /* =========================================================
-   SRMS_DB — Term Project (FINAL)
-   Part 5C — TA Procedures (Complete, Final)
-
-   Includes:
-     - sp__EnsureTAOwnsCourse
-     - sp_TA_ViewCourses
-     - sp_TA_ViewStudentsByCourse
-     - sp_TA_RecordAttendance   (MERGE per day, no duplicates)
-     - sp_TA_UpdateAttendance   (must belong to TA course)
-     - sp_TA_DeleteAttendance   (soft delete, must belong to TA course)
-
-   Depends on:
-     - Part 1 (tables)
-     - Part 2 (DENY direct table access + EXECUTE-only)
-     - Part 3 (sp_CheckAccess, sp_LogAction)
-     - Part 5A shared helpers (sp__EnsureCourseActive, sp__EnsureStudentActive)
-   ========================================================= */
-
-USE SRMS_DB;
-GO
-
-/* =========================================================
-   HELPER — Ensure TA owns course
-   ========================================================= */
-IF OBJECT_ID('dbo.sp__EnsureTAOwnsCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__EnsureTAOwnsCourse;
-GO
-
-CREATE PROCEDURE dbo.sp__EnsureTAOwnsCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.TA_COURSE TC
-        JOIN dbo.USERS U
-          ON U.Username = TC.TAUsername
-        WHERE TC.TAUsername = @CurrentUsername
-          AND TC.CourseID   = @CourseID
-          AND U.IsDeleted   = 0
-    )
-    BEGIN
-        RAISERROR('Access Denied: Course not assigned to this TA.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
-/* =========================================================
-   C1 — TA: View Courses
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_TA_ViewCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_TA_ViewCourses;
-GO
-
-CREATE PROCEDURE dbo.sp_TA_ViewCourses
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'TA',
-        @RequiredClearance = 1,
-        @Mode              = 'READ';
-
-    SELECT
-        C.CourseID,
-        C.CourseName,
-        C.Description,
-        C.PublicInfo
-    FROM dbo.TA_COURSE TC
-    JOIN dbo.COURSE C
-      ON C.CourseID = TC.CourseID
-    JOIN dbo.USERS U
-      ON U.Username = TC.TAUsername
-    WHERE TC.TAUsername = @CurrentUsername
-      AND U.IsDeleted = 0
-      AND C.IsDeleted = 0;
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'TA_VIEW_COURSES',
-        @Details  = NULL;
-END
-GO
-
-/* =========================================================
-   C2 — TA: View Students By Course (TA assigned)
-   ========================================================= */
----------------------------------------------------------
--- C2 — TA: View Students By Course (OPTIONAL CourseID)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_TA_ViewStudentsByCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_TA_ViewStudentsByCourse;
-GO
-
-CREATE PROCEDURE dbo.sp_TA_ViewStudentsByCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID        INT = NULL   -- ✅ OPTIONAL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'TA',
-        @RequiredClearance = 2,
-        @Mode              = 'READ';
-
-    -- لو CourseID اتبعت → تأكيد إن الكورس للـ TA
-    IF @CourseID IS NOT NULL
-    BEGIN
-        EXEC dbo.sp__EnsureCourseActive @CourseID;
-        EXEC dbo.sp__EnsureTAOwnsCourse @CurrentUsername, @CourseID;
-    END
-
-    SELECT
-        S.StudentID,
-        S.FullName,
-        S.Email,
-        S.Department,
-        C.CourseName
-    FROM dbo.TA_COURSE TC
-    JOIN dbo.COURSE_STUDENT CS
-        ON CS.CourseID = TC.CourseID
-    JOIN dbo.STUDENT S
-        ON S.StudentID = CS.StudentID
-    JOIN dbo.COURSE C
-        ON C.CourseID = TC.CourseID
-    WHERE TC.TAUsername = @CurrentUsername
-      AND S.IsDeleted = 0
-      AND C.IsDeleted = 0
-      AND (
-            @CourseID IS NULL
-            OR TC.CourseID = @CourseID
-          );
-
-    DECLARE @Details NVARCHAR(4000);
-    SET @Details =
-        CASE
-            WHEN @CourseID IS NULL
-            THEN N'All courses'
-            ELSE N'CourseID=' + CAST(@CourseID AS NVARCHAR(20))
-        END;
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'TA_VIEW_STUDENTS',
-        @Details  = @Details;
-END
-GO
-
-
-/* =========================================================
-   C3 — TA: Record / Update Attendance (MERGE per day)
-   - No duplicates per student/course/day
-   - Must be TA assigned + student enrolled
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_TA_RecordAttendance','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_TA_RecordAttendance;
-GO
-
-CREATE PROCEDURE dbo.sp_TA_RecordAttendance
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID       INT,
-    @CourseID        INT,
-    @Status          BIT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'TA',
-        @RequiredClearance = 3,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureStudentActive @StudentID;
-    EXEC dbo.sp__EnsureTAOwnsCourse @CurrentUsername, @CourseID;
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.COURSE_STUDENT
-        WHERE CourseID = @CourseID
-          AND StudentID = @StudentID
-    )
-    BEGIN
-        RAISERROR('Student is not enrolled in this course.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        MERGE dbo.ATTENDANCE AS tgt
-        USING (
-            SELECT
-                @StudentID AS StudentID,
-                @CourseID  AS CourseID,
-                CAST(GETDATE() AS DATE) AS AttDate
-        ) AS src
-        ON (
-            tgt.StudentID = src.StudentID
-            AND tgt.CourseID = src.CourseID
-            AND CAST(tgt.DateRecorded AS DATE) = src.AttDate
-        )
-        WHEN MATCHED THEN
-            UPDATE SET
-                Status       = @Status,
-                DateRecorded = GETDATE(),
-                IsDeleted    = 0
-        WHEN NOT MATCHED THEN
-            INSERT (StudentID, CourseID, Status)
-            VALUES (@StudentID, @CourseID, @Status);
-
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
-           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'TA_RECORD_ATTENDANCE',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-        -- Keep same error message but bubble up properly
-        THROW;
-    END CATCH
-END
-GO
-
-/* =========================================================
-   C4 — TA: Update Attendance (by AttendanceID)
-   - Record must exist and be active
-   - Course must be assigned to TA
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_TA_UpdateAttendance','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_TA_UpdateAttendance;
-GO
-
-CREATE PROCEDURE dbo.sp_TA_UpdateAttendance
-(
-    @CurrentUsername NVARCHAR(50),
-    @AttendanceID    INT,
-    @Status          BIT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'TA',
-        @RequiredClearance = 3,
-        @Mode              = 'WRITE';
-
-    DECLARE @CourseID INT;
-
-    SELECT @CourseID = CourseID
-    FROM dbo.ATTENDANCE
-    WHERE AttendanceID = @AttendanceID
-      AND IsDeleted = 0;
-
-    IF @CourseID IS NULL
-    BEGIN
-        RAISERROR('Attendance record not found or deleted.', 16, 1);
-        RETURN;
-    END
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureTAOwnsCourse @CurrentUsername, @CourseID;
-
-    UPDATE dbo.ATTENDANCE
-    SET Status = @Status,
-        DateRecorded = GETDATE()
-    WHERE AttendanceID = @AttendanceID
-      AND IsDeleted = 0;
-
-	DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'AttendanceID=' + CAST(@AttendanceID AS NVARCHAR(20)) 
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'TA_UPDATE_ATTENDANCE',
-        @Details  = @Details;
-END
-GO
-
-/* =========================================================
-   C5 — TA: Delete Attendance (Soft Delete)
-   - Record must exist and be active
-   - Course must be assigned to TA
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_TA_DeleteAttendance','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_TA_DeleteAttendance;
-GO
-
-CREATE PROCEDURE dbo.sp_TA_DeleteAttendance
-(
-    @CurrentUsername NVARCHAR(50),
-    @AttendanceID    INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'TA',
-        @RequiredClearance = 3,
-        @Mode              = 'WRITE';
-
-    DECLARE @CourseID INT;
-
-    SELECT @CourseID = CourseID
-    FROM dbo.ATTENDANCE
-    WHERE AttendanceID = @AttendanceID
-      AND IsDeleted = 0;
-
-    IF @CourseID IS NULL
-    BEGIN
-        RAISERROR('Attendance record not found or already deleted.', 16, 1);
-        RETURN;
-    END
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureTAOwnsCourse @CurrentUsername, @CourseID;
-
-    UPDATE dbo.ATTENDANCE
-    SET IsDeleted = 1
-    WHERE AttendanceID = @AttendanceID
-      AND IsDeleted = 0;
-
-
-	DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'AttendanceID=' + CAST(@AttendanceID AS NVARCHAR(20)) 
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'TA_DELETE_ATTENDANCE',
-        @Details  = @Details;
-END
-GO
-
-
-
----------------------------------------------------------
--- C6 — TA: View Attendance (All courses assigned to TA)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_TA_ViewAttendance','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_TA_ViewAttendance;
-GO
-
-CREATE PROCEDURE dbo.sp_TA_ViewAttendance
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -------------------------------------------------
-    -- Security Check
-    -------------------------------------------------
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'TA',
-        @RequiredClearance = 2,
-        @Mode              = 'READ';
-
-    -------------------------------------------------
-    -- Return attendance for TA courses only
-    -------------------------------------------------
-    SELECT
-        A.AttendanceID,
-        A.StudentID,
-        C.CourseName,
-        CASE 
-            WHEN A.Status = 1 THEN 'Present'
-            ELSE 'Absent'
-        END AS StatusText,
-        A.DateRecorded
-    FROM dbo.ATTENDANCE A
-    JOIN dbo.COURSE C
-        ON C.CourseID = A.CourseID
-    JOIN dbo.TA_COURSE TC
-        ON TC.CourseID = A.CourseID
-    WHERE TC.TAUsername = @CurrentUsername
-      AND A.IsDeleted = 0
-      AND C.IsDeleted = 0;
-
-    -------------------------------------------------
-    -- Audit log
-    -------------------------------------------------
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'TA_VIEW_ATTENDANCE',
-        @Details  = NULL;
-END
-GO
-
-
-/* ===========================
-   END OF PART 5C
-   =========================== */
-
-
-
-
-
-
-
-
-
-
-
-
-   /* =========================================================
-   SRMS_DB — Term Project (FINAL)
-   Part 5D + Part 5E
-   Admin Procedures + Enrollment/Assignments (FINAL)
-
-   Depends on:
-     - Part 1 (Tables)
-     - Part 2 (DENY direct access + EXECUTE-only model)
-     - Part 3 (sp_CheckAccess + sp_LogAction)
-     - Part 5A helpers: sp__EnsureCourseActive, sp__EnsureStudentActive
-       (This script re-creates missing helpers safely if needed.)
-
-   Notes:
-     - For WRITE operations by Admin, we pass RequiredClearance = 5
-       (to avoid MLS "No Write Down" violations).
-   ========================================================= */
-
-/* =========================================================
-   EXTRA HELPERS (Admin needs)
-   ========================================================= */
-
----------------------------------------------------------
--- Ensure Instructor exists and active
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureInstructorActive','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__EnsureInstructorActive;
-GO
-CREATE PROCEDURE dbo.sp__EnsureInstructorActive
-(
-    @InstructorID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.INSTRUCTOR
-        WHERE InstructorID = @InstructorID
-          AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('Instructor not found or deleted.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
----------------------------------------------------------
--- Ensure User exists and active
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureUserActive','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp__EnsureUserActive;
-GO
-CREATE PROCEDURE dbo.sp__EnsureUserActive
-(
-    @Username NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.USERS
-        WHERE Username = @Username
-          AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('User not found or deleted.', 16, 1);
-        RETURN;
-    END
-END
-GO
-
----------------------------------------------------------
--- Ensure Course exists and active (fallback if 5A not run)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureCourseActive','P') IS NULL
-EXEC('
-CREATE PROCEDURE dbo.sp__EnsureCourseActive (@CourseID INT)
-AS
-BEGIN
-    SET NOCOUNT ON;
-    IF NOT EXISTS (SELECT 1 FROM dbo.COURSE WHERE CourseID=@CourseID AND IsDeleted=0)
-    BEGIN
-        RAISERROR(''Course not found or deleted.'',16,1);
-        RETURN;
-    END
-END
-');
-GO
-
----------------------------------------------------------
--- Ensure Student exists and active (fallback if 5A not run)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp__EnsureStudentActive','P') IS NULL
-EXEC('
-CREATE PROCEDURE dbo.sp__EnsureStudentActive (@StudentID INT)
-AS
-BEGIN
-    SET NOCOUNT ON;
-    IF NOT EXISTS (SELECT 1 FROM dbo.STUDENT WHERE StudentID=@StudentID AND IsDeleted=0)
-    BEGIN
-        RAISERROR(''Student not found or deleted.'',16,1);
-        RETURN;
-    END
-END
-');
-GO
-
-/* =========================================================
-   PART 5D — ADMIN: COURSE CRUD
-   ========================================================= */
-
----------------------------------------------------------
--- D1. Admin: Create Course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_CreateCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_CreateCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_CreateCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseName      NVARCHAR(100),
-    @Description     NVARCHAR(MAX) = NULL,
-    @PublicInfo      NVARCHAR(MAX) = NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    IF @CourseName IS NULL OR LTRIM(RTRIM(@CourseName)) = ''
-    BEGIN
-        RAISERROR('CourseName is required.', 16, 1);
-        RETURN;
-    END
-
-    IF EXISTS (
-        SELECT 1
-        FROM dbo.COURSE
-        WHERE CourseName = @CourseName
-          AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('CourseName already exists.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        INSERT INTO dbo.COURSE (CourseName, Description, PublicInfo, ClearanceLevel, IsDeleted)
-        VALUES (@CourseName, @Description, @PublicInfo, 1, 0);
-
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_CREATE_COURSE',
-            @Details  = @CourseName;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- D2. Admin: Update Course (partial update allowed)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_UpdateCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_UpdateCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_UpdateCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID        INT,
-    @CourseName      NVARCHAR(100) = NULL,
-    @Description     NVARCHAR(MAX) = NULL,
-    @PublicInfo      NVARCHAR(MAX) = NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-
-    IF @CourseName IS NOT NULL AND LTRIM(RTRIM(@CourseName)) <> ''
-    BEGIN
-        IF EXISTS (
-            SELECT 1
-            FROM dbo.COURSE
-            WHERE CourseName = @CourseName
-              AND CourseID  <> @CourseID
-              AND IsDeleted = 0
-        )
-        BEGIN
-            RAISERROR('Another course already has this name.', 16, 1);
-            RETURN;
-        END
-    END
-
-    BEGIN TRY
-        UPDATE dbo.COURSE
-        SET
-            CourseName  = COALESCE(NULLIF(LTRIM(RTRIM(@CourseName)), ''), CourseName),
-            Description = COALESCE(@Description, Description),
-            PublicInfo  = COALESCE(@PublicInfo, PublicInfo)
-        WHERE CourseID = @CourseID;
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'CourseID=' + CAST(@CourseID AS NVARCHAR(20)) 
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_UPDATE_COURSE',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- D3. Admin: Delete Course (soft delete)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_DeleteCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_DeleteCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_DeleteCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-
-    BEGIN TRY
-        UPDATE dbo.COURSE
-        SET IsDeleted = 1
-        WHERE CourseID = @CourseID;
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-           N'CourseID=' + CAST(@CourseID AS NVARCHAR(20)) 
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_DELETE_COURSE',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- D4. Admin: Get Courses (includes deleted for admin audit)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetCourses;
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetCourses
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 1,
-        @Mode              = 'READ';
-
-    SELECT
-        CourseID,
-        CourseName,
-        Description,
-        PublicInfo,
-        ClearanceLevel,
-        IsDeleted
-    FROM dbo.COURSE;
-
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'ADMIN_GET_COURSES',
-        @Details  = NULL;
-END
-GO
-
-IF OBJECT_ID('dbo.sp_User_UpdateRole','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_UpdateRole;
-GO
-
-CREATE PROCEDURE dbo.sp_User_UpdateRole
-(
-    @AdminUsername NVARCHAR(50),
-    @TargetUsername NVARCHAR(50),
-    @NewRole NVARCHAR(20),
-
-    @FullName NVARCHAR(100)=NULL,
-    @Email NVARCHAR(100)=NULL,
-    @Phone NVARCHAR(20)=NULL,
-    @DOB DATE=NULL,
-    @Department NVARCHAR(50)=NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'WRITE';
-
-    UPDATE dbo.USERS
-    SET Role = @NewRole
-    WHERE Username = @TargetUsername
-      AND IsDeleted = 0;
-
-	  DECLARE @Details NVARCHAR(4000);
-      SET @Details = N'User=' + CAST(@TargetUsername AS NVARCHAR(200)) + N' NewRole=' + CAST(@NewRole AS NVARCHAR(50));
-
-    EXEC dbo.sp_LogAction
-    @Username = @AdminUsername,
-    @Action   = N'UPDATE_ROLE',
-    @Details  = @Details;
-
-END
-GO
-
-
-
-/* =========================================================
-   PART 5E — ADMIN: ENROLLMENT + ASSIGNMENTS
-   ========================================================= */
-
----------------------------------------------------------
--- E1. Admin: Enroll Student in Course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_EnrollStudentInCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_EnrollStudentInCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_EnrollStudentInCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID       INT,
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive  @CourseID;
-    EXEC dbo.sp__EnsureStudentActive @StudentID;
-
-    IF EXISTS (
-        SELECT 1
-        FROM dbo.COURSE_STUDENT
-        WHERE CourseID  = @CourseID
-          AND StudentID = @StudentID
-    )
-    BEGIN
-        RAISERROR('Student already enrolled in this course.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID)
-        VALUES (@CourseID, @StudentID);
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-        N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
-        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_ENROLL_STUDENT',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- E2. Admin: Remove Enrollment
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_RemoveEnrollment','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_RemoveEnrollment;
-GO
-CREATE PROCEDURE dbo.sp_Admin_RemoveEnrollment
-(
-    @CurrentUsername NVARCHAR(50),
-    @StudentID       INT,
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.COURSE_STUDENT
-        WHERE CourseID  = @CourseID
-          AND StudentID = @StudentID
-    )
-    BEGIN
-        RAISERROR('Enrollment not found.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        DELETE FROM dbo.COURSE_STUDENT
-        WHERE CourseID  = @CourseID
-          AND StudentID = @StudentID;
-		  DECLARE @Details NVARCHAR(4000);
-
-          SET @Details =
-          N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
-          N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_REMOVE_ENROLLMENT',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- E3. Admin: Assign Instructor to Course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_AssignInstructorToCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_AssignInstructorToCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_AssignInstructorToCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @InstructorID    INT,
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive      @CourseID;
-    EXEC dbo.sp__EnsureInstructorActive  @InstructorID;
-
-    IF EXISTS (
-        SELECT 1
-        FROM dbo.INSTRUCTOR_COURSE
-        WHERE InstructorID = @InstructorID
-          AND CourseID     = @CourseID
-    )
-    BEGIN
-        RAISERROR('Instructor already assigned to this course.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        INSERT INTO dbo.INSTRUCTOR_COURSE (InstructorID, CourseID)
-        VALUES (@InstructorID, @CourseID);
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-        N'InstructorID=' + CAST(@InstructorID AS NVARCHAR(20)) +
-        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_ASSIGN_INSTRUCTOR',
-            @Details  =@Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- E4. Admin: Unassign Instructor from Course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_UnassignInstructorFromCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_UnassignInstructorFromCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_UnassignInstructorFromCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @InstructorID    INT,
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.INSTRUCTOR_COURSE
-        WHERE InstructorID = @InstructorID
-          AND CourseID     = @CourseID
-    )
-    BEGIN
-        RAISERROR('Instructor assignment not found.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        DELETE FROM dbo.INSTRUCTOR_COURSE
-        WHERE InstructorID = @InstructorID
-          AND CourseID     = @CourseID;
-
-
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-        N'InstructorID=' + CAST(@InstructorID AS NVARCHAR(20)) +
-        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_UNASSIGN_INSTRUCTOR',
-            @Details  =@Details ;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- E5. Admin: Assign TA (by username) to Course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_AssignTAtoCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_AssignTAtoCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_AssignTAtoCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @TAUsername      NVARCHAR(50),
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-    EXEC dbo.sp__EnsureUserActive   @TAUsername;
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.USERS
-        WHERE Username  = @TAUsername
-          AND Role      = 'TA'
-          AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('TA user not found or not active TA.', 16, 1);
-        RETURN;
-    END
-
-    IF EXISTS (
-        SELECT 1
-        FROM dbo.TA_COURSE
-        WHERE TAUsername = @TAUsername
-          AND CourseID   = @CourseID
-    )
-    BEGIN
-        RAISERROR('TA already assigned to this course.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        INSERT INTO dbo.TA_COURSE (TAUsername, CourseID)
-        VALUES (@TAUsername, @CourseID);
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-        N'TAUsername=' + CAST(@TAUsername AS NVARCHAR(20)) +
-        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_ASSIGN_TA',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- E6. Admin: Unassign TA from Course
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_UnassignTAFromCourse','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_UnassignTAFromCourse;
-GO
-CREATE PROCEDURE dbo.sp_Admin_UnassignTAFromCourse
-(
-    @CurrentUsername NVARCHAR(50),
-    @TAUsername      NVARCHAR(50),
-    @CourseID        INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 5,
-        @Mode              = 'WRITE';
-
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.TA_COURSE
-        WHERE TAUsername = @TAUsername
-          AND CourseID   = @CourseID
-    )
-    BEGIN
-        RAISERROR('TA assignment not found.', 16, 1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        DELETE FROM dbo.TA_COURSE
-        WHERE TAUsername = @TAUsername
-          AND CourseID   = @CourseID;
-
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-        N'TAUsername=' + CAST(@TAUsername AS NVARCHAR(20)) +
-        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'ADMIN_UNASSIGN_TA',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
-    RAISERROR(@Err, 16, 1);
-    RETURN;
-    END CATCH
-END
-GO
-
----------------------------------------------------------
--- E7. Admin: 
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetCourses;
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetCourses
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'READ';
-
-    SELECT CourseID, CourseName
-    FROM dbo.COURSE
-    WHERE IsDeleted = 0
-    ORDER BY CourseName;
-END
-GO
-
----------------------------------------------------------
--- E8. Admin: 
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetStudents','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetStudents;
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetStudents
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'READ';
-
-    SELECT StudentID, FullName
-    FROM dbo.STUDENT
-    WHERE IsDeleted = 0
-    ORDER BY FullName;
-END
-GO
-
----------------------------------------------------------
--- E9. Admin: 
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetInstructors','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetInstructors;
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetInstructors
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'READ';
-
-    SELECT InstructorID, FullName
-    FROM dbo.INSTRUCTOR
-    WHERE IsDeleted = 0
-    ORDER BY FullName;
-END
-GO
-
----------------------------------------------------------
--- E10. Admin: 
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetTAs','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetTAs;
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetTAs
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'READ';
-
-    SELECT Username
-    FROM dbo.USERS
-    WHERE Role = 'TA'
-      AND IsDeleted = 0
-    ORDER BY Username;
-END
-GO
-
----------------------------------------------------------
--- E11. Admin: 
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetInstructorAssignments','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetInstructorAssignments
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetInstructorAssignments
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'READ';
-
-    SELECT
-        ic.InstructorID,
-        i.FullName AS InstructorName,
-        ic.CourseID,
-        c.CourseName
-    FROM dbo.INSTRUCTOR_COURSE ic
-    JOIN dbo.INSTRUCTOR i ON ic.InstructorID = i.InstructorID
-    JOIN dbo.COURSE c ON ic.CourseID = c.CourseID
-    WHERE c.IsDeleted = 0;
-END
-GO
-
----------------------------------------------------------
--- E12. Admin: 
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Admin_GetTAAssignments','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_GetTAAssignments;
-GO
-CREATE PROCEDURE dbo.sp_Admin_GetTAAssignments
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'READ';
-
-    SELECT
-        tc.TAUsername,
-        tc.CourseID,
-        c.CourseName
-    FROM dbo.TA_COURSE tc
-    JOIN dbo.COURSE c ON tc.CourseID = c.CourseID
-    WHERE c.IsDeleted = 0;
-END
-GO
-
-
-
----------------------------------------------------------
--- E. Admin: User_GetAll
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_User_GetAll','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_GetAll;
-GO
-
-CREATE PROCEDURE dbo.sp_User_GetAll
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -------------------------------------------------
-    -- Security Check (Admin only)
-    -------------------------------------------------
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Admin',
-        @RequiredClearance = 4,
-        @Mode              = 'READ';
-
-    -------------------------------------------------
-    -- Return users from ADMIN VIEW (NOT table)
-    -------------------------------------------------
-    SELECT
-        Username,
-        Role,
-        ClearanceLevel
-    FROM dbo.vw_Admin_Users
-    WHERE IsDeleted = 0
-    ORDER BY Username;
-
-    -------------------------------------------------
-    -- Audit log
-    -------------------------------------------------
-    EXEC dbo.sp_LogAction
-        @Username = @CurrentUsername,
-        @Action   = 'ADMIN_VIEW_USERS',
-        @Details  = NULL;
-END
-GO
-
-
----------------------------------------------------------
--- E. Guest: sp_Get_PublicCourses
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Get_PublicCourses','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Get_PublicCourses;
-GO
-CREATE PROCEDURE dbo.sp_Get_PublicCourses
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Guestrole',1,'READ';
-
-    SELECT
-        CourseID,
-        CourseName,
-        Description,
-        PublicInfo
-    FROM dbo.COURSE
-    WHERE IsDeleted = 0
-      AND ClearanceLevel = 1
-    ORDER BY CourseName;
-END
-GO
-
-
-
-/* ===========================
-   END OF PART 5D + 5E
-   =========================== */
-
-
-
-
-
-
-/* =========================================================
-   SRMS_DB — Term Project (FINAL)
-   Part 5F — Inference-safe aggregates
-
-   Depends on: Part 1, 2, 3, 4 + Part 5A/B helpers
-   ========================================================= */
-
----------------------------------------------------------
--- F1. Instructor/Admin: Average Grade per Course (>=3) [SAFE]
--- Notes:
--- - No decrypt in views; decrypt happens here after open key.
--- - Inference control: group size must be >= 3.
--- - Ownership: if Instructor then must own the course.
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_Get_AvgGrade_Safe','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Get_AvgGrade_Safe;
-GO
-CREATE PROCEDURE dbo.sp_Get_AvgGrade_Safe
-(
-    @CurrentUsername NVARCHAR(50),
-    @CourseID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername   = @CurrentUsername,
-        @RequiredRole      = 'Instructor,Admin',
-        @RequiredClearance = 3,
-        @Mode              = 'READ';
-
-    EXEC dbo.sp__EnsureCourseActive @CourseID;
-
-    -- If Instructor -> must own course
-    DECLARE @Role NVARCHAR(20);
-    SELECT @Role = Role
-    FROM dbo.USERS
-    WHERE Username=@CurrentUsername AND IsDeleted=0;
-
-    IF @Role = 'Instructor'
-        EXEC dbo.sp__EnsureInstructorOwnsCourse @CurrentUsername, @CourseID;
-
-    -- Inference control: >= 3 rows
-    IF NOT EXISTS (
-        SELECT 1
-        FROM dbo.GRADES
-        WHERE CourseID = @CourseID
-          AND IsDeleted = 0
-          AND EncryptedGradeValue IS NOT NULL
-        GROUP BY CourseID
-        HAVING COUNT(*) >= 3
-    )
-    BEGIN
-        RAISERROR('Inference Control: Group size < 3.',16,1);
-        RETURN;
-    END
-
-    BEGIN TRY
-        EXEC dbo.sp_Key_Open;
-
-        SELECT
-            AVG(
-                TRY_CONVERT(
-                    DECIMAL(10,2),
-                    CONVERT(NVARCHAR(50), DecryptByKey(EncryptedGradeValue))
-                )
-            ) AS AvgGrade
-        FROM dbo.GRADES
-        WHERE CourseID=@CourseID
-          AND IsDeleted=0
-          AND EncryptedGradeValue IS NOT NULL;
-
-        EXEC dbo.sp_Key_Close;
-
-		DECLARE @Details NVARCHAR(4000);
-
-        SET @Details =
-        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
-        EXEC dbo.sp_LogAction
-            @Username = @CurrentUsername,
-            @Action   = 'VIEW_AVG_GRADE_SAFE',
-            @Details  = @Details;
-    END TRY
-    BEGIN CATCH
-        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
-        THROW;
-    END CATCH
-END
-GO
-
-
-
-
-
-
-
-
-
-
-
-/* =========================================================
-   PART 6 — USER MANAGEMENT + ROLE REQUESTS (FINAL)
-   SAFE VERSION (NO CONCAT / NO + INSIDE EXEC)
-   ========================================================= */
-
-
-/* =========================================================
-   6.1 — USER REGISTER (PUBLIC)
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_User_Register','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_Register;
-GO
-
-CREATE PROCEDURE dbo.sp_User_Register
-(
-    @Username NVARCHAR(50),
-    @PasswordPlain NVARCHAR(200),
-    @Role NVARCHAR(20),
-
-    @FullName NVARCHAR(100) = NULL,
-    @Email NVARCHAR(100) = NULL,
-    @Phone NVARCHAR(20) = NULL,
-    @DOB DATE = NULL,
-    @Department NVARCHAR(50) = NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF @Role NOT IN ('Admin','Instructor','TA','Student','Guestrole')
-        THROW 50000, 'Invalid role.', 1;
-
-    IF EXISTS (SELECT 1 FROM dbo.USERS WHERE Username=@Username AND IsDeleted=0)
-        THROW 50001, 'Username already exists.', 1;
-
-    DECLARE @PwdHash VARBINARY(MAX) =
-        HASHBYTES('SHA2_256', @PasswordPlain);
-
-    DECLARE @ClearanceLevel INT =
-        CASE @Role
-            WHEN 'Admin'      THEN 5
-            WHEN 'Instructor' THEN 4
-            WHEN 'TA'         THEN 3
-            WHEN 'Student'    THEN 2
-            WHEN 'Guestrole'  THEN 1
-        END;
-
-    DECLARE @StudentID INT = NULL;
-    DECLARE @InstructorID INT = NULL;
-    DECLARE @TAID INT = NULL;
-
-    EXEC dbo.sp_Key_Open;
-
-    -------------------------------------------------
-    -- Student
-    -------------------------------------------------
-    IF @Role = 'Student'
-    BEGIN
-        IF @FullName IS NULL OR @Email IS NULL OR @Phone IS NULL
-           OR @DOB IS NULL OR @Department IS NULL
-            THROW 50002, 'Missing student fields.', 1;
-
-        INSERT INTO dbo.STUDENT
-        (FullName,Email,DOB,Department,ClearanceLevel,EncryptedPhone,IsDeleted)
-        VALUES
-        (@FullName,@Email,@DOB,@Department,2,
-         EncryptByKey(Key_GUID('SRMSSymmetricKey'),@Phone),0);
-
-        SET @StudentID = SCOPE_IDENTITY();
-    END
-
-    -------------------------------------------------
-    -- Instructor
-    -------------------------------------------------
-    IF @Role = 'Instructor'
-    BEGIN
-        INSERT INTO dbo.INSTRUCTOR
-        (FullName,Email,ClearanceLevel,IsDeleted)
-        VALUES
-        (ISNULL(@FullName,@Username),
-         ISNULL(@Email,CONCAT(@Username,'@uni.edu')),
-         4,0);
-
-        SET @InstructorID = SCOPE_IDENTITY();
-    END
-
-    -------------------------------------------------
-    -- TA
-    -------------------------------------------------
-    IF @Role = 'TA'
-    BEGIN
-        INSERT INTO dbo.TA
-        (FullName,Email,ClearanceLevel,IsDeleted)
-        VALUES
-        (ISNULL(@FullName,@Username),
-         ISNULL(@Email,CONCAT(@Username,'@uni.edu')),
-         3,0);
-
-        SET @TAID = SCOPE_IDENTITY();
-    END
-
-    -------------------------------------------------
-    -- USERS
-    -------------------------------------------------
-    INSERT INTO dbo.USERS
-    (Username,Password,Role,ClearanceLevel,
-     StudentID,InstructorID,TAID,
-     EncryptedUsername,IsDeleted)
-    VALUES
-    (@Username,@PwdHash,@Role,@ClearanceLevel,
-     @StudentID,@InstructorID,@TAID,
-     EncryptByKey(Key_GUID('SRMSSymmetricKey'),@Username),0);
-
-    EXEC dbo.sp_Key_Close;
-
-    EXEC dbo.sp_LogAction @Username,'REGISTER_USER',@Role;
-END
-GO
-
-
-
-/* =========================================================
-   6.2 — USER LOGIN
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_User_Login','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_Login;
-GO
-CREATE PROCEDURE dbo.sp_User_Login
-(
-    @Username NVARCHAR(50),
-    @PasswordPlain NVARCHAR(200)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    DECLARE @StoredHash VARBINARY(MAX);
-
-    SELECT @StoredHash = [Password]
-    FROM dbo.USERS
-    WHERE Username=@Username AND IsDeleted=0;
-
-    IF @StoredHash IS NULL
-        THROW 50003, 'Invalid username.', 1;
-
-    IF @StoredHash <> HASHBYTES('SHA2_256',@PasswordPlain)
-        THROW 50004, 'Invalid password.', 1;
-
-    SELECT Username,Role,ClearanceLevel,StudentID,InstructorID,TAID
-    FROM dbo.USERS
-    WHERE Username=@Username AND IsDeleted=0;
-
-    EXEC dbo.sp_LogAction @Username,'LOGIN',NULL;
-END
-GO
-
-
-/* =========================================================
-   6.3 — ADMIN CREATE USER
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_Admin_CreateUser','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_Admin_CreateUser;
-GO
-
-CREATE PROCEDURE dbo.sp_Admin_CreateUser
-(
-    @CurrentUsername NVARCHAR(50),
-    @Username NVARCHAR(50),
-    @PasswordPlain NVARCHAR(200),
-    @Role NVARCHAR(20),
-
-    @FullName NVARCHAR(100)=NULL,
-    @Email NVARCHAR(100)=NULL,
-    @Phone NVARCHAR(20)=NULL,
-    @DOB DATE=NULL,
-    @Department NVARCHAR(50)=NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -- Admin only
-    EXEC dbo.sp_CheckAccess
-        @CurrentUsername,'Admin',5,'WRITE';
-
-    -- Delegate to unified register procedure
-    EXEC dbo.sp_User_Register
-        @Username      = @Username,
-        @PasswordPlain = @PasswordPlain,
-        @Role          = @Role,
-        @FullName      = @FullName,
-        @Email         = @Email,
-        @Phone         = @Phone,
-        @DOB           = @DOB,
-        @Department    = @Department;
-
-    EXEC dbo.sp_LogAction
-        @CurrentUsername,
-        'ADMIN_CREATE_USER';
-END
-GO
-
-
-/* =========================================================
-   6.4 — UPDATE PASSWORD
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_User_UpdatePassword','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_UpdatePassword;
-GO
-CREATE PROCEDURE dbo.sp_User_UpdatePassword
-(
-    @CurrentUsername NVARCHAR(50),
-    @TargetUsername NVARCHAR(50),
-    @NewPasswordPlain NVARCHAR(200)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    IF @CurrentUsername<>@TargetUsername
-        EXEC dbo.sp_CheckAccess
-            @CurrentUsername,'Admin',4,'WRITE';
-
-    UPDATE dbo.USERS
-    SET [Password]=HASHBYTES('SHA2_256',@NewPasswordPlain)
-    WHERE Username=@TargetUsername AND IsDeleted=0;
-
-    DECLARE @Details NVARCHAR(200)=N'Password changed for '+@TargetUsername;
-    EXEC dbo.sp_LogAction @CurrentUsername,'UPDATE_PASSWORD',@Details;
-END
-GO
-
-
-/* =========================================================
-   6.5 — UPDATE Role
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_User_UpdateRole','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_UpdateRole;
-GO
-
-CREATE PROCEDURE dbo.sp_User_UpdateRole
-(
-    @AdminUsername   NVARCHAR(50),
-    @TargetUsername  NVARCHAR(50),
-    @NewRole         NVARCHAR(20)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    -------------------------------------------------
-    -- Admin only
-    -------------------------------------------------
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',5,'WRITE';
-
-    -------------------------------------------------
-    -- Validate role
-    -------------------------------------------------
-    IF @NewRole NOT IN ('Admin','Instructor','TA','Student','Guestrole')
-        RAISERROR('Invalid role.',16,1);
-
-    -------------------------------------------------
-    -- Load current user
-    -------------------------------------------------
-    DECLARE 
-        @OldRole NVARCHAR(20),
-        @StudentID INT,
-        @InstructorID INT,
-        @TAID INT;
-
-    SELECT
-        @OldRole = Role,
-        @StudentID = StudentID,
-        @InstructorID = InstructorID,
-        @TAID = TAID
-    FROM dbo.USERS
-    WHERE Username = @TargetUsername
-      AND IsDeleted = 0;
-
-    IF @OldRole IS NULL
-        RAISERROR('User not found.',16,1);
-
-    -------------------------------------------------
-    -- Clear old links
-    -------------------------------------------------
-    SET @StudentID = NULL;
-    SET @InstructorID = NULL;
-    SET @TAID = NULL;
-
-    -------------------------------------------------
-    -- Create required entity for new role
-    -------------------------------------------------
-
-    IF @NewRole = 'Student'
-    BEGIN
-        INSERT INTO dbo.STUDENT
-        (FullName, Email, DOB, Department, ClearanceLevel, IsDeleted)
-        VALUES
-        (@TargetUsername, CONCAT(@TargetUsername,'@std.edu'),
-         '2000-01-01', 'CS', 2, 0);
-
-        SET @StudentID = SCOPE_IDENTITY();
-    END
-
-    ELSE IF @NewRole = 'Instructor'
-    BEGIN
-        INSERT INTO dbo.INSTRUCTOR
-        (FullName, Email, ClearanceLevel, IsDeleted)
-        VALUES
-        (@TargetUsername, CONCAT(@TargetUsername,'@uni.edu'), 4, 0);
-
-        SET @InstructorID = SCOPE_IDENTITY();
-    END
-
-    ELSE IF @NewRole = 'TA'
-    BEGIN
-        INSERT INTO dbo.TA
-        (FullName, Email, ClearanceLevel, IsDeleted)
-        VALUES
-        (@TargetUsername, CONCAT(@TargetUsername,'@uni.edu'), 3, 0);
-
-        SET @TAID = SCOPE_IDENTITY();
-    END
-
-    -------------------------------------------------
-    -- Update USERS
-    -------------------------------------------------
-    UPDATE dbo.USERS
-    SET
-        Role = @NewRole,
-        ClearanceLevel =
-            CASE @NewRole
-                WHEN 'Admin'      THEN 5
-                WHEN 'Instructor' THEN 4
-                WHEN 'TA'         THEN 3
-                WHEN 'Student'    THEN 2
-                WHEN 'Guestrole'  THEN 1
-            END,
-        StudentID    = @StudentID,
-        InstructorID = @InstructorID,
-        TAID         = @TAID
-    WHERE Username = @TargetUsername;
-
-    -------------------------------------------------
-    -- Audit log
-    -------------------------------------------------
-    EXEC dbo.sp_LogAction
-        @AdminUsername,
-        'UPDATE_ROLE';
-END
-GO
-
-
-
-/* =========================================================
-   6.5 — user_delete
-   ========================================================= */
-IF OBJECT_ID('dbo.sp_User_Delete','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_User_Delete;
-GO
-
-CREATE PROCEDURE dbo.sp_User_Delete
-(
-    @AdminUsername NVARCHAR(50),
-    @TargetUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername, 'Admin', 5, 'WRITE';
-
-    IF NOT EXISTS (
-        SELECT 1 FROM dbo.USERS
-        WHERE Username = @TargetUsername AND IsDeleted = 0
-    )
-    BEGIN
-        RAISERROR('User not found or already deleted.',16,1);
-        RETURN;
-    END
-
-    UPDATE dbo.USERS
-    SET IsDeleted = 1
-    WHERE Username = @TargetUsername;
-
-    EXEC dbo.sp_LogAction
-        @AdminUsername,
-        'DELETE_USER',
-        @TargetUsername;
-END
-GO
-
-
-
-
-
-
-/* =========================================================
-   Part 6.2 — ROLE REQUEST WORKFLOW
-   ========================================================= */
-
----------------------------------------------------------
--- Submit Role Request (Student / TA)
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_RoleRequest_Submit','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_RoleRequest_Submit;
-GO
-CREATE PROCEDURE dbo.sp_RoleRequest_Submit
-(
-    @CurrentUsername NVARCHAR(50),
-    @RequestedRole   NVARCHAR(20),
-    @Reason          NVARCHAR(300),
-    @Comments        NVARCHAR(300) = NULL
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    DECLARE @CurrentRole NVARCHAR(20);
-
-    SELECT @CurrentRole = Role
-    FROM dbo.USERS
-    WHERE Username=@CurrentUsername AND IsDeleted=0;
-
-    IF @CurrentRole NOT IN ('Student','TA')
-        RAISERROR('Only Student or TA can request role upgrade.',16,1);
-
-    IF NOT (
-        (@CurrentRole='Student' AND @RequestedRole IN ('TA','Instructor'))
-        OR
-        (@CurrentRole='TA' AND @RequestedRole='Instructor')
-    )
-        RAISERROR('Invalid role upgrade path.',16,1);
-
-    IF EXISTS (
-        SELECT 1 FROM dbo.ROLE_REQUESTS
-        WHERE Username=@CurrentUsername AND Status='Pending'
-    )
-        RAISERROR('You already have a pending request.',16,1);
-
-    INSERT INTO dbo.ROLE_REQUESTS
-    (
-        Username, CurrentRole, RequestedRole,
-        Reason, Comments, Status, DateSubmitted
-    )
-    VALUES
-    (
-        @CurrentUsername, @CurrentRole, @RequestedRole,
-        @Reason, @Comments, 'Pending', GETDATE()
-    );
-
-    DECLARE @Details NVARCHAR(200) =
-        N'From=' + @CurrentRole + N' To=' + @RequestedRole;
-
-    EXEC dbo.sp_LogAction
-        @CurrentUsername,
-        'SUBMIT_ROLE_REQUEST',
-        @Details;
-END
-GO
-
-
----------------------------------------------------------
--- Get My Role Requests
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_RoleRequest_GetMy','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_RoleRequest_GetMy;
-GO
-CREATE PROCEDURE dbo.sp_RoleRequest_GetMy
-(
-    @CurrentUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    SELECT
-        RequestID, CurrentRole, RequestedRole,
-        Reason, Comments, Status, DateSubmitted
-    FROM dbo.ROLE_REQUESTS
-    WHERE Username=@CurrentUsername
-    ORDER BY DateSubmitted DESC;
-
-    EXEC dbo.sp_LogAction
-        @CurrentUsername,
-        'VIEW_MY_ROLE_REQUESTS',
-        NULL;
-END
-GO
-
-
----------------------------------------------------------
--- Admin: View Pending Role Requests
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_RoleRequest_GetPending','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_RoleRequest_GetPending;
-GO
-CREATE PROCEDURE dbo.sp_RoleRequest_GetPending
-(
-    @AdminUsername NVARCHAR(50)
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',4,'READ';
-
-    SELECT *
-    FROM dbo.ROLE_REQUESTS
-    WHERE Status='Pending'
-    ORDER BY DateSubmitted;
-
-    EXEC dbo.sp_LogAction
-        @AdminUsername,
-        'VIEW_PENDING_ROLE_REQUESTS',
-        NULL;
-END
-GO
-
----------------------------------------------------------
--- Admin: dbo.sp_RoleRequest_Approve
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_RoleRequest_Approve','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_RoleRequest_Approve;
-GO
-
-CREATE PROCEDURE dbo.sp_RoleRequest_Approve
-(
-    @AdminUsername NVARCHAR(50),
-    @RequestID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',4,'WRITE';
-
-    DECLARE
-        @Username NVARCHAR(50),
-        @CurrentRole NVARCHAR(20),
-        @NewRole NVARCHAR(20),
-        @StudentID INT;
-
-    SELECT
-        @Username = Username,
-        @CurrentRole = CurrentRole,
-        @NewRole = RequestedRole
-    FROM dbo.ROLE_REQUESTS
-    WHERE RequestID=@RequestID AND Status='Pending';
-
-    IF @Username IS NULL
-        RAISERROR('Request not found or already processed.',16,1);
-
-    -------------------------------------------------
-    -- Student → TA
-    -------------------------------------------------
-    IF @CurrentRole='Student' AND @NewRole='TA'
-    BEGIN
-        SELECT @StudentID = StudentID
-        FROM dbo.USERS
-        WHERE Username=@Username;
-
-        INSERT INTO dbo.TA (FullName, Email, ClearanceLevel, IsDeleted)
-        SELECT FullName, Email, 3, 0
-        FROM dbo.STUDENT
-        WHERE StudentID=@StudentID;
-
-        UPDATE dbo.USERS
-        SET Role='TA',
-            ClearanceLevel=3,
-            TAID = SCOPE_IDENTITY()
-        WHERE Username=@Username;
-    END
-
-    -------------------------------------------------
-    -- TA → Instructor
-    -------------------------------------------------
-    ELSE IF @CurrentRole='TA' AND @NewRole='Instructor'
-    BEGIN
-        INSERT INTO dbo.INSTRUCTOR (FullName, Email, ClearanceLevel, IsDeleted)
-        SELECT FullName, Email, 4, 0
-        FROM dbo.TA
-        WHERE TAID = (
-            SELECT TAID FROM dbo.USERS WHERE Username=@Username
-        );
-
-        UPDATE dbo.USERS
-        SET Role='Instructor',
-            ClearanceLevel=4,
-            InstructorID = SCOPE_IDENTITY()
-        WHERE Username=@Username;
-    END
-    ELSE
-        RAISERROR('Invalid role transition.',16,1);
-
-    UPDATE dbo.ROLE_REQUESTS
-    SET Status='Approved'
-    WHERE RequestID=@RequestID;
-
-    EXEC dbo.sp_LogAction
-        @AdminUsername,
-        'APPROVE_ROLE_REQUEST';
-END
-GO
-
-
-
-
----------------------------------------------------------
--- Admin: Deny Role Request
----------------------------------------------------------
-IF OBJECT_ID('dbo.sp_RoleRequest_Deny','P') IS NOT NULL
-    DROP PROCEDURE dbo.sp_RoleRequest_Deny;
-GO
-CREATE PROCEDURE dbo.sp_RoleRequest_Deny
-(
-    @AdminUsername NVARCHAR(50),
-    @RequestID INT
-)
-AS
-BEGIN
-    SET NOCOUNT ON;
-
-    EXEC dbo.sp_CheckAccess
-        @AdminUsername,'Admin',4,'WRITE';
-
-    DECLARE @Username NVARCHAR(50);
-
-    SELECT @Username = Username
-    FROM dbo.ROLE_REQUESTS
-    WHERE RequestID=@RequestID AND Status='Pending';
-
-    IF @Username IS NULL
-        RAISERROR('Request not found or already processed.',16,1);
-
-    UPDATE dbo.ROLE_REQUESTS
-    SET Status='Denied'
-    WHERE RequestID=@RequestID;
-
-    DECLARE @Details NVARCHAR(200) =
-        N'RequestID=' + CAST(@RequestID AS NVARCHAR(20))
-        + N' User=' + @Username;
-
-    EXEC dbo.sp_LogAction
-        @AdminUsername,
-        'DENY_ROLE_REQUEST',
-        @Details;
-END
-GO
-
-
----------------------------------------------------------
--- Security Matrix View
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_Security_Matrix', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_Security_Matrix;
-GO
-CREATE VIEW dbo.vw_Security_Matrix
-AS
-SELECT
-    CAST('Admin' AS NVARCHAR(20)) AS [Role],
-    CAST('Manage users, roles, approvals; CRUD on all entities via stored procedures; audit logs; highest clearance.' AS NVARCHAR(500)) AS Permissions
-UNION ALL
-SELECT
-    'Instructor',
-    'View own courses; view enrolled students; insert/update grades for own courses; view attendance for own courses.'
-UNION ALL
-SELECT
-    'TA',
-    'View assigned courses; manage attendance for assigned courses; view enrolled students (no grades access).'
-UNION ALL
-SELECT
-    'Student',
-    'View own profile; view own courses; view own grades; view own attendance; submit role upgrade request.'
-UNION ALL
-SELECT
-    'Guestrole',
-    'View public course catalog only.';
-GO
-
-
-
----------------------------------------------------------
--- MLS Levels View
----------------------------------------------------------
-IF OBJECT_ID('dbo.vw_MLS_Levels', 'V') IS NOT NULL
-    DROP VIEW dbo.vw_MLS_Levels;
-GO
-CREATE VIEW dbo.vw_MLS_Levels
-AS
-SELECT CAST('COURSE' AS NVARCHAR(30)) AS ObjectName,
-       1 AS ClearanceLevel,
-       'Unclassified public course information.' AS Description
-UNION ALL
-SELECT 'STUDENT', 2, 'Confidential student personal data.'
-UNION ALL
-SELECT 'ROLE_REQUESTS', 2, 'Confidential role upgrade workflow data.'
-UNION ALL
-SELECT 'GRADES', 3, 'Secret academic performance data.'
-UNION ALL
-SELECT 'ATTENDANCE', 3, 'Secret attendance records.'
-UNION ALL
-SELECT 'TA', 3, 'Teaching assistant records.'
-UNION ALL
-SELECT 'INSTRUCTOR', 4, 'Instructor records.'
-UNION ALL
-SELECT 'USERS', 4, 'Authentication and RBAC mapping.'
-UNION ALL
-SELECT 'LOGS', 4, 'Audit trail.';
-GO
-
-
-
-
-
-
-/* =========================================================
-   Part 7.0 — Open Encryption Key (safe)
-   ========================================================= */
-BEGIN TRY
-    EXEC dbo.sp_Key_Open;
-END TRY
-BEGIN CATCH
-END CATCH;
-GO
-
-/* =========================================================
-   Part 7.1 — COURSES (5 Courses)
-   ========================================================= */
-DECLARE @Courses TABLE (Name NVARCHAR(100), Descr NVARCHAR(200));
-
-INSERT INTO @Courses VALUES
-(N'Database Systems', N'Relational DB, SQL'),
-(N'Operating Systems', N'Processes & Memory'),
-(N'Computer Networks', N'Routing & TCP/IP'),
-(N'Software Engineering', N'SDLC & Design'),
-(N'Information Security', N'Crypto & Access Control');
-
-INSERT INTO dbo.COURSE (CourseName, Description, PublicInfo, ClearanceLevel, IsDeleted)
-SELECT Name, Descr, N'Core Course', 1, 0
-FROM @Courses c
-WHERE NOT EXISTS (
-    SELECT 1 FROM dbo.COURSE WHERE CourseName = c.Name AND IsDeleted = 0
-);
-GO
-
-/* =========================================================
-   Part 7.2 — INSTRUCTORS + USERS (3 Instructors)
-   ========================================================= */
-DECLARE @Instructors TABLE
-(
-    FullName NVARCHAR(100),
-    Email NVARCHAR(100),
-    Username NVARCHAR(50)
-);
-
-INSERT INTO @Instructors VALUES
-(N'Dr. Hassan', N'hassan@uni.edu', N'DrHassan'),
-(N'Dr. Mona',   N'mona@uni.edu',   N'DrMona'),
-(N'Dr. Karim',  N'karim@uni.edu',  N'DrKarim');
-
-INSERT INTO dbo.INSTRUCTOR (FullName, Email, ClearanceLevel, IsDeleted)
-SELECT FullName, Email, 4, 0
-FROM @Instructors i
-WHERE NOT EXISTS (SELECT 1 FROM dbo.INSTRUCTOR WHERE Email=i.Email);
-
-DECLARE @U NVARCHAR(50);
-DECLARE cur_ins CURSOR FOR SELECT Username FROM @Instructors;
-
-OPEN cur_ins;
-FETCH NEXT FROM cur_ins INTO @U;
-
-WHILE @@FETCH_STATUS = 0
-BEGIN
-    IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username=@U)
-        EXEC dbo.sp_User_Register
-            @Username=@U,
-            @PasswordPlain=N'1234',
-            @Role=N'Instructor';
-
-    FETCH NEXT FROM cur_ins INTO @U;
-END
-
-CLOSE cur_ins;
-DEALLOCATE cur_ins;
-GO
-
-/* =========================================================
-   Part 7.3 — TAs + USERS (4 TAs)
-   ========================================================= */
-DECLARE @TAs TABLE
-(
-    FullName NVARCHAR(100),
-    Email NVARCHAR(100),
-    Username NVARCHAR(50)
-);
-
-INSERT INTO @TAs VALUES
-(N'Ashraf Hamdy', N'ashraf@uni.edu', N'AshrafTA'),
-(N'Sara Adel',    N'sara@uni.edu',   N'SaraTA'),
-(N'Omar Nabil',   N'omar@uni.edu',   N'OmarTA'),
-(N'Laila Samy',   N'laila@uni.edu',  N'LailaTA');
-
-INSERT INTO dbo.TA (FullName, Email, ClearanceLevel, IsDeleted)
-SELECT FullName, Email, 3, 0
-FROM @TAs t
-WHERE NOT EXISTS (SELECT 1 FROM dbo.TA WHERE Email=t.Email);
-
-DECLARE @TAUser NVARCHAR(50);
-DECLARE cur_ta CURSOR FOR SELECT Username FROM @TAs;
-
-OPEN cur_ta;
-FETCH NEXT FROM cur_ta INTO @TAUser;
-
-WHILE @@FETCH_STATUS = 0
-BEGIN
-    IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username=@TAUser)
-        EXEC dbo.sp_User_Register
-            @Username=@TAUser,
-            @PasswordPlain=N'1234',
-            @Role=N'TA';
-
-    FETCH NEXT FROM cur_ta INTO @TAUser;
-END
-
-CLOSE cur_ta;
-DEALLOCATE cur_ta;
-GO
-
-/* =========================================================
-   Part 7.4 — RESET STUDENTS (IMPORTANT)
-   ========================================================= */
-DELETE FROM dbo.USERS WHERE Role = 'Student';
-DELETE FROM dbo.STUDENT;
-GO
-
-/* =========================================================
-   Part 7.5 — STUDENTS + USERS (20 Students)
-   ========================================================= */
-DECLARE @i INT = 1;
-
-WHILE @i <= 20
-BEGIN
-    DECLARE @Email NVARCHAR(100) = CONCAT(N'student', @i, N'@std.edu');
-    DECLARE @Name  NVARCHAR(100) = CONCAT(N'Student ', @i);
-    DECLARE @User  NVARCHAR(50)  = CONCAT(N'student', @i);
-    DECLARE @Phone NVARCHAR(20)  = CONCAT(N'01000000', CAST(@i AS NVARCHAR(10)));
-
-    EXEC dbo.sp_User_Register
-        @Username      = @User,
-        @PasswordPlain = N'1234',
-        @Role          = N'Student',
-        @FullName      = @Name,
-        @Email         = @Email,
-        @Phone         = @Phone,
-        @DOB           = '2002-01-01',
-        @Department    = N'CS';
-
-    SET @i += 1;
-END
-GO
-
-/* =========================================================
-   Part 7.6 — ADMIN + GUEST
-   ========================================================= */
-IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username='IbrahimHamdy')
-    EXEC dbo.sp_User_Register
-        @Username='IbrahimHamdy',
-        @PasswordPlain=N'1234',
-        @Role=N'Admin';
-
-
-IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username='AhmedMostafa')
-    EXEC dbo.sp_User_Register
-        @Username='AhmedMostafa',
-        @PasswordPlain=N'1234',
-        @Role=N'Admin';
-IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username='Guest1')
-    EXEC dbo.sp_User_Register
-        @Username='Guest1',
-        @PasswordPlain=N'1234',
-        @Role=N'Guestrole';
-GO
-
-/* =========================================================
-   Part 7.7 — ASSIGN INSTRUCTORS + TAs TO COURSES
-   ========================================================= */
-INSERT INTO dbo.INSTRUCTOR_COURSE
-SELECT i.InstructorID, c.CourseID
-FROM dbo.INSTRUCTOR i
-CROSS JOIN dbo.COURSE c
-WHERE NOT EXISTS (
-    SELECT 1 FROM dbo.INSTRUCTOR_COURSE ic
-    WHERE ic.InstructorID=i.InstructorID AND ic.CourseID=c.CourseID
-);
-
-INSERT INTO dbo.TA_COURSE
-SELECT u.Username, c.CourseID
-FROM dbo.USERS u
-CROSS JOIN dbo.COURSE c
-WHERE u.Role='TA'
-AND NOT EXISTS (
-    SELECT 1 FROM dbo.TA_COURSE tc
-    WHERE tc.TAUsername=u.Username AND tc.CourseID=c.CourseID
-);
-GO
-
-/* =========================================================
-   Part 7.8 — ENROLL STUDENTS
-   ========================================================= */
-INSERT INTO dbo.COURSE_STUDENT
-SELECT c.CourseID, s.StudentID
-FROM dbo.COURSE c
-CROSS JOIN dbo.STUDENT s
-WHERE NOT EXISTS (
-    SELECT 1 FROM dbo.COURSE_STUDENT cs
-    WHERE cs.CourseID=c.CourseID AND cs.StudentID=s.StudentID
-);
-GO
-
-/* =========================================================
-   Part 7.9 — GRADES (Encrypted)
-   ========================================================= */
-BEGIN TRY
-    EXEC dbo.sp_Key_Open;
-END TRY
-BEGIN CATCH
-END CATCH;
-GO
-
-INSERT INTO dbo.GRADES (StudentID, CourseID, EncryptedGradeValue, IsDeleted)
-SELECT
-    cs.StudentID,
-    cs.CourseID,
-    EncryptByKey(Key_GUID('SRMSSymmetricKey'),
-        CAST(60 + (ABS(CHECKSUM(NEWID())) % 41) AS NVARCHAR(5))),
-    0
-FROM dbo.COURSE_STUDENT cs
-WHERE NOT EXISTS (
-    SELECT 1 FROM dbo.GRADES g
-    WHERE g.StudentID=cs.StudentID AND g.CourseID=cs.CourseID
-);
-GO
-
-/* =========================================================
-   Part 7.10 — ATTENDANCE
-   ========================================================= */
-DECLARE @d INT = 0;
-WHILE @d < 5
-BEGIN
-    INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, Status, DateRecorded, IsDeleted)
-    SELECT
-        cs.StudentID,
-        cs.CourseID,
-        ABS(CHECKSUM(NEWID())) % 2,
-        DATEADD(DAY, -@d, CAST(GETDATE() AS DATE)),
-        0
-    FROM dbo.COURSE_STUDENT cs
-    WHERE NOT EXISTS (
-        SELECT 1 FROM dbo.ATTENDANCE a
-        WHERE a.StudentID=cs.StudentID
-          AND a.CourseID=cs.CourseID
-          AND a.DateRecorded=DATEADD(DAY, -@d, CAST(GETDATE() AS DATE))
-    );
-    SET @d += 1;
-END
-GO
-
-/* =========================================================
-   Part 7.11 — ROLE REQUESTS
-   ========================================================= */
-INSERT INTO dbo.ROLE_REQUESTS
-(Username, CurrentRole, RequestedRole, Reason, Status)
-SELECT Username, 'Student','TA','Good performance','Pending'
-FROM dbo.USERS
-WHERE Role='Student'
-AND NOT EXISTS (
-    SELECT 1 FROM dbo.ROLE_REQUESTS r
-    WHERE r.Username=dbo.USERS.Username AND r.Status='Pending'
-);
-GO
-
-/* =========================================================
-   Part 7.12 — Close Key
-   ========================================================= */
-BEGIN TRY
-    EXEC dbo.sp_Key_Close;
-END TRY
-BEGIN CATCH
-END CATCH;
-GO
-
+/* =========================================================
+   SRMS_DB — Term Project (FINAL) — Part 1
+   Database + Core Tables (Schema Only)
+
+   Roles:
+     Admin, Instructor, TA, Student, Guestrole
+
+   MLS Clearance Levels:
+     1 = Unclassified (Public)
+     2 = Confidential (Student data)
+     3 = Secret (Grades / Attendance)
+     4 = Instructor / Auth
+     5 = Admin
+   ========================================================= */
+
+---------------------------------------------------------
+-- 1.0 DROP + CREATE DATABASE
+---------------------------------------------------------
+IF DB_ID('SRMS_DB') IS NOT NULL
+BEGIN
+    ALTER DATABASE SRMS_DB SET SINGLE_USER WITH ROLLBACK IMMEDIATE;
+    DROP DATABASE SRMS_DB;
+END
+GO
+
+CREATE DATABASE SRMS_DB;
+GO
+USE SRMS_DB;
+GO
+
+---------------------------------------------------------
+-- 1.1 DROP TABLES (Safe Order)
+---------------------------------------------------------
+DROP TABLE IF EXISTS dbo.ARCHIVE_HOLD;
+DROP TABLE IF EXISTS dbo.ATTENDANCE_BITMAP;
+DROP TABLE IF EXISTS dbo.ATTENDANCE;
+DROP TABLE IF EXISTS dbo.GRADES;
+DROP TABLE IF EXISTS dbo.COURSE_STUDENT;
+DROP TABLE IF EXISTS dbo.TA_COURSE;
+DROP TABLE IF EXISTS dbo.INSTRUCTOR_COURSE;
+DROP TABLE IF EXISTS dbo.ROLE_REQUESTS;
+DROP TABLE IF EXISTS dbo.USERS;
+DROP TABLE IF EXISTS dbo.TA;
+DROP TABLE IF EXISTS dbo.INSTRUCTOR;
+DROP TABLE IF EXISTS dbo.STUDENT;
+DROP TABLE IF EXISTS dbo.COURSE;
+DROP TABLE IF EXISTS dbo.TERM;
+DROP TABLE IF EXISTS dbo.LOGS;
+DROP TABLE IF EXISTS dbo.AUDIT_READ_COUNTER;
+DROP TABLE IF EXISTS dbo.AUDIT_POLICY;
+DROP TABLE IF EXISTS dbo.DATA_VERSION;
+DROP TABLE IF EXISTS dbo.ENROLLMENT_IMPORT_STAGE;
+DROP TABLE IF EXISTS dbo.GRADES_HISTORY;
+DROP TABLE IF EXISTS dbo.ATTENDANCE_HISTORY;
+DROP TABLE IF EXISTS dbo.ATTENDANCE_BITMAP_HISTORY;
+DROP TABLE IF EXISTS dbo.COURSE_STUDENT_HISTORY;
+GO
+
+---------------------------------------------------------
+-- 1.1a TERMS (academic calendar) + TERM PARTITIONING
+--   TermID = Year * 10 + Season (1 Spring, 2 Summer, 3 Fall)
+--   Term assignment:
+--     COURSE_STUDENT.TermID  term of the enrollment (default: current)
+--     GRADES.TermID          term of the enrollment being graded
+--     ATTENDANCE.TermID      term whose dates contain DateRecorded
+--   GRADES / ATTENDANCE are partitioned by TermID: one
+--   partition per term, so current-term reads touch only the
+--   current partition however many years are stored.
+--   Boundaries for 2020-2040 are created up front, so adding
+--   a term is a plain INSERT (no DDL rights needed at runtime).
+--   IsReadOnly = 1 closes a term: write procedures reject it
+--   (physically read-only storage: Part 2.6).
+---------------------------------------------------------
+CREATE TABLE dbo.TERM (
+    TermID      INT NOT NULL PRIMARY KEY,
+    TermName    NVARCHAR(30) NOT NULL,
+    StartDate   DATE NOT NULL,
+    EndDate     DATE NOT NULL,
+
+    IsCurrent   BIT NOT NULL DEFAULT 0,
+    IsReadOnly  BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT CK_TERM_Season CHECK (TermID % 10 BETWEEN 1 AND 3),
+    CONSTRAINT CK_TERM_Dates  CHECK (EndDate >= StartDate),
+    CONSTRAINT UQ_TERM_Start  UNIQUE (StartDate)
+);
+GO
+
+-- At most one term flagged current (none flagged: the term containing today)
+CREATE UNIQUE INDEX UX_TERM_Current ON dbo.TERM(IsCurrent) WHERE IsCurrent = 1;
+GO
+
+-- Last year (closed) + this year
+;WITH Y AS (
+    SELECT YEAR(GETDATE()) - 1 AS Yr
+    UNION ALL
+    SELECT YEAR(GETDATE())
+),
+S AS (
+    SELECT 1 AS Season, N'Spring' AS Name, 1 AS FirstMonth, 5 AS LastMonth UNION ALL
+    SELECT 2, N'Summer', 6, 8 UNION ALL
+    SELECT 3, N'Fall', 9, 12
+)
+INSERT INTO dbo.TERM (TermID, TermName, StartDate, EndDate, IsReadOnly)
+SELECT
+    Y.Yr * 10 + S.Season,
+    S.Name + N' ' + CAST(Y.Yr AS NVARCHAR(4)),
+    DATEFROMPARTS(Y.Yr, S.FirstMonth, 1),
+    EOMONTH(DATEFROMPARTS(Y.Yr, S.LastMonth, 1)),
+    CASE WHEN Y.Yr < YEAR(GETDATE()) THEN 1 ELSE 0 END
+FROM Y CROSS JOIN S;
+GO
+
+-- Term of a date: latest term started on or before it
+CREATE FUNCTION dbo.fn__TermOfDate (@Date DATE)
+RETURNS INT
+AS
+BEGIN
+    RETURN (
+        SELECT TOP (1) TermID
+        FROM dbo.TERM
+        WHERE StartDate <= @Date
+        ORDER BY StartDate DESC
+    );
+END
+GO
+
+-- Current term: the flagged one, else the term containing today
+CREATE FUNCTION dbo.fn__CurrentTermID ()
+RETURNS INT
+AS
+BEGIN
+    RETURN COALESCE(
+        (SELECT TermID FROM dbo.TERM WHERE IsCurrent = 1),
+        dbo.fn__TermOfDate(CAST(GETDATE() AS DATE))
+    );
+END
+GO
+
+CREATE PARTITION FUNCTION pf_Term (INT)
+AS RANGE RIGHT FOR VALUES (
+    20201, 20202, 20203, 20211, 20212, 20213, 20221, 20222, 20223,
+    20231, 20232, 20233, 20241, 20242, 20243, 20251, 20252, 20253,
+    20261, 20262, 20263, 20271, 20272, 20273, 20281, 20282, 20283,
+    20291, 20292, 20293, 20301, 20302, 20303, 20311, 20312, 20313,
+    20321, 20322, 20323, 20331, 20332, 20333, 20341, 20342, 20343,
+    20351, 20352, 20353, 20361, 20362, 20363, 20371, 20372, 20373,
+    20381, 20382, 20383, 20391, 20392, 20393, 20401, 20402, 20403
+);
+GO
+
+CREATE PARTITION SCHEME ps_Term
+AS PARTITION pf_Term ALL TO ([PRIMARY]);
+GO
+
+---------------------------------------------------------
+-- 1.2 CORE TABLES
+---------------------------------------------------------
+
+/* STUDENT — Confidential */
+CREATE TABLE dbo.STUDENT (
+    StudentID       INT IDENTITY(100,1) PRIMARY KEY,
+    FullName        NVARCHAR(100) NOT NULL,
+    Email           NVARCHAR(100) NOT NULL,
+    DOB             DATE NOT NULL,
+    Department      NVARCHAR(50) NOT NULL,
+
+    ClearanceLevel  INT NOT NULL DEFAULT 2,
+    EncryptedPhone  VARBINARY(MAX) NULL,
+
+    IsDeleted       BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT CK_STUDENT_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
+    CONSTRAINT UQ_STUDENT_Email UNIQUE (Email)
+);
+GO
+
+/* INSTRUCTOR — Level 4 */
+CREATE TABLE dbo.INSTRUCTOR (
+    InstructorID    INT IDENTITY(200,1) PRIMARY KEY,
+    FullName        NVARCHAR(100) NOT NULL,
+    Email           NVARCHAR(100) NOT NULL,
+
+    ClearanceLevel  INT NOT NULL DEFAULT 4,
+    IsDeleted       BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT CK_INSTRUCTOR_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
+    CONSTRAINT UQ_INSTRUCTOR_Email UNIQUE (Email)
+);
+GO
+
+/* TA — Level 3 */
+CREATE TABLE dbo.TA (
+    TAID            INT IDENTITY(3000,1) PRIMARY KEY,
+    FullName        NVARCHAR(100) NOT NULL,
+    Email           NVARCHAR(100) NOT NULL,
+
+    ClearanceLevel  INT NOT NULL DEFAULT 3,
+    IsDeleted       BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT CK_TA_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
+    CONSTRAINT UQ_TA_Email UNIQUE (Email)
+);
+GO
+
+/* COURSE — Unclassified */
+CREATE TABLE dbo.COURSE (
+    CourseID        INT IDENTITY(300,1) PRIMARY KEY,
+    CourseName      NVARCHAR(100) NOT NULL,
+    Description     NVARCHAR(MAX) NULL,
+    PublicInfo      NVARCHAR(MAX) NULL,
+
+    ClearanceLevel  INT NOT NULL DEFAULT 1,
+    IsDeleted       BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT CK_COURSE_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
+    CONSTRAINT UQ_COURSE_Name UNIQUE (CourseName)
+);
+GO
+
+/* USERS — Authentication + RBAC + MLS */
+CREATE TABLE dbo.USERS (
+    Username          NVARCHAR(50) PRIMARY KEY,
+    Password          VARBINARY(MAX) NOT NULL,
+    Role              NVARCHAR(20) NOT NULL,
+    ClearanceLevel    INT NOT NULL,
+
+    StudentID         INT NULL,
+    InstructorID      INT NULL,
+    TAID              INT NULL,
+
+    EncryptedUsername VARBINARY(MAX) NULL,
+    IsDeleted         BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT CK_USERS_Clearance CHECK (ClearanceLevel BETWEEN 1 AND 5),
+    CONSTRAINT CK_USERS_Role CHECK (Role IN ('Admin','Instructor','TA','Student','Guestrole')),
+
+    CONSTRAINT FK_USERS_STUDENT    FOREIGN KEY (StudentID)    REFERENCES dbo.STUDENT(StudentID),
+    CONSTRAINT FK_USERS_INSTRUCTOR FOREIGN KEY (InstructorID) REFERENCES dbo.INSTRUCTOR(InstructorID),
+    CONSTRAINT FK_USERS_TA         FOREIGN KEY (TAID)         REFERENCES dbo.TA(TAID),
+
+    CONSTRAINT CK_USERS_ROLE_LINK CHECK (
+        (Role IN ('Admin','Guestrole') AND StudentID IS NULL AND InstructorID IS NULL AND TAID IS NULL)
+        OR (Role = 'Student'    AND StudentID IS NOT NULL)
+        OR (Role = 'Instructor' AND InstructorID IS NOT NULL)
+        OR (Role = 'TA'         AND TAID IS NOT NULL)
+    )
+);
+GO
+
+
+
+
+/* GRADES — Secret */
+-- Partitioned by term: every unique key carries TermID (aligned indexes)
+CREATE TABLE dbo.GRADES (
+    GradeID             INT IDENTITY(400,1) NOT NULL,
+    StudentID           INT NOT NULL,
+    CourseID            INT NOT NULL,
+    TermID              INT NOT NULL DEFAULT dbo.fn__CurrentTermID(),
+    DateEntered         DATETIME NOT NULL DEFAULT GETDATE(),
+
+    EncryptedGradeValue VARBINARY(MAX) NOT NULL,
+    IsDeleted           BIT NOT NULL DEFAULT 0,
+
+    CONSTRAINT PK_GRADES PRIMARY KEY CLUSTERED (GradeID, TermID),
+    CONSTRAINT FK_GRADES_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID),
+    CONSTRAINT FK_GRADES_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
+    CONSTRAINT FK_GRADES_TERM    FOREIGN KEY (TermID)    REFERENCES dbo.TERM(TermID),
+    CONSTRAINT UQ_GRADES UNIQUE (StudentID, CourseID, TermID)
+) ON ps_Term(TermID);
+GO
+
+/* ATTENDANCE — Secret */
+CREATE TABLE dbo.ATTENDANCE (
+    AttendanceID   INT IDENTITY(500,1) NOT NULL,
+    StudentID      INT NOT NULL,
+    CourseID       INT NOT NULL,
+    TermID         INT NOT NULL DEFAULT dbo.fn__CurrentTermID(),
+    Status         BIT NOT NULL,
+    DateRecorded DATE NOT NULL DEFAULT CAST(GETDATE() AS DATE),
+
+    IsDeleted      BIT NOT NULL DEFAULT 0,
+    RowVer         ROWVERSION,     -- change tracking for TA offline replica (delta sync)
+
+    CONSTRAINT PK_ATTENDANCE PRIMARY KEY CLUSTERED (AttendanceID, TermID),
+    CONSTRAINT FK_ATT_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID),
+    CONSTRAINT FK_ATT_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
+    CONSTRAINT FK_ATT_TERM    FOREIGN KEY (TermID)    REFERENCES dbo.TERM(TermID),
+    CONSTRAINT UQ_ATT UNIQUE (StudentID, CourseID, DateRecorded, TermID)
+) ON ps_Term(TermID);
+GO
+
+/* ROLE REQUESTS — Part B */
+CREATE TABLE dbo.ROLE_REQUESTS (
+    RequestID     INT IDENTITY(1,1) PRIMARY KEY,
+    Username      NVARCHAR(50) NOT NULL,
+    CurrentRole   NVARCHAR(20) NOT NULL,
+    RequestedRole NVARCHAR(20) NOT NULL,
+    Reason        NVARCHAR(300) NOT NULL,
+    Comments      NVARCHAR(300) NULL,
+    Status        NVARCHAR(20) NOT NULL DEFAULT 'Pending',
+    DateSubmitted DATETIME NOT NULL DEFAULT GETDATE(),
+
+    CONSTRAINT FK_ROLE_REQ_USER FOREIGN KEY (Username) REFERENCES dbo.USERS(Username),
+    CONSTRAINT CK_ROLE_REQ_STATUS CHECK (Status IN ('Pending','Approved','Denied'))
+);
+GO
+
+---------------------------------------------------------
+-- 1.3 MAPPING TABLES
+---------------------------------------------------------
+CREATE TABLE dbo.INSTRUCTOR_COURSE (
+    InstructorID INT NOT NULL,
+    CourseID     INT NOT NULL,
+    CONSTRAINT PK_INSTRUCTOR_COURSE PRIMARY KEY (InstructorID, CourseID),
+    CONSTRAINT FK_IC_INSTRUCTOR FOREIGN KEY (InstructorID) REFERENCES dbo.INSTRUCTOR(InstructorID),
+    CONSTRAINT FK_IC_COURSE     FOREIGN KEY (CourseID)     REFERENCES dbo.COURSE(CourseID)
+);
+GO
+
+CREATE TABLE dbo.TA_COURSE (
+    TAUsername NVARCHAR(50) NOT NULL,
+    CourseID   INT NOT NULL,
+    CONSTRAINT PK_TA_COURSE PRIMARY KEY (TAUsername, CourseID),
+    CONSTRAINT FK_TC_USER   FOREIGN KEY (TAUsername) REFERENCES dbo.USERS(Username),
+    CONSTRAINT FK_TC_COURSE FOREIGN KEY (CourseID)   REFERENCES dbo.COURSE(CourseID)
+);
+GO
+
+CREATE TABLE dbo.COURSE_STUDENT (
+    CourseID  INT NOT NULL,
+    StudentID INT NOT NULL,
+    TermID    INT NOT NULL DEFAULT dbo.fn__CurrentTermID(),   -- term the course is taken in
+    CONSTRAINT PK_COURSE_STUDENT PRIMARY KEY (CourseID, StudentID),
+    CONSTRAINT FK_CS_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
+    CONSTRAINT FK_CS_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID),
+    CONSTRAINT FK_CS_TERM    FOREIGN KEY (TermID)    REFERENCES dbo.TERM(TermID)
+);
+GO
+
+---------------------------------------------------------
+-- 1.4 LOGS
+---------------------------------------------------------
+CREATE TABLE dbo.LOGS (
+    LogID      INT IDENTITY(1,1) PRIMARY KEY,
+    Username   NVARCHAR(50) NULL,
+    Action     NVARCHAR(200) NOT NULL,
+    Details    NVARCHAR(4000) NULL,
+    LogTime    DATETIME NOT NULL DEFAULT GETDATE(),
+    EventCount INT NOT NULL DEFAULT 1,    -- > 1: aggregated read counter (per minute)
+
+    -- Typed subject of the action (indexed; see Part 2.5)
+    --   EntityType: STUDENT / INSTRUCTOR / TA / USER / COURSE /
+    --               ATTENDANCE / ROLE_REQUEST
+    --   CourseID  : course context, when the action has one
+    EntityType NVARCHAR(20) NULL,
+    EntityID   INT NULL,
+    CourseID   INT NULL
+);
+GO
+
+---------------------------------------------------------
+-- 1.4a AUDIT POLICY (audit level per action class)
+--   ITEMIZED   : one LOGS row per call (all writes)
+--   AGGREGATED : counted per user / action / details / minute
+--                in AUDIT_READ_COUNTER, flushed to LOGS as one
+--                row with EventCount = number of calls
+--   ActionPattern is a LIKE pattern; the longest matching
+--   pattern wins; actions matching no pattern are ITEMIZED.
+---------------------------------------------------------
+CREATE TABLE dbo.AUDIT_POLICY (
+    ActionPattern NVARCHAR(200) NOT NULL PRIMARY KEY,
+    AuditLevel    NVARCHAR(20)  NOT NULL
+        CONSTRAINT CK_AUDIT_POLICY_Level CHECK (AuditLevel IN ('ITEMIZED', 'AGGREGATED')),
+    UpdatedAt     DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+-- High-volume reads (role-prefixed views, GET helpers, logins)
+INSERT INTO dbo.AUDIT_POLICY (ActionPattern, AuditLevel) VALUES
+('%[_]VIEW[_]%', 'AGGREGATED'),
+('VIEW[_]%',     'AGGREGATED'),
+('%[_]GET[_]%',  'AGGREGATED'),
+('LOGIN',        'AGGREGATED');
+GO
+
+CREATE TABLE dbo.AUDIT_READ_COUNTER (
+    MinuteStart DATETIME       NOT NULL,
+    Username    NVARCHAR(50)   NOT NULL,     -- '' = anonymous
+    Action      NVARCHAR(200)  NOT NULL,
+    DetailsHash VARBINARY(32)  NOT NULL,     -- SHA-256 of Details + entity columns
+    Details     NVARCHAR(4000) NULL,
+    EntityType  NVARCHAR(20)   NULL,
+    EntityID    INT            NULL,
+    CourseID    INT            NULL,
+    Hits        INT            NOT NULL DEFAULT 1,
+    LastSeen    DATETIME       NOT NULL DEFAULT GETDATE(),
+
+    CONSTRAINT PK_AUDIT_READ_COUNTER PRIMARY KEY (MinuteStart, Username, Action, DetailsHash)
+);
+GO
+
+---------------------------------------------------------
+-- 1.4b DATA VERSION (change counters for client polling)
+--   Bumped by write procedures (sp__BumpDataVersion);
+--   read by sp_GetDataVersions so open screens refresh
+--   only when their underlying tables changed.
+---------------------------------------------------------
+CREATE TABLE dbo.DATA_VERSION (
+    TableName NVARCHAR(50) NOT NULL PRIMARY KEY,
+    Version   BIGINT NOT NULL DEFAULT 0,
+    UpdatedAt DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+INSERT INTO dbo.DATA_VERSION (TableName) VALUES
+('STUDENT'), ('INSTRUCTOR'), ('TA'), ('COURSE'), ('USERS'),
+('GRADES'), ('ATTENDANCE'), ('ROLE_REQUESTS'),
+('INSTRUCTOR_COURSE'), ('TA_COURSE'), ('COURSE_STUDENT'), ('TERM');
+GO
+
+---------------------------------------------------------
+-- 1.4c BULK IMPORT STAGING
+--   Rows are streamed in (TVP chunks), validated and
+--   diffed server-side, then applied in batches.
+--   RejectReason = fn__ReasonMessage code (NULL = accepted).
+---------------------------------------------------------
+CREATE TABLE dbo.ENROLLMENT_IMPORT_STAGE (
+    ImportID     UNIQUEIDENTIFIER NOT NULL,
+    RowNum       INT NOT NULL,
+    StudentID    INT NULL,
+    CourseID     INT NULL,
+    RejectReason INT NULL,
+    StagedAt     DATETIME NOT NULL DEFAULT GETDATE(),
+
+    CONSTRAINT PK_ENROLLMENT_IMPORT_STAGE PRIMARY KEY (ImportID, RowNum)
+);
+GO
+
+CREATE TYPE dbo.EnrollmentRowList AS TABLE (
+    RowNum    INT NOT NULL PRIMARY KEY,
+    StudentID INT NULL,
+    CourseID  INT NULL
+);
+GO
+
+-- Bulk role request decisions (sp_RoleRequest_DecideBulk)
+CREATE TYPE dbo.RequestIDList AS TABLE (
+    RequestID INT NOT NULL PRIMARY KEY
+);
+GO
+
+-- Skipped LogIDs re-read by the security monitor (sp_Admin_GetLogsByID)
+CREATE TYPE dbo.LogIDList AS TABLE (
+    LogID INT NOT NULL PRIMARY KEY
+);
+GO
+
+-- Assignment matrix edits (sp_Admin_ApplyAssignmentChanges)
+-- PersonKey = InstructorID (as text) or TA username
+CREATE TYPE dbo.AssignmentChangeList AS TABLE (
+    PersonKey NVARCHAR(50) NOT NULL,
+    CourseID  INT NOT NULL,
+    Assign    BIT NOT NULL,     -- 1 = assign, 0 = unassign
+
+    PRIMARY KEY (PersonKey, CourseID)
+);
+GO
+
+-- Bulk user provisioning (sp_Admin_BulkCreateUsers)
+-- PasswordHash is computed client-side:
+--   HASHBYTES('SHA2_256', NVARCHAR) == SHA-256(UTF-16LE)
+CREATE TYPE dbo.UserProvisionList AS TABLE (
+    RowNum       INT NOT NULL PRIMARY KEY,
+    Username     NVARCHAR(50)   NULL,
+    PasswordHash VARBINARY(32)  NULL,
+    Role         NVARCHAR(20)   NULL,
+    FullName     NVARCHAR(100)  NULL,
+    Email        NVARCHAR(100)  NULL,
+    Phone        NVARCHAR(20)   NULL,
+    DOB          DATE           NULL,
+    Department   NVARCHAR(50)   NULL
+);
+GO
+
+---------------------------------------------------------
+-- 1.4d ARCHIVE (history tables)
+--   Mirrors of GRADES / ATTENDANCE / COURSE_STUDENT. Rows
+--   are moved here by sp_Admin_ArchiveBatch, so the live
+--   tables hold active data only: soft-deleted rows, and
+--   all records of deleted courses, deleted students and
+--   long-inactive students.
+--   STUDENT / COURSE rows stay live as the FK anchors
+--   (USERS, mappings, LOGS), whatever their state.
+--   Original keys are kept. No FK / CHECK constraints, because
+--   these tables are DELETE ... OUTPUT INTO targets.
+--   ArchiveReason: DELETED | COURSE_DELETED | STUDENT_DELETED | INACTIVE
+---------------------------------------------------------
+CREATE TABLE dbo.GRADES_HISTORY (
+    HistoryID           BIGINT IDENTITY(1,1) PRIMARY KEY,
+    GradeID             INT NOT NULL,
+    StudentID           INT NOT NULL,
+    CourseID            INT NOT NULL,
+    TermID              INT NOT NULL,
+    DateEntered         DATETIME NOT NULL,
+    EncryptedGradeValue VARBINARY(MAX) NOT NULL,
+    IsDeleted           BIT NOT NULL,
+
+    ArchiveReason       NVARCHAR(20) NOT NULL,
+    ArchivedAt          DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+CREATE TABLE dbo.ATTENDANCE_HISTORY (
+    HistoryID     BIGINT IDENTITY(1,1) PRIMARY KEY,
+    AttendanceID  INT NOT NULL,
+    StudentID     INT NOT NULL,
+    CourseID      INT NOT NULL,
+    TermID        INT NOT NULL,
+    Status        BIT NOT NULL,
+    DateRecorded  DATE NOT NULL,
+    IsDeleted     BIT NOT NULL,
+
+    ArchiveReason NVARCHAR(20) NOT NULL,
+    ArchivedAt    DATETIME NOT NULL DEFAULT GETDATE(),
+    ArchiveRowVer ROWVERSION        -- tombstone for TA replicas (sp_TA_GetAttendanceChanges)
+);
+GO
+
+CREATE TABLE dbo.COURSE_STUDENT_HISTORY (
+    HistoryID     BIGINT IDENTITY(1,1) PRIMARY KEY,
+    CourseID      INT NOT NULL,
+    StudentID     INT NOT NULL,
+    TermID        INT NOT NULL,
+
+    ArchiveReason NVARCHAR(20) NOT NULL,
+    ArchivedAt    DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+CREATE INDEX IX_GRADESH_Student  ON dbo.GRADES_HISTORY(StudentID, CourseID);
+CREATE INDEX IX_GRADESH_Course   ON dbo.GRADES_HISTORY(CourseID);
+CREATE INDEX IX_ATTH_Student     ON dbo.ATTENDANCE_HISTORY(StudentID, CourseID);
+CREATE INDEX IX_ATTH_Course_RowVer ON dbo.ATTENDANCE_HISTORY(CourseID, ArchiveRowVer);
+CREATE INDEX IX_CSH_Student      ON dbo.COURSE_STUDENT_HISTORY(StudentID, CourseID);
+CREATE INDEX IX_CSH_Course       ON dbo.COURSE_STUDENT_HISTORY(CourseID);
+GO
+
+-- Students whose records were restored: not archived as
+-- inactive again before HoldUntil
+CREATE TABLE dbo.ARCHIVE_HOLD (
+    StudentID  INT NOT NULL PRIMARY KEY,
+    HoldUntil  DATE NOT NULL,
+    HeldBy     NVARCHAR(50) NOT NULL,
+    CONSTRAINT FK_ARCHIVE_HOLD_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID)
+);
+GO
+
+---------------------------------------------------------
+-- 1.4e ATTENDANCE BITMAPS (packed closed terms)
+--   One row per (StudentID, CourseID, TermID) instead of one
+--   row per day: bit n stands for StartDate + n, least
+--   significant bit of each byte first.
+--     Recorded  bit set = an attendance record exists
+--     Present   bit set = that record is Present
+--   Sessions / Present counts are kept with the bitmap so
+--   aggregates never expand it.
+--   Filled by sp_Admin_PackAttendanceTerm (closed terms only)
+--   and expanded back into ATTENDANCE when a term is reopened.
+--   Readers see both stores through vw__AttendanceRows /
+--   vw__AttendanceCounts (Part 4.0).
+---------------------------------------------------------
+CREATE TABLE dbo.ATTENDANCE_BITMAP (
+    BitmapID      INT IDENTITY(1,1) NOT NULL,
+    StudentID     INT NOT NULL,
+    CourseID      INT NOT NULL,
+    TermID        INT NOT NULL,
+    StartDate     DATE NOT NULL,
+    Days          SMALLINT NOT NULL,
+    Recorded      VARBINARY(64) NOT NULL,
+    Present       VARBINARY(64) NOT NULL,
+    Sessions      SMALLINT NOT NULL,
+    PresentCount  SMALLINT NOT NULL,
+    PackedAt      DATETIME NOT NULL DEFAULT GETDATE(),
+
+    CONSTRAINT PK_ATTENDANCE_BITMAP PRIMARY KEY CLUSTERED (TermID, CourseID, StudentID),
+    CONSTRAINT UQ_ATTBM_ID UNIQUE (BitmapID),
+    CONSTRAINT FK_ATTBM_STUDENT FOREIGN KEY (StudentID) REFERENCES dbo.STUDENT(StudentID),
+    CONSTRAINT FK_ATTBM_COURSE  FOREIGN KEY (CourseID)  REFERENCES dbo.COURSE(CourseID),
+    CONSTRAINT FK_ATTBM_TERM    FOREIGN KEY (TermID)    REFERENCES dbo.TERM(TermID),
+    CONSTRAINT CK_ATTBM_Days    CHECK (Days BETWEEN 1 AND 512)     -- 64 bytes
+);
+GO
+
+CREATE INDEX IX_ATTBM_Student ON dbo.ATTENDANCE_BITMAP(StudentID, TermID);
+GO
+
+-- Archived bitmaps (sp_Admin_ArchiveBatch, as 1.4d): packed days
+-- of deleted courses / students and of inactive students
+CREATE TABLE dbo.ATTENDANCE_BITMAP_HISTORY (
+    HistoryID     BIGINT IDENTITY(1,1) PRIMARY KEY,
+    BitmapID      INT NOT NULL,
+    StudentID     INT NOT NULL,
+    CourseID      INT NOT NULL,
+    TermID        INT NOT NULL,
+    StartDate     DATE NOT NULL,
+    Days          SMALLINT NOT NULL,
+    Recorded      VARBINARY(64) NOT NULL,
+    Present       VARBINARY(64) NOT NULL,
+    Sessions      SMALLINT NOT NULL,
+    PresentCount  SMALLINT NOT NULL,
+    PackedAt      DATETIME NOT NULL,
+
+    ArchiveReason NVARCHAR(20) NOT NULL,
+    ArchivedAt    DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+CREATE INDEX IX_ATTBMH_Student ON dbo.ATTENDANCE_BITMAP_HISTORY(StudentID, CourseID);
+GO
+
+---------------------------------------------------------
+-- 1.5 INDEXES
+---------------------------------------------------------
+CREATE INDEX IX_STUDENT_Email   ON dbo.STUDENT(Email);
+CREATE INDEX IX_USERS_Role      ON dbo.USERS(Role);
+CREATE INDEX IX_USERS_Clearance ON dbo.USERS(ClearanceLevel);
+CREATE INDEX IX_GRADES_Student  ON dbo.GRADES(StudentID);
+CREATE INDEX IX_ATT_Student     ON dbo.ATTENDANCE(StudentID);
+GO
+
+/* =========================
+   END OF PART 1
+   ========================= */
+
+
+
+
+
+
+
+/* =========================================================
+   SRMS_DB — Term Project (FINAL) — Part 2 [FINAL]
+   Roles, RBAC & Security Infrastructure
+
+   Depends on:
+     - Part 1 (Database + Core Tables)
+
+   Guarantees:
+     - EXECUTE-ONLY access model
+     - No direct SELECT/INSERT/UPDATE/DELETE on tables
+     - Clear RBAC hierarchy via RBAC_RANK
+     - Idempotent (safe re-run)
+   ========================================================= */
+
+---------------------------------------------------------
+-- Part 2.1 — CREATE DATABASE ROLES (Idempotent)
+---------------------------------------------------------
+IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Admin' AND type = 'R')
+    CREATE ROLE [Admin];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Instructor' AND type = 'R')
+    CREATE ROLE [Instructor];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'TA' AND type = 'R')
+    CREATE ROLE [TA];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Student' AND type = 'R')
+    CREATE ROLE [Student];
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.database_principals WHERE name = 'Guestrole' AND type = 'R')
+    CREATE ROLE [Guestrole];
+GO
+
+---------------------------------------------------------
+-- Part 2.2 — DENY ALL DIRECT TABLE ACCESS
+-- Defense-in-depth: even Admin uses stored procedures only
+---------------------------------------------------------
+
+-- Core tables
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.STUDENT        TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.INSTRUCTOR     TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.TA             TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.COURSE         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.USERS          TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.GRADES         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ATTENDANCE     TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ROLE_REQUESTS  TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.TERM           TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+
+-- Mapping tables
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.INSTRUCTOR_COURSE TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.TA_COURSE         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.COURSE_STUDENT    TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+
+-- Logs
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.LOGS           TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.AUDIT_POLICY   TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.AUDIT_READ_COUNTER TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+
+-- Change counters
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.DATA_VERSION   TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+
+-- Import staging
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ENROLLMENT_IMPORT_STAGE TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+
+-- Archive (history tables)
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.GRADES_HISTORY         TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ATTENDANCE_HISTORY     TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.COURSE_STUDENT_HISTORY TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ARCHIVE_HOLD           TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ATTENDANCE_BITMAP      TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.ATTENDANCE_BITMAP_HISTORY TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+GO
+
+---------------------------------------------------------
+-- Part 2.3 — GRANT EXECUTE ONLY
+-- All operations go through Stored Procedures
+-- (also covers table types passed as TVPs)
+---------------------------------------------------------
+GRANT EXECUTE TO [Admin];
+GRANT EXECUTE TO [Instructor];
+GRANT EXECUTE TO [TA];
+GRANT EXECUTE TO [Student];
+GRANT EXECUTE TO [Guestrole];
+GO
+
+---------------------------------------------------------
+-- Part 2.4 — RBAC_RANK TABLE (Role Hierarchy)
+-- Used by sp_CheckAccess later
+-- Idempotent: Create-if-not-exists + reset content
+---------------------------------------------------------
+IF OBJECT_ID('dbo.RBAC_RANK', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.RBAC_RANK (
+        RoleName NVARCHAR(20) NOT NULL PRIMARY KEY,
+        Rank     INT NOT NULL
+    );
+END
+GO
+
+-- Reset & seed (idempotent)
+DELETE FROM dbo.RBAC_RANK;
+GO
+
+INSERT INTO dbo.RBAC_RANK (RoleName, Rank) VALUES
+('Guestrole', 1),
+('Student',   2),
+('TA',        3),
+('Instructor',4),
+('Admin',     5);
+GO
+
+---------------------------------------------------------
+-- (Optional Hardening) DENY direct table access to RBAC_RANK too
+-- Keeps "no direct access" consistent
+---------------------------------------------------------
+DENY SELECT, INSERT, UPDATE, DELETE ON dbo.RBAC_RANK TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+GO
+
+---------------------------------------------------------
+-- Part 2.5 — SECURITY/PERFORMANCE INDEXES (Idempotent)
+---------------------------------------------------------
+
+-- USERS (RBAC / MLS lookups)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_USERS_Role_RBAC' AND object_id = OBJECT_ID('dbo.USERS'))
+    CREATE INDEX IX_USERS_Role_RBAC ON dbo.USERS(Role);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_USERS_Clearance_RBAC' AND object_id = OBJECT_ID('dbo.USERS'))
+    CREATE INDEX IX_USERS_Clearance_RBAC ON dbo.USERS(ClearanceLevel);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_USERS_Role_Clearance' AND object_id = OBJECT_ID('dbo.USERS'))
+    CREATE INDEX IX_USERS_Role_Clearance ON dbo.USERS(Role, ClearanceLevel);
+
+-- ROLE_REQUESTS (Part B workflow)
+-- Keyset paging (sp_RoleRequest_GetPage): Status seek, RequestID order
+-- (clustered key rides along), queue columns included
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ROLE_REQUESTS_Status_RBAC' AND object_id = OBJECT_ID('dbo.ROLE_REQUESTS'))
+    CREATE INDEX IX_ROLE_REQUESTS_Status_RBAC ON dbo.ROLE_REQUESTS(Status, RequestID)
+        INCLUDE (Username, CurrentRole, RequestedRole, DateSubmitted);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ROLE_REQUESTS_User_RBAC' AND object_id = OBJECT_ID('dbo.ROLE_REQUESTS'))
+    CREATE INDEX IX_ROLE_REQUESTS_User_RBAC ON dbo.ROLE_REQUESTS(Username);
+
+-- Mappings (authorization checks)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_IC_Instructor' AND object_id = OBJECT_ID('dbo.INSTRUCTOR_COURSE'))
+    CREATE INDEX IX_IC_Instructor ON dbo.INSTRUCTOR_COURSE(InstructorID);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TC_TAUsername' AND object_id = OBJECT_ID('dbo.TA_COURSE'))
+    CREATE INDEX IX_TC_TAUsername ON dbo.TA_COURSE(TAUsername);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_CS_Enrollment' AND object_id = OBJECT_ID('dbo.COURSE_STUDENT'))
+    CREATE INDEX IX_CS_Enrollment ON dbo.COURSE_STUDENT(StudentID, CourseID);
+
+-- Attendance delta sync (sp_TA_GetAttendanceChanges: per course, RowVer > watermark)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ATT_Course_RowVer' AND object_id = OBJECT_ID('dbo.ATTENDANCE'))
+    CREATE INDEX IX_ATT_Course_RowVer ON dbo.ATTENDANCE(CourseID, RowVer);
+
+-- Course-first covering indexes (active rows only)
+-- Hot per-course reads filter on CourseID + IsDeleted = 0:
+--   sp_Instructor_ViewGradesByCourse, sp_Get_AvgGrade_Safe       -> IX_GRADES_Course_Active
+--   sp_Instructor_ViewAttendanceByCourse, sp_TA_ViewAttendance,
+--   vw_Attendance_Aggregate_Safe                                 -> IX_ATT_Course_Active
+--   sp_Student_ViewAttendance                                    -> IX_ATT_Student_Active
+-- DateRecorded is the second key: a @FromDate / @ToDate window
+-- is a range seek inside the course (or student).
+-- Filtered + INCLUDE => seek on the course, no key lookups, and
+-- soft-deleted rows never enter the index.
+-- NOTE: filtered indexes need ANSI_NULLS / QUOTED_IDENTIFIER ON
+--       for DML (SSMS + ODBC defaults).
+-- Benchmark: SQL Code/SRMS_Index_Benchmark.sql
+-- GRADES / ATTENDANCE are partitioned on ps_Term: these indexes are
+-- created partition-aligned, so a per-term read touches one partition.
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_GRADES_Course_Active' AND object_id = OBJECT_ID('dbo.GRADES'))
+    CREATE INDEX IX_GRADES_Course_Active
+        ON dbo.GRADES(CourseID)
+        INCLUDE (StudentID, DateEntered, EncryptedGradeValue)
+        WHERE IsDeleted = 0;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ATT_Course_Active' AND object_id = OBJECT_ID('dbo.ATTENDANCE'))
+    CREATE INDEX IX_ATT_Course_Active
+        ON dbo.ATTENDANCE(CourseID, DateRecorded)
+        INCLUDE (StudentID, Status)
+        WHERE IsDeleted = 0;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ATT_Student_Active' AND object_id = OBJECT_ID('dbo.ATTENDANCE'))
+    CREATE INDEX IX_ATT_Student_Active
+        ON dbo.ATTENDANCE(StudentID, DateRecorded)
+        INCLUDE (CourseID, Status)
+        WHERE IsDeleted = 0;
+
+-- Archival (sp_Admin_ArchiveBatch): soft-deleted rows found without a scan
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_GRADES_Deleted' AND object_id = OBJECT_ID('dbo.GRADES'))
+    CREATE INDEX IX_GRADES_Deleted ON dbo.GRADES(StudentID) WHERE IsDeleted = 1;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_ATT_Deleted' AND object_id = OBJECT_ID('dbo.ATTENDANCE'))
+    CREATE INDEX IX_ATT_Deleted ON dbo.ATTENDANCE(StudentID) WHERE IsDeleted = 1;
+
+-- Course -> staff lookups (PKs are staff-first)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_TC_Course' AND object_id = OBJECT_ID('dbo.TA_COURSE'))
+    CREATE INDEX IX_TC_Course ON dbo.TA_COURSE(CourseID);
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_IC_Course' AND object_id = OBJECT_ID('dbo.INSTRUCTOR_COURSE'))
+    CREATE INDEX IX_IC_Course ON dbo.INSTRUCTOR_COURSE(CourseID);
+
+-- Type-ahead search (sp_Admin_Search*): prefix seeks
+--   STUDENT.FullName -> IX_STUDENT_FullName_Active
+--   STUDENT.Email    -> IX_STUDENT_Email
+--   COURSE.CourseName -> UQ_COURSE_Name, USERS.Username -> PK
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_STUDENT_FullName_Active' AND object_id = OBJECT_ID('dbo.STUDENT'))
+    CREATE INDEX IX_STUDENT_FullName_Active
+        ON dbo.STUDENT(FullName)
+        INCLUDE (Email)
+        WHERE IsDeleted = 0;
+
+-- Audit investigations (sp_Admin_GetEntityHistory): seeks on the
+-- typed LOGS columns instead of LIKE scans over Details
+--   entity history -> IX_LOGS_Entity
+--   course history -> IX_LOGS_Course
+--   user activity  -> IX_LOGS_User_Time
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_LOGS_Entity' AND object_id = OBJECT_ID('dbo.LOGS'))
+    CREATE INDEX IX_LOGS_Entity
+        ON dbo.LOGS(EntityType, EntityID, LogTime)
+        INCLUDE (Username, Action, CourseID, EventCount)
+        WHERE EntityID IS NOT NULL;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_LOGS_Course' AND object_id = OBJECT_ID('dbo.LOGS'))
+    CREATE INDEX IX_LOGS_Course
+        ON dbo.LOGS(CourseID, LogTime)
+        INCLUDE (Username, Action, EntityType, EntityID, EventCount)
+        WHERE CourseID IS NOT NULL;
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_LOGS_User_Time' AND object_id = OBJECT_ID('dbo.LOGS'))
+    CREATE INDEX IX_LOGS_User_Time
+        ON dbo.LOGS(Username, LogTime)
+        INCLUDE (Action, EntityType, EntityID, CourseID, EventCount);
+GO
+
+---------------------------------------------------------
+-- Part 2.6 — READ-ONLY TERM STORAGE (DBA step, not run here)
+--   GRADES / ATTENDANCE indexes are all aligned on ps_Term,
+--   so a TermID filter reads one partition of each index.
+--   ps_Term maps every term to [PRIMARY] so this script runs
+--   anywhere. Production maps each year's three partitions
+--   to a filegroup of its own; once a year's terms are closed
+--   (sp_Admin_SetTermReadOnly) its storage is frozen:
+--
+--     ALTER DATABASE SRMS_DB ADD FILEGROUP FG_2025;
+--     ALTER DATABASE SRMS_DB ADD FILE
+--         (NAME = N'SRMS_2025', FILENAME = N'<data dir>\SRMS_2025.ndf')
+--         TO FILEGROUP FG_2025;
+--     -- ps_Term: AS PARTITION pf_Term TO ([PRIMARY], ..., FG_2025, FG_2025, FG_2025, ...)
+--
+--     -- compact, then freeze (@p = $PARTITION.pf_Term(20251), per term)
+--     ALTER INDEX ALL ON dbo.GRADES     REBUILD PARTITION = @p;
+--     ALTER INDEX ALL ON dbo.ATTENDANCE REBUILD PARTITION = @p;
+--     ALTER DATABASE SRMS_DB MODIFY FILEGROUP FG_2025 READ_ONLY;
+--
+--   Packing a closed term's attendance first
+--   (sp_Admin_PackAttendanceTerm, E23) leaves its ATTENDANCE
+--   partition nearly empty; the bitmaps are ~1% of the size.
+--
+--   Read-only filegroups take no locks, are backed up once
+--   and never grow, so the writable (current) partitions stay
+--   the same size year after year.
+---------------------------------------------------------
+
+/* ===========================
+   END OF PART 2 (FINAL)
+   =========================== */
+
+
+
+
+
+
+
+
+
+
+
+
+/* =========================================================
+   SRMS_DB — Term Project (FINAL) — Part 3 (FINAL)
+   Encryption + Core Security Procedures
+
+   Depends on:
+     - Part 1 (DB + Tables)
+     - Part 2 (Roles + RBAC_RANK + EXECUTE-only model)
+
+   Includes:
+   - Master Key
+   - Certificate
+   - Symmetric Key (AES-256)
+   - sp_Key_Open / sp_Key_Close
+   - sp_LogAction
+   - sp_CheckAccess (RBAC + MLS Bell–LaPadula)
+     ✅ No Read Up
+     ✅ No Write Down
+   - sp__BumpDataVersion / sp_GetDataVersions (change counters)
+   ========================================================= */
+
+---------------------------------------------------------
+-- Part 3.1 — MASTER KEY (Root of Encryption) [Idempotent]
+---------------------------------------------------------
+IF NOT EXISTS (
+    SELECT 1 FROM sys.symmetric_keys
+    WHERE name = '##MS_DatabaseMasterKey##'
+)
+BEGIN
+    CREATE MASTER KEY
+    ENCRYPTION BY PASSWORD = 'SRMS_MasterKey_StrongPassword_2025!';
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.2 — CERTIFICATE (Protects Symmetric Key) [Idempotent]
+---------------------------------------------------------
+IF NOT EXISTS (
+    SELECT 1 FROM sys.certificates
+    WHERE name = 'SRMSCert'
+)
+BEGIN
+    CREATE CERTIFICATE SRMSCert
+    WITH SUBJECT = 'SRMS Encryption Certificate';
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.3 — SYMMETRIC KEY (AES-256) [Idempotent]
+---------------------------------------------------------
+IF NOT EXISTS (
+    SELECT 1 FROM sys.symmetric_keys
+    WHERE name = 'SRMSSymmetricKey'
+)
+BEGIN
+    CREATE SYMMETRIC KEY SRMSSymmetricKey
+    WITH ALGORITHM = AES_256
+    ENCRYPTION BY CERTIFICATE SRMSCert;
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.4 — HELPER: OPEN SYMMETRIC KEY (Safe)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Key_Open', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Key_Open;
+GO
+
+CREATE PROCEDURE dbo.sp_Key_Open
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    BEGIN TRY
+        OPEN SYMMETRIC KEY SRMSSymmetricKey
+            DECRYPTION BY CERTIFICATE SRMSCert;
+    END TRY
+    BEGIN CATCH
+        -- Ignore "already open" error; rethrow anything else
+        IF ERROR_NUMBER() <> 15315
+            THROW;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.5 — HELPER: CLOSE SYMMETRIC KEY (Safe)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Key_Close', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Key_Close;
+GO
+
+CREATE PROCEDURE dbo.sp_Key_Close
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    BEGIN TRY
+        CLOSE SYMMETRIC KEY SRMSSymmetricKey;
+    END TRY
+    BEGIN CATCH
+        -- If key isn't open, CLOSE may error; ignore that case
+        -- Re-throw anything unexpected
+        IF ERROR_NUMBER() NOT IN (15313, 15315)
+            THROW;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.6 — CENTRAL LOGGING PROCEDURE
+-- Audit level comes from AUDIT_POLICY (see 1.4a):
+--   ITEMIZED   -> one LOGS row
+--   AGGREGATED -> upsert of the current minute's counter;
+--                 finished minutes are moved to LOGS when a
+--                 new counter starts (sp__FlushAuditCounters)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp__FlushAuditCounters', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp__FlushAuditCounters;
+GO
+
+CREATE PROCEDURE dbo.sp__FlushAuditCounters
+(
+    @Before DATETIME = NULL    -- counters of minutes before this; NULL = before the current minute
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF @Before IS NULL
+        SET @Before = DATEADD(MINUTE, DATEDIFF(MINUTE, 0, GETDATE()), 0);
+
+    -- One flusher at a time; a busy flush is skipped, not waited for
+    DECLARE @rc INT;
+    EXEC @rc = sp_getapplock
+        @Resource    = 'SRMS_AUDIT_FLUSH',
+        @LockMode    = 'Exclusive',
+        @LockOwner   = 'Session',
+        @LockTimeout = 0;
+    IF @rc < 0
+        RETURN;
+
+    BEGIN TRY
+        WHILE 1 = 1
+        BEGIN
+            DELETE TOP (5000) C
+            OUTPUT NULLIF(deleted.Username, N''), deleted.Action, deleted.Details,
+                   deleted.MinuteStart, deleted.Hits,
+                   deleted.EntityType, deleted.EntityID, deleted.CourseID
+            INTO dbo.LOGS (Username, Action, Details, LogTime, EventCount,
+                           EntityType, EntityID, CourseID)
+            FROM dbo.AUDIT_READ_COUNTER C
+            WHERE C.MinuteStart < @Before;
+
+            IF @@ROWCOUNT < 5000
+                BREAK;
+        END
+    END TRY
+    BEGIN CATCH
+        EXEC sp_releaseapplock @Resource = 'SRMS_AUDIT_FLUSH', @LockOwner = 'Session';
+        THROW;
+    END CATCH
+
+    EXEC sp_releaseapplock @Resource = 'SRMS_AUDIT_FLUSH', @LockOwner = 'Session';
+END
+GO
+
+-- Entity of a user account: its role profile (StudentID /
+-- InstructorID / TAID); USER with no ID for Admin / Guest
+IF OBJECT_ID('dbo.fn__UserEntity', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.fn__UserEntity;
+GO
+
+CREATE FUNCTION dbo.fn__UserEntity
+(
+    @Username NVARCHAR(50)
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT
+        CAST(CASE Role
+                 WHEN 'Student'    THEN 'STUDENT'
+                 WHEN 'Instructor' THEN 'INSTRUCTOR'
+                 WHEN 'TA'         THEN 'TA'
+                 ELSE 'USER'
+             END AS NVARCHAR(20)) AS EntityType,
+        CASE Role
+            WHEN 'Student'    THEN StudentID
+            WHEN 'Instructor' THEN InstructorID
+            WHEN 'TA'         THEN TAID
+        END AS EntityID
+    FROM dbo.USERS
+    WHERE Username = @Username;
+GO
+
+IF OBJECT_ID('dbo.sp_LogAction', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_LogAction;
+GO
+
+CREATE PROCEDURE dbo.sp_LogAction
+(
+    @Username   NVARCHAR(50),
+    @Action     NVARCHAR(200),
+    @Details    NVARCHAR(4000) = NULL,
+    @EntityType NVARCHAR(20)   = NULL,   -- typed subject (see LOGS)
+    @EntityID   INT            = NULL,
+    @CourseID   INT            = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Level NVARCHAR(20) = 'ITEMIZED';
+
+    SELECT TOP (1) @Level = AuditLevel
+    FROM dbo.AUDIT_POLICY
+    WHERE @Action LIKE ActionPattern
+    ORDER BY LEN(ActionPattern) DESC, ActionPattern;
+
+    IF @Level = 'ITEMIZED'
+    BEGIN
+        INSERT INTO dbo.LOGS (Username, Action, Details, EntityType, EntityID, CourseID)
+        VALUES (@Username, @Action, @Details, @EntityType, @EntityID, @CourseID);
+        RETURN;
+    END
+
+    -----------------------------------------------------
+    -- AGGREGATED: count this call in the current minute
+    -----------------------------------------------------
+    DECLARE @Minute DATETIME      = DATEADD(MINUTE, DATEDIFF(MINUTE, 0, GETDATE()), 0);
+    DECLARE @User   NVARCHAR(50)  = ISNULL(@Username, N'');
+    DECLARE @Hash   VARBINARY(32) = HASHBYTES('SHA2_256',
+        ISNULL(@EntityType, N'') + N'|' + ISNULL(CAST(@EntityID AS NVARCHAR(20)), N'') + N'|' +
+        ISNULL(CAST(@CourseID AS NVARCHAR(20)), N'') + N'|' + ISNULL(@Details, N''));
+    DECLARE @New    BIT = 0;
+
+    BEGIN TRAN;
+
+    -- UPDLOCK + HOLDLOCK: concurrent first calls cannot both insert
+    UPDATE dbo.AUDIT_READ_COUNTER WITH (UPDLOCK, HOLDLOCK)
+    SET Hits     = Hits + 1,
+        LastSeen = GETDATE()
+    WHERE MinuteStart = @Minute
+      AND Username    = @User
+      AND Action      = @Action
+      AND DetailsHash = @Hash;
+
+    IF @@ROWCOUNT = 0
+    BEGIN
+        INSERT INTO dbo.AUDIT_READ_COUNTER
+            (MinuteStart, Username, Action, DetailsHash, Details, EntityType, EntityID, CourseID)
+        VALUES (@Minute, @User, @Action, @Hash, @Details, @EntityType, @EntityID, @CourseID);
+        SET @New = 1;
+    END
+
+    COMMIT;
+
+    IF @New = 1
+        EXEC dbo.sp__FlushAuditCounters;
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.7 — CENTRAL ACCESS CHECK (RBAC + MLS) [FINAL]
+-- Bell–LaPadula Enforcement:
+--   ✅ No Read Up    (READ:  user clearance >= object clearance)
+--   ✅ No Write Down (WRITE: user clearance <= object clearance)
+--
+-- RBAC:
+--   - If @RequiredRole contains comma => Allow-list (exact roles)
+--   - Else => Minimum-role (hierarchy rank via RBAC_RANK)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_CheckAccess', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_CheckAccess;
+GO
+
+CREATE PROCEDURE dbo.sp_CheckAccess
+(
+    @CurrentUsername   NVARCHAR(50),
+    @RequiredRole      NVARCHAR(200),  -- 'Instructor' OR 'TA,Instructor' OR 'Instructor,Admin'
+    @RequiredClearance INT,            -- object classification level (1..5)
+    @Mode              NVARCHAR(10)    -- 'READ' / 'WRITE'
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -----------------------------------------------------
+    -- Normalize + validate inputs
+    -----------------------------------------------------
+    SET @CurrentUsername = LTRIM(RTRIM(@CurrentUsername));
+    SET @RequiredRole    = LTRIM(RTRIM(@RequiredRole));
+    SET @Mode            = UPPER(LTRIM(RTRIM(@Mode)));
+
+    IF @CurrentUsername IS NULL OR @CurrentUsername = ''
+    BEGIN
+        RAISERROR('Access Denied: Missing username.', 16, 1);
+        RETURN;
+    END
+
+    IF @RequiredRole IS NULL OR @RequiredRole = ''
+    BEGIN
+        RAISERROR('Access Denied: Missing required role.', 16, 1);
+        RETURN;
+    END
+
+    IF @Mode NOT IN ('READ','WRITE')
+    BEGIN
+        RAISERROR('Invalid Mode. Use READ or WRITE.', 16, 1);
+        RETURN;
+    END
+
+    IF @RequiredClearance IS NULL OR @RequiredClearance NOT BETWEEN 1 AND 5
+    BEGIN
+        RAISERROR('Invalid RequiredClearance. Use 1..5.', 16, 1);
+        RETURN;
+    END
+
+    -----------------------------------------------------
+    -- Load current user role + clearance
+    -----------------------------------------------------
+    DECLARE @UserRole NVARCHAR(20);
+    DECLARE @UserClearance INT;
+
+    SELECT
+        @UserRole      = Role,
+        @UserClearance = ClearanceLevel
+    FROM dbo.USERS
+    WHERE Username = @CurrentUsername
+      AND IsDeleted = 0;
+
+    IF @UserRole IS NULL
+    BEGIN
+        RAISERROR('Access Denied: Unknown user.', 16, 1);
+        RETURN;
+    END
+
+    -----------------------------------------------------
+    -- Admin bypass (RBAC + MLS) for management operations
+    -- NOTE: Still no direct table access due to DENY policy (Part 2).
+    -----------------------------------------------------
+    IF @UserRole = 'Admin'
+        RETURN;
+
+    -----------------------------------------------------
+    -- RBAC Check
+    -----------------------------------------------------
+    DECLARE @UserRank INT;
+    SELECT @UserRank = Rank
+    FROM dbo.RBAC_RANK
+    WHERE RoleName = @UserRole;
+
+    IF @UserRank IS NULL
+    BEGIN
+        RAISERROR('Access Denied: Role rank missing (RBAC_RANK).', 16, 1);
+        RETURN;
+    END
+
+    -- Case A: Allow-list CSV (exact roles) e.g. 'TA,Instructor'
+    IF CHARINDEX(',', @RequiredRole) > 0
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1
+            FROM string_split(@RequiredRole, ',') s
+            WHERE LTRIM(RTRIM(s.value)) = @UserRole
+        )
+        BEGIN
+            RAISERROR('Access Denied: Role not permitted.', 16, 1);
+            RETURN;
+        END
+    END
+    ELSE
+    BEGIN
+        -- Case B: Minimum-role (hierarchy) e.g. RequiredRole='Instructor'
+        DECLARE @RequiredRank INT;
+
+        SELECT @RequiredRank = Rank
+        FROM dbo.RBAC_RANK
+        WHERE RoleName = @RequiredRole;
+
+        IF @RequiredRank IS NULL
+        BEGIN
+            RAISERROR('Access Denied: Required role rank missing (RBAC_RANK).', 16, 1);
+            RETURN;
+        END
+
+        IF @UserRank < @RequiredRank
+        BEGIN
+            RAISERROR('Access Denied: Role not permitted.', 16, 1);
+            RETURN;
+        END
+    END
+
+    -----------------------------------------------------
+    -- MLS: Bell–LaPadula
+    -----------------------------------------------------
+    -- ✅ No Read Up
+    IF @Mode = 'READ' AND @UserClearance < @RequiredClearance
+    BEGIN
+        RAISERROR('MLS Violation: No Read Up.', 16, 1);
+        RETURN;
+    END
+
+    -- ✅ No Write Down
+    IF @Mode = 'WRITE' AND @UserClearance > @RequiredClearance
+    BEGIN
+        RAISERROR('MLS Violation: No Write Down.', 16, 1);
+        RETURN;
+    END
+END
+GO
+
+---------------------------------------------------------
+-- Part 3.8 — DATA VERSION COUNTERS
+-- sp__BumpDataVersion: called by write procedures after a change
+-- sp_GetDataVersions : one small read for client pollers
+--   (no audit row: it runs every few seconds per open screen
+--    and returns no record data, only counters)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp__BumpDataVersion', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp__BumpDataVersion;
+GO
+
+CREATE PROCEDURE dbo.sp__BumpDataVersion
+(
+    @TableName NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    UPDATE dbo.DATA_VERSION
+    SET Version   = Version + 1,
+        UpdatedAt = GETDATE()
+    WHERE TableName = @TableName;
+
+    IF @@ROWCOUNT = 0
+        INSERT INTO dbo.DATA_VERSION (TableName, Version)
+        VALUES (@TableName, 1);
+END
+GO
+
+IF OBJECT_ID('dbo.sp_GetDataVersions', 'P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_GetDataVersions;
+GO
+
+CREATE PROCEDURE dbo.sp_GetDataVersions
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Guestrole',
+        @RequiredClearance = 1,
+        @Mode              = 'READ';
+
+    SELECT TableName, Version
+    FROM dbo.DATA_VERSION;
+END
+GO
+
+/* ===========================
+   END OF PART 3 (FINAL)
+   =========================== */
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+/* =========================================================
+   SRMS_DB — Term Project (FINAL) — Part 4
+   Views (By Role) + Inference Control Views (No Decrypt Here)
+
+   Depends on:
+     - Part 1 (Tables)
+     - Part 2 (DENY direct table access)
+     - Part 3 (encryption infra for later SPs)
+
+   IMPORTANT:
+     - Do NOT decrypt inside views.
+       Decryption happens in Stored Procedures (Part 5) after sp_Key_Open.
+
+   CRITICAL (Compatibility with Part 2):
+     - Since Part 2 DENY SELECT on tables for all roles,
+       users must be granted SELECT on VIEWS ONLY.
+   ========================================================= */
+
+---------------------------------------------------------
+-- Part 4.0 — ATTENDANCE (row store + packed bitmaps)
+--   vw__AttendanceRows    one row per recorded day, live rows
+--                         and expanded bitmaps alike
+--     RowKey              unique ordering key: AttendanceID for
+--                         stored rows; 2^31 + BitmapID * 512 + day
+--                         for packed ones (AttendanceID NULL)
+--   vw__AttendanceCounts  Sessions / Present per (StudentID,
+--                         CourseID, TermID), bitmaps not expanded
+--   Internal: no role may select them (procedures / views only).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.fn__DayNumbers', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.fn__DayNumbers;
+GO
+
+-- 0..511: one number per bitmap bit
+CREATE FUNCTION dbo.fn__DayNumbers ()
+RETURNS TABLE
+AS
+RETURN
+    SELECT CAST(H.N * 64 + T.N * 8 + U.N AS SMALLINT) AS N
+    FROM       (VALUES (0),(1),(2),(3),(4),(5),(6),(7)) H(N)
+    CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7)) T(N)
+    CROSS JOIN (VALUES (0),(1),(2),(3),(4),(5),(6),(7)) U(N);
+GO
+
+IF OBJECT_ID('dbo.vw__AttendanceRows', 'V') IS NOT NULL
+    DROP VIEW dbo.vw__AttendanceRows;
+GO
+
+CREATE VIEW dbo.vw__AttendanceRows
+AS
+SELECT
+    CAST(A.AttendanceID AS BIGINT) AS RowKey,
+    A.AttendanceID,
+    A.StudentID,
+    A.CourseID,
+    A.TermID,
+    A.Status,
+    A.DateRecorded,
+    CAST(NULL AS INT) AS BitmapID
+FROM dbo.ATTENDANCE A
+WHERE A.IsDeleted = 0
+
+UNION ALL
+
+SELECT
+    2147483648 + CAST(B.BitmapID AS BIGINT) * 512 + D.N,
+    NULL,
+    B.StudentID,
+    B.CourseID,
+    B.TermID,
+    CAST(CASE WHEN CAST(SUBSTRING(B.Present, D.N / 8 + 1, 1) AS TINYINT) & POWER(2, D.N % 8) <> 0
+              THEN 1 ELSE 0 END AS BIT),
+    DATEADD(DAY, D.N, B.StartDate),
+    B.BitmapID
+FROM dbo.ATTENDANCE_BITMAP B
+JOIN dbo.fn__DayNumbers() D
+    ON D.N < B.Days
+WHERE CAST(SUBSTRING(B.Recorded, D.N / 8 + 1, 1) AS TINYINT) & POWER(2, D.N % 8) <> 0;
+GO
+
+IF OBJECT_ID('dbo.vw__AttendanceCounts', 'V') IS NOT NULL
+    DROP VIEW dbo.vw__AttendanceCounts;
+GO
+
+CREATE VIEW dbo.vw__AttendanceCounts
+AS
+SELECT
+    StudentID,
+    CourseID,
+    TermID,
+    COUNT(*) AS Sessions,
+    SUM(CAST(Status AS INT)) AS Present
+FROM dbo.ATTENDANCE
+WHERE IsDeleted = 0
+GROUP BY StudentID, CourseID, TermID
+
+UNION ALL
+
+SELECT
+    StudentID,
+    CourseID,
+    TermID,
+    Sessions,
+    PresentCount
+FROM dbo.ATTENDANCE_BITMAP;
+GO
+
+DENY SELECT ON dbo.vw__AttendanceRows   TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+DENY SELECT ON dbo.vw__AttendanceCounts TO [Admin], [Instructor], [TA], [Student], [Guestrole];
+GO
+
+---------------------------------------------------------
+-- Part 4.1 — PUBLIC VIEWS (Guestrole)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_Course_Public', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Course_Public;
+GO
+
+CREATE VIEW dbo.vw_Course_Public
+AS
+SELECT
+    CourseID,
+    CourseName,
+    Description,
+    PublicInfo
+FROM dbo.COURSE
+WHERE IsDeleted = 0
+  AND ClearanceLevel = 1;
+GO
+
+---------------------------------------------------------
+-- Part 4.2 — ADMIN VIEWS
+-- Admin typically needs full visibility (including deleted),
+-- but you can add filters if you prefer.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_Admin_Students', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_Students;
+GO
+
+CREATE VIEW dbo.vw_Admin_Students
+AS
+SELECT
+    StudentID,
+    FullName,
+    Email,
+    DOB,
+    Department,
+    ClearanceLevel,
+    IsDeleted
+FROM dbo.STUDENT;
+GO
+
+IF OBJECT_ID('dbo.vw_Admin_Instructors', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_Instructors;
+GO
+
+CREATE VIEW dbo.vw_Admin_Instructors
+AS
+SELECT
+    InstructorID,
+    FullName,
+    Email,
+    ClearanceLevel,
+    IsDeleted
+FROM dbo.INSTRUCTOR;
+GO
+
+IF OBJECT_ID('dbo.vw_Admin_TAs', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_TAs;
+GO
+
+CREATE VIEW dbo.vw_Admin_TAs
+AS
+SELECT
+    TAID,
+    FullName,
+    Email,
+    ClearanceLevel,
+    IsDeleted
+FROM dbo.TA;
+GO
+
+IF OBJECT_ID('dbo.vw_Admin_Courses', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_Courses;
+GO
+
+CREATE VIEW dbo.vw_Admin_Courses
+AS
+SELECT
+    CourseID,
+    CourseName,
+    Description,
+    PublicInfo,
+    ClearanceLevel,
+    IsDeleted
+FROM dbo.COURSE;
+GO
+
+IF OBJECT_ID('dbo.vw_Admin_Users', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_Users;
+GO
+
+CREATE VIEW dbo.vw_Admin_Users
+AS
+SELECT
+    Username,
+    Role,
+    ClearanceLevel,
+    StudentID,
+    InstructorID,
+    TAID,
+    IsDeleted
+FROM dbo.USERS;
+GO
+
+IF OBJECT_ID('dbo.vw_Admin_RoleRequests', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_RoleRequests;
+GO
+
+CREATE VIEW dbo.vw_Admin_RoleRequests
+AS
+SELECT
+    RequestID,
+    Username,
+    CurrentRole,
+    RequestedRole,
+    Reason,
+    Comments,
+    Status,
+    DateSubmitted
+FROM dbo.ROLE_REQUESTS;
+GO
+
+IF OBJECT_ID('dbo.vw_Admin_Logs', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Admin_Logs;
+GO
+
+-- Includes read counters not flushed yet (LogID NULL)
+CREATE VIEW dbo.vw_Admin_Logs
+AS
+SELECT
+    LogID,
+    Username,
+    Action,
+    Details,
+    LogTime,
+    EventCount,
+    EntityType,
+    EntityID,
+    CourseID
+FROM dbo.LOGS
+UNION ALL
+SELECT
+    NULL,
+    NULLIF(Username, N''),
+    Action,
+    Details,
+    MinuteStart,
+    Hits,
+    EntityType,
+    EntityID,
+    CourseID
+FROM dbo.AUDIT_READ_COUNTER;
+GO
+
+---------------------------------------------------------
+-- Part 4.3 — INSTRUCTOR VIEWS (scoped by Username)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_Instructor_Courses', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Instructor_Courses;
+GO
+
+CREATE VIEW dbo.vw_Instructor_Courses
+AS
+SELECT
+    U.Username,
+    IC.InstructorID,
+    C.CourseID,
+    C.CourseName,
+    C.Description,
+    C.PublicInfo,
+    C.ClearanceLevel
+FROM dbo.INSTRUCTOR_COURSE IC
+JOIN dbo.USERS U
+    ON U.InstructorID = IC.InstructorID
+JOIN dbo.COURSE C
+    ON C.CourseID = IC.CourseID
+WHERE U.IsDeleted = 0
+  AND C.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_Instructor_Students', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Instructor_Students;
+GO
+
+CREATE VIEW dbo.vw_Instructor_Students
+AS
+SELECT DISTINCT
+    U.Username,
+    IC.InstructorID,
+    CS.CourseID,
+    S.StudentID,
+    S.FullName,
+    S.Email,
+    S.Department
+FROM dbo.INSTRUCTOR_COURSE IC
+JOIN dbo.USERS U
+    ON U.InstructorID = IC.InstructorID
+JOIN dbo.COURSE_STUDENT CS
+    ON CS.CourseID = IC.CourseID
+JOIN dbo.STUDENT S
+    ON S.StudentID = CS.StudentID
+WHERE U.IsDeleted = 0
+  AND S.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_Instructor_Grades', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Instructor_Grades;
+GO
+
+CREATE VIEW dbo.vw_Instructor_Grades
+AS
+SELECT
+    U.Username,
+    IC.InstructorID,
+    G.GradeID,
+    G.StudentID,
+    G.CourseID,
+    G.DateEntered,
+    G.EncryptedGradeValue
+FROM dbo.INSTRUCTOR_COURSE IC
+JOIN dbo.USERS U
+    ON U.InstructorID = IC.InstructorID
+JOIN dbo.GRADES G
+    ON G.CourseID = IC.CourseID
+WHERE U.IsDeleted = 0
+  AND G.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_Instructor_Attendance', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Instructor_Attendance;
+GO
+
+CREATE VIEW dbo.vw_Instructor_Attendance
+AS
+SELECT
+    U.Username,
+    IC.InstructorID,
+    A.AttendanceID,
+    A.StudentID,
+    A.CourseID,
+    A.Status,
+    A.DateRecorded
+FROM dbo.INSTRUCTOR_COURSE IC
+JOIN dbo.USERS U
+    ON U.InstructorID = IC.InstructorID
+JOIN dbo.vw__AttendanceRows A
+    ON A.CourseID = IC.CourseID
+WHERE U.IsDeleted = 0;
+GO
+
+---------------------------------------------------------
+-- Part 4.4 — TA VIEWS (scoped by TAUsername)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_TA_Courses', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_TA_Courses;
+GO
+
+CREATE VIEW dbo.vw_TA_Courses
+AS
+SELECT
+    TC.TAUsername,
+    TC.CourseID,
+    C.CourseName,
+    C.Description,
+    C.PublicInfo,
+    C.ClearanceLevel
+FROM dbo.TA_COURSE TC
+JOIN dbo.COURSE C
+    ON C.CourseID = TC.CourseID
+JOIN dbo.USERS U
+    ON U.Username = TC.TAUsername
+WHERE U.IsDeleted = 0
+  AND C.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_TA_Students', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_TA_Students;
+GO
+
+CREATE VIEW dbo.vw_TA_Students
+AS
+SELECT DISTINCT
+    TC.TAUsername,
+    CS.CourseID,
+    S.StudentID,
+    S.FullName,
+    S.Email,
+    S.Department
+FROM dbo.TA_COURSE TC
+JOIN dbo.USERS U
+    ON U.Username = TC.TAUsername
+JOIN dbo.COURSE_STUDENT CS
+    ON CS.CourseID = TC.CourseID
+JOIN dbo.STUDENT S
+    ON S.StudentID = CS.StudentID
+WHERE U.IsDeleted = 0
+  AND S.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_TA_Attendance', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_TA_Attendance;
+GO
+
+CREATE VIEW dbo.vw_TA_Attendance
+AS
+SELECT
+    TC.TAUsername,
+    A.AttendanceID,
+    A.StudentID,
+    A.CourseID,
+    A.Status,
+    A.DateRecorded
+FROM dbo.TA_COURSE TC
+JOIN dbo.USERS U
+    ON U.Username = TC.TAUsername
+JOIN dbo.vw__AttendanceRows A
+    ON A.CourseID = TC.CourseID
+WHERE U.IsDeleted = 0;
+GO
+
+---------------------------------------------------------
+-- Part 4.5 — STUDENT VIEWS (self scoped by Username)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_Student_Self', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Student_Self;
+GO
+
+CREATE VIEW dbo.vw_Student_Self
+AS
+SELECT
+    U.Username,
+    S.StudentID,
+    S.FullName,
+    S.Email,
+    S.DOB,
+    S.Department,
+    S.EncryptedPhone
+FROM dbo.USERS U
+JOIN dbo.STUDENT S
+    ON S.StudentID = U.StudentID
+WHERE U.IsDeleted = 0
+  AND S.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_Student_Courses', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Student_Courses;
+GO
+
+CREATE VIEW dbo.vw_Student_Courses
+AS
+SELECT
+    U.Username,
+    CS.StudentID,
+    C.CourseID,
+    C.CourseName,
+    C.Description,
+    C.PublicInfo,
+    C.ClearanceLevel
+FROM dbo.USERS U
+JOIN dbo.COURSE_STUDENT CS
+    ON CS.StudentID = U.StudentID
+JOIN dbo.COURSE C
+    ON C.CourseID = CS.CourseID
+WHERE U.IsDeleted = 0
+  AND C.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_Student_Grades', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Student_Grades;
+GO
+
+CREATE VIEW dbo.vw_Student_Grades
+AS
+SELECT
+    U.Username,
+    G.GradeID,
+    G.StudentID,
+    G.CourseID,
+    G.DateEntered,
+    G.EncryptedGradeValue
+FROM dbo.USERS U
+JOIN dbo.GRADES G
+    ON G.StudentID = U.StudentID
+WHERE U.IsDeleted = 0
+  AND G.IsDeleted = 0;
+GO
+
+IF OBJECT_ID('dbo.vw_Student_Attendance', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Student_Attendance;
+GO
+
+CREATE VIEW dbo.vw_Student_Attendance
+AS
+SELECT
+    U.Username,
+    A.AttendanceID,
+    A.StudentID,
+    A.CourseID,
+    A.Status,
+    A.DateRecorded
+FROM dbo.USERS U
+JOIN dbo.vw__AttendanceRows A
+    ON A.StudentID = U.StudentID
+WHERE U.IsDeleted = 0;
+GO
+
+---------------------------------------------------------
+-- Part 4.6 — INFERENCE CONTROL (Query Set Size ≥ 3)
+-- IMPORTANT: No Decrypt in views.
+-- We'll implement AvgGrade in SP in Part 5 (open key + decrypt + HAVING >=3).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_Grades_GroupSize_Safe', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Grades_GroupSize_Safe;
+GO
+
+CREATE VIEW dbo.vw_Grades_GroupSize_Safe
+AS
+SELECT
+    CourseID,
+    COUNT(*) AS StudentCount
+FROM dbo.GRADES
+WHERE IsDeleted = 0
+GROUP BY CourseID
+HAVING COUNT(*) >= 3;
+GO
+
+IF OBJECT_ID('dbo.vw_Attendance_Aggregate_Safe', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Attendance_Aggregate_Safe;
+GO
+
+CREATE VIEW dbo.vw_Attendance_Aggregate_Safe
+AS
+SELECT
+    CourseID,
+    SUM(Sessions) AS TotalRecords,
+    SUM(Present) AS PresentCount
+FROM dbo.vw__AttendanceCounts
+GROUP BY CourseID
+HAVING SUM(Sessions) >= 3;
+GO
+
+---------------------------------------------------------
+-- Part 4.7 — GRANT SELECT ON VIEWS (Required with Part 2 DENY)
+---------------------------------------------------------
+
+-- Guestrole (public)
+GRANT SELECT ON dbo.vw_Course_Public TO [Guestrole];
+
+-- Admin (full admin views)
+GRANT SELECT ON dbo.vw_Admin_Students      TO [Admin];
+GRANT SELECT ON dbo.vw_Admin_Instructors   TO [Admin];
+GRANT SELECT ON dbo.vw_Admin_TAs           TO [Admin];
+GRANT SELECT ON dbo.vw_Admin_Courses       TO [Admin];
+GRANT SELECT ON dbo.vw_Admin_Users         TO [Admin];
+GRANT SELECT ON dbo.vw_Admin_RoleRequests  TO [Admin];
+GRANT SELECT ON dbo.vw_Admin_Logs          TO [Admin];
+
+-- Instructor
+GRANT SELECT ON dbo.vw_Instructor_Courses     TO [Instructor];
+GRANT SELECT ON dbo.vw_Instructor_Students    TO [Instructor];
+GRANT SELECT ON dbo.vw_Instructor_Grades      TO [Instructor];
+GRANT SELECT ON dbo.vw_Instructor_Attendance  TO [Instructor];
+
+-- TA
+GRANT SELECT ON dbo.vw_TA_Courses     TO [TA];
+GRANT SELECT ON dbo.vw_TA_Students    TO [TA];
+GRANT SELECT ON dbo.vw_TA_Attendance  TO [TA];
+
+-- Student
+GRANT SELECT ON dbo.vw_Student_Self        TO [Student];
+GRANT SELECT ON dbo.vw_Student_Courses     TO [Student];
+GRANT SELECT ON dbo.vw_Student_Grades      TO [Student];
+GRANT SELECT ON dbo.vw_Student_Attendance  TO [Student];
+
+-- Safe aggregate (optional, if you want to expose safely)
+-- You can grant these to Instructor/TA/Admin depending on requirements:
+GRANT SELECT ON dbo.vw_Grades_GroupSize_Safe      TO [Instructor];
+GRANT SELECT ON dbo.vw_Attendance_Aggregate_Safe  TO [Instructor];
+
+GRANT SELECT ON dbo.vw_Grades_GroupSize_Safe      TO [Admin];
+GRANT SELECT ON dbo.vw_Attendance_Aggregate_Safe  TO [Admin];
+GO
+
+/* ===========================
+   END OF PART 4 (FINAL)
+   =========================== */
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+
+/* =========================================================
+   SRMS_DB — Term Project (FINAL)
+   Part 5A — Shared Helpers + Student Procedures (FINAL)
+
+   Depends on:
+     - Part 1 (Schema + Tables)
+     - Part 2 (EXECUTE-only + DENY table access)
+     - Part 3 (Encryption infra + sp_Key_Open/sp_Key_Close + sp_LogAction + sp_CheckAccess)
+     - Part 4 (Views without decrypt)
+
+   Notes:
+     - All reads/writes via Stored Procedures only.
+     - Decrypt happens ONLY inside SPs after sp_Key_Open.
+   ========================================================= */
+
+/* =========================================================
+   SHARED VALIDATION (set-based)
+   One inline TVF call per procedure instead of a chain of
+   nested helper EXECs: course / student / ownership /
+   enrollment are resolved in a single joined query that
+   returns one ReasonCode (0 = OK) + its message.
+
+   Reason codes:
+      0  OK
+      1  CourseID is required.
+      2  Course not found or deleted.
+      3  StudentID is required.
+      4  Student not found or deleted.
+      5  Course not assigned to this instructor.
+      6  Course not assigned to this TA.
+      7  Student is not enrolled in this course.
+      8  Instructor not found or deleted.
+      9  User not found or deleted.
+     10  TA user not found or not active TA.
+     11  Student already enrolled in this course.
+     12  Instructor already assigned to this course.
+     13  TA already assigned to this course.
+     14  Duplicate row in import.
+
+   Caller pattern:
+     SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+     FROM dbo.fn__ValidateCourseAction(...);
+     IF @Reason <> 0 BEGIN RAISERROR(@ReasonMsg,16,1); RETURN; END
+
+   NOTE: unlike a nested EXEC, the RETURN is in the caller,
+         so a failed check stops the write itself.
+   ========================================================= */
+
+---------------------------------------------------------
+-- Reason code -> message
+---------------------------------------------------------
+IF OBJECT_ID('dbo.fn__ReasonMessage','IF') IS NOT NULL
+    DROP FUNCTION dbo.fn__ReasonMessage;
+GO
+CREATE FUNCTION dbo.fn__ReasonMessage
+(
+    @ReasonCode INT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT ReasonMessage =
+        CASE @ReasonCode
+            WHEN 0  THEN NULL
+            WHEN 1  THEN N'CourseID is required.'
+            WHEN 2  THEN N'Course not found or deleted.'
+            WHEN 3  THEN N'StudentID is required.'
+            WHEN 4  THEN N'Student not found or deleted.'
+            WHEN 5  THEN N'Access Denied: Course not assigned to this instructor.'
+            WHEN 6  THEN N'Access Denied: Course not assigned to this TA.'
+            WHEN 7  THEN N'Student is not enrolled in this course.'
+            WHEN 8  THEN N'Instructor not found or deleted.'
+            WHEN 9  THEN N'User not found or deleted.'
+            WHEN 10 THEN N'TA user not found or not active TA.'
+            WHEN 11 THEN N'Student already enrolled in this course.'
+            WHEN 12 THEN N'Instructor already assigned to this course.'
+            WHEN 13 THEN N'TA already assigned to this course.'
+            WHEN 14 THEN N'Duplicate row in import.'
+            ELSE N'Validation failed.'
+        END;
+GO
+
+---------------------------------------------------------
+-- Course action (Instructor / TA / shared reads)
+--   @OwnerRole       'Instructor' | 'TA' | NULL (no ownership check)
+--   @CheckStudent    1 => StudentID required + active
+--   @CheckEnrollment 1 => (CourseID, StudentID) in COURSE_STUDENT
+---------------------------------------------------------
+IF OBJECT_ID('dbo.fn__ValidateCourseAction','IF') IS NOT NULL
+    DROP FUNCTION dbo.fn__ValidateCourseAction;
+GO
+CREATE FUNCTION dbo.fn__ValidateCourseAction
+(
+    @CurrentUsername NVARCHAR(50),
+    @OwnerRole       NVARCHAR(20),
+    @CourseID        INT,
+    @StudentID       INT,
+    @CheckStudent    BIT,
+    @CheckEnrollment BIT
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT V.ReasonCode, M.ReasonMessage
+    FROM (
+        SELECT ReasonCode =
+            CASE
+                WHEN @CourseID IS NULL                                    THEN 1
+                WHEN C.CourseID IS NULL                                   THEN 2
+                WHEN @CheckStudent = 1 AND @StudentID IS NULL             THEN 3
+                WHEN @CheckStudent = 1 AND S.StudentID IS NULL            THEN 4
+                WHEN @OwnerRole = N'Instructor' AND IC.CourseID IS NULL   THEN 5
+                WHEN @OwnerRole = N'TA' AND TC.CourseID IS NULL           THEN 6
+                WHEN @CheckEnrollment = 1 AND CS.CourseID IS NULL         THEN 7
+                ELSE 0
+            END
+        FROM (VALUES (1)) AS X(One)
+        LEFT JOIN dbo.COURSE C
+               ON C.CourseID = @CourseID
+              AND C.IsDeleted = 0
+        LEFT JOIN dbo.STUDENT S
+               ON @CheckStudent = 1
+              AND S.StudentID = @StudentID
+              AND S.IsDeleted = 0
+        OUTER APPLY (
+            SELECT TOP (1) IC.CourseID
+            FROM dbo.USERS U
+            JOIN dbo.INSTRUCTOR_COURSE IC ON IC.InstructorID = U.InstructorID
+            WHERE @OwnerRole = N'Instructor'
+              AND U.Username = @CurrentUsername
+              AND U.IsDeleted = 0
+              AND IC.CourseID = @CourseID
+        ) IC
+        OUTER APPLY (
+            SELECT TOP (1) TC.CourseID
+            FROM dbo.TA_COURSE TC
+            JOIN dbo.USERS U ON U.Username = TC.TAUsername
+            WHERE @OwnerRole = N'TA'
+              AND TC.TAUsername = @CurrentUsername
+              AND TC.CourseID   = @CourseID
+              AND U.IsDeleted   = 0
+        ) TC
+        LEFT JOIN dbo.COURSE_STUDENT CS
+               ON @CheckEnrollment = 1
+              AND CS.CourseID  = @CourseID
+              AND CS.StudentID = @StudentID
+    ) V
+    CROSS APPLY dbo.fn__ReasonMessage(V.ReasonCode) M;
+GO
+
+---------------------------------------------------------
+-- Admin course link (course CRUD, enroll, assign)
+--   @LinkType NULL         course only
+--             'STUDENT'    + student active, not yet enrolled
+--             'INSTRUCTOR' + instructor active, not yet assigned
+--             'TA'         + active TA user, not yet assigned
+---------------------------------------------------------
+IF OBJECT_ID('dbo.fn__ValidateAdminCourseLink','IF') IS NOT NULL
+    DROP FUNCTION dbo.fn__ValidateAdminCourseLink;
+GO
+CREATE FUNCTION dbo.fn__ValidateAdminCourseLink
+(
+    @CourseID     INT,
+    @LinkType     NVARCHAR(20),
+    @StudentID    INT,
+    @InstructorID INT,
+    @TAUsername   NVARCHAR(50)
+)
+RETURNS TABLE
+AS
+RETURN
+    SELECT V.ReasonCode, M.ReasonMessage
+    FROM (
+        SELECT ReasonCode =
+            CASE
+                WHEN @CourseID IS NULL                                        THEN 1
+                WHEN C.CourseID IS NULL                                       THEN 2
+                WHEN @LinkType = N'STUDENT'    AND @StudentID IS NULL         THEN 3
+                WHEN @LinkType = N'STUDENT'    AND S.StudentID IS NULL        THEN 4
+                WHEN @LinkType = N'STUDENT'    AND CS.CourseID IS NOT NULL    THEN 11
+                WHEN @LinkType = N'INSTRUCTOR' AND I.InstructorID IS NULL     THEN 8
+                WHEN @LinkType = N'INSTRUCTOR' AND IC.CourseID IS NOT NULL    THEN 12
+                WHEN @LinkType = N'TA'         AND U.Username IS NULL         THEN 9
+                WHEN @LinkType = N'TA'         AND U.Role <> N'TA'            THEN 10
+                WHEN @LinkType = N'TA'         AND TC.CourseID IS NOT NULL    THEN 13
+                ELSE 0
+            END
+        FROM (VALUES (1)) AS X(One)
+        LEFT JOIN dbo.COURSE C
+               ON C.CourseID = @CourseID
+              AND C.IsDeleted = 0
+        LEFT JOIN dbo.STUDENT S
+               ON @LinkType = N'STUDENT'
+              AND S.StudentID = @StudentID
+              AND S.IsDeleted = 0
+        LEFT JOIN dbo.COURSE_STUDENT CS
+               ON @LinkType = N'STUDENT'
+              AND CS.CourseID  = @CourseID
+              AND CS.StudentID = @StudentID
+        LEFT JOIN dbo.INSTRUCTOR I
+               ON @LinkType = N'INSTRUCTOR'
+              AND I.InstructorID = @InstructorID
+              AND I.IsDeleted = 0
+        LEFT JOIN dbo.INSTRUCTOR_COURSE IC
+               ON @LinkType = N'INSTRUCTOR'
+              AND IC.InstructorID = @InstructorID
+              AND IC.CourseID     = @CourseID
+        LEFT JOIN dbo.USERS U
+               ON @LinkType = N'TA'
+              AND U.Username  = @TAUsername
+              AND U.IsDeleted = 0
+        LEFT JOIN dbo.TA_COURSE TC
+               ON @LinkType = N'TA'
+              AND TC.TAUsername = @TAUsername
+              AND TC.CourseID   = @CourseID
+    ) V
+    CROSS APPLY dbo.fn__ReasonMessage(V.ReasonCode) M;
+GO
+
+/* =========================================================
+   SHARED HELPERS
+   ========================================================= */
+
+---------------------------------------------------------
+-- Helper: Resolve current StudentID for a Student user (active linkage)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp__GetCurrentStudentID','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp__GetCurrentStudentID;
+GO
+CREATE PROCEDURE dbo.sp__GetCurrentStudentID
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID INT OUTPUT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SET @CurrentUsername = LTRIM(RTRIM(@CurrentUsername));
+
+    IF @CurrentUsername IS NULL OR @CurrentUsername = ''
+    BEGIN
+        RAISERROR('Missing username.', 16, 1);
+        RETURN;
+    END
+
+    SELECT @StudentID = U.StudentID
+    FROM dbo.USERS U
+    WHERE U.Username = @CurrentUsername
+      AND U.IsDeleted = 0
+      AND U.Role = 'Student';
+
+    IF @StudentID IS NULL
+    BEGIN
+        RAISERROR('Student linkage not found or user is not an active Student.', 16, 1);
+        RETURN;
+    END
+
+    -- Ensure underlying student row is active
+    IF NOT EXISTS (SELECT 1 FROM dbo.STUDENT WHERE StudentID = @StudentID AND IsDeleted = 0)
+    BEGIN
+        RAISERROR('Linked student record not found or deleted.', 16, 1);
+        RETURN;
+    END
+END
+GO
+
+
+/* =========================================================
+   SECTION A — STUDENT PROCEDURES
+   ========================================================= */
+
+---------------------------------------------------------
+-- A1. Student: View Own Profile (Decrypt Phone)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Student_ViewProfile','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Student_ViewProfile;
+GO
+CREATE PROCEDURE dbo.sp_Student_ViewProfile
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Student',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    DECLARE @StudentID INT;
+    EXEC dbo.sp__GetCurrentStudentID
+        @CurrentUsername = @CurrentUsername,
+        @StudentID = @StudentID OUTPUT;
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT
+            S.StudentID,
+            S.FullName,
+            S.Email,
+            S.DOB,
+            S.Department,
+            CONVERT(NVARCHAR(20), DecryptByKey(S.EncryptedPhone)) AS Phone
+        FROM dbo.STUDENT S
+        WHERE S.StudentID = @StudentID
+          AND S.IsDeleted = 0;
+
+        EXEC dbo.sp_Key_Close;
+
+        DECLARE @Details NVARCHAR(4000);
+        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
+
+        EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'STUDENT_VIEW_PROFILE',
+        @Details  = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID;
+
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+
+---------------------------------------------------------
+-- A2. Student: Update Own Phone (Encrypt)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Student_UpdateOwnPhone','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Student_UpdateOwnPhone;
+GO
+CREATE PROCEDURE dbo.sp_Student_UpdateOwnPhone
+(
+    @CurrentUsername NVARCHAR(50),
+    @NewPhone        NVARCHAR(20)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Student',
+        @RequiredClearance = 2,
+        @Mode              = 'WRITE';
+
+    SET @NewPhone = LTRIM(RTRIM(@NewPhone));
+    IF @NewPhone IS NULL OR @NewPhone = ''
+    BEGIN
+        RAISERROR('NewPhone is required.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @StudentID INT;
+    EXEC dbo.sp__GetCurrentStudentID
+        @CurrentUsername = @CurrentUsername,
+        @StudentID = @StudentID OUTPUT;
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        UPDATE dbo.STUDENT
+        SET EncryptedPhone = EncryptByKey(Key_GUID('SRMSSymmetricKey'), @NewPhone)
+        WHERE StudentID = @StudentID
+          AND IsDeleted = 0;
+
+        EXEC dbo.sp_Key_Close;
+
+		DECLARE @Details NVARCHAR(4000);
+        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'STUDENT';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'STUDENT_UPDATE_PHONE',
+            @Details = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+
+END
+GO
+
+
+---------------------------------------------------------
+-- A3. Student: View Own Courses
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Student_ViewCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Student_ViewCourses;
+GO
+CREATE PROCEDURE dbo.sp_Student_ViewCourses
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Student',
+        @RequiredClearance = 1,
+        @Mode              = 'READ';
+
+    DECLARE @StudentID INT;
+    EXEC dbo.sp__GetCurrentStudentID
+        @CurrentUsername = @CurrentUsername,
+        @StudentID = @StudentID OUTPUT;
+
+    SELECT
+        C.CourseID,
+        C.CourseName,
+        C.Description,
+        C.PublicInfo
+    FROM dbo.COURSE_STUDENT CS
+    JOIN dbo.COURSE C ON C.CourseID = CS.CourseID
+    WHERE CS.StudentID = @StudentID
+      AND C.IsDeleted = 0;
+
+	  DECLARE @Details NVARCHAR(4000);
+        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20));
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'STUDENT_VIEW_COURSES',
+        @Details  = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID;
+END
+GO
+
+
+---------------------------------------------------------
+-- A4. Student: View Own Grades (Decrypt)
+--   @TermID NULL = current term
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Student_ViewGrades','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Student_ViewGrades;
+GO
+
+CREATE PROCEDURE dbo.sp_Student_ViewGrades
+(
+    @CurrentUsername NVARCHAR(50),
+    @TermID          INT = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -------------------------------------------------
+    -- Student only (Clearance = 2)
+    -------------------------------------------------
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Student',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    -------------------------------------------------
+    -- Get StudentID safely
+    -------------------------------------------------
+    DECLARE @StudentID INT;
+    EXEC dbo.sp__GetCurrentStudentID
+        @CurrentUsername = @CurrentUsername,
+        @StudentID = @StudentID OUTPUT;
+
+    IF @StudentID IS NULL
+        RAISERROR('Student profile not found.',16,1);
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    -------------------------------------------------
+    -- View Grades (MLS SAFE)
+    -------------------------------------------------
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT
+            G.GradeID,
+            G.CourseID,
+            C.CourseName,
+            TRY_CONVERT(
+                DECIMAL(10,2),
+                CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))
+            ) AS Grade,
+            G.DateEntered
+        FROM dbo.GRADES G
+        JOIN dbo.COURSE C
+            ON C.CourseID = G.CourseID
+        WHERE G.StudentID = @StudentID
+          AND G.TermID = @TermID
+          AND G.IsDeleted = 0
+          AND C.IsDeleted = 0
+          AND C.ClearanceLevel <= 2   -- ✅ MLS FILTER
+          AND G.EncryptedGradeValue IS NOT NULL;
+
+        EXEC dbo.sp_Key_Close;
+
+        -------------------------------------------------
+        -- Audit
+        -------------------------------------------------
+        DECLARE @Details NVARCHAR(4000);
+        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+                       N', TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'-');
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'STUDENT_VIEW_GRADES',
+            @Details  = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID;
+    END TRY
+    BEGIN CATCH
+        DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+        RAISERROR(@Err, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- A5. Student: View Own Attendance (SAFE - MLS)
+--   @TermID NULL = current term
+--   @FromDate / @ToDate: optional window (inclusive)
+--   Keyset paging: @PageSize rows ordered by
+--   (DateRecorded, RowKey); next page: @AfterDate /
+--   @AfterRowKey = last row shown. @PageSize NULL = all.
+--   Packed terms (Part 4.0) come back as rows with
+--   AttendanceID NULL.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Student_ViewAttendance','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Student_ViewAttendance;
+GO
+
+CREATE PROCEDURE dbo.sp_Student_ViewAttendance
+(
+    @CurrentUsername   NVARCHAR(50),
+    @TermID            INT  = NULL,
+    @FromDate          DATE = NULL,
+    @ToDate            DATE = NULL,
+    @AfterDate         DATE = NULL,
+    @AfterRowKey       BIGINT = NULL,
+    @PageSize          INT  = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -------------------------------------------------
+    -- Student only (CLEARANCE = 2)
+    -------------------------------------------------
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Student',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    -------------------------------------------------
+    -- Get StudentID safely
+    -------------------------------------------------
+    DECLARE @StudentID INT;
+    EXEC dbo.sp__GetCurrentStudentID
+        @CurrentUsername = @CurrentUsername,
+        @StudentID       = @StudentID OUTPUT;
+
+    IF @StudentID IS NULL
+        RAISERROR('Student profile not found.',16,1);
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    IF @PageSize < 1 SET @PageSize = NULL;
+    IF @PageSize > 5000 SET @PageSize = 5000;
+
+    -------------------------------------------------
+    -- SAFE MLS QUERY
+    -------------------------------------------------
+    SELECT TOP (ISNULL(@PageSize, 2147483647))
+        A.AttendanceID,
+        A.RowKey,
+        C.CourseName,
+        CASE A.Status
+            WHEN 1 THEN 'Present'
+            WHEN 0 THEN 'Absent'
+            ELSE 'Unknown'
+        END AS StatusText,
+        A.DateRecorded
+    FROM dbo.vw__AttendanceRows A
+    JOIN dbo.COURSE C
+        ON A.CourseID = C.CourseID
+    WHERE A.StudentID = @StudentID
+      AND A.TermID = @TermID
+      AND C.IsDeleted = 0
+      AND C.ClearanceLevel <= 2    -- 🔐 MLS FILTER
+      AND (@FromDate IS NULL OR A.DateRecorded >= @FromDate)
+      AND (@ToDate   IS NULL OR A.DateRecorded <= @ToDate)
+      AND (@AfterDate IS NULL
+           OR A.DateRecorded > @AfterDate
+           OR (A.DateRecorded = @AfterDate AND A.RowKey > @AfterRowKey))
+    ORDER BY A.DateRecorded, A.RowKey
+    OPTION (RECOMPILE);
+
+    -------------------------------------------------
+    -- Audit log (first page only)
+    -------------------------------------------------
+    IF @AfterDate IS NULL
+    BEGIN
+        DECLARE @Details NVARCHAR(4000);
+        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+                       N', TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'-') +
+                       ISNULL(N', From=' + CONVERT(NVARCHAR(10), @FromDate, 23), N'') +
+                       ISNULL(N', To=' + CONVERT(NVARCHAR(10), @ToDate, 23), N'');
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'STUDENT_VIEW_ATTENDANCE',
+            @Details  = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID;
+    END
+END
+GO
+
+
+---------------------------------------------------------
+-- A6. Student: Overview (Profile + Courses + Grades + Attendance)
+--   One access check, one key open, one audit row.
+--   Returns 4 result sets, same columns as A1 / A3 / A4 / A5:
+--     1) profile  2) courses  3) grades  4) attendance
+--   Grades / attendance: @TermID, NULL = current term
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Student_Overview','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Student_Overview;
+GO
+CREATE PROCEDURE dbo.sp_Student_Overview
+(
+    @CurrentUsername NVARCHAR(50),
+    @TermID          INT = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Student',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    DECLARE @StudentID INT;
+    EXEC dbo.sp__GetCurrentStudentID
+        @CurrentUsername = @CurrentUsername,
+        @StudentID       = @StudentID OUTPUT;
+
+    IF @StudentID IS NULL
+    BEGIN
+        RAISERROR('Student profile not found.', 16, 1);
+        RETURN;
+    END
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        -- 1) Profile
+        SELECT
+            S.StudentID,
+            S.FullName,
+            S.Email,
+            S.DOB,
+            S.Department,
+            CONVERT(NVARCHAR(20), DecryptByKey(S.EncryptedPhone)) AS Phone
+        FROM dbo.STUDENT S
+        WHERE S.StudentID = @StudentID
+          AND S.IsDeleted = 0;
+
+        -- 2) Courses
+        SELECT
+            C.CourseID,
+            C.CourseName,
+            C.Description,
+            C.PublicInfo
+        FROM dbo.COURSE_STUDENT CS
+        JOIN dbo.COURSE C ON C.CourseID = CS.CourseID
+        WHERE CS.StudentID = @StudentID
+          AND C.IsDeleted = 0;
+
+        -- 3) Grades (MLS filter as A4)
+        SELECT
+            G.GradeID,
+            G.CourseID,
+            C.CourseName,
+            TRY_CONVERT(
+                DECIMAL(10,2),
+                CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))
+            ) AS Grade,
+            G.DateEntered
+        FROM dbo.GRADES G
+        JOIN dbo.COURSE C
+            ON C.CourseID = G.CourseID
+        WHERE G.StudentID = @StudentID
+          AND G.TermID = @TermID
+          AND G.IsDeleted = 0
+          AND C.IsDeleted = 0
+          AND C.ClearanceLevel <= 2
+          AND G.EncryptedGradeValue IS NOT NULL;
+
+        EXEC dbo.sp_Key_Close;
+
+        -- 4) Attendance (MLS filter as A5)
+        SELECT
+            A.AttendanceID,
+            A.RowKey,
+            C.CourseName,
+            CASE A.Status
+                WHEN 1 THEN 'Present'
+                WHEN 0 THEN 'Absent'
+                ELSE 'Unknown'
+            END AS StatusText,
+            A.DateRecorded
+        FROM dbo.vw__AttendanceRows A
+        JOIN dbo.COURSE C
+            ON A.CourseID = C.CourseID
+        WHERE A.StudentID = @StudentID
+          AND A.TermID = @TermID
+          AND C.IsDeleted = 0
+          AND C.ClearanceLevel <= 2;
+
+        DECLARE @Details NVARCHAR(4000);
+        SET @Details = N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+                       N', TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'-');
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'STUDENT_VIEW_OVERVIEW',
+            @Details  = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+        RAISERROR(@Err, 16, 1);
+        RETURN;
+    END CATCH
+END
+GO
+
+
+
+
+/* ===========================
+   END OF PART 5A
+   =========================== */
+
+
+
+
+
+
+
+
+
+
+
+
+/* =========================================================
+   SRMS_DB — Term Project (FINAL)
+   Part 5B — Instructor Procedures
+
+   Depends on:
+     Part 1, Part 2, Part 3, Part 4
+   Requires Part 5A validation:
+     - fn__ValidateCourseAction (@OwnerRole = 'Instructor')
+   ========================================================= */
+
+USE SRMS_DB;
+GO
+
+/* =========================================================
+   SECTION B — INSTRUCTOR PROCEDURES
+   ========================================================= */
+
+---------------------------------------------------------
+-- B1. Instructor: View Courses
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_ViewCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_ViewCourses;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_ViewCourses
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 1,
+        @Mode              = 'READ';
+
+    SELECT
+        C.CourseID,
+        C.CourseName,
+        C.Description,
+        C.PublicInfo
+    FROM dbo.USERS U
+    JOIN dbo.INSTRUCTOR_COURSE IC ON IC.InstructorID = U.InstructorID
+    JOIN dbo.COURSE C ON C.CourseID = IC.CourseID
+    WHERE U.Username = @CurrentUsername
+      AND U.IsDeleted = 0
+      AND C.IsDeleted = 0;
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_VIEW_COURSES',
+        @Details  = NULL,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+---------------------------------------------------------
+-- B2. Instructor: View Students By Course (owned course)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_ViewStudentsByCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_ViewStudentsByCourse;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_ViewStudentsByCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, NULL, 0, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    SELECT
+        S.StudentID,
+        S.FullName,
+        S.Email,
+        S.Department
+    FROM dbo.COURSE_STUDENT CS
+    JOIN dbo.STUDENT S ON S.StudentID = CS.StudentID
+    WHERE CS.CourseID = @CourseID
+      AND S.IsDeleted = 0;
+
+	  DECLARE @Details NVARCHAR(4000);
+      SET @Details = N'CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_VIEW_STUDENTS_BY_COURSE',
+        @Details  = @CourseID,
+        @EntityType = 'COURSE',
+        @EntityID   = @CourseID,
+        @CourseID   = @CourseID;
+END
+GO
+
+---------------------------------------------------------
+-- B3. Instructor: Insert/Update Grade (Encrypt)  [Create/Update]
+--   The grade belongs to the enrollment's term; closed terms
+--   are read-only.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_SaveGrade','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_SaveGrade;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_SaveGrade
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID INT,
+    @CourseID  INT,
+    @Grade     DECIMAL(5,2)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- WRITE at Instructor level to avoid MLS "No Write Down" false blocks
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 4,
+        @Mode              = 'WRITE';
+
+    -- Course + student + ownership + enrollment
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, @StudentID, 1, 1);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    DECLARE @TermID INT = (
+        SELECT TermID FROM dbo.COURSE_STUDENT
+        WHERE CourseID = @CourseID AND StudentID = @StudentID
+    );
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('Term is closed (read-only).', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        MERGE dbo.GRADES AS tgt
+        USING (SELECT @StudentID AS StudentID, @CourseID AS CourseID, @TermID AS TermID) src
+        ON (tgt.StudentID = src.StudentID AND tgt.CourseID = src.CourseID AND tgt.TermID = src.TermID)
+        WHEN MATCHED THEN
+            UPDATE SET
+                EncryptedGradeValue =
+                    EncryptByKey(Key_GUID('SRMSSymmetricKey'), CAST(@Grade AS NVARCHAR(20))),
+                DateEntered = GETDATE(),
+                IsDeleted = 0
+        WHEN NOT MATCHED THEN
+            INSERT (StudentID, CourseID, TermID, EncryptedGradeValue)
+            VALUES (
+                @StudentID,
+                @CourseID,
+                @TermID,
+                EncryptByKey(Key_GUID('SRMSSymmetricKey'), CAST(@Grade AS NVARCHAR(20)))
+            );
+
+        EXEC dbo.sp_Key_Close;
+
+        DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'GRADES';
+
+        EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_SAVE_GRADE',
+        @Details  = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID,
+        @CourseID   = @CourseID;
+
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- B4. Instructor: Get Grade (by student+course) [Read]
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_GetGrade','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_GetGrade;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_GetGrade
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID INT,
+    @CourseID  INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 3,
+        @Mode              = 'READ';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, @StudentID, 1, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT
+            G.GradeID,
+            G.StudentID,
+            G.CourseID,
+            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))) AS Grade,
+            G.DateEntered,
+            G.IsDeleted
+        FROM dbo.GRADES G
+        JOIN dbo.COURSE_STUDENT CS
+            ON CS.StudentID = G.StudentID
+           AND CS.CourseID  = G.CourseID
+           AND CS.TermID    = G.TermID      -- the enrollment's term
+        WHERE G.StudentID = @StudentID
+          AND G.CourseID  = @CourseID;
+
+        EXEC dbo.sp_Key_Close;
+
+        DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_GET_GRADE',
+        @Details  = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID,
+        @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- B5. Instructor: View Grades By Course (owned course) [Read]
+--   @TermID NULL = current term
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_ViewGradesByCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_ViewGradesByCourse;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_ViewGradesByCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID INT,
+    @TermID   INT = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 3,
+        @Mode              = 'READ';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, NULL, 0, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT
+            G.GradeID,
+            G.StudentID,
+            S.FullName,
+            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))) AS Grade,
+            G.DateEntered
+        FROM dbo.GRADES G
+        JOIN dbo.STUDENT S ON S.StudentID = G.StudentID
+        WHERE G.CourseID = @CourseID
+          AND G.TermID = @TermID
+          AND G.IsDeleted = 0
+          AND S.IsDeleted = 0
+          AND G.EncryptedGradeValue IS NOT NULL;
+
+        EXEC dbo.sp_Key_Close;
+
+		
+        DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20)) +
+           N', TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'-');
+
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'INSTRUCTOR_VIEW_GRADES_BY_COURSE',
+            @Details  = @Details,
+            @EntityType = 'COURSE',
+            @EntityID   = @CourseID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- B6. Instructor: Delete Grade (soft delete) [Delete]
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_DeleteGrade','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_DeleteGrade;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_DeleteGrade
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID INT,
+    @CourseID  INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- WRITE at Instructor level to avoid MLS false blocks
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 4,
+        @Mode              = 'WRITE';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, @StudentID, 1, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    DECLARE @TermID INT = (
+        SELECT TermID FROM dbo.COURSE_STUDENT
+        WHERE CourseID = @CourseID AND StudentID = @StudentID
+    );
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('Term is closed (read-only).', 16, 1);
+        RETURN;
+    END
+
+    UPDATE dbo.GRADES
+    SET IsDeleted = 1
+    WHERE StudentID = @StudentID
+      AND CourseID  = @CourseID
+      AND TermID    = @TermID;
+
+	DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'GRADES';
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_DELETE_GRADE',
+        @Details  = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID,
+        @CourseID   = @CourseID;
+END
+GO
+
+---------------------------------------------------------
+-- B7. Instructor: View Attendance By Course (owned course) [Read]
+--   @TermID NULL = current term
+--   Window / keyset paging as in A5 (seeks IX_ATT_Course_Active)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_ViewAttendanceByCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_ViewAttendanceByCourse;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_ViewAttendanceByCourse
+(
+    @CurrentUsername   NVARCHAR(50),
+    @CourseID          INT,
+    @TermID            INT  = NULL,
+    @FromDate          DATE = NULL,
+    @ToDate            DATE = NULL,
+    @AfterDate         DATE = NULL,
+    @AfterRowKey       BIGINT = NULL,
+    @PageSize          INT  = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor',
+        @RequiredClearance = 3,
+        @Mode              = 'READ';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, NULL, 0, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    IF @PageSize < 1 SET @PageSize = NULL;
+    IF @PageSize > 5000 SET @PageSize = 5000;
+
+    SELECT TOP (ISNULL(@PageSize, 2147483647))
+        A.AttendanceID,
+        A.RowKey,
+        A.StudentID,
+        S.FullName,
+        A.Status,
+        A.DateRecorded
+    FROM dbo.vw__AttendanceRows A
+    JOIN dbo.STUDENT S ON S.StudentID = A.StudentID
+    WHERE A.CourseID = @CourseID
+      AND A.TermID = @TermID
+      AND S.IsDeleted = 0
+      AND (@FromDate IS NULL OR A.DateRecorded >= @FromDate)
+      AND (@ToDate   IS NULL OR A.DateRecorded <= @ToDate)
+      AND (@AfterDate IS NULL
+           OR A.DateRecorded > @AfterDate
+           OR (A.DateRecorded = @AfterDate AND A.RowKey > @AfterRowKey))
+    ORDER BY A.DateRecorded, A.RowKey
+    OPTION (RECOMPILE);
+
+    -- One audit row per window, not per page
+    IF @AfterDate IS NULL
+    BEGIN
+	    DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20)) +
+           N', TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'-') +
+           ISNULL(N', From=' + CONVERT(NVARCHAR(10), @FromDate, 23), N'') +
+           ISNULL(N', To=' + CONVERT(NVARCHAR(10), @ToDate, 23), N'');
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'INSTRUCTOR_VIEW_ATTENDANCE_BY_COURSE',
+            @Details  = @Details,
+            @EntityType = 'COURSE',
+            @EntityID   = @CourseID,
+            @CourseID   = @CourseID;
+    END
+END
+GO
+
+
+---------------------------------------------------------
+-- B8. Instructor
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_ViewProfile','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_ViewProfile;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_ViewProfile
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Instructor',4,'READ';
+
+    SELECT
+        I.InstructorID,
+        I.FullName,
+        I.Email,
+        I.ClearanceLevel
+    FROM dbo.USERS U
+    JOIN dbo.INSTRUCTOR I
+        ON I.InstructorID = U.InstructorID
+    WHERE U.Username = @CurrentUsername
+      AND U.IsDeleted = 0
+      AND I.IsDeleted = 0;
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_VIEW_PROFILE',
+        @Details  = NULL,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+---------------------------------------------------------
+-- B9. Instructor
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_UpdateProfile','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_UpdateProfile;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_UpdateProfile
+(
+    @CurrentUsername NVARCHAR(50),
+    @FullName NVARCHAR(100) = NULL,
+    @Email    NVARCHAR(100) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Instructor',4,'WRITE';
+
+    UPDATE I
+    SET
+        FullName = COALESCE(NULLIF(LTRIM(RTRIM(@FullName)),''), FullName),
+        Email    = COALESCE(NULLIF(LTRIM(RTRIM(@Email)),''), Email)
+    FROM dbo.INSTRUCTOR I
+    JOIN dbo.USERS U ON U.InstructorID = I.InstructorID
+    WHERE U.Username = @CurrentUsername
+      AND U.IsDeleted = 0
+      AND I.IsDeleted = 0;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'INSTRUCTOR_UPDATE_PROFILE',
+        @Details  = NULL,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+---------------------------------------------------------
+-- B10. Instructor
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_GetMyCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_GetMyCourses;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_GetMyCourses
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Instructor',1,'READ';
+
+    SELECT
+        C.CourseID,
+        C.CourseName
+    FROM dbo.USERS U
+    JOIN dbo.INSTRUCTOR_COURSE IC ON IC.InstructorID = U.InstructorID
+    JOIN dbo.COURSE C ON C.CourseID = IC.CourseID
+    WHERE U.Username = @CurrentUsername
+      AND U.IsDeleted = 0
+      AND C.IsDeleted = 0
+    ORDER BY C.CourseName;
+END
+GO
+
+---------------------------------------------------------
+-- B11. Instructor
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_GetMyStudentsByCourse_UI','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_GetMyStudentsByCourse_UI;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_GetMyStudentsByCourse_UI
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Instructor',2,'READ';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, NULL, 0, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    SELECT
+        S.StudentID,
+        S.FullName
+    FROM dbo.COURSE_STUDENT CS
+    JOIN dbo.STUDENT S ON S.StudentID = CS.StudentID
+    WHERE CS.CourseID = @CourseID
+      AND S.IsDeleted = 0
+    ORDER BY S.FullName;
+END
+GO
+
+
+---------------------------------------------------------
+-- B12. Instructor
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Instructor_GetMyTAsByCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Instructor_GetMyTAsByCourse;
+GO
+CREATE PROCEDURE dbo.sp_Instructor_GetMyTAsByCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Instructor',3,'READ';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'Instructor', @CourseID, NULL, 0, 0);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    SELECT
+        TC.TAUsername
+    FROM dbo.TA_COURSE TC
+    WHERE TC.CourseID = @CourseID
+    ORDER BY TC.TAUsername;
+END
+GO
+
+
+
+/* ===========================
+   END OF PART 5B
+   =========================== */
+
+
+
+
+
+
+
+   /* =========================================================
+   SRMS_DB — Term Project (FINAL)
+   Part 5C — TA Procedures (Complete, Final)
+
+   Includes:
+     - sp_TA_ViewCourses
+     - sp_TA_ViewStudentsByCourse
+     - sp_TA_RecordAttendance   (MERGE per day, no duplicates)
+     - sp_TA_UpdateAttendance   (must belong to TA course)
+     - sp_TA_DeleteAttendance   (soft delete, must belong to TA course)
+     - sp_TA_GetAttendanceChanges (delta sync for the TA offline replica)
+
+   Depends on:
+     - Part 1 (tables)
+     - Part 2 (DENY direct table access + EXECUTE-only)
+     - Part 3 (sp_CheckAccess, sp_LogAction)
+     - Part 5A validation (fn__ValidateCourseAction, @OwnerRole = 'TA')
+   ========================================================= */
+
+USE SRMS_DB;
+GO
+
+/* =========================================================
+   C1 — TA: View Courses
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_TA_ViewCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_ViewCourses;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_ViewCourses
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 1,
+        @Mode              = 'READ';
+
+    SELECT
+        C.CourseID,
+        C.CourseName,
+        C.Description,
+        C.PublicInfo
+    FROM dbo.TA_COURSE TC
+    JOIN dbo.COURSE C
+      ON C.CourseID = TC.CourseID
+    JOIN dbo.USERS U
+      ON U.Username = TC.TAUsername
+    WHERE TC.TAUsername = @CurrentUsername
+      AND U.IsDeleted = 0
+      AND C.IsDeleted = 0;
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'TA_VIEW_COURSES',
+        @Details  = NULL,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+/* =========================================================
+   C2 — TA: View Students By Course (TA assigned)
+   ========================================================= */
+---------------------------------------------------------
+-- C2 — TA: View Students By Course (OPTIONAL CourseID)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_TA_ViewStudentsByCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_ViewStudentsByCourse;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_ViewStudentsByCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID        INT = NULL   -- ✅ OPTIONAL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    -- لو CourseID اتبعت → تأكيد إن الكورس للـ TA
+    IF @CourseID IS NOT NULL
+    BEGIN
+        DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+        SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+        FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'TA', @CourseID, NULL, 0, 0);
+
+        IF @Reason <> 0
+        BEGIN
+            RAISERROR(@ReasonMsg, 16, 1);
+            RETURN;
+        END
+    END
+
+    SELECT
+        S.StudentID,
+        S.FullName,
+        S.Email,
+        S.Department,
+        C.CourseID,
+        C.CourseName
+    FROM dbo.TA_COURSE TC
+    JOIN dbo.COURSE_STUDENT CS
+        ON CS.CourseID = TC.CourseID
+    JOIN dbo.STUDENT S
+        ON S.StudentID = CS.StudentID
+    JOIN dbo.COURSE C
+        ON C.CourseID = TC.CourseID
+    WHERE TC.TAUsername = @CurrentUsername
+      AND S.IsDeleted = 0
+      AND C.IsDeleted = 0
+      AND (
+            @CourseID IS NULL
+            OR TC.CourseID = @CourseID
+          );
+
+    DECLARE @Details NVARCHAR(4000);
+    SET @Details =
+        CASE
+            WHEN @CourseID IS NULL
+            THEN N'All courses'
+            ELSE N'CourseID=' + CAST(@CourseID AS NVARCHAR(20))
+        END;
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'TA_VIEW_STUDENTS',
+        @Details  = @Details,
+        @EntityType = 'COURSE',
+        @EntityID   = @CourseID,
+        @CourseID   = @CourseID;
+END
+GO
+
+
+/* =========================================================
+   C3 — TA: Record / Update Attendance (MERGE per day)
+   - No duplicates per student/course/day
+   - Must be TA assigned + student enrolled
+   - @DateRecorded: day of the session (default today); used when
+     the offline replica replays attendance taken while disconnected
+   - @BaseRowVer: sync watermark of the replica; if the day's row was
+     changed on the server after it, the write is rejected (conflict)
+   - The row goes to the term covering the day; closed terms are
+     read-only
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_TA_RecordAttendance','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_RecordAttendance;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_RecordAttendance
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID       INT,
+    @CourseID        INT,
+    @Status          BIT,
+    @DateRecorded    DATE = NULL,
+    @BaseRowVer      BINARY(8) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 3,
+        @Mode              = 'WRITE';
+
+    DECLARE @AttDate DATE = COALESCE(@DateRecorded, CAST(GETDATE() AS DATE));
+
+    IF @AttDate > CAST(GETDATE() AS DATE)
+    BEGIN
+        RAISERROR('DateRecorded cannot be in the future.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateCourseAction(@CurrentUsername, N'TA', @CourseID, @StudentID, 1, 1);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    DECLARE @TermID INT = dbo.fn__TermOfDate(@AttDate);
+
+    IF @TermID IS NULL
+    BEGIN
+        RAISERROR('No term covers this date.', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('Term is closed (read-only).', 16, 1);
+        RETURN;
+    END
+
+    IF @BaseRowVer IS NOT NULL AND EXISTS (
+        SELECT 1
+        FROM dbo.ATTENDANCE
+        WHERE StudentID    = @StudentID
+          AND CourseID     = @CourseID
+          AND DateRecorded = @AttDate
+          AND RowVer       > @BaseRowVer
+    )
+    BEGIN
+        RAISERROR('Conflict: attendance record was changed on the server since last sync.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        MERGE dbo.ATTENDANCE AS tgt
+        USING (
+            SELECT
+                @StudentID AS StudentID,
+                @CourseID  AS CourseID,
+                @TermID    AS TermID,
+                @AttDate   AS AttDate
+        ) AS src
+        ON (
+            tgt.StudentID = src.StudentID
+            AND tgt.CourseID = src.CourseID
+            AND tgt.TermID = src.TermID
+            AND CAST(tgt.DateRecorded AS DATE) = src.AttDate
+        )
+        WHEN MATCHED THEN
+            UPDATE SET
+                Status       = @Status,
+                DateRecorded = src.AttDate,
+                IsDeleted    = 0
+        WHEN NOT MATCHED THEN
+            INSERT (StudentID, CourseID, TermID, Status, DateRecorded)
+            VALUES (@StudentID, @CourseID, @TermID, @Status, src.AttDate);
+
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+           N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'TA_RECORD_ATTENDANCE',
+            @Details  = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+        -- Keep same error message but bubble up properly
+        THROW;
+    END CATCH
+END
+GO
+
+/* =========================================================
+   C4 — TA: Update Attendance (by AttendanceID)
+   - Record must exist and be active
+   - Course must be assigned to TA
+   - @BaseRowVer: optional conflict check (see C3)
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_TA_UpdateAttendance','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_UpdateAttendance;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_UpdateAttendance
+(
+    @CurrentUsername NVARCHAR(50),
+    @AttendanceID    INT,
+    @Status          BIT,
+    @BaseRowVer      BINARY(8) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 3,
+        @Mode              = 'WRITE';
+
+    DECLARE @CourseID INT, @TermID INT, @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT
+        @CourseID  = A.CourseID,
+        @TermID    = A.TermID,
+        @Reason    = V.ReasonCode,
+        @ReasonMsg = V.ReasonMessage
+    FROM dbo.ATTENDANCE A
+    CROSS APPLY dbo.fn__ValidateCourseAction(@CurrentUsername, N'TA', A.CourseID, NULL, 0, 0) V
+    WHERE A.AttendanceID = @AttendanceID
+      AND A.IsDeleted = 0;
+
+    IF @CourseID IS NULL
+    BEGIN
+        RAISERROR('Attendance record not found or deleted.', 16, 1);
+        RETURN;
+    END
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('Term is closed (read-only).', 16, 1);
+        RETURN;
+    END
+
+    IF @BaseRowVer IS NOT NULL AND EXISTS (
+        SELECT 1
+        FROM dbo.ATTENDANCE
+        WHERE AttendanceID = @AttendanceID
+          AND RowVer       > @BaseRowVer
+    )
+    BEGIN
+        RAISERROR('Conflict: attendance record was changed on the server since last sync.', 16, 1);
+        RETURN;
+    END
+
+    -- DateRecorded is the session day; a correction keeps it
+    -- (moving it would collide with UQ_ATT
+    --  and break replicas that key rows by day)
+    UPDATE dbo.ATTENDANCE
+    SET Status = @Status
+    WHERE AttendanceID = @AttendanceID
+      AND IsDeleted = 0;
+
+	DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'AttendanceID=' + CAST(@AttendanceID AS NVARCHAR(20)) 
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'TA_UPDATE_ATTENDANCE',
+        @Details  = @Details,
+        @EntityType = 'ATTENDANCE',
+        @EntityID   = @AttendanceID,
+        @CourseID   = @CourseID;
+END
+GO
+
+/* =========================================================
+   C5 — TA: Delete Attendance (Soft Delete)
+   - Record must exist and be active
+   - Course must be assigned to TA
+   - @BaseRowVer: optional conflict check (see C3)
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_TA_DeleteAttendance','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_DeleteAttendance;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_DeleteAttendance
+(
+    @CurrentUsername NVARCHAR(50),
+    @AttendanceID    INT,
+    @BaseRowVer      BINARY(8) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 3,
+        @Mode              = 'WRITE';
+
+    DECLARE @CourseID INT, @TermID INT, @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT
+        @CourseID  = A.CourseID,
+        @TermID    = A.TermID,
+        @Reason    = V.ReasonCode,
+        @ReasonMsg = V.ReasonMessage
+    FROM dbo.ATTENDANCE A
+    CROSS APPLY dbo.fn__ValidateCourseAction(@CurrentUsername, N'TA', A.CourseID, NULL, 0, 0) V
+    WHERE A.AttendanceID = @AttendanceID
+      AND A.IsDeleted = 0;
+
+    IF @CourseID IS NULL
+    BEGIN
+        RAISERROR('Attendance record not found or already deleted.', 16, 1);
+        RETURN;
+    END
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('Term is closed (read-only).', 16, 1);
+        RETURN;
+    END
+
+    IF @BaseRowVer IS NOT NULL AND EXISTS (
+        SELECT 1
+        FROM dbo.ATTENDANCE
+        WHERE AttendanceID = @AttendanceID
+          AND RowVer       > @BaseRowVer
+    )
+    BEGIN
+        RAISERROR('Conflict: attendance record was changed on the server since last sync.', 16, 1);
+        RETURN;
+    END
+
+    UPDATE dbo.ATTENDANCE
+    SET IsDeleted = 1
+    WHERE AttendanceID = @AttendanceID
+      AND IsDeleted = 0;
+
+
+	DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'AttendanceID=' + CAST(@AttendanceID AS NVARCHAR(20)) 
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'TA_DELETE_ATTENDANCE',
+        @Details  = @Details,
+        @EntityType = 'ATTENDANCE',
+        @EntityID   = @AttendanceID,
+        @CourseID   = @CourseID;
+END
+GO
+
+
+
+---------------------------------------------------------
+-- C6 — TA: View Attendance (All courses assigned to TA)
+--   @TermID NULL = current term
+--   @CourseID NULL = every assigned course
+--   Window / keyset paging as in A5 (one IX_ATT_Course_Active
+--   range seek per assigned course)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_TA_ViewAttendance','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_ViewAttendance;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_ViewAttendance
+(
+    @CurrentUsername   NVARCHAR(50),
+    @TermID            INT  = NULL,
+    @FromDate          DATE = NULL,
+    @ToDate            DATE = NULL,
+    @AfterDate         DATE = NULL,
+    @AfterRowKey       BIGINT = NULL,
+    @PageSize          INT  = NULL,
+    @CourseID          INT  = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -------------------------------------------------
+    -- Security Check
+    -------------------------------------------------
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    IF @PageSize < 1 SET @PageSize = NULL;
+    IF @PageSize > 5000 SET @PageSize = 5000;
+
+    -------------------------------------------------
+    -- Return attendance for TA courses only
+    -------------------------------------------------
+    SELECT TOP (ISNULL(@PageSize, 2147483647))
+        A.AttendanceID,
+        A.RowKey,
+        A.StudentID,
+        C.CourseName,
+        CASE 
+            WHEN A.Status = 1 THEN 'Present'
+            ELSE 'Absent'
+        END AS StatusText,
+        A.DateRecorded
+    FROM dbo.vw__AttendanceRows A
+    JOIN dbo.COURSE C
+        ON C.CourseID = A.CourseID
+    JOIN dbo.TA_COURSE TC
+        ON TC.CourseID = A.CourseID
+    WHERE TC.TAUsername = @CurrentUsername
+      AND A.TermID = @TermID
+      AND C.IsDeleted = 0
+      AND (@CourseID IS NULL OR A.CourseID = @CourseID)
+      AND (@FromDate IS NULL OR A.DateRecorded >= @FromDate)
+      AND (@ToDate   IS NULL OR A.DateRecorded <= @ToDate)
+      AND (@AfterDate IS NULL
+           OR A.DateRecorded > @AfterDate
+           OR (A.DateRecorded = @AfterDate AND A.RowKey > @AfterRowKey))
+    ORDER BY A.DateRecorded, A.RowKey
+    OPTION (RECOMPILE);
+
+    -------------------------------------------------
+    -- Audit log (first page only)
+    -------------------------------------------------
+    IF @AfterDate IS NULL
+    BEGIN
+        DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+        SELECT @EntityType = EntityType, @EntityID = EntityID
+        FROM dbo.fn__UserEntity(@CurrentUsername);
+
+        DECLARE @Details NVARCHAR(4000) =
+            NULLIF(
+                ISNULL(N'From=' + CONVERT(NVARCHAR(10), @FromDate, 23) + N' ', N'') +
+                ISNULL(N'To=' + CONVERT(NVARCHAR(10), @ToDate, 23) + N' ', N'') +
+                ISNULL(N'CourseID=' + CAST(@CourseID AS NVARCHAR(20)), N''),
+                N'');
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'TA_VIEW_ATTENDANCE',
+            @Details  = @Details,
+            @EntityType = @EntityType,
+            @EntityID   = @EntityID,
+            @CourseID   = @CourseID;
+    END
+END
+GO
+
+
+---------------------------------------------------------
+-- C7 — TA: Attendance Changes (delta sync for offline replica)
+--   @SinceRowVer NULL => full snapshot (active rows only)
+--   @SinceRowVer set  => rows changed after the watermark,
+--                        including soft-deleted ones (IsDeleted = 1)
+--   Rows still inside open transactions (RowVer >= MIN_ACTIVE_ROWVERSION)
+--   are held back so the client watermark never skips a change.
+--   Rows moved to ATTENDANCE_HISTORY (archival) come back as
+--   deletions, stamped with the rowversion of their archiving.
+--   Packed days (ATTENDANCE_BITMAP, closed terms) are not part
+--   of the pull: a snapshot holds row-stored days only, and
+--   packing sends no deletions, so rows a replica already holds
+--   stay as they were (the term is read-only). Reopening the
+--   term re-creates them as new rows.
+--   @CourseID: one course only; replicas keep a watermark per
+--   course, so a newly assigned course starts with a snapshot.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_TA_GetAttendanceChanges','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_TA_GetAttendanceChanges;
+GO
+
+CREATE PROCEDURE dbo.sp_TA_GetAttendanceChanges
+(
+    @CurrentUsername NVARCHAR(50),
+    @SinceRowVer     BINARY(8) = NULL,
+    @CourseID        INT       = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'TA',
+        @RequiredClearance = 2,
+        @Mode              = 'READ';
+
+    DECLARE @UpperRowVer BINARY(8) = MIN_ACTIVE_ROWVERSION();
+
+    SELECT
+        A.AttendanceID,
+        A.StudentID,
+        A.CourseID,
+        C.CourseName,
+        A.Status,
+        A.DateRecorded,
+        A.IsDeleted,
+        A.RowVer
+    FROM dbo.TA_COURSE TC
+    JOIN dbo.COURSE C
+        ON C.CourseID = TC.CourseID
+    JOIN dbo.ATTENDANCE A
+        ON A.CourseID = TC.CourseID
+    WHERE TC.TAUsername = @CurrentUsername
+      AND (@CourseID IS NULL OR TC.CourseID = @CourseID)
+      AND C.IsDeleted = 0
+      AND A.RowVer < @UpperRowVer
+      AND (
+            (@SinceRowVer IS NULL AND A.IsDeleted = 0)
+            OR A.RowVer > @SinceRowVer
+          )
+
+    UNION ALL
+
+    SELECT
+        H.AttendanceID,
+        H.StudentID,
+        H.CourseID,
+        C.CourseName,
+        H.Status,
+        H.DateRecorded,
+        CAST(1 AS BIT) AS IsDeleted,
+        H.ArchiveRowVer AS RowVer
+    FROM dbo.TA_COURSE TC
+    JOIN dbo.COURSE C
+        ON C.CourseID = TC.CourseID
+    JOIN dbo.ATTENDANCE_HISTORY H
+        ON H.CourseID = TC.CourseID
+    WHERE @SinceRowVer IS NOT NULL
+      AND TC.TAUsername = @CurrentUsername
+      AND (@CourseID IS NULL OR TC.CourseID = @CourseID)
+      AND C.IsDeleted = 0
+      AND H.ArchiveRowVer > @SinceRowVer
+      AND H.ArchiveRowVer < @UpperRowVer
+
+    ORDER BY RowVer;
+
+    DECLARE @Details NVARCHAR(4000);
+    SET @Details =
+        CASE
+            WHEN @SinceRowVer IS NULL
+            THEN N'Full snapshot'
+            ELSE N'SinceRowVer=' + CONVERT(NVARCHAR(20), @SinceRowVer, 1)
+        END +
+        CASE WHEN @CourseID IS NULL THEN N'' ELSE N', CourseID=' + CAST(@CourseID AS NVARCHAR(20)) END;
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'TA_SYNC_ATTENDANCE',
+        @Details  = @Details,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID,
+        @CourseID   = @CourseID;
+END
+GO
+
+
+/* ===========================
+   END OF PART 5C
+   =========================== */
+
+
+
+
+
+
+
+
+
+
+
+
+   /* =========================================================
+   SRMS_DB — Term Project (FINAL)
+   Part 5D + Part 5E
+   Admin Procedures + Enrollment/Assignments (FINAL)
+
+   Depends on:
+     - Part 1 (Tables)
+     - Part 2 (DENY direct access + EXECUTE-only model)
+     - Part 3 (sp_CheckAccess + sp_LogAction)
+     - Part 5A validation: fn__ValidateAdminCourseLink
+
+   Notes:
+     - For WRITE operations by Admin, we pass RequiredClearance = 5
+       (to avoid MLS "No Write Down" violations).
+   ========================================================= */
+
+/* =========================================================
+   PART 5D — ADMIN: COURSE CRUD
+   ========================================================= */
+
+---------------------------------------------------------
+-- D1. Admin: Create Course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_CreateCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_CreateCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_CreateCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseName      NVARCHAR(100),
+    @Description     NVARCHAR(MAX) = NULL,
+    @PublicInfo      NVARCHAR(MAX) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @CourseName IS NULL OR LTRIM(RTRIM(@CourseName)) = ''
+    BEGIN
+        RAISERROR('CourseName is required.', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (
+        SELECT 1
+        FROM dbo.COURSE
+        WHERE CourseName = @CourseName
+          AND IsDeleted = 0
+    )
+    BEGIN
+        RAISERROR('CourseName already exists.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        INSERT INTO dbo.COURSE (CourseName, Description, PublicInfo, ClearanceLevel, IsDeleted)
+        VALUES (@CourseName, @Description, @PublicInfo, 1, 0);
+
+        DECLARE @CourseID INT = SCOPE_IDENTITY();
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_CREATE_COURSE',
+            @Details  = @CourseName,
+            @EntityType = 'COURSE',
+            @EntityID   = @CourseID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- D2. Admin: Update Course (partial update allowed)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_UpdateCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_UpdateCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_UpdateCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID        INT,
+    @CourseName      NVARCHAR(100) = NULL,
+    @Description     NVARCHAR(MAX) = NULL,
+    @PublicInfo      NVARCHAR(MAX) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateAdminCourseLink(@CourseID, NULL, NULL, NULL, NULL);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    IF @CourseName IS NOT NULL AND LTRIM(RTRIM(@CourseName)) <> ''
+    BEGIN
+        IF EXISTS (
+            SELECT 1
+            FROM dbo.COURSE
+            WHERE CourseName = @CourseName
+              AND CourseID  <> @CourseID
+              AND IsDeleted = 0
+        )
+        BEGIN
+            RAISERROR('Another course already has this name.', 16, 1);
+            RETURN;
+        END
+    END
+
+    BEGIN TRY
+        UPDATE dbo.COURSE
+        SET
+            CourseName  = COALESCE(NULLIF(LTRIM(RTRIM(@CourseName)), ''), CourseName),
+            Description = COALESCE(@Description, Description),
+            PublicInfo  = COALESCE(@PublicInfo, PublicInfo)
+        WHERE CourseID = @CourseID;
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'CourseID=' + CAST(@CourseID AS NVARCHAR(20)) 
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_UPDATE_COURSE',
+            @Details  = @Details,
+            @EntityType = 'COURSE',
+            @EntityID   = @CourseID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- D3. Admin: Delete Course (soft delete)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_DeleteCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_DeleteCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_DeleteCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateAdminCourseLink(@CourseID, NULL, NULL, NULL, NULL);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        UPDATE dbo.COURSE
+        SET IsDeleted = 1
+        WHERE CourseID = @CourseID;
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+           N'CourseID=' + CAST(@CourseID AS NVARCHAR(20)) 
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_DELETE_COURSE',
+            @Details  = @Details,
+            @EntityType = 'COURSE',
+            @EntityID   = @CourseID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- D4. Admin: Get Courses (includes deleted for admin audit)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetCourses;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetCourses
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 1,
+        @Mode              = 'READ';
+
+    SELECT
+        CourseID,
+        CourseName,
+        Description,
+        PublicInfo,
+        ClearanceLevel,
+        IsDeleted
+    FROM dbo.COURSE;
+
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'ADMIN_GET_COURSES',
+        @Details  = NULL;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_User_UpdateRole','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_UpdateRole;
+GO
+
+CREATE PROCEDURE dbo.sp_User_UpdateRole
+(
+    @AdminUsername NVARCHAR(50),
+    @TargetUsername NVARCHAR(50),
+    @NewRole NVARCHAR(20),
+
+    @FullName NVARCHAR(100)=NULL,
+    @Email NVARCHAR(100)=NULL,
+    @Phone NVARCHAR(20)=NULL,
+    @DOB DATE=NULL,
+    @Department NVARCHAR(50)=NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'WRITE';
+
+    UPDATE dbo.USERS
+    SET Role = @NewRole
+    WHERE Username = @TargetUsername
+      AND IsDeleted = 0;
+
+	  DECLARE @Details NVARCHAR(4000);
+      SET @Details = N'User=' + CAST(@TargetUsername AS NVARCHAR(200)) + N' NewRole=' + CAST(@NewRole AS NVARCHAR(50));
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@TargetUsername);
+
+    EXEC dbo.sp_LogAction
+    @Username = @AdminUsername,
+    @Action   = N'UPDATE_ROLE',
+    @Details  = @Details,
+    @EntityType = @EntityType,
+    @EntityID   = @EntityID;
+
+END
+GO
+
+
+
+/* =========================================================
+   PART 5E — ADMIN: ENROLLMENT + ASSIGNMENTS
+   ========================================================= */
+
+---------------------------------------------------------
+-- E1. Admin: Enroll Student in Course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_EnrollStudentInCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_EnrollStudentInCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_EnrollStudentInCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID       INT,
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateAdminCourseLink(@CourseID, N'STUDENT', @StudentID, NULL, NULL);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID)
+        VALUES (@CourseID, @StudentID);
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+        N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE_STUDENT';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_ENROLL_STUDENT',
+            @Details  = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- E2. Admin: Remove Enrollment
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_RemoveEnrollment','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_RemoveEnrollment;
+GO
+CREATE PROCEDURE dbo.sp_Admin_RemoveEnrollment
+(
+    @CurrentUsername NVARCHAR(50),
+    @StudentID       INT,
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF NOT EXISTS (
+        SELECT 1
+        FROM dbo.COURSE_STUDENT
+        WHERE CourseID  = @CourseID
+          AND StudentID = @StudentID
+    )
+    BEGIN
+        RAISERROR('Enrollment not found.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        DELETE FROM dbo.COURSE_STUDENT
+        WHERE CourseID  = @CourseID
+          AND StudentID = @StudentID;
+		  DECLARE @Details NVARCHAR(4000);
+
+          SET @Details =
+          N'StudentID=' + CAST(@StudentID AS NVARCHAR(20)) +
+          N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE_STUDENT';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_REMOVE_ENROLLMENT',
+            @Details  = @Details,
+            @EntityType = 'STUDENT',
+            @EntityID   = @StudentID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- E3. Admin: Assign Instructor to Course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_AssignInstructorToCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_AssignInstructorToCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_AssignInstructorToCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @InstructorID    INT,
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateAdminCourseLink(@CourseID, N'INSTRUCTOR', NULL, @InstructorID, NULL);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        INSERT INTO dbo.INSTRUCTOR_COURSE (InstructorID, CourseID)
+        VALUES (@InstructorID, @CourseID);
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+        N'InstructorID=' + CAST(@InstructorID AS NVARCHAR(20)) +
+        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR_COURSE';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_ASSIGN_INSTRUCTOR',
+            @Details  =@Details,
+            @EntityType = 'INSTRUCTOR',
+            @EntityID   = @InstructorID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- E4. Admin: Unassign Instructor from Course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_UnassignInstructorFromCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_UnassignInstructorFromCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_UnassignInstructorFromCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @InstructorID    INT,
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF NOT EXISTS (
+        SELECT 1
+        FROM dbo.INSTRUCTOR_COURSE
+        WHERE InstructorID = @InstructorID
+          AND CourseID     = @CourseID
+    )
+    BEGIN
+        RAISERROR('Instructor assignment not found.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        DELETE FROM dbo.INSTRUCTOR_COURSE
+        WHERE InstructorID = @InstructorID
+          AND CourseID     = @CourseID;
+
+
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+        N'InstructorID=' + CAST(@InstructorID AS NVARCHAR(20)) +
+        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR_COURSE';
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_UNASSIGN_INSTRUCTOR',
+            @Details  =@Details,
+            @EntityType = 'INSTRUCTOR',
+            @EntityID   = @InstructorID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- E5. Admin: Assign TA (by username) to Course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_AssignTAtoCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_AssignTAtoCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_AssignTAtoCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @TAUsername      NVARCHAR(50),
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = ReasonCode, @ReasonMsg = ReasonMessage
+    FROM dbo.fn__ValidateAdminCourseLink(@CourseID, N'TA', NULL, NULL, @TAUsername);
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        INSERT INTO dbo.TA_COURSE (TAUsername, CourseID)
+        VALUES (@TAUsername, @CourseID);
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+        N'TAUsername=' + CAST(@TAUsername AS NVARCHAR(20)) +
+        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'TA_COURSE';
+
+        DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+        SELECT @EntityType = EntityType, @EntityID = EntityID
+        FROM dbo.fn__UserEntity(@TAUsername);
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_ASSIGN_TA',
+            @Details  = @Details,
+            @EntityType = @EntityType,
+            @EntityID   = @EntityID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- E6. Admin: Unassign TA from Course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_UnassignTAFromCourse','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_UnassignTAFromCourse;
+GO
+CREATE PROCEDURE dbo.sp_Admin_UnassignTAFromCourse
+(
+    @CurrentUsername NVARCHAR(50),
+    @TAUsername      NVARCHAR(50),
+    @CourseID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF NOT EXISTS (
+        SELECT 1
+        FROM dbo.TA_COURSE
+        WHERE TAUsername = @TAUsername
+          AND CourseID   = @CourseID
+    )
+    BEGIN
+        RAISERROR('TA assignment not found.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        DELETE FROM dbo.TA_COURSE
+        WHERE TAUsername = @TAUsername
+          AND CourseID   = @CourseID;
+
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+        N'TAUsername=' + CAST(@TAUsername AS NVARCHAR(20)) +
+        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20));
+
+        EXEC dbo.sp__BumpDataVersion @TableName = N'TA_COURSE';
+
+        DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+        SELECT @EntityType = EntityType, @EntityID = EntityID
+        FROM dbo.fn__UserEntity(@TAUsername);
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_UNASSIGN_TA',
+            @Details  = @Details,
+            @EntityType = @EntityType,
+            @EntityID   = @EntityID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+    DECLARE @Err NVARCHAR(4000) = ERROR_MESSAGE();
+    RAISERROR(@Err, 16, 1);
+    RETURN;
+    END CATCH
+END
+GO
+
+---------------------------------------------------------
+-- E7. Admin: 
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetCourses;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetCourses
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT CourseID, CourseName
+    FROM dbo.COURSE
+    WHERE IsDeleted = 0
+    ORDER BY CourseName;
+END
+GO
+
+---------------------------------------------------------
+-- E8. Admin: 
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetStudents','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetStudents;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetStudents
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT StudentID, FullName
+    FROM dbo.STUDENT
+    WHERE IsDeleted = 0
+    ORDER BY FullName;
+END
+GO
+
+---------------------------------------------------------
+-- E9. Admin: 
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetInstructors','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetInstructors;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetInstructors
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT InstructorID, FullName
+    FROM dbo.INSTRUCTOR
+    WHERE IsDeleted = 0
+    ORDER BY FullName;
+END
+GO
+
+---------------------------------------------------------
+-- E10. Admin: 
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetTAs','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetTAs;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetTAs
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT Username
+    FROM dbo.USERS
+    WHERE Role = 'TA'
+      AND IsDeleted = 0
+    ORDER BY Username;
+END
+GO
+
+---------------------------------------------------------
+-- E11. Admin: 
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetInstructorAssignments','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetInstructorAssignments
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetInstructorAssignments
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT
+        ic.InstructorID,
+        i.FullName AS InstructorName,
+        ic.CourseID,
+        c.CourseName
+    FROM dbo.INSTRUCTOR_COURSE ic
+    JOIN dbo.INSTRUCTOR i ON ic.InstructorID = i.InstructorID
+    JOIN dbo.COURSE c ON ic.CourseID = c.CourseID
+    WHERE c.IsDeleted = 0;
+END
+GO
+
+---------------------------------------------------------
+-- E12. Admin: 
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetTAAssignments','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetTAAssignments;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetTAAssignments
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT
+        tc.TAUsername,
+        tc.CourseID,
+        c.CourseName
+    FROM dbo.TA_COURSE tc
+    JOIN dbo.COURSE c ON tc.CourseID = c.CourseID
+    WHERE c.IsDeleted = 0;
+END
+GO
+
+
+
+---------------------------------------------------------
+-- E13. Admin: Bulk Enrollment Import — stage rows
+--   Called once per chunk (TVP); no per-row work here.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_ImportEnrollments_Stage','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ImportEnrollments_Stage;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ImportEnrollments_Stage
+(
+    @CurrentUsername NVARCHAR(50),
+    @ImportID        UNIQUEIDENTIFIER,
+    @Rows            dbo.EnrollmentRowList READONLY
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @ImportID IS NULL
+    BEGIN
+        RAISERROR('ImportID is required.', 16, 1);
+        RETURN;
+    END
+
+    -- Leftovers of abandoned imports
+    DELETE FROM dbo.ENROLLMENT_IMPORT_STAGE
+    WHERE StagedAt < DATEADD(DAY, -1, GETDATE());
+
+    INSERT INTO dbo.ENROLLMENT_IMPORT_STAGE (ImportID, RowNum, StudentID, CourseID)
+    SELECT @ImportID, R.RowNum, R.StudentID, R.CourseID
+    FROM @Rows R;
+END
+GO
+
+---------------------------------------------------------
+-- E14. Admin: Bulk Enrollment Import — validate, diff, apply
+--   1) Reject invalid rows (deleted/unknown student or
+--      course, duplicates) without failing the import
+--   2) Diff desired roster vs COURSE_STUDENT in one query
+--      @RemoveMissing = 1 => courses in the file are
+--      replaced (enrollments not listed are removed)
+--   3) Apply in @BatchSize transactions, one audit row each
+--
+--   Call with autocommit ON (each batch commits on its own).
+--   Re-running after a failure resumes: the diff is
+--   recomputed from what is already committed.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_ImportEnrollments_Apply','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ImportEnrollments_Apply;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ImportEnrollments_Apply
+(
+    @CurrentUsername NVARCHAR(50),
+    @ImportID        UNIQUEIDENTIFIER,
+    @RemoveMissing   BIT = 0,
+    @BatchSize       INT = 5000
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @BatchSize IS NULL OR @BatchSize < 1
+        SET @BatchSize = 5000;
+
+    -------------------------------------------------
+    -- 1) Reject
+    -------------------------------------------------
+    UPDATE St
+    SET RejectReason =
+        CASE
+            WHEN St.CourseID IS NULL   THEN 1
+            WHEN C.CourseID IS NULL    THEN 2
+            WHEN St.StudentID IS NULL  THEN 3
+            WHEN S.StudentID IS NULL   THEN 4
+            WHEN Dup.Occurrence > 1    THEN 14
+        END
+    FROM dbo.ENROLLMENT_IMPORT_STAGE St
+    -- Duplicates in one pass: every (course, student) after its first row
+    JOIN (
+        SELECT
+            RowNum,
+            ROW_NUMBER() OVER (PARTITION BY CourseID, StudentID ORDER BY RowNum) AS Occurrence
+        FROM dbo.ENROLLMENT_IMPORT_STAGE
+        WHERE ImportID = @ImportID
+    ) Dup
+        ON Dup.RowNum = St.RowNum
+    LEFT JOIN dbo.COURSE C
+           ON C.CourseID = St.CourseID
+          AND C.IsDeleted = 0
+    LEFT JOIN dbo.STUDENT S
+           ON S.StudentID = St.StudentID
+          AND S.IsDeleted = 0
+    WHERE St.ImportID = @ImportID;
+
+    DECLARE @Staged INT, @Rejected INT;
+
+    SELECT
+        @Staged   = COUNT(*),
+        @Rejected = COUNT(RejectReason)
+    FROM dbo.ENROLLMENT_IMPORT_STAGE
+    WHERE ImportID = @ImportID;
+
+    -------------------------------------------------
+    -- 2) Diff (set-based)
+    -------------------------------------------------
+    CREATE TABLE #Diff (
+        Seq       INT IDENTITY(1,1) PRIMARY KEY,
+        Op        CHAR(1) NOT NULL,          -- I = enroll, D = remove
+        CourseID  INT NOT NULL,
+        StudentID INT NOT NULL
+    );
+
+    WITH Desired AS (
+        SELECT CourseID, StudentID
+        FROM dbo.ENROLLMENT_IMPORT_STAGE
+        WHERE ImportID = @ImportID
+          AND RejectReason IS NULL
+    ),
+    InScope AS (
+        SELECT CS.CourseID, CS.StudentID
+        FROM dbo.COURSE_STUDENT CS
+        WHERE CS.CourseID IN (SELECT CourseID FROM Desired)
+    )
+    INSERT INTO #Diff (Op, CourseID, StudentID)
+    SELECT
+        CASE WHEN Cur.CourseID IS NULL THEN 'I' ELSE 'D' END,
+        COALESCE(Des.CourseID,  Cur.CourseID),
+        COALESCE(Des.StudentID, Cur.StudentID)
+    FROM Desired Des
+    FULL OUTER JOIN InScope Cur
+        ON Cur.CourseID  = Des.CourseID
+       AND Cur.StudentID = Des.StudentID
+    WHERE Cur.CourseID IS NULL
+       OR (Des.CourseID IS NULL AND @RemoveMissing = 1)
+    ORDER BY COALESCE(Des.CourseID, Cur.CourseID), COALESCE(Des.StudentID, Cur.StudentID);
+
+    -------------------------------------------------
+    -- 3) Apply in batches
+    -------------------------------------------------
+    DECLARE
+        @Total    INT = (SELECT COUNT(*) FROM #Diff),
+        @Batch    INT = 0,
+        @From     INT,
+        @Ins      INT,
+        @Del      INT,
+        @Inserted INT = 0,
+        @Deleted  INT = 0,
+        @Details  NVARCHAR(4000),
+        @TermID   INT = dbo.fn__CurrentTermID();     -- imported enrollments belong to the current term
+
+    WHILE @Batch * @BatchSize < @Total
+    BEGIN
+        SET @From = @Batch * @BatchSize;
+
+        BEGIN TRY
+            BEGIN TRAN;
+
+            INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID, TermID)
+            SELECT D.CourseID, D.StudentID, @TermID
+            FROM #Diff D
+            WHERE D.Seq > @From
+              AND D.Seq <= @From + @BatchSize
+              AND D.Op = 'I'
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM dbo.COURSE_STUDENT CS
+                  WHERE CS.CourseID  = D.CourseID
+                    AND CS.StudentID = D.StudentID
+              );
+            SET @Ins = @@ROWCOUNT;
+
+            DELETE CS
+            FROM dbo.COURSE_STUDENT CS
+            JOIN #Diff D
+              ON D.CourseID  = CS.CourseID
+             AND D.StudentID = CS.StudentID
+            WHERE D.Seq > @From
+              AND D.Seq <= @From + @BatchSize
+              AND D.Op = 'D';
+            SET @Del = @@ROWCOUNT;
+
+            SET @Details =
+                N'ImportID=' + CAST(@ImportID AS NVARCHAR(36)) +
+                N', Batch=' + CAST(@Batch + 1 AS NVARCHAR(20)) +
+                N', Enrolled=' + CAST(@Ins AS NVARCHAR(20)) +
+                N', Removed=' + CAST(@Del AS NVARCHAR(20));
+
+            EXEC dbo.sp_LogAction
+                @Username = @CurrentUsername,
+                @Action   = 'ADMIN_IMPORT_ENROLLMENTS_BATCH',
+                @Details  = @Details;
+
+            COMMIT;
+        END TRY
+        BEGIN CATCH
+            IF @@TRANCOUNT > 0 ROLLBACK;
+            IF @Inserted + @Deleted > 0
+                EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE_STUDENT';
+            THROW;
+        END CATCH
+
+        SET @Inserted += @Ins;
+        SET @Deleted  += @Del;
+        SET @Batch    += 1;
+    END
+
+    IF @Inserted + @Deleted > 0
+        EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE_STUDENT';
+
+    -- Accepted rows are done; rejected rows stay for the report
+    DELETE FROM dbo.ENROLLMENT_IMPORT_STAGE
+    WHERE ImportID = @ImportID
+      AND RejectReason IS NULL;
+
+    SELECT
+        @Staged   AS Staged,
+        @Rejected AS Rejected,
+        @Inserted AS Enrolled,
+        @Deleted  AS Removed,
+        @Batch    AS Batches;
+END
+GO
+
+---------------------------------------------------------
+-- E15. Admin: Bulk Enrollment Import — rejected rows
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_ImportEnrollments_GetRejected','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ImportEnrollments_GetRejected;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ImportEnrollments_GetRejected
+(
+    @CurrentUsername NVARCHAR(50),
+    @ImportID        UNIQUEIDENTIFIER
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'READ';
+
+    SELECT
+        St.RowNum,
+        St.StudentID,
+        St.CourseID,
+        St.RejectReason,
+        M.ReasonMessage
+    FROM dbo.ENROLLMENT_IMPORT_STAGE St
+    CROSS APPLY dbo.fn__ReasonMessage(St.RejectReason) M
+    WHERE St.ImportID = @ImportID
+      AND St.RejectReason IS NOT NULL
+    ORDER BY St.RowNum;
+END
+GO
+
+
+---------------------------------------------------------
+-- E16. Admin: Apply assignment matrix changes
+--   @Kind 'INSTRUCTOR' | 'TA'
+--   Only the changed cells arrive; applied set-based in one
+--   transaction (all or nothing), idempotent per cell.
+--   Call with autocommit ON.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_ApplyAssignmentChanges','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ApplyAssignmentChanges;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ApplyAssignmentChanges
+(
+    @CurrentUsername NVARCHAR(50),
+    @Kind            NVARCHAR(20),
+    @Changes         dbo.AssignmentChangeList READONLY
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @Kind NOT IN ('INSTRUCTOR','TA')
+    BEGIN
+        RAISERROR('Invalid assignment kind.', 16, 1);
+        RETURN;
+    END
+
+    -- New assignments must point at active rows
+    DECLARE @Invalid INT;
+
+    SELECT @Invalid = COUNT(*)
+    FROM @Changes X
+    LEFT JOIN dbo.COURSE C
+           ON C.CourseID = X.CourseID
+          AND C.IsDeleted = 0
+    LEFT JOIN dbo.INSTRUCTOR I
+           ON @Kind = 'INSTRUCTOR'
+          AND I.InstructorID = TRY_CAST(X.PersonKey AS INT)
+          AND I.IsDeleted = 0
+    LEFT JOIN dbo.USERS U
+           ON @Kind = 'TA'
+          AND U.Username  = X.PersonKey
+          AND U.Role      = 'TA'
+          AND U.IsDeleted = 0
+    WHERE X.Assign = 1
+      AND (C.CourseID IS NULL OR (I.InstructorID IS NULL AND U.Username IS NULL));
+
+    IF @Invalid > 0
+    BEGIN
+        RAISERROR('%d assignment(s) reference a deleted course or inactive person. Reload and try again.', 16, 1, @Invalid);
+        RETURN;
+    END
+
+    DECLARE @Assigned INT = 0, @Unassigned INT = 0, @Details NVARCHAR(4000);
+
+    BEGIN TRY
+        BEGIN TRAN;
+
+        IF @Kind = 'INSTRUCTOR'
+        BEGIN
+            DELETE IC
+            FROM dbo.INSTRUCTOR_COURSE IC
+            JOIN @Changes X
+              ON TRY_CAST(X.PersonKey AS INT) = IC.InstructorID
+             AND X.CourseID = IC.CourseID
+            WHERE X.Assign = 0;
+            SET @Unassigned = @@ROWCOUNT;
+
+            INSERT INTO dbo.INSTRUCTOR_COURSE (InstructorID, CourseID)
+            SELECT CAST(X.PersonKey AS INT), X.CourseID
+            FROM @Changes X
+            WHERE X.Assign = 1
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM dbo.INSTRUCTOR_COURSE IC
+                  WHERE IC.InstructorID = CAST(X.PersonKey AS INT)
+                    AND IC.CourseID     = X.CourseID
+              );
+            SET @Assigned = @@ROWCOUNT;
+
+            EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR_COURSE';
+        END
+        ELSE
+        BEGIN
+            DELETE TC
+            FROM dbo.TA_COURSE TC
+            JOIN @Changes X
+              ON X.PersonKey = TC.TAUsername
+             AND X.CourseID  = TC.CourseID
+            WHERE X.Assign = 0;
+            SET @Unassigned = @@ROWCOUNT;
+
+            INSERT INTO dbo.TA_COURSE (TAUsername, CourseID)
+            SELECT X.PersonKey, X.CourseID
+            FROM @Changes X
+            WHERE X.Assign = 1
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM dbo.TA_COURSE TC
+                  WHERE TC.TAUsername = X.PersonKey
+                    AND TC.CourseID   = X.CourseID
+              );
+            SET @Assigned = @@ROWCOUNT;
+
+            EXEC dbo.sp__BumpDataVersion @TableName = N'TA_COURSE';
+        END
+
+        SET @Details =
+            N'Kind=' + @Kind +
+            N', Assigned=' + CAST(@Assigned AS NVARCHAR(20)) +
+            N', Unassigned=' + CAST(@Unassigned AS NVARCHAR(20));
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_APPLY_ASSIGNMENT_CHANGES',
+            @Details  = @Details;
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        THROW;
+    END CATCH
+
+    SELECT @Assigned AS Assigned, @Unassigned AS Unassigned;
+END
+GO
+
+
+
+---------------------------------------------------------
+-- E17. Admin: Type-ahead search (students / courses / users)
+--   Ranked: exact ID, then prefix seeks, then (3+ chars
+--   and room left) a bounded contains scan. TOP @Limit.
+--   Not audited: runs per keystroke and returns directory
+--   data only (no grades / attendance / phone).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_SearchStudents','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_SearchStudents;
+GO
+CREATE PROCEDURE dbo.sp_Admin_SearchStudents
+(
+    @AdminUsername NVARCHAR(50),
+    @Query         NVARCHAR(100),
+    @Limit         INT = 20
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SET @Query = LTRIM(RTRIM(ISNULL(@Query, N'')));
+    IF @Limit IS NULL OR @Limit < 1 SET @Limit = 20;
+    IF @Limit > 100 SET @Limit = 100;
+
+    DECLARE @Esc NVARCHAR(200) =
+        REPLACE(REPLACE(REPLACE(@Query, N'[', N'[[]'), N'%', N'[%]'), N'_', N'[_]');
+    DECLARE @ID INT = TRY_CAST(@Query AS INT);
+    DECLARE @Hit TABLE (StudentID INT PRIMARY KEY, MatchRank TINYINT NOT NULL);
+
+    IF @Query <> N''
+    BEGIN
+        INSERT INTO @Hit (StudentID, MatchRank)
+        SELECT StudentID, 0
+        FROM dbo.STUDENT
+        WHERE StudentID = @ID
+          AND IsDeleted = 0;
+
+        INSERT INTO @Hit (StudentID, MatchRank)
+        SELECT TOP (@Limit) S.StudentID, 1
+        FROM dbo.STUDENT S
+        WHERE S.FullName LIKE @Esc + N'%'
+          AND S.IsDeleted = 0
+          AND NOT EXISTS (SELECT 1 FROM @Hit H WHERE H.StudentID = S.StudentID)
+        ORDER BY S.FullName;
+
+        INSERT INTO @Hit (StudentID, MatchRank)
+        SELECT TOP (@Limit) S.StudentID, 2
+        FROM dbo.STUDENT S
+        WHERE S.Email LIKE @Esc + N'%'
+          AND S.IsDeleted = 0
+          AND NOT EXISTS (SELECT 1 FROM @Hit H WHERE H.StudentID = S.StudentID)
+        ORDER BY S.Email;
+
+        IF LEN(@Query) >= 3 AND (SELECT COUNT(*) FROM @Hit) < @Limit
+            INSERT INTO @Hit (StudentID, MatchRank)
+            SELECT TOP (@Limit) S.StudentID, 3
+            FROM dbo.STUDENT S
+            WHERE (S.FullName LIKE N'%' + @Esc + N'%' OR S.Email LIKE N'%' + @Esc + N'%')
+              AND S.IsDeleted = 0
+              AND NOT EXISTS (SELECT 1 FROM @Hit H WHERE H.StudentID = S.StudentID)
+            ORDER BY S.FullName;
+    END
+
+    SELECT TOP (@Limit) S.StudentID, S.FullName, S.Email
+    FROM @Hit H
+    JOIN dbo.STUDENT S ON S.StudentID = H.StudentID
+    ORDER BY H.MatchRank, S.FullName;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_SearchCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_SearchCourses;
+GO
+CREATE PROCEDURE dbo.sp_Admin_SearchCourses
+(
+    @AdminUsername NVARCHAR(50),
+    @Query         NVARCHAR(100),
+    @Limit         INT = 20
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SET @Query = LTRIM(RTRIM(ISNULL(@Query, N'')));
+    IF @Limit IS NULL OR @Limit < 1 SET @Limit = 20;
+    IF @Limit > 100 SET @Limit = 100;
+
+    DECLARE @Esc NVARCHAR(200) =
+        REPLACE(REPLACE(REPLACE(@Query, N'[', N'[[]'), N'%', N'[%]'), N'_', N'[_]');
+    DECLARE @ID INT = TRY_CAST(@Query AS INT);
+    DECLARE @Hit TABLE (CourseID INT PRIMARY KEY, MatchRank TINYINT NOT NULL);
+
+    IF @Query <> N''
+    BEGIN
+        INSERT INTO @Hit (CourseID, MatchRank)
+        SELECT CourseID, 0
+        FROM dbo.COURSE
+        WHERE CourseID = @ID
+          AND IsDeleted = 0;
+
+        INSERT INTO @Hit (CourseID, MatchRank)
+        SELECT TOP (@Limit) C.CourseID, 1
+        FROM dbo.COURSE C
+        WHERE C.CourseName LIKE @Esc + N'%'
+          AND C.IsDeleted = 0
+          AND NOT EXISTS (SELECT 1 FROM @Hit H WHERE H.CourseID = C.CourseID)
+        ORDER BY C.CourseName;
+
+        IF LEN(@Query) >= 3 AND (SELECT COUNT(*) FROM @Hit) < @Limit
+            INSERT INTO @Hit (CourseID, MatchRank)
+            SELECT TOP (@Limit) C.CourseID, 2
+            FROM dbo.COURSE C
+            WHERE C.CourseName LIKE N'%' + @Esc + N'%'
+              AND C.IsDeleted = 0
+              AND NOT EXISTS (SELECT 1 FROM @Hit H WHERE H.CourseID = C.CourseID)
+            ORDER BY C.CourseName;
+    END
+
+    SELECT TOP (@Limit) C.CourseID, C.CourseName
+    FROM @Hit H
+    JOIN dbo.COURSE C ON C.CourseID = H.CourseID
+    ORDER BY H.MatchRank, C.CourseName;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_SearchUsers','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_SearchUsers;
+GO
+CREATE PROCEDURE dbo.sp_Admin_SearchUsers
+(
+    @AdminUsername NVARCHAR(50),
+    @Query         NVARCHAR(100),
+    @Limit         INT = 20
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SET @Query = LTRIM(RTRIM(ISNULL(@Query, N'')));
+    IF @Limit IS NULL OR @Limit < 1 SET @Limit = 20;
+    IF @Limit > 100 SET @Limit = 100;
+
+    DECLARE @Esc NVARCHAR(200) =
+        REPLACE(REPLACE(REPLACE(@Query, N'[', N'[[]'), N'%', N'[%]'), N'_', N'[_]');
+    DECLARE @Hit TABLE (Username NVARCHAR(50) PRIMARY KEY, MatchRank TINYINT NOT NULL);
+
+    IF @Query <> N''
+    BEGIN
+        INSERT INTO @Hit (Username, MatchRank)
+        SELECT TOP (@Limit) U.Username, 1
+        FROM dbo.USERS U
+        WHERE U.Username LIKE @Esc + N'%'
+          AND U.IsDeleted = 0
+        ORDER BY U.Username;
+
+        IF LEN(@Query) >= 3 AND (SELECT COUNT(*) FROM @Hit) < @Limit
+            INSERT INTO @Hit (Username, MatchRank)
+            SELECT TOP (@Limit) U.Username, 2
+            FROM dbo.USERS U
+            WHERE U.Username LIKE N'%' + @Esc + N'%'
+              AND U.IsDeleted = 0
+              AND NOT EXISTS (SELECT 1 FROM @Hit H WHERE H.Username = U.Username)
+            ORDER BY U.Username;
+    END
+
+    SELECT TOP (@Limit) U.Username, U.Role
+    FROM @Hit H
+    JOIN dbo.USERS U ON U.Username = H.Username
+    ORDER BY H.MatchRank, U.Username;
+END
+GO
+
+
+
+---------------------------------------------------------
+-- E. Admin: User_GetAll
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_User_GetAll','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_GetAll;
+GO
+
+CREATE PROCEDURE dbo.sp_User_GetAll
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -------------------------------------------------
+    -- Security Check (Admin only)
+    -------------------------------------------------
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 4,
+        @Mode              = 'READ';
+
+    -------------------------------------------------
+    -- Return users from ADMIN VIEW (NOT table)
+    -------------------------------------------------
+    SELECT
+        Username,
+        Role,
+        ClearanceLevel
+    FROM dbo.vw_Admin_Users
+    WHERE IsDeleted = 0
+    ORDER BY Username;
+
+    -------------------------------------------------
+    -- Audit log
+    -------------------------------------------------
+    EXEC dbo.sp_LogAction
+        @Username = @CurrentUsername,
+        @Action   = 'ADMIN_VIEW_USERS',
+        @Details  = NULL;
+END
+GO
+
+
+---------------------------------------------------------
+-- E. Guest: sp_Get_PublicCourses
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Get_PublicCourses','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Get_PublicCourses;
+GO
+CREATE PROCEDURE dbo.sp_Get_PublicCourses
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Guestrole',1,'READ';
+
+    SELECT
+        CourseID,
+        CourseName,
+        Description,
+        PublicInfo
+    FROM dbo.COURSE
+    WHERE IsDeleted = 0
+      AND ClearanceLevel = 1
+    ORDER BY CourseName;
+END
+GO
+
+
+---------------------------------------------------------
+-- E. Guest: sp_Get_PublicCatalog (versioned snapshot)
+--   Result set 1: Version (DATA_VERSION 'COURSE')
+--   Result set 2: public courses, only when @KnownVersion
+--                 differs (empty otherwise)
+--   Version is read first: a concurrent change can only
+--   make the client refetch, never keep stale rows.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Get_PublicCatalog','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Get_PublicCatalog;
+GO
+CREATE PROCEDURE dbo.sp_Get_PublicCatalog
+(
+    @CurrentUsername NVARCHAR(50),
+    @KnownVersion    BIGINT = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Guestrole',1,'READ';
+
+    DECLARE @Version BIGINT;
+
+    SELECT @Version = Version
+    FROM dbo.DATA_VERSION
+    WHERE TableName = N'COURSE';
+
+    SET @Version = ISNULL(@Version, 0);
+
+    SELECT @Version AS Version;
+
+    SELECT
+        CourseID,
+        CourseName,
+        Description,
+        PublicInfo
+    FROM dbo.COURSE
+    WHERE IsDeleted = 0
+      AND ClearanceLevel = 1
+      AND (@KnownVersion IS NULL OR @KnownVersion <> @Version)
+    ORDER BY CourseName;
+END
+GO
+
+
+---------------------------------------------------------
+-- E18. Admin: Chunked export (grades / attendance)
+--   Keyset chunks on the clustered PK: rows with
+--   key > @AfterID, TOP @ChunkSize, key order. Each call is
+--   one short statement (READ COMMITTED locks are released
+--   as the scan moves on), so a full export never holds
+--   locks for long and can resume from the last key written.
+--   Result set 1: rows of the chunk
+--   Result set 2: MaxID (progress estimate)
+--   One audit row per chunk (exported key range).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_ExportGrades_Chunk','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ExportGrades_Chunk;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ExportGrades_Chunk
+(
+    @AdminUsername NVARCHAR(50),
+    @AfterID       INT = 0,
+    @ChunkSize     INT = 5000
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SET @AfterID = ISNULL(@AfterID, 0);
+    IF @ChunkSize IS NULL OR @ChunkSize < 1 SET @ChunkSize = 5000;
+    IF @ChunkSize > 50000 SET @ChunkSize = 50000;
+
+    DECLARE @Rows INT, @LastID INT;
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT TOP (@ChunkSize)
+            G.GradeID,
+            G.StudentID,
+            S.FullName AS StudentName,
+            G.CourseID,
+            C.CourseName,
+            G.TermID,
+            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))) AS Grade,
+            G.DateEntered
+        INTO #Chunk
+        FROM dbo.GRADES G
+        JOIN dbo.STUDENT S ON S.StudentID = G.StudentID
+        JOIN dbo.COURSE  C ON C.CourseID  = G.CourseID
+        WHERE G.GradeID > @AfterID
+          AND G.IsDeleted = 0
+        ORDER BY G.GradeID;
+
+        SET @Rows = @@ROWCOUNT;
+
+        EXEC dbo.sp_Key_Close;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+
+    SELECT GradeID, StudentID, StudentName, CourseID, CourseName, TermID, Grade, DateEntered
+    FROM #Chunk
+    ORDER BY GradeID;
+
+    SELECT ISNULL(MAX(GradeID), 0) AS MaxID
+    FROM dbo.GRADES;
+
+    SELECT @LastID = MAX(GradeID) FROM #Chunk;
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'AfterID=' + CAST(@AfterID AS NVARCHAR(20)) +
+        N', LastID=' + ISNULL(CAST(@LastID AS NVARCHAR(20)), N'-') +
+        N', Rows=' + CAST(@Rows AS NVARCHAR(20));
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'ADMIN_EXPORT_GRADES_CHUNK',
+        @Details;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_ExportAttendance_Chunk','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ExportAttendance_Chunk;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ExportAttendance_Chunk
+(
+    @AdminUsername NVARCHAR(50),
+    @AfterID       BIGINT = 0,     -- RowKey (Part 4.0): stored rows first, then packed terms
+    @ChunkSize     INT = 20000
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SET @AfterID = ISNULL(@AfterID, 0);
+    IF @ChunkSize IS NULL OR @ChunkSize < 1 SET @ChunkSize = 20000;
+    IF @ChunkSize > 100000 SET @ChunkSize = 100000;
+
+    DECLARE @Rows INT, @LastID BIGINT;
+
+    -- 1) Stored rows (RowKey = AttendanceID)
+    SELECT TOP (@ChunkSize)
+        CAST(A.AttendanceID AS BIGINT) AS RowKey,
+        A.AttendanceID,
+        A.StudentID,
+        A.CourseID,
+        C.CourseName,
+        A.TermID,
+        A.Status,
+        A.DateRecorded
+    INTO #Chunk
+    FROM dbo.ATTENDANCE A
+    JOIN dbo.COURSE C ON C.CourseID = A.CourseID
+    WHERE @AfterID < 2147483648
+      AND A.AttendanceID > @AfterID
+      AND A.IsDeleted = 0
+    ORDER BY A.AttendanceID;
+
+    SET @Rows = @@ROWCOUNT;
+
+    -- 2) Then packed terms: only the next bitmaps are expanded
+    --    (each holds at least one day)
+    IF @Rows < @ChunkSize
+    BEGIN
+        DECLARE @Need INT = @ChunkSize - @Rows;
+        DECLARE @FromBitmap INT =
+            CASE WHEN @AfterID < 2147483648 THEN 0
+                 ELSE CAST((@AfterID - 2147483648) / 512 AS INT) END;
+
+        SELECT TOP (@Need) BitmapID
+        INTO #Bitmaps
+        FROM dbo.ATTENDANCE_BITMAP
+        WHERE BitmapID >= @FromBitmap
+        ORDER BY BitmapID;
+
+        INSERT INTO #Chunk (RowKey, AttendanceID, StudentID, CourseID, CourseName, TermID, Status, DateRecorded)
+        SELECT TOP (@Need)
+            A.RowKey, A.AttendanceID, A.StudentID, A.CourseID, C.CourseName, A.TermID, A.Status, A.DateRecorded
+        FROM #Bitmaps K
+        JOIN dbo.vw__AttendanceRows A ON A.BitmapID = K.BitmapID
+        JOIN dbo.COURSE C ON C.CourseID = A.CourseID
+        WHERE A.RowKey > @AfterID
+        ORDER BY A.RowKey;
+
+        SET @Rows += @@ROWCOUNT;
+    END
+
+    SELECT RowKey, AttendanceID, StudentID, CourseID, CourseName, TermID, Status, DateRecorded
+    FROM #Chunk
+    ORDER BY RowKey;
+
+    SELECT ISNULL(
+        (SELECT 2147483648 + CAST(MAX(BitmapID) AS BIGINT) * 512 + 511 FROM dbo.ATTENDANCE_BITMAP),
+        (SELECT ISNULL(MAX(AttendanceID), 0) FROM dbo.ATTENDANCE)
+    ) AS MaxID;
+
+    SELECT @LastID = MAX(RowKey) FROM #Chunk;
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'AfterID=' + CAST(@AfterID AS NVARCHAR(20)) +
+        N', LastID=' + ISNULL(CAST(@LastID AS NVARCHAR(20)), N'-') +
+        N', Rows=' + CAST(@Rows AS NVARCHAR(20));
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'ADMIN_EXPORT_ATTENDANCE_CHUNK',
+        @Details;
+END
+GO
+
+---------------------------------------------------------
+-- E19. Admin: Term-end report data (set-based)
+--   Everything the batch transcript / course reports need,
+--   in one call of a few set-based queries (no per-student
+--   or per-course round trips):
+--   1. Versions    DATA_VERSION of the source tables
+--   2. Students    live students
+--   3. Courses     live courses + instructor names
+--   4. Enrollments (StudentID, CourseID)
+--   5. Grades      decrypted, one per (StudentID, CourseID)
+--   6. Attendance  sessions / present per (StudentID, CourseID)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetReportData','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetReportData;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetReportData
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT TableName, Version
+    FROM dbo.DATA_VERSION
+    WHERE TableName IN (N'STUDENT', N'COURSE', N'INSTRUCTOR', N'INSTRUCTOR_COURSE',
+                        N'COURSE_STUDENT', N'GRADES', N'ATTENDANCE');
+
+    SELECT StudentID, FullName, Email, Department
+    FROM dbo.STUDENT
+    WHERE IsDeleted = 0
+    ORDER BY StudentID;
+
+    SELECT
+        C.CourseID,
+        C.CourseName,
+        Instructors = STUFF((
+            SELECT N', ' + I.FullName
+            FROM dbo.INSTRUCTOR_COURSE IC
+            JOIN dbo.INSTRUCTOR I ON I.InstructorID = IC.InstructorID AND I.IsDeleted = 0
+            WHERE IC.CourseID = C.CourseID
+            ORDER BY I.FullName
+            FOR XML PATH(''), TYPE).value('.', 'NVARCHAR(MAX)'), 1, 2, N'')
+    FROM dbo.COURSE C
+    WHERE C.IsDeleted = 0
+    ORDER BY C.CourseID;
+
+    SELECT CS.StudentID, CS.CourseID
+    FROM dbo.COURSE_STUDENT CS
+    JOIN dbo.STUDENT S ON S.StudentID = CS.StudentID AND S.IsDeleted = 0
+    JOIN dbo.COURSE  C ON C.CourseID  = CS.CourseID  AND C.IsDeleted = 0
+    ORDER BY CS.StudentID, CS.CourseID;
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT
+            G.StudentID,
+            G.CourseID,
+            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue))) AS Grade
+        FROM dbo.GRADES G
+        WHERE G.IsDeleted = 0
+        ORDER BY G.StudentID, G.CourseID;
+
+        EXEC dbo.sp_Key_Close;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+
+    SELECT
+        A.StudentID,
+        A.CourseID,
+        SUM(A.Sessions) AS Sessions,
+        SUM(A.Present) AS Present
+    FROM dbo.vw__AttendanceCounts A
+    GROUP BY A.StudentID, A.CourseID
+    ORDER BY A.StudentID, A.CourseID;
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'ADMIN_REPORT_DATA';
+END
+GO
+
+---------------------------------------------------------
+-- E20. Admin: Analytics facts (inference-safe aggregates)
+--   Source of the offline columnar snapshot. One row per
+--   (CourseID, Department, ClearanceLevel) of enrolled
+--   students; no per-student values leave the server:
+--   - groups with < 3 enrolled students are dropped
+--   - grade / attendance measures of a group are masked
+--     (GradeMasked / AttendanceMasked = 1, measures 0) when
+--     fewer than 3 of its students contribute to them
+--   Grade histogram: 10 buckets of 10 points (H0 = [0,10),
+--   ..., H9 = [90,100]).
+--   Result set 1: DATA_VERSION of the source tables
+--   Result set 2: facts
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetAnalyticsFacts','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetAnalyticsFacts;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetAnalyticsFacts
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT TableName, Version
+    FROM dbo.DATA_VERSION
+    WHERE TableName IN (N'STUDENT', N'COURSE', N'COURSE_STUDENT', N'GRADES', N'ATTENDANCE');
+
+    CREATE TABLE #Enrolled
+    (
+        CourseID       INT NOT NULL,
+        StudentID      INT NOT NULL,
+        Department     NVARCHAR(50) NOT NULL,
+        ClearanceLevel INT NOT NULL,
+        Grade          DECIMAL(10,2) NULL,
+        Sessions       INT NULL,
+        Present        INT NULL,
+        PRIMARY KEY (CourseID, StudentID)
+    );
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        INSERT INTO #Enrolled (CourseID, StudentID, Department, ClearanceLevel, Grade)
+        SELECT
+            CS.CourseID,
+            CS.StudentID,
+            S.Department,
+            S.ClearanceLevel,
+            TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(G.EncryptedGradeValue)))
+        FROM dbo.COURSE_STUDENT CS
+        JOIN dbo.STUDENT S ON S.StudentID = CS.StudentID AND S.IsDeleted = 0
+        JOIN dbo.COURSE  C ON C.CourseID  = CS.CourseID  AND C.IsDeleted = 0
+        LEFT JOIN dbo.GRADES G
+            ON G.StudentID = CS.StudentID
+           AND G.CourseID  = CS.CourseID
+           AND G.IsDeleted = 0;
+
+        EXEC dbo.sp_Key_Close;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+
+    UPDATE E
+    SET Sessions = A.Sessions,
+        Present  = A.Present
+    FROM #Enrolled E
+    JOIN (
+        SELECT StudentID, CourseID, SUM(Sessions) AS Sessions, SUM(Present) AS Present
+        FROM dbo.vw__AttendanceCounts
+        GROUP BY StudentID, CourseID
+    ) A ON A.StudentID = E.StudentID AND A.CourseID = E.CourseID;
+
+    ;WITH Groups AS
+    (
+        SELECT
+            E.CourseID,
+            E.Department,
+            E.ClearanceLevel,
+            COUNT(*)                                              AS Enrolled,
+            COUNT(E.Grade)                                        AS Graded,
+            SUM(CAST(E.Grade AS FLOAT))                           AS GradeSum,
+            SUM(CAST(E.Grade AS FLOAT) * CAST(E.Grade AS FLOAT))  AS GradeSumSq,
+            SUM(CASE WHEN E.Grade < 10 THEN 1 ELSE 0 END)                   AS H0,
+            SUM(CASE WHEN E.Grade >= 10 AND E.Grade < 20 THEN 1 ELSE 0 END) AS H1,
+            SUM(CASE WHEN E.Grade >= 20 AND E.Grade < 30 THEN 1 ELSE 0 END) AS H2,
+            SUM(CASE WHEN E.Grade >= 30 AND E.Grade < 40 THEN 1 ELSE 0 END) AS H3,
+            SUM(CASE WHEN E.Grade >= 40 AND E.Grade < 50 THEN 1 ELSE 0 END) AS H4,
+            SUM(CASE WHEN E.Grade >= 50 AND E.Grade < 60 THEN 1 ELSE 0 END) AS H5,
+            SUM(CASE WHEN E.Grade >= 60 AND E.Grade < 70 THEN 1 ELSE 0 END) AS H6,
+            SUM(CASE WHEN E.Grade >= 70 AND E.Grade < 80 THEN 1 ELSE 0 END) AS H7,
+            SUM(CASE WHEN E.Grade >= 80 AND E.Grade < 90 THEN 1 ELSE 0 END) AS H8,
+            SUM(CASE WHEN E.Grade >= 90 THEN 1 ELSE 0 END)                  AS H9,
+            COUNT(E.Sessions)                                     AS AttendStudents,
+            ISNULL(SUM(E.Sessions), 0)                            AS Sessions,
+            ISNULL(SUM(E.Present), 0)                             AS Present
+        FROM #Enrolled E
+        GROUP BY E.CourseID, E.Department, E.ClearanceLevel
+        HAVING COUNT(*) >= 3
+    )
+    SELECT
+        G.CourseID,
+        C.CourseName,
+        G.Department,
+        G.ClearanceLevel,
+        G.Enrolled,
+        CAST(CASE WHEN G.Graded BETWEEN 1 AND 2 THEN 1 ELSE 0 END AS BIT) AS GradeMasked,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.Graded END                   AS Graded,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.GradeSum END                 AS GradeSum,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.GradeSumSq END               AS GradeSumSq,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H0 END AS H0,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H1 END AS H1,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H2 END AS H2,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H3 END AS H3,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H4 END AS H4,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H5 END AS H5,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H6 END AS H6,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H7 END AS H7,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H8 END AS H8,
+        CASE WHEN G.Graded < 3 THEN 0 ELSE G.H9 END AS H9,
+        CAST(CASE WHEN G.AttendStudents BETWEEN 1 AND 2 THEN 1 ELSE 0 END AS BIT) AS AttendanceMasked,
+        CASE WHEN G.AttendStudents < 3 THEN 0 ELSE G.Sessions END         AS Sessions,
+        CASE WHEN G.AttendStudents < 3 THEN 0 ELSE G.Present END          AS Present
+    FROM Groups G
+    JOIN dbo.COURSE C ON C.CourseID = G.CourseID
+    ORDER BY G.CourseID, G.Department, G.ClearanceLevel;
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'ADMIN_ANALYTICS_FACTS';
+END
+GO
+
+
+---------------------------------------------------------
+-- E21. Terms (academic calendar)
+--   sp_GetTerms: every term, newest first (public calendar)
+--   Admin: create a term, set the current term, close /
+--   reopen a term (IsReadOnly = 1 => write procedures
+--   reject its grades and attendance)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_GetTerms','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_GetTerms;
+GO
+CREATE PROCEDURE dbo.sp_GetTerms
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Guestrole',1,'READ';
+
+    DECLARE @Current INT = dbo.fn__CurrentTermID();
+
+    SELECT
+        TermID,
+        TermName,
+        StartDate,
+        EndDate,
+        CAST(CASE WHEN TermID = @Current THEN 1 ELSE 0 END AS BIT) AS IsCurrent,
+        IsReadOnly
+    FROM dbo.TERM
+    ORDER BY StartDate DESC;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_CreateTerm','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_CreateTerm;
+GO
+CREATE PROCEDURE dbo.sp_Admin_CreateTerm
+(
+    @AdminUsername NVARCHAR(50),
+    @TermID        INT,             -- Year * 10 + Season (1 Spring, 2 Summer, 3 Fall)
+    @TermName      NVARCHAR(30),
+    @StartDate     DATE,
+    @EndDate       DATE
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @TermID IS NULL OR @TermID % 10 NOT BETWEEN 1 AND 3
+    BEGIN
+        RAISERROR('TermID must be Year * 10 + Season (1-3).', 16, 1);
+        RETURN;
+    END
+
+    -- Partitions exist for 2020-2040 only (pf_Term)
+    IF @TermID NOT BETWEEN 20201 AND 20403
+    BEGIN
+        RAISERROR('Term outside the partitioned range; extend pf_Term first.', 16, 1);
+        RETURN;
+    END
+
+    IF NULLIF(LTRIM(RTRIM(@TermName)), N'') IS NULL OR @StartDate IS NULL OR @EndDate IS NULL OR @EndDate < @StartDate
+    BEGIN
+        RAISERROR('Term name and a valid date range are required.', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID)
+    BEGIN
+        RAISERROR('Term already exists.', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (
+        SELECT 1 FROM dbo.TERM
+        WHERE StartDate <= @EndDate
+          AND EndDate   >= @StartDate
+    )
+    BEGIN
+        RAISERROR('Term dates overlap an existing term.', 16, 1);
+        RETURN;
+    END
+
+    INSERT INTO dbo.TERM (TermID, TermName, StartDate, EndDate)
+    VALUES (@TermID, LTRIM(RTRIM(@TermName)), @StartDate, @EndDate);
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'TermID=' + CAST(@TermID AS NVARCHAR(20)) +
+        N', ' + CONVERT(NVARCHAR(10), @StartDate, 23) +
+        N'..' + CONVERT(NVARCHAR(10), @EndDate, 23);
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'TERM';
+
+    EXEC dbo.sp_LogAction
+        @Username = @AdminUsername,
+        @Action   = 'ADMIN_CREATE_TERM',
+        @Details  = @Details;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_SetCurrentTerm','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_SetCurrentTerm;
+GO
+CREATE PROCEDURE dbo.sp_Admin_SetCurrentTerm
+(
+    @AdminUsername NVARCHAR(50),
+    @TermID        INT = NULL       -- NULL = follow the calendar (term containing today)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @TermID IS NOT NULL AND NOT EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID)
+    BEGIN
+        RAISERROR('Term not found.', 16, 1);
+        RETURN;
+    END
+
+    IF EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('A closed (read-only) term cannot be current.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRAN;
+
+    UPDATE dbo.TERM SET IsCurrent = 0 WHERE IsCurrent = 1;
+
+    IF @TermID IS NOT NULL
+        UPDATE dbo.TERM SET IsCurrent = 1 WHERE TermID = @TermID;
+
+    COMMIT;
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'(calendar)');
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'TERM';
+
+    EXEC dbo.sp_LogAction
+        @Username = @AdminUsername,
+        @Action   = 'ADMIN_SET_CURRENT_TERM',
+        @Details  = @Details;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_SetTermReadOnly','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_SetTermReadOnly;
+GO
+CREATE PROCEDURE dbo.sp_Admin_SetTermReadOnly
+(
+    @AdminUsername NVARCHAR(50),
+    @TermID        INT,
+    @ReadOnly      BIT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID)
+    BEGIN
+        RAISERROR('Term not found.', 16, 1);
+        RETURN;
+    END
+
+    IF @ReadOnly = 1 AND @TermID = dbo.fn__CurrentTermID()
+    BEGIN
+        RAISERROR('The current term cannot be closed.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @Unpacked INT = 0;
+
+    SET XACT_ABORT ON;
+    BEGIN TRY
+        BEGIN TRAN;
+
+        UPDATE dbo.TERM
+        SET IsReadOnly = ISNULL(@ReadOnly, 1)
+        WHERE TermID = @TermID;
+
+        -- Reopened: packed attendance (E23) goes back to rows so it
+        -- can be edited again (new AttendanceIDs)
+        IF ISNULL(@ReadOnly, 1) = 0
+        BEGIN
+            INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, TermID, Status, DateRecorded)
+            SELECT A.StudentID, A.CourseID, A.TermID, A.Status, A.DateRecorded
+            FROM dbo.vw__AttendanceRows A
+            WHERE A.TermID = @TermID
+              AND A.BitmapID IS NOT NULL;
+
+            SET @Unpacked = @@ROWCOUNT;
+
+            DELETE FROM dbo.ATTENDANCE_BITMAP
+            WHERE TermID = @TermID;
+        END
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        THROW;
+    END CATCH
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'TermID=' + CAST(@TermID AS NVARCHAR(20)) +
+        N', ReadOnly=' + CAST(ISNULL(@ReadOnly, 1) AS NVARCHAR(1)) +
+        CASE WHEN @Unpacked > 0 THEN N', Unpacked=' + CAST(@Unpacked AS NVARCHAR(20)) ELSE N'' END;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'TERM';
+    IF @Unpacked > 0 EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+
+    EXEC dbo.sp_LogAction
+        @Username = @AdminUsername,
+        @Action   = 'ADMIN_SET_TERM_READONLY',
+        @Details  = @Details;
+END
+GO
+
+
+---------------------------------------------------------
+-- E22. Archival (live tables -> *_HISTORY)
+--   sp_Admin_ArchiveBatch moves at most @BatchSize rows per
+--   table in one short transaction; call it until every
+--   count is 0 (archive.py, or a SQL Agent job step:
+--     WHILE 1 = 1 ... EXEC dbo.sp_Admin_ArchiveBatch ...).
+--   Moved:
+--     DELETED          soft-deleted grade / attendance rows
+--     COURSE_DELETED   every record of a deleted course
+--     STUDENT_DELETED  every record of a deleted student
+--     INACTIVE         records of students with nothing in a
+--                      term still open or ended after the
+--                      cutoff (@InactiveYears); only rows of
+--                      closed terms ever move
+--   Packed attendance (ATTENDANCE_BITMAP) moves whole bitmaps
+--   to ATTENDANCE_BITMAP_HISTORY for the last three reasons
+--   (bitmaps have no soft delete).
+--   STUDENT / COURSE rows stay (FK anchors), so no live FK
+--   is ever broken. Restores re-insert rows with new IDs
+--   (the history keeps the original ones).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_ArchiveBatch','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_ArchiveBatch;
+GO
+CREATE PROCEDURE dbo.sp_Admin_ArchiveBatch
+(
+    @AdminUsername NVARCHAR(50),
+    @BatchSize     INT = 2000,
+    @InactiveYears INT = 2
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF @BatchSize IS NULL OR @BatchSize < 1 SET @BatchSize = 2000;
+    IF @BatchSize > 20000 SET @BatchSize = 20000;
+    IF @InactiveYears IS NULL OR @InactiveYears < 1 SET @InactiveYears = 2;
+
+    DECLARE
+        @Today       DATE = CAST(GETDATE() AS DATE),
+        @Cutoff      DATE,
+        @Grades      INT = 0,
+        @Attendance  INT = 0,
+        @Bitmaps     INT = 0,
+        @Enrollments INT = 0;
+
+    SET @Cutoff = DATEADD(YEAR, -@InactiveYears, @Today);
+
+    -------------------------------------------------
+    -- Whole-record moves
+    -------------------------------------------------
+    CREATE TABLE #Course (CourseID INT PRIMARY KEY);
+
+    INSERT INTO #Course (CourseID)
+    SELECT CourseID FROM dbo.COURSE WHERE IsDeleted = 1;
+
+    CREATE TABLE #Student (StudentID INT PRIMARY KEY, Reason NVARCHAR(20) NOT NULL);
+
+    INSERT INTO #Student (StudentID, Reason)
+    SELECT
+        S.StudentID,
+        CASE WHEN S.IsDeleted = 1 THEN N'STUDENT_DELETED' ELSE N'INACTIVE' END
+    FROM dbo.STUDENT S
+    WHERE S.IsDeleted = 1
+       OR (
+            NOT EXISTS (
+                SELECT 1 FROM dbo.ARCHIVE_HOLD H
+                WHERE H.StudentID = S.StudentID AND H.HoldUntil >= @Today
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM dbo.COURSE_STUDENT CS
+                JOIN dbo.TERM T ON T.TermID = CS.TermID
+                WHERE CS.StudentID = S.StudentID
+                  AND (T.IsReadOnly = 0 OR T.EndDate >= @Cutoff)
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM dbo.GRADES G
+                JOIN dbo.TERM T ON T.TermID = G.TermID
+                WHERE G.StudentID = S.StudentID
+                  AND G.IsDeleted = 0
+                  AND (T.IsReadOnly = 0 OR T.EndDate >= @Cutoff)
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM dbo.ATTENDANCE A
+                JOIN dbo.TERM T ON T.TermID = A.TermID
+                WHERE A.StudentID = S.StudentID
+                  AND A.IsDeleted = 0
+                  AND (T.IsReadOnly = 0 OR T.EndDate >= @Cutoff)
+            )
+            AND NOT EXISTS (
+                SELECT 1 FROM dbo.ATTENDANCE_BITMAP B
+                JOIN dbo.TERM T ON T.TermID = B.TermID
+                WHERE B.StudentID = S.StudentID
+                  AND (T.IsReadOnly = 0 OR T.EndDate >= @Cutoff)
+            )
+          );
+
+    CREATE TABLE #G  (GradeID INT NOT NULL, TermID INT NOT NULL, Reason NVARCHAR(20) NOT NULL, PRIMARY KEY (GradeID, TermID));
+    CREATE TABLE #A  (AttendanceID INT NOT NULL, TermID INT NOT NULL, Reason NVARCHAR(20) NOT NULL, PRIMARY KEY (AttendanceID, TermID));
+    CREATE TABLE #B  (TermID INT NOT NULL, CourseID INT NOT NULL, StudentID INT NOT NULL, Reason NVARCHAR(20) NOT NULL,
+                      PRIMARY KEY (TermID, CourseID, StudentID));
+    CREATE TABLE #CS (CourseID INT NOT NULL, StudentID INT NOT NULL, Reason NVARCHAR(20) NOT NULL, PRIMARY KEY (CourseID, StudentID));
+
+    BEGIN TRY
+        BEGIN TRAN;
+
+        -------------------------------------------------
+        -- GRADES (one branch per reason, each on an index)
+        -------------------------------------------------
+        INSERT INTO #G (GradeID, TermID, Reason)
+        SELECT TOP (@BatchSize) X.GradeID, X.TermID, X.Reason
+        FROM (
+            SELECT G.GradeID, G.TermID, N'DELETED' AS Reason
+            FROM dbo.GRADES G
+            WHERE G.IsDeleted = 1
+
+            UNION ALL
+
+            SELECT G.GradeID, G.TermID, N'COURSE_DELETED'
+            FROM #Course C
+            JOIN dbo.GRADES G ON G.CourseID = C.CourseID
+            WHERE G.IsDeleted = 0
+
+            UNION ALL
+
+            SELECT G.GradeID, G.TermID, St.Reason
+            FROM #Student St
+            JOIN dbo.GRADES G ON G.StudentID = St.StudentID
+            JOIN dbo.TERM T ON T.TermID = G.TermID
+            WHERE G.IsDeleted = 0
+              AND NOT EXISTS (SELECT 1 FROM #Course C WHERE C.CourseID = G.CourseID)
+              AND (St.Reason = N'STUDENT_DELETED' OR (T.IsReadOnly = 1 AND T.EndDate < @Cutoff))
+        ) X;
+
+        DELETE G
+        OUTPUT
+            deleted.GradeID, deleted.StudentID, deleted.CourseID, deleted.TermID,
+            deleted.DateEntered, deleted.EncryptedGradeValue, deleted.IsDeleted, K.Reason
+        INTO dbo.GRADES_HISTORY
+            (GradeID, StudentID, CourseID, TermID, DateEntered, EncryptedGradeValue, IsDeleted, ArchiveReason)
+        FROM dbo.GRADES G
+        JOIN #G K
+            ON K.GradeID = G.GradeID
+           AND K.TermID  = G.TermID;
+
+        SET @Grades = @@ROWCOUNT;
+
+        -------------------------------------------------
+        -- ATTENDANCE
+        -------------------------------------------------
+        INSERT INTO #A (AttendanceID, TermID, Reason)
+        SELECT TOP (@BatchSize) X.AttendanceID, X.TermID, X.Reason
+        FROM (
+            SELECT A.AttendanceID, A.TermID, N'DELETED' AS Reason
+            FROM dbo.ATTENDANCE A
+            WHERE A.IsDeleted = 1
+
+            UNION ALL
+
+            SELECT A.AttendanceID, A.TermID, N'COURSE_DELETED'
+            FROM #Course C
+            JOIN dbo.ATTENDANCE A ON A.CourseID = C.CourseID
+            WHERE A.IsDeleted = 0
+
+            UNION ALL
+
+            SELECT A.AttendanceID, A.TermID, St.Reason
+            FROM #Student St
+            JOIN dbo.ATTENDANCE A ON A.StudentID = St.StudentID
+            JOIN dbo.TERM T ON T.TermID = A.TermID
+            WHERE A.IsDeleted = 0
+              AND NOT EXISTS (SELECT 1 FROM #Course C WHERE C.CourseID = A.CourseID)
+              AND (St.Reason = N'STUDENT_DELETED' OR (T.IsReadOnly = 1 AND T.EndDate < @Cutoff))
+        ) X;
+
+        DELETE A
+        OUTPUT
+            deleted.AttendanceID, deleted.StudentID, deleted.CourseID, deleted.TermID,
+            deleted.Status, deleted.DateRecorded, deleted.IsDeleted, K.Reason
+        INTO dbo.ATTENDANCE_HISTORY
+            (AttendanceID, StudentID, CourseID, TermID, Status, DateRecorded, IsDeleted, ArchiveReason)
+        FROM dbo.ATTENDANCE A
+        JOIN #A K
+            ON K.AttendanceID = A.AttendanceID
+           AND K.TermID       = A.TermID;
+
+        SET @Attendance = @@ROWCOUNT;
+
+        -------------------------------------------------
+        -- ATTENDANCE_BITMAP (packed closed terms)
+        -------------------------------------------------
+        INSERT INTO #B (TermID, CourseID, StudentID, Reason)
+        SELECT TOP (@BatchSize) X.TermID, X.CourseID, X.StudentID, X.Reason
+        FROM (
+            SELECT B.TermID, B.CourseID, B.StudentID, N'COURSE_DELETED' AS Reason
+            FROM #Course C
+            JOIN dbo.ATTENDANCE_BITMAP B ON B.CourseID = C.CourseID
+
+            UNION ALL
+
+            SELECT B.TermID, B.CourseID, B.StudentID, St.Reason
+            FROM #Student St
+            JOIN dbo.ATTENDANCE_BITMAP B ON B.StudentID = St.StudentID
+            JOIN dbo.TERM T ON T.TermID = B.TermID
+            WHERE NOT EXISTS (SELECT 1 FROM #Course C WHERE C.CourseID = B.CourseID)
+              AND (St.Reason = N'STUDENT_DELETED' OR (T.IsReadOnly = 1 AND T.EndDate < @Cutoff))
+        ) X;
+
+        DELETE B
+        OUTPUT
+            deleted.BitmapID, deleted.StudentID, deleted.CourseID, deleted.TermID,
+            deleted.StartDate, deleted.Days, deleted.Recorded, deleted.Present,
+            deleted.Sessions, deleted.PresentCount, deleted.PackedAt, K.Reason
+        INTO dbo.ATTENDANCE_BITMAP_HISTORY
+            (BitmapID, StudentID, CourseID, TermID, StartDate, Days, Recorded, Present,
+             Sessions, PresentCount, PackedAt, ArchiveReason)
+        FROM dbo.ATTENDANCE_BITMAP B
+        JOIN #B K
+            ON K.TermID    = B.TermID
+           AND K.CourseID  = B.CourseID
+           AND K.StudentID = B.StudentID;
+
+        SET @Bitmaps = @@ROWCOUNT;
+
+        -------------------------------------------------
+        -- COURSE_STUDENT (enrollments have no soft delete)
+        -------------------------------------------------
+        INSERT INTO #CS (CourseID, StudentID, Reason)
+        SELECT TOP (@BatchSize) X.CourseID, X.StudentID, X.Reason
+        FROM (
+            SELECT CS.CourseID, CS.StudentID, N'COURSE_DELETED' AS Reason
+            FROM #Course C
+            JOIN dbo.COURSE_STUDENT CS ON CS.CourseID = C.CourseID
+
+            UNION ALL
+
+            SELECT CS.CourseID, CS.StudentID, St.Reason
+            FROM #Student St
+            JOIN dbo.COURSE_STUDENT CS ON CS.StudentID = St.StudentID
+            JOIN dbo.TERM T ON T.TermID = CS.TermID
+            WHERE NOT EXISTS (SELECT 1 FROM #Course C WHERE C.CourseID = CS.CourseID)
+              AND (St.Reason = N'STUDENT_DELETED' OR (T.IsReadOnly = 1 AND T.EndDate < @Cutoff))
+        ) X;
+
+        DELETE CS
+        OUTPUT deleted.CourseID, deleted.StudentID, deleted.TermID, K.Reason
+        INTO dbo.COURSE_STUDENT_HISTORY (CourseID, StudentID, TermID, ArchiveReason)
+        FROM dbo.COURSE_STUDENT CS
+        JOIN #CS K
+            ON K.CourseID  = CS.CourseID
+           AND K.StudentID = CS.StudentID;
+
+        SET @Enrollments = @@ROWCOUNT;
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        THROW;
+    END CATCH
+
+    IF @Grades > 0                  EXEC dbo.sp__BumpDataVersion @TableName = N'GRADES';
+    IF @Attendance + @Bitmaps > 0   EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+    IF @Enrollments > 0             EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE_STUDENT';
+
+    IF @Grades + @Attendance + @Bitmaps + @Enrollments > 0
+    BEGIN
+        DECLARE @Details NVARCHAR(4000) =
+            N'Grades=' + CAST(@Grades AS NVARCHAR(20)) +
+            N', Attendance=' + CAST(@Attendance AS NVARCHAR(20)) +
+            N', Bitmaps=' + CAST(@Bitmaps AS NVARCHAR(20)) +
+            N', Enrollments=' + CAST(@Enrollments AS NVARCHAR(20)) +
+            N', InactiveYears=' + CAST(@InactiveYears AS NVARCHAR(20));
+
+        EXEC dbo.sp_LogAction
+            @AdminUsername,
+            'ADMIN_ARCHIVE_BATCH',
+            @Details;
+    END
+
+    SELECT
+        @Grades      AS Grades,
+        @Attendance  AS Attendance,
+        @Bitmaps     AS Bitmaps,
+        @Enrollments AS Enrollments;
+END
+GO
+
+---------------------------------------------------------
+-- Admin: View the archive
+--   Result set 1: row counts per table / reason
+--   Result set 2: newest @MaxRows rows of @Kind
+--                 ('GRADES' | 'ATTENDANCE' | 'ENROLLMENTS'),
+--                 optionally for one student / course
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetArchive','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetArchive;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetArchive
+(
+    @AdminUsername NVARCHAR(50),
+    @Kind          NVARCHAR(20),
+    @StudentID     INT = NULL,
+    @CourseID      INT = NULL,
+    @MaxRows       INT = 500
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    IF @Kind NOT IN (N'GRADES', N'ATTENDANCE', N'ENROLLMENTS')
+    BEGIN
+        RAISERROR('Kind must be GRADES, ATTENDANCE or ENROLLMENTS.', 16, 1);
+        RETURN;
+    END
+
+    IF @MaxRows IS NULL OR @MaxRows < 1 SET @MaxRows = 500;
+    IF @MaxRows > 5000 SET @MaxRows = 5000;
+
+    SELECT N'GRADES' AS Kind, ArchiveReason, COUNT(*) AS Total
+    FROM dbo.GRADES_HISTORY GROUP BY ArchiveReason
+    UNION ALL
+    SELECT N'ATTENDANCE', ArchiveReason, COUNT(*)
+    FROM dbo.ATTENDANCE_HISTORY GROUP BY ArchiveReason
+    UNION ALL
+    SELECT N'ATTENDANCE_BITMAP', ArchiveReason, COUNT(*)
+    FROM dbo.ATTENDANCE_BITMAP_HISTORY GROUP BY ArchiveReason
+    UNION ALL
+    SELECT N'ENROLLMENTS', ArchiveReason, COUNT(*)
+    FROM dbo.COURSE_STUDENT_HISTORY GROUP BY ArchiveReason
+    ORDER BY Kind, ArchiveReason;
+
+    IF @Kind = N'GRADES'
+    BEGIN
+        BEGIN TRY
+            EXEC dbo.sp_Key_Open;
+
+            SELECT TOP (@MaxRows)
+                H.HistoryID,
+                H.GradeID,
+                H.StudentID,
+                S.FullName,
+                H.CourseID,
+                C.CourseName,
+                H.TermID,
+                TRY_CONVERT(DECIMAL(10,2), CONVERT(NVARCHAR(50), DecryptByKey(H.EncryptedGradeValue))) AS Grade,
+                H.DateEntered,
+                H.ArchiveReason,
+                H.ArchivedAt
+            FROM dbo.GRADES_HISTORY H
+            JOIN dbo.STUDENT S ON S.StudentID = H.StudentID
+            JOIN dbo.COURSE  C ON C.CourseID  = H.CourseID
+            WHERE (@StudentID IS NULL OR H.StudentID = @StudentID)
+              AND (@CourseID  IS NULL OR H.CourseID  = @CourseID)
+            ORDER BY H.HistoryID DESC;
+
+            EXEC dbo.sp_Key_Close;
+        END TRY
+        BEGIN CATCH
+            BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+            THROW;
+        END CATCH
+    END
+    ELSE IF @Kind = N'ATTENDANCE'
+    BEGIN
+        SELECT TOP (@MaxRows)
+            H.HistoryID,
+            H.AttendanceID,
+            H.StudentID,
+            S.FullName,
+            H.CourseID,
+            C.CourseName,
+            H.TermID,
+            CASE WHEN H.Status = 1 THEN 'Present' ELSE 'Absent' END AS StatusText,
+            H.DateRecorded,
+            H.ArchiveReason,
+            H.ArchivedAt
+        FROM dbo.ATTENDANCE_HISTORY H
+        JOIN dbo.STUDENT S ON S.StudentID = H.StudentID
+        JOIN dbo.COURSE  C ON C.CourseID  = H.CourseID
+        WHERE (@StudentID IS NULL OR H.StudentID = @StudentID)
+          AND (@CourseID  IS NULL OR H.CourseID  = @CourseID)
+        ORDER BY H.HistoryID DESC;
+    END
+    ELSE
+    BEGIN
+        SELECT TOP (@MaxRows)
+            H.HistoryID,
+            H.StudentID,
+            S.FullName,
+            H.CourseID,
+            C.CourseName,
+            H.TermID,
+            H.ArchiveReason,
+            H.ArchivedAt
+        FROM dbo.COURSE_STUDENT_HISTORY H
+        JOIN dbo.STUDENT S ON S.StudentID = H.StudentID
+        JOIN dbo.COURSE  C ON C.CourseID  = H.CourseID
+        WHERE (@StudentID IS NULL OR H.StudentID = @StudentID)
+          AND (@CourseID  IS NULL OR H.CourseID  = @CourseID)
+        ORDER BY H.HistoryID DESC;
+    END
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'Kind=' + @Kind +
+        N', StudentID=' + ISNULL(CAST(@StudentID AS NVARCHAR(20)), N'-') +
+        N', CourseID=' + ISNULL(CAST(@CourseID AS NVARCHAR(20)), N'-');
+
+    EXEC dbo.sp_LogAction
+        @Username   = @AdminUsername,
+        @Action     = 'ADMIN_VIEW_ARCHIVE',
+        @Details    = @Details,
+        @EntityType = CASE WHEN @StudentID IS NOT NULL THEN 'STUDENT' END,
+        @EntityID   = @StudentID,
+        @CourseID   = @CourseID;
+END
+GO
+
+---------------------------------------------------------
+-- Admin: Restore from the archive
+--   sp_Admin_RestoreArchived: one history row (@Kind as in
+--     sp_Admin_GetArchive) back to its live table, active
+--     (IsDeleted = 0; a DELETED row is thereby undeleted)
+--   sp_Admin_RestoreStudentArchive: every record of a
+--     student archived with the student (INACTIVE /
+--     STUDENT_DELETED); rows that clash with live ones stay.
+--     Archived bitmaps go back as bitmaps while their term is
+--     closed, as rows if it was reopened since; a bitmap stays
+--     archived while any live record exists for its key
+--   Student and course must be live. The student is held
+--   back from inactive archival for a year (ARCHIVE_HOLD).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_RestoreArchived','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_RestoreArchived;
+GO
+CREATE PROCEDURE dbo.sp_Admin_RestoreArchived
+(
+    @AdminUsername NVARCHAR(50),
+    @Kind          NVARCHAR(20),
+    @HistoryID     BIGINT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    DECLARE @StudentID INT, @CourseID INT, @TermID INT, @OldID INT, @NewID INT;
+
+    IF @Kind = N'GRADES'
+        SELECT @StudentID = StudentID, @CourseID = CourseID, @TermID = TermID, @OldID = GradeID
+        FROM dbo.GRADES_HISTORY WHERE HistoryID = @HistoryID;
+    ELSE IF @Kind = N'ATTENDANCE'
+        SELECT @StudentID = StudentID, @CourseID = CourseID, @TermID = TermID, @OldID = AttendanceID
+        FROM dbo.ATTENDANCE_HISTORY WHERE HistoryID = @HistoryID;
+    ELSE IF @Kind = N'ENROLLMENTS'
+        SELECT @StudentID = StudentID, @CourseID = CourseID, @TermID = TermID
+        FROM dbo.COURSE_STUDENT_HISTORY WHERE HistoryID = @HistoryID;
+    ELSE
+    BEGIN
+        RAISERROR('Kind must be GRADES, ATTENDANCE or ENROLLMENTS.', 16, 1);
+        RETURN;
+    END
+
+    IF @StudentID IS NULL
+    BEGIN
+        RAISERROR('Archived row not found.', 16, 1);
+        RETURN;
+    END
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.STUDENT WHERE StudentID = @StudentID AND IsDeleted = 0)
+       OR NOT EXISTS (SELECT 1 FROM dbo.COURSE WHERE CourseID = @CourseID AND IsDeleted = 0)
+    BEGIN
+        RAISERROR('Student or course is deleted; restore it first.', 16, 1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        BEGIN TRAN;
+
+        IF @Kind = N'GRADES'
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM dbo.GRADES
+                WHERE StudentID = @StudentID AND CourseID = @CourseID AND TermID = @TermID
+            )
+            BEGIN
+                ROLLBACK;
+                RAISERROR('A live grade exists for this student, course and term.', 16, 1);
+                RETURN;
+            END
+
+            INSERT INTO dbo.GRADES (StudentID, CourseID, TermID, DateEntered, EncryptedGradeValue, IsDeleted)
+            SELECT StudentID, CourseID, TermID, DateEntered, EncryptedGradeValue, 0
+            FROM dbo.GRADES_HISTORY
+            WHERE HistoryID = @HistoryID;
+
+            SET @NewID = SCOPE_IDENTITY();
+            DELETE FROM dbo.GRADES_HISTORY WHERE HistoryID = @HistoryID;
+        END
+        ELSE IF @Kind = N'ATTENDANCE'
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM dbo.ATTENDANCE A
+                JOIN dbo.ATTENDANCE_HISTORY H
+                    ON H.StudentID    = A.StudentID
+                   AND H.CourseID     = A.CourseID
+                   AND H.DateRecorded = A.DateRecorded
+                   AND H.TermID       = A.TermID
+                WHERE H.HistoryID = @HistoryID
+            )
+            BEGIN
+                ROLLBACK;
+                RAISERROR('A live attendance record exists for this day.', 16, 1);
+                RETURN;
+            END
+
+            INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, TermID, Status, DateRecorded, IsDeleted)
+            SELECT StudentID, CourseID, TermID, Status, DateRecorded, 0
+            FROM dbo.ATTENDANCE_HISTORY
+            WHERE HistoryID = @HistoryID;
+
+            SET @NewID = SCOPE_IDENTITY();
+            DELETE FROM dbo.ATTENDANCE_HISTORY WHERE HistoryID = @HistoryID;
+        END
+        ELSE
+        BEGIN
+            IF EXISTS (SELECT 1 FROM dbo.COURSE_STUDENT WHERE CourseID = @CourseID AND StudentID = @StudentID)
+            BEGIN
+                ROLLBACK;
+                RAISERROR('Student is already enrolled in this course.', 16, 1);
+                RETURN;
+            END
+
+            INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID, TermID)
+            VALUES (@CourseID, @StudentID, @TermID);
+
+            DELETE FROM dbo.COURSE_STUDENT_HISTORY WHERE HistoryID = @HistoryID;
+        END
+
+        MERGE dbo.ARCHIVE_HOLD AS tgt
+        USING (SELECT @StudentID AS StudentID) src
+        ON tgt.StudentID = src.StudentID
+        WHEN MATCHED THEN
+            UPDATE SET HoldUntil = DATEADD(YEAR, 1, CAST(GETDATE() AS DATE)), HeldBy = @AdminUsername
+        WHEN NOT MATCHED THEN
+            INSERT (StudentID, HoldUntil, HeldBy)
+            VALUES (@StudentID, DATEADD(YEAR, 1, CAST(GETDATE() AS DATE)), @AdminUsername);
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        THROW;
+    END CATCH
+
+    DECLARE @Table NVARCHAR(50) =
+        CASE @Kind WHEN N'GRADES' THEN N'GRADES' WHEN N'ATTENDANCE' THEN N'ATTENDANCE' ELSE N'COURSE_STUDENT' END;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = @Table;
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'Kind=' + @Kind +
+        N', HistoryID=' + CAST(@HistoryID AS NVARCHAR(20)) +
+        ISNULL(N', ID ' + CAST(@OldID AS NVARCHAR(20)) + N' -> ' + CAST(@NewID AS NVARCHAR(20)), N'');
+
+    EXEC dbo.sp_LogAction
+        @Username   = @AdminUsername,
+        @Action     = 'ADMIN_RESTORE_ARCHIVED',
+        @Details    = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID,
+        @CourseID   = @CourseID;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_RestoreStudentArchive','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_RestoreStudentArchive;
+GO
+CREATE PROCEDURE dbo.sp_Admin_RestoreStudentArchive
+(
+    @AdminUsername NVARCHAR(50),
+    @StudentID     INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.STUDENT WHERE StudentID = @StudentID AND IsDeleted = 0)
+    BEGIN
+        RAISERROR('Student not found or deleted.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE @Grades INT = 0, @Attendance INT = 0, @Bitmaps INT = 0, @Enrollments INT = 0;
+
+    CREATE TABLE #GH  (HistoryID BIGINT PRIMARY KEY);
+    CREATE TABLE #AH  (HistoryID BIGINT PRIMARY KEY);
+    CREATE TABLE #BH  (HistoryID BIGINT PRIMARY KEY);
+    CREATE TABLE #CSH (HistoryID BIGINT PRIMARY KEY);
+
+    BEGIN TRY
+        BEGIN TRAN;
+
+        -- Newest archived copy per key; live course; no clash with live rows
+        INSERT INTO #CSH (HistoryID)
+        SELECT MAX(H.HistoryID)
+        FROM dbo.COURSE_STUDENT_HISTORY H
+        JOIN dbo.COURSE C ON C.CourseID = H.CourseID AND C.IsDeleted = 0
+        WHERE H.StudentID = @StudentID
+          AND H.ArchiveReason IN (N'INACTIVE', N'STUDENT_DELETED')
+          AND NOT EXISTS (
+              SELECT 1 FROM dbo.COURSE_STUDENT CS
+              WHERE CS.CourseID = H.CourseID AND CS.StudentID = H.StudentID
+          )
+        GROUP BY H.CourseID;
+
+        INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID, TermID)
+        SELECT H.CourseID, H.StudentID, H.TermID
+        FROM dbo.COURSE_STUDENT_HISTORY H
+        JOIN #CSH K ON K.HistoryID = H.HistoryID;
+
+        SET @Enrollments = @@ROWCOUNT;
+
+        INSERT INTO #GH (HistoryID)
+        SELECT MAX(H.HistoryID)
+        FROM dbo.GRADES_HISTORY H
+        JOIN dbo.COURSE C ON C.CourseID = H.CourseID AND C.IsDeleted = 0
+        WHERE H.StudentID = @StudentID
+          AND H.ArchiveReason IN (N'INACTIVE', N'STUDENT_DELETED')
+          AND NOT EXISTS (
+              SELECT 1 FROM dbo.GRADES G
+              WHERE G.StudentID = H.StudentID AND G.CourseID = H.CourseID AND G.TermID = H.TermID
+          )
+        GROUP BY H.CourseID, H.TermID;
+
+        INSERT INTO dbo.GRADES (StudentID, CourseID, TermID, DateEntered, EncryptedGradeValue, IsDeleted)
+        SELECT H.StudentID, H.CourseID, H.TermID, H.DateEntered, H.EncryptedGradeValue, 0
+        FROM dbo.GRADES_HISTORY H
+        JOIN #GH K ON K.HistoryID = H.HistoryID;
+
+        SET @Grades = @@ROWCOUNT;
+
+        INSERT INTO #AH (HistoryID)
+        SELECT MAX(H.HistoryID)
+        FROM dbo.ATTENDANCE_HISTORY H
+        JOIN dbo.COURSE C ON C.CourseID = H.CourseID AND C.IsDeleted = 0
+        WHERE H.StudentID = @StudentID
+          AND H.ArchiveReason IN (N'INACTIVE', N'STUDENT_DELETED')
+          AND NOT EXISTS (
+              SELECT 1 FROM dbo.ATTENDANCE A
+              WHERE A.StudentID = H.StudentID AND A.CourseID = H.CourseID
+                AND A.DateRecorded = H.DateRecorded AND A.TermID = H.TermID
+          )
+        GROUP BY H.CourseID, H.DateRecorded, H.TermID;
+
+        INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, TermID, Status, DateRecorded, IsDeleted)
+        SELECT H.StudentID, H.CourseID, H.TermID, H.Status, H.DateRecorded, 0
+        FROM dbo.ATTENDANCE_HISTORY H
+        JOIN #AH K ON K.HistoryID = H.HistoryID;
+
+        SET @Attendance = @@ROWCOUNT;
+
+        INSERT INTO #BH (HistoryID)
+        SELECT MAX(H.HistoryID)
+        FROM dbo.ATTENDANCE_BITMAP_HISTORY H
+        JOIN dbo.COURSE C ON C.CourseID = H.CourseID AND C.IsDeleted = 0
+        WHERE H.StudentID = @StudentID
+          AND H.ArchiveReason IN (N'INACTIVE', N'STUDENT_DELETED')
+          AND NOT EXISTS (
+              SELECT 1 FROM dbo.ATTENDANCE_BITMAP B
+              WHERE B.TermID = H.TermID AND B.CourseID = H.CourseID AND B.StudentID = H.StudentID
+          )
+          AND NOT EXISTS (
+              SELECT 1 FROM dbo.ATTENDANCE A
+              WHERE A.StudentID = H.StudentID AND A.CourseID = H.CourseID AND A.TermID = H.TermID
+          )
+        GROUP BY H.CourseID, H.TermID;
+
+        -- Term still closed: back as a bitmap
+        INSERT INTO dbo.ATTENDANCE_BITMAP
+            (StudentID, CourseID, TermID, StartDate, Days, Recorded, Present, Sessions, PresentCount, PackedAt)
+        SELECT
+            H.StudentID, H.CourseID, H.TermID, H.StartDate, H.Days,
+            H.Recorded, H.Present, H.Sessions, H.PresentCount, H.PackedAt
+        FROM dbo.ATTENDANCE_BITMAP_HISTORY H
+        JOIN #BH K ON K.HistoryID = H.HistoryID
+        JOIN dbo.TERM T ON T.TermID = H.TermID AND T.IsReadOnly = 1;
+
+        SET @Bitmaps = @@ROWCOUNT;
+
+        -- Term reopened since: expanded into rows (as vw__AttendanceRows)
+        INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, TermID, Status, DateRecorded, IsDeleted)
+        SELECT
+            H.StudentID, H.CourseID, H.TermID,
+            CAST(CASE WHEN CAST(SUBSTRING(H.Present, D.N / 8 + 1, 1) AS TINYINT) & POWER(2, D.N % 8) <> 0
+                      THEN 1 ELSE 0 END AS BIT),
+            DATEADD(DAY, D.N, H.StartDate),
+            0
+        FROM dbo.ATTENDANCE_BITMAP_HISTORY H
+        JOIN #BH K ON K.HistoryID = H.HistoryID
+        JOIN dbo.TERM T ON T.TermID = H.TermID AND T.IsReadOnly = 0
+        JOIN dbo.fn__DayNumbers() D
+            ON D.N < H.Days
+        WHERE CAST(SUBSTRING(H.Recorded, D.N / 8 + 1, 1) AS TINYINT) & POWER(2, D.N % 8) <> 0;
+
+        SET @Attendance += @@ROWCOUNT;
+
+        DELETE H FROM dbo.COURSE_STUDENT_HISTORY H JOIN #CSH K ON K.HistoryID = H.HistoryID;
+        DELETE H FROM dbo.GRADES_HISTORY         H JOIN #GH  K ON K.HistoryID = H.HistoryID;
+        DELETE H FROM dbo.ATTENDANCE_HISTORY     H JOIN #AH  K ON K.HistoryID = H.HistoryID;
+        DELETE H FROM dbo.ATTENDANCE_BITMAP_HISTORY H JOIN #BH K ON K.HistoryID = H.HistoryID;
+
+        MERGE dbo.ARCHIVE_HOLD AS tgt
+        USING (SELECT @StudentID AS StudentID) src
+        ON tgt.StudentID = src.StudentID
+        WHEN MATCHED THEN
+            UPDATE SET HoldUntil = DATEADD(YEAR, 1, CAST(GETDATE() AS DATE)), HeldBy = @AdminUsername
+        WHEN NOT MATCHED THEN
+            INSERT (StudentID, HoldUntil, HeldBy)
+            VALUES (@StudentID, DATEADD(YEAR, 1, CAST(GETDATE() AS DATE)), @AdminUsername);
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        THROW;
+    END CATCH
+
+    IF @Grades > 0                  EXEC dbo.sp__BumpDataVersion @TableName = N'GRADES';
+    IF @Attendance + @Bitmaps > 0   EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+    IF @Enrollments > 0             EXEC dbo.sp__BumpDataVersion @TableName = N'COURSE_STUDENT';
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'Grades=' + CAST(@Grades AS NVARCHAR(20)) +
+        N', Attendance=' + CAST(@Attendance AS NVARCHAR(20)) +
+        N', Bitmaps=' + CAST(@Bitmaps AS NVARCHAR(20)) +
+        N', Enrollments=' + CAST(@Enrollments AS NVARCHAR(20));
+
+    EXEC dbo.sp_LogAction
+        @Username   = @AdminUsername,
+        @Action     = 'ADMIN_RESTORE_STUDENT_ARCHIVE',
+        @Details    = @Details,
+        @EntityType = 'STUDENT',
+        @EntityID   = @StudentID;
+
+    SELECT
+        @Grades      AS Grades,
+        @Attendance  AS Attendance,
+        @Bitmaps     AS Bitmaps,
+        @Enrollments AS Enrollments;
+END
+GO
+
+
+
+---------------------------------------------------------
+-- E23. Attendance bitmaps (closed terms)
+--   fn__PackAttendance: live rows of one (term, course) as
+--     one bitmap pair per student (bit n = StartDate + n,
+--     least significant bit first in each byte). Students
+--     whose records span more than 512 days stay as rows.
+--   sp_Admin_PackAttendanceTerm: replaces the rows of a
+--     read-only term by bitmaps, one short transaction per
+--     course; readers see no difference (Part 4.0 views).
+--     Reopening the term (sp_Admin_SetTermReadOnly) expands
+--     them back.
+--   sp_Admin_GetAttendanceBitmaps: raw bitmaps of a term
+--     (packed ones, plus open rows packed on the fly) for
+--     client-side decoding (attendance_bitmap.py).
+---------------------------------------------------------
+IF OBJECT_ID('dbo.fn__PackAttendance', 'IF') IS NOT NULL
+    DROP FUNCTION dbo.fn__PackAttendance;
+GO
+
+CREATE FUNCTION dbo.fn__PackAttendance
+(
+    @TermID   INT,
+    @CourseID INT
+)
+RETURNS TABLE
+AS
+RETURN
+    WITH G AS (
+        SELECT
+            StudentID,
+            CourseID,
+            TermID,
+            MIN(DateRecorded) AS StartDate,
+            DATEDIFF(DAY, MIN(DateRecorded), MAX(DateRecorded)) + 1 AS Days,
+            COUNT(*) AS Sessions,
+            SUM(CAST(Status AS INT)) AS PresentCount
+        FROM dbo.ATTENDANCE
+        WHERE TermID = @TermID
+          AND CourseID = @CourseID
+          AND IsDeleted = 0
+        GROUP BY StudentID, CourseID, TermID
+    ),
+    D AS (
+        SELECT
+            G.StudentID,
+            DATEDIFF(DAY, G.StartDate, A.DateRecorded) AS DayNo,
+            A.Status
+        FROM G
+        JOIN dbo.ATTENDANCE A
+            ON A.StudentID = G.StudentID
+           AND A.CourseID  = G.CourseID
+           AND A.TermID    = G.TermID
+        WHERE A.IsDeleted = 0
+    ),
+    Bytes AS (
+        SELECT
+            StudentID,
+            DayNo / 8 AS ByteNo,
+            SUM(POWER(2, DayNo % 8)) AS RecordedByte,
+            SUM(CASE WHEN Status = 1 THEN POWER(2, DayNo % 8) ELSE 0 END) AS PresentByte
+        FROM D
+        GROUP BY StudentID, DayNo / 8
+    )
+    SELECT
+        G.StudentID,
+        G.CourseID,
+        G.TermID,
+        G.StartDate,
+        CAST(G.Days AS SMALLINT) AS Days,
+        CONVERT(VARBINARY(64), (
+            SELECT CONVERT(CHAR(2), CAST(CAST(ISNULL(B.RecordedByte, 0) AS TINYINT) AS BINARY(1)), 2)
+            FROM dbo.fn__DayNumbers() N
+            LEFT JOIN Bytes B
+                ON B.StudentID = G.StudentID
+               AND B.ByteNo    = N.N
+            WHERE N.N <= (G.Days - 1) / 8
+            ORDER BY N.N
+            FOR XML PATH(''), TYPE).value('.', 'VARCHAR(128)'), 2) AS Recorded,
+        CONVERT(VARBINARY(64), (
+            SELECT CONVERT(CHAR(2), CAST(CAST(ISNULL(B.PresentByte, 0) AS TINYINT) AS BINARY(1)), 2)
+            FROM dbo.fn__DayNumbers() N
+            LEFT JOIN Bytes B
+                ON B.StudentID = G.StudentID
+               AND B.ByteNo    = N.N
+            WHERE N.N <= (G.Days - 1) / 8
+            ORDER BY N.N
+            FOR XML PATH(''), TYPE).value('.', 'VARCHAR(128)'), 2) AS Present,
+        CAST(G.Sessions AS SMALLINT) AS Sessions,
+        CAST(G.PresentCount AS SMALLINT) AS PresentCount
+    FROM G
+    WHERE G.Days <= 512;
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_PackAttendanceTerm','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_PackAttendanceTerm;
+GO
+CREATE PROCEDURE dbo.sp_Admin_PackAttendanceTerm
+(
+    @AdminUsername NVARCHAR(50),
+    @TermID        INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @AdminUsername,
+        @RequiredRole      = 'Admin',
+        @RequiredClearance = 5,
+        @Mode              = 'WRITE';
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID)
+    BEGIN
+        RAISERROR('Term not found.', 16, 1);
+        RETURN;
+    END
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID AND IsReadOnly = 1)
+    BEGIN
+        RAISERROR('Only a closed (read-only) term can be packed.', 16, 1);
+        RETURN;
+    END
+
+    DECLARE
+        @CourseID INT = 0,
+        @Next     INT,
+        @Courses  INT = 0,
+        @Records  INT = 0,
+        @Bitmaps  INT = 0,
+        @Packed   INT;
+
+    CREATE TABLE #Packed (StudentID INT PRIMARY KEY);
+
+    WHILE 1 = 1
+    BEGIN
+        SET @Next = (
+            SELECT MIN(CourseID)
+            FROM dbo.ATTENDANCE
+            WHERE TermID = @TermID
+              AND CourseID > @CourseID
+              AND IsDeleted = 0
+        );
+
+        IF @Next IS NULL BREAK;
+        SET @CourseID = @Next;
+
+        TRUNCATE TABLE #Packed;
+
+        BEGIN TRY
+            BEGIN TRAN;
+
+            -- Holds off a concurrent reopen until this course is done
+            IF NOT EXISTS (
+                SELECT 1 FROM dbo.TERM WITH (UPDLOCK, HOLDLOCK)
+                WHERE TermID = @TermID AND IsReadOnly = 1
+            )
+                RAISERROR('The term was reopened while packing.', 16, 1);
+
+            INSERT INTO dbo.ATTENDANCE_BITMAP
+                (StudentID, CourseID, TermID, StartDate, Days, Recorded, Present, Sessions, PresentCount)
+            OUTPUT inserted.StudentID INTO #Packed (StudentID)
+            SELECT
+                P.StudentID, P.CourseID, P.TermID, P.StartDate, P.Days,
+                P.Recorded, P.Present, P.Sessions, P.PresentCount
+            FROM dbo.fn__PackAttendance(@TermID, @CourseID) P
+            WHERE NOT EXISTS (
+                SELECT 1 FROM dbo.ATTENDANCE_BITMAP B
+                WHERE B.TermID    = P.TermID
+                  AND B.CourseID  = P.CourseID
+                  AND B.StudentID = P.StudentID
+            );
+
+            SET @Packed = @@ROWCOUNT;
+
+            DELETE A
+            FROM dbo.ATTENDANCE A
+            JOIN #Packed P ON P.StudentID = A.StudentID
+            WHERE A.TermID = @TermID
+              AND A.CourseID = @CourseID
+              AND A.IsDeleted = 0;
+
+            SET @Records += @@ROWCOUNT;
+
+            COMMIT;
+        END TRY
+        BEGIN CATCH
+            IF @@TRANCOUNT > 0 ROLLBACK;
+            THROW;
+        END CATCH
+
+        SET @Bitmaps += @Packed;
+        IF @Packed > 0 SET @Courses += 1;
+    END
+
+    IF @Records > 0 EXEC dbo.sp__BumpDataVersion @TableName = N'ATTENDANCE';
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'TermID=' + CAST(@TermID AS NVARCHAR(20)) +
+        N', Courses=' + CAST(@Courses AS NVARCHAR(20)) +
+        N', Records=' + CAST(@Records AS NVARCHAR(20)) +
+        N', Bitmaps=' + CAST(@Bitmaps AS NVARCHAR(20));
+
+    EXEC dbo.sp_LogAction
+        @Username   = @AdminUsername,
+        @Action     = 'ADMIN_PACK_ATTENDANCE',
+        @Details    = @Details,
+        @EntityType = 'TERM',
+        @EntityID   = @TermID;
+
+    SELECT
+        @Courses AS Courses,
+        @Records AS RecordsPacked,
+        @Bitmaps AS Bitmaps;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_GetAttendanceBitmaps','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetAttendanceBitmaps;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetAttendanceBitmaps
+(
+    @AdminUsername NVARCHAR(50),
+    @TermID        INT,
+    @CourseID      INT = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess @AdminUsername, 'Admin', 5, 'READ';
+
+    IF NOT EXISTS (SELECT 1 FROM dbo.TERM WHERE TermID = @TermID)
+    BEGIN
+        RAISERROR('Term not found.', 16, 1);
+        RETURN;
+    END
+
+    SELECT
+        B.StudentID, B.CourseID, B.TermID, B.StartDate, B.Days,
+        B.Recorded, B.Present, B.Sessions, B.PresentCount,
+        CAST(1 AS BIT) AS IsPacked
+    FROM dbo.ATTENDANCE_BITMAP B
+    WHERE B.TermID = @TermID
+      AND (@CourseID IS NULL OR B.CourseID = @CourseID)
+
+    UNION ALL
+
+    SELECT
+        P.StudentID, P.CourseID, P.TermID, P.StartDate, P.Days,
+        P.Recorded, P.Present, P.Sessions, P.PresentCount,
+        CAST(0 AS BIT)
+    FROM dbo.COURSE C
+    CROSS APPLY dbo.fn__PackAttendance(@TermID, C.CourseID) P
+    WHERE (@CourseID IS NULL OR C.CourseID = @CourseID)
+      AND EXISTS (
+            SELECT 1 FROM dbo.ATTENDANCE A
+            WHERE A.TermID = @TermID
+              AND A.CourseID = C.CourseID
+              AND A.IsDeleted = 0
+          )
+    ORDER BY CourseID, StudentID
+    OPTION (RECOMPILE);
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'TermID=' + CAST(@TermID AS NVARCHAR(20)) +
+        CASE WHEN @CourseID IS NULL THEN N'' ELSE N', CourseID=' + CAST(@CourseID AS NVARCHAR(20)) END;
+
+    EXEC dbo.sp_LogAction
+        @Username = @AdminUsername,
+        @Action   = 'ADMIN_GET_ATTENDANCE_BITMAPS',
+        @Details  = @Details,
+        @CourseID = @CourseID;
+END
+GO
+
+
+/* ===========================
+   END OF PART 5D + 5E
+   =========================== */
+
+
+
+
+
+
+/* =========================================================
+   SRMS_DB — Term Project (FINAL)
+   Part 5F — Inference-safe aggregates
+
+   Depends on: Part 1, 2, 3, 4 + Part 5A validation
+   ========================================================= */
+
+---------------------------------------------------------
+-- F1. Instructor/Admin: Average Grade per Course (>=3) [SAFE]
+-- Notes:
+-- - No decrypt in views; decrypt happens here after open key.
+-- - Inference control: group size must be >= 3.
+-- - Ownership: if Instructor then must own the course.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Get_AvgGrade_Safe','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Get_AvgGrade_Safe;
+GO
+CREATE PROCEDURE dbo.sp_Get_AvgGrade_Safe
+(
+    @CurrentUsername NVARCHAR(50),
+    @CourseID INT,
+    @TermID   INT = NULL      -- NULL = current term
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername   = @CurrentUsername,
+        @RequiredRole      = 'Instructor,Admin',
+        @RequiredClearance = 3,
+        @Mode              = 'READ';
+
+    -- Course active; if Instructor -> must own course
+    DECLARE @Reason INT, @ReasonMsg NVARCHAR(200);
+
+    SELECT @Reason = V.ReasonCode, @ReasonMsg = V.ReasonMessage
+    FROM dbo.USERS U
+    CROSS APPLY dbo.fn__ValidateCourseAction(
+        @CurrentUsername,
+        CASE WHEN U.Role = 'Instructor' THEN N'Instructor' END,
+        @CourseID, NULL, 0, 0
+    ) V
+    WHERE U.Username = @CurrentUsername
+      AND U.IsDeleted = 0;
+
+    IF @Reason <> 0
+    BEGIN
+        RAISERROR(@ReasonMsg, 16, 1);
+        RETURN;
+    END
+
+    SET @TermID = COALESCE(@TermID, dbo.fn__CurrentTermID());
+
+    -- Inference control: >= 3 rows
+    IF NOT EXISTS (
+        SELECT 1
+        FROM dbo.GRADES
+        WHERE CourseID = @CourseID
+          AND TermID = @TermID
+          AND IsDeleted = 0
+          AND EncryptedGradeValue IS NOT NULL
+        GROUP BY CourseID
+        HAVING COUNT(*) >= 3
+    )
+    BEGIN
+        RAISERROR('Inference Control: Group size < 3.',16,1);
+        RETURN;
+    END
+
+    BEGIN TRY
+        EXEC dbo.sp_Key_Open;
+
+        SELECT
+            AVG(
+                TRY_CONVERT(
+                    DECIMAL(10,2),
+                    CONVERT(NVARCHAR(50), DecryptByKey(EncryptedGradeValue))
+                )
+            ) AS AvgGrade
+        FROM dbo.GRADES
+        WHERE CourseID=@CourseID
+          AND TermID=@TermID
+          AND IsDeleted=0
+          AND EncryptedGradeValue IS NOT NULL;
+
+        EXEC dbo.sp_Key_Close;
+
+		DECLARE @Details NVARCHAR(4000);
+
+        SET @Details =
+        N', CourseID=' + CAST(@CourseID AS NVARCHAR(20)) +
+        N', TermID=' + ISNULL(CAST(@TermID AS NVARCHAR(20)), N'-');
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'VIEW_AVG_GRADE_SAFE',
+            @Details  = @Details,
+            @EntityType = 'COURSE',
+            @EntityID   = @CourseID,
+            @CourseID   = @CourseID;
+    END TRY
+    BEGIN CATCH
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+END
+GO
+
+
+
+
+
+
+
+
+
+
+
+/* =========================================================
+   PART 6 — USER MANAGEMENT + ROLE REQUESTS (FINAL)
+   SAFE VERSION (NO CONCAT / NO + INSIDE EXEC)
+   ========================================================= */
+
+
+/* =========================================================
+   6.1 — USER REGISTER (PUBLIC)
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_User_Register','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_Register;
+GO
+
+CREATE PROCEDURE dbo.sp_User_Register
+(
+    @Username NVARCHAR(50),
+    @PasswordPlain NVARCHAR(200),
+    @Role NVARCHAR(20),
+
+    @FullName NVARCHAR(100) = NULL,
+    @Email NVARCHAR(100) = NULL,
+    @Phone NVARCHAR(20) = NULL,
+    @DOB DATE = NULL,
+    @Department NVARCHAR(50) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF @Role NOT IN ('Admin','Instructor','TA','Student','Guestrole')
+        THROW 50000, 'Invalid role.', 1;
+
+    IF EXISTS (SELECT 1 FROM dbo.USERS WHERE Username=@Username AND IsDeleted=0)
+        THROW 50001, 'Username already exists.', 1;
+
+    DECLARE @PwdHash VARBINARY(MAX) =
+        HASHBYTES('SHA2_256', @PasswordPlain);
+
+    DECLARE @ClearanceLevel INT =
+        CASE @Role
+            WHEN 'Admin'      THEN 5
+            WHEN 'Instructor' THEN 4
+            WHEN 'TA'         THEN 3
+            WHEN 'Student'    THEN 2
+            WHEN 'Guestrole'  THEN 1
+        END;
+
+    DECLARE @StudentID INT = NULL;
+    DECLARE @InstructorID INT = NULL;
+    DECLARE @TAID INT = NULL;
+
+    EXEC dbo.sp_Key_Open;
+
+    -------------------------------------------------
+    -- Student
+    -------------------------------------------------
+    IF @Role = 'Student'
+    BEGIN
+        IF @FullName IS NULL OR @Email IS NULL OR @Phone IS NULL
+           OR @DOB IS NULL OR @Department IS NULL
+            THROW 50002, 'Missing student fields.', 1;
+
+        INSERT INTO dbo.STUDENT
+        (FullName,Email,DOB,Department,ClearanceLevel,EncryptedPhone,IsDeleted)
+        VALUES
+        (@FullName,@Email,@DOB,@Department,2,
+         EncryptByKey(Key_GUID('SRMSSymmetricKey'),@Phone),0);
+
+        SET @StudentID = SCOPE_IDENTITY();
+    END
+
+    -------------------------------------------------
+    -- Instructor
+    -------------------------------------------------
+    IF @Role = 'Instructor'
+    BEGIN
+        INSERT INTO dbo.INSTRUCTOR
+        (FullName,Email,ClearanceLevel,IsDeleted)
+        VALUES
+        (ISNULL(@FullName,@Username),
+         ISNULL(@Email,CONCAT(@Username,'@uni.edu')),
+         4,0);
+
+        SET @InstructorID = SCOPE_IDENTITY();
+    END
+
+    -------------------------------------------------
+    -- TA
+    -------------------------------------------------
+    IF @Role = 'TA'
+    BEGIN
+        INSERT INTO dbo.TA
+        (FullName,Email,ClearanceLevel,IsDeleted)
+        VALUES
+        (ISNULL(@FullName,@Username),
+         ISNULL(@Email,CONCAT(@Username,'@uni.edu')),
+         3,0);
+
+        SET @TAID = SCOPE_IDENTITY();
+    END
+
+    -------------------------------------------------
+    -- USERS
+    -------------------------------------------------
+    INSERT INTO dbo.USERS
+    (Username,Password,Role,ClearanceLevel,
+     StudentID,InstructorID,TAID,
+     EncryptedUsername,IsDeleted)
+    VALUES
+    (@Username,@PwdHash,@Role,@ClearanceLevel,
+     @StudentID,@InstructorID,@TAID,
+     EncryptByKey(Key_GUID('SRMSSymmetricKey'),@Username),0);
+
+    EXEC dbo.sp_Key_Close;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+    IF @StudentID IS NOT NULL    EXEC dbo.sp__BumpDataVersion @TableName = N'STUDENT';
+    IF @InstructorID IS NOT NULL EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR';
+    IF @TAID IS NOT NULL         EXEC dbo.sp__BumpDataVersion @TableName = N'TA';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@Username);
+
+    EXEC dbo.sp_LogAction @Username,'REGISTER_USER',@Role, @EntityType = @EntityType, @EntityID = @EntityID;
+END
+GO
+
+
+
+/* =========================================================
+   6.2 — USER LOGIN
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_User_Login','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_Login;
+GO
+CREATE PROCEDURE dbo.sp_User_Login
+(
+    @Username NVARCHAR(50),
+    @PasswordPlain NVARCHAR(200)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @StoredHash VARBINARY(MAX);
+
+    SELECT @StoredHash = [Password]
+    FROM dbo.USERS
+    WHERE Username=@Username AND IsDeleted=0;
+
+    -- Failures are audited before the error (LOGIN_FAILED is always
+    -- itemized; the client calls this with autocommit so the row
+    -- survives the THROW)
+    IF @StoredHash IS NULL
+    BEGIN
+        EXEC dbo.sp_LogAction @Username,'LOGIN_FAILED',N'Unknown username';
+        THROW 50003, 'Invalid username.', 1;
+    END
+
+    IF @StoredHash <> HASHBYTES('SHA2_256',@PasswordPlain)
+    BEGIN
+        EXEC dbo.sp_LogAction @Username,'LOGIN_FAILED',N'Wrong password';
+        THROW 50004, 'Invalid password.', 1;
+    END
+
+    SELECT Username,Role,ClearanceLevel,StudentID,InstructorID,TAID
+    FROM dbo.USERS
+    WHERE Username=@Username AND IsDeleted=0;
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@Username);
+
+    EXEC dbo.sp_LogAction @Username,'LOGIN',NULL, @EntityType = @EntityType, @EntityID = @EntityID;
+END
+GO
+
+
+/* =========================================================
+   6.3 — ADMIN CREATE USER
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_Admin_CreateUser','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_CreateUser;
+GO
+
+CREATE PROCEDURE dbo.sp_Admin_CreateUser
+(
+    @CurrentUsername NVARCHAR(50),
+    @Username NVARCHAR(50),
+    @PasswordPlain NVARCHAR(200),
+    @Role NVARCHAR(20),
+
+    @FullName NVARCHAR(100)=NULL,
+    @Email NVARCHAR(100)=NULL,
+    @Phone NVARCHAR(20)=NULL,
+    @DOB DATE=NULL,
+    @Department NVARCHAR(50)=NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -- Admin only
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Admin',5,'WRITE';
+
+    -- Delegate to unified register procedure
+    EXEC dbo.sp_User_Register
+        @Username      = @Username,
+        @PasswordPlain = @PasswordPlain,
+        @Role          = @Role,
+        @FullName      = @FullName,
+        @Email         = @Email,
+        @Phone         = @Phone,
+        @DOB           = @DOB,
+        @Department    = @Department;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@Username);
+
+    EXEC dbo.sp_LogAction
+        @CurrentUsername,
+        'ADMIN_CREATE_USER',
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+
+/* =========================================================
+   6.3b — ADMIN BULK CREATE USERS (set-based)
+   One call per batch (TVP). Passwords arrive pre-hashed.
+   Invalid rows are returned with a reason; the rest are
+   created in one transaction:
+     STUDENT / INSTRUCTOR / TA  (MERGE ... OUTPUT -> RowNum map)
+     USERS                      (linked via the map)
+   One audit row per batch.
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_Admin_BulkCreateUsers','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_BulkCreateUsers;
+GO
+
+CREATE PROCEDURE dbo.sp_Admin_BulkCreateUsers
+(
+    @CurrentUsername NVARCHAR(50),
+    @Rows            dbo.UserProvisionList READONLY
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @CurrentUsername,'Admin',5,'WRITE';
+
+    SELECT
+        RowNum,
+        NULLIF(LTRIM(RTRIM(Username)), '')   AS Username,
+        PasswordHash,
+        NULLIF(LTRIM(RTRIM(Role)), '')       AS Role,
+        NULLIF(LTRIM(RTRIM(FullName)), '')   AS FullName,
+        NULLIF(LTRIM(RTRIM(Email)), '')      AS Email,
+        NULLIF(LTRIM(RTRIM(Phone)), '')      AS Phone,
+        DOB,
+        NULLIF(LTRIM(RTRIM(Department)), '') AS Department,
+        CAST(NULL AS NVARCHAR(200))          AS Reason
+    INTO #Rows
+    FROM @Rows;
+
+    -- Same defaults as sp_User_Register
+    UPDATE #Rows
+    SET FullName = ISNULL(FullName, Username),
+        Email    = ISNULL(Email, CONCAT(Username, '@uni.edu'))
+    WHERE Role IN ('Instructor','TA');
+
+    -------------------------------------------------
+    -- Reject (one pass)
+    -------------------------------------------------
+    UPDATE R
+    SET Reason =
+        CASE
+            WHEN R.Username IS NULL
+                THEN N'Username is required.'
+            WHEN R.Role IS NULL OR R.Role NOT IN ('Admin','Instructor','TA','Student','Guestrole')
+                THEN N'Invalid role.'
+            WHEN R.PasswordHash IS NULL OR DATALENGTH(R.PasswordHash) <> 32
+                THEN N'Invalid password hash.'
+            WHEN U.Username IS NOT NULL
+                THEN N'Username already exists.'
+            WHEN Dup.UserOccurrence > 1
+                THEN N'Duplicate username in file.'
+            WHEN R.Role = 'Student'
+                 AND (R.FullName IS NULL OR R.Email IS NULL OR R.Phone IS NULL
+                      OR R.DOB IS NULL OR R.Department IS NULL)
+                THEN N'Missing student fields.'
+            WHEN R.Role IN ('Student','Instructor','TA') AND R.Email IS NOT NULL AND Dup.EmailOccurrence > 1
+                THEN N'Duplicate email in file.'
+            WHEN S.StudentID IS NOT NULL OR I.InstructorID IS NOT NULL OR T.TAID IS NOT NULL
+                THEN N'Email already exists.'
+        END
+    FROM #Rows R
+    -- In-file duplicates in one pass: every row after the first of its key
+    JOIN (
+        SELECT
+            RowNum,
+            ROW_NUMBER() OVER (PARTITION BY Username ORDER BY RowNum)    AS UserOccurrence,
+            ROW_NUMBER() OVER (PARTITION BY Role, Email ORDER BY RowNum) AS EmailOccurrence
+        FROM #Rows
+    ) Dup
+        ON Dup.RowNum = R.RowNum
+    LEFT JOIN dbo.USERS U
+           ON U.Username = R.Username
+    LEFT JOIN dbo.STUDENT S
+           ON R.Role = 'Student' AND S.Email = R.Email
+    LEFT JOIN dbo.INSTRUCTOR I
+           ON R.Role = 'Instructor' AND I.Email = R.Email
+    LEFT JOIN dbo.TA T
+           ON R.Role = 'TA' AND T.Email = R.Email;
+
+    -------------------------------------------------
+    -- Create (one transaction per batch)
+    -------------------------------------------------
+    CREATE TABLE #Map (
+        RowNum    INT PRIMARY KEY,
+        ProfileID INT NOT NULL
+    );
+
+    DECLARE @Created INT = 0, @Rejected INT, @Details NVARCHAR(4000);
+
+    SELECT @Rejected = COUNT(*) FROM #Rows WHERE Reason IS NOT NULL;
+
+    BEGIN TRY
+        BEGIN TRAN;
+
+        EXEC dbo.sp_Key_Open;
+
+        MERGE dbo.STUDENT AS tgt
+        USING (SELECT * FROM #Rows WHERE Reason IS NULL AND Role = 'Student') AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (FullName, Email, DOB, Department, ClearanceLevel, EncryptedPhone, IsDeleted)
+            VALUES (src.FullName, src.Email, src.DOB, src.Department, 2,
+                    EncryptByKey(Key_GUID('SRMSSymmetricKey'), src.Phone), 0)
+        OUTPUT src.RowNum, inserted.StudentID INTO #Map (RowNum, ProfileID);
+
+        MERGE dbo.INSTRUCTOR AS tgt
+        USING (SELECT * FROM #Rows WHERE Reason IS NULL AND Role = 'Instructor') AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (FullName, Email, ClearanceLevel, IsDeleted)
+            VALUES (src.FullName, src.Email, 4, 0)
+        OUTPUT src.RowNum, inserted.InstructorID INTO #Map (RowNum, ProfileID);
+
+        MERGE dbo.TA AS tgt
+        USING (SELECT * FROM #Rows WHERE Reason IS NULL AND Role = 'TA') AS src
+        ON 1 = 0
+        WHEN NOT MATCHED THEN
+            INSERT (FullName, Email, ClearanceLevel, IsDeleted)
+            VALUES (src.FullName, src.Email, 3, 0)
+        OUTPUT src.RowNum, inserted.TAID INTO #Map (RowNum, ProfileID);
+
+        INSERT INTO dbo.USERS
+        (Username, Password, Role, ClearanceLevel,
+         StudentID, InstructorID, TAID,
+         EncryptedUsername, IsDeleted)
+        SELECT
+            R.Username,
+            R.PasswordHash,
+            R.Role,
+            CASE R.Role
+                WHEN 'Admin'      THEN 5
+                WHEN 'Instructor' THEN 4
+                WHEN 'TA'         THEN 3
+                WHEN 'Student'    THEN 2
+                WHEN 'Guestrole'  THEN 1
+            END,
+            CASE WHEN R.Role = 'Student'    THEN M.ProfileID END,
+            CASE WHEN R.Role = 'Instructor' THEN M.ProfileID END,
+            CASE WHEN R.Role = 'TA'         THEN M.ProfileID END,
+            EncryptByKey(Key_GUID('SRMSSymmetricKey'), R.Username),
+            0
+        FROM #Rows R
+        LEFT JOIN #Map M ON M.RowNum = R.RowNum
+        WHERE R.Reason IS NULL;
+
+        SET @Created = @@ROWCOUNT;
+
+        EXEC dbo.sp_Key_Close;
+
+        IF @Created > 0
+        BEGIN
+            EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+            EXEC dbo.sp__BumpDataVersion @TableName = N'STUDENT';
+            EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR';
+            EXEC dbo.sp__BumpDataVersion @TableName = N'TA';
+        END
+
+        SET @Details =
+            N'Created=' + CAST(@Created AS NVARCHAR(20)) +
+            N', Rejected=' + CAST(@Rejected AS NVARCHAR(20));
+
+        EXEC dbo.sp_LogAction
+            @Username = @CurrentUsername,
+            @Action   = 'ADMIN_BULK_CREATE_USERS',
+            @Details  = @Details;
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        BEGIN TRY EXEC dbo.sp_Key_Close; END TRY BEGIN CATCH END CATCH;
+        THROW;
+    END CATCH
+
+    SELECT RowNum, Username, Reason
+    FROM #Rows
+    WHERE Reason IS NOT NULL
+    ORDER BY RowNum;
+END
+GO
+
+
+/* =========================================================
+   6.4 — UPDATE PASSWORD
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_User_UpdatePassword','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_UpdatePassword;
+GO
+CREATE PROCEDURE dbo.sp_User_UpdatePassword
+(
+    @CurrentUsername NVARCHAR(50),
+    @TargetUsername NVARCHAR(50),
+    @NewPasswordPlain NVARCHAR(200)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    IF @CurrentUsername<>@TargetUsername
+        EXEC dbo.sp_CheckAccess
+            @CurrentUsername,'Admin',4,'WRITE';
+
+    UPDATE dbo.USERS
+    SET [Password]=HASHBYTES('SHA2_256',@NewPasswordPlain)
+    WHERE Username=@TargetUsername AND IsDeleted=0;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+
+    DECLARE @Details NVARCHAR(200)=N'Password changed for '+@TargetUsername;
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@TargetUsername);
+
+    EXEC dbo.sp_LogAction @CurrentUsername,'UPDATE_PASSWORD',@Details, @EntityType = @EntityType, @EntityID = @EntityID;
+END
+GO
+
+
+/* =========================================================
+   6.5 — UPDATE Role
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_User_UpdateRole','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_UpdateRole;
+GO
+
+CREATE PROCEDURE dbo.sp_User_UpdateRole
+(
+    @AdminUsername   NVARCHAR(50),
+    @TargetUsername  NVARCHAR(50),
+    @NewRole         NVARCHAR(20)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    -------------------------------------------------
+    -- Admin only
+    -------------------------------------------------
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'WRITE';
+
+    -------------------------------------------------
+    -- Validate role
+    -------------------------------------------------
+    IF @NewRole NOT IN ('Admin','Instructor','TA','Student','Guestrole')
+        RAISERROR('Invalid role.',16,1);
+
+    -------------------------------------------------
+    -- Load current user
+    -------------------------------------------------
+    DECLARE 
+        @OldRole NVARCHAR(20),
+        @StudentID INT,
+        @InstructorID INT,
+        @TAID INT;
+
+    SELECT
+        @OldRole = Role,
+        @StudentID = StudentID,
+        @InstructorID = InstructorID,
+        @TAID = TAID
+    FROM dbo.USERS
+    WHERE Username = @TargetUsername
+      AND IsDeleted = 0;
+
+    IF @OldRole IS NULL
+        RAISERROR('User not found.',16,1);
+
+    -------------------------------------------------
+    -- Clear old links
+    -------------------------------------------------
+    SET @StudentID = NULL;
+    SET @InstructorID = NULL;
+    SET @TAID = NULL;
+
+    -------------------------------------------------
+    -- Create required entity for new role
+    -------------------------------------------------
+
+    IF @NewRole = 'Student'
+    BEGIN
+        INSERT INTO dbo.STUDENT
+        (FullName, Email, DOB, Department, ClearanceLevel, IsDeleted)
+        VALUES
+        (@TargetUsername, CONCAT(@TargetUsername,'@std.edu'),
+         '2000-01-01', 'CS', 2, 0);
+
+        SET @StudentID = SCOPE_IDENTITY();
+    END
+
+    ELSE IF @NewRole = 'Instructor'
+    BEGIN
+        INSERT INTO dbo.INSTRUCTOR
+        (FullName, Email, ClearanceLevel, IsDeleted)
+        VALUES
+        (@TargetUsername, CONCAT(@TargetUsername,'@uni.edu'), 4, 0);
+
+        SET @InstructorID = SCOPE_IDENTITY();
+    END
+
+    ELSE IF @NewRole = 'TA'
+    BEGIN
+        INSERT INTO dbo.TA
+        (FullName, Email, ClearanceLevel, IsDeleted)
+        VALUES
+        (@TargetUsername, CONCAT(@TargetUsername,'@uni.edu'), 3, 0);
+
+        SET @TAID = SCOPE_IDENTITY();
+    END
+
+    -------------------------------------------------
+    -- Update USERS
+    -------------------------------------------------
+    UPDATE dbo.USERS
+    SET
+        Role = @NewRole,
+        ClearanceLevel =
+            CASE @NewRole
+                WHEN 'Admin'      THEN 5
+                WHEN 'Instructor' THEN 4
+                WHEN 'TA'         THEN 3
+                WHEN 'Student'    THEN 2
+                WHEN 'Guestrole'  THEN 1
+            END,
+        StudentID    = @StudentID,
+        InstructorID = @InstructorID,
+        TAID         = @TAID
+    WHERE Username = @TargetUsername;
+
+    -------------------------------------------------
+    -- Audit log
+    -------------------------------------------------
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+    IF @StudentID IS NOT NULL    EXEC dbo.sp__BumpDataVersion @TableName = N'STUDENT';
+    IF @InstructorID IS NOT NULL EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR';
+    IF @TAID IS NOT NULL         EXEC dbo.sp__BumpDataVersion @TableName = N'TA';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@TargetUsername);
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'UPDATE_ROLE',
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+
+
+/* =========================================================
+   6.5 — user_delete
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_User_Delete','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_User_Delete;
+GO
+
+CREATE PROCEDURE dbo.sp_User_Delete
+(
+    @AdminUsername NVARCHAR(50),
+    @TargetUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername, 'Admin', 5, 'WRITE';
+
+    IF NOT EXISTS (
+        SELECT 1 FROM dbo.USERS
+        WHERE Username = @TargetUsername AND IsDeleted = 0
+    )
+    BEGIN
+        RAISERROR('User not found or already deleted.',16,1);
+        RETURN;
+    END
+
+    UPDATE dbo.USERS
+    SET IsDeleted = 1
+    WHERE Username = @TargetUsername;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@TargetUsername);
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'DELETE_USER',
+        @TargetUsername,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+
+
+
+
+
+/* =========================================================
+   Part 6.2 — ROLE REQUEST WORKFLOW
+   ========================================================= */
+
+---------------------------------------------------------
+-- Submit Role Request (Student / TA)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_Submit','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_Submit;
+GO
+CREATE PROCEDURE dbo.sp_RoleRequest_Submit
+(
+    @CurrentUsername NVARCHAR(50),
+    @RequestedRole   NVARCHAR(20),
+    @Reason          NVARCHAR(300),
+    @Comments        NVARCHAR(300) = NULL
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @CurrentRole NVARCHAR(20);
+
+    SELECT @CurrentRole = Role
+    FROM dbo.USERS
+    WHERE Username=@CurrentUsername AND IsDeleted=0;
+
+    IF @CurrentRole NOT IN ('Student','TA')
+        RAISERROR('Only Student or TA can request role upgrade.',16,1);
+
+    IF NOT (
+        (@CurrentRole='Student' AND @RequestedRole IN ('TA','Instructor'))
+        OR
+        (@CurrentRole='TA' AND @RequestedRole='Instructor')
+    )
+        RAISERROR('Invalid role upgrade path.',16,1);
+
+    IF EXISTS (
+        SELECT 1 FROM dbo.ROLE_REQUESTS
+        WHERE Username=@CurrentUsername AND Status='Pending'
+    )
+        RAISERROR('You already have a pending request.',16,1);
+
+    INSERT INTO dbo.ROLE_REQUESTS
+    (
+        Username, CurrentRole, RequestedRole,
+        Reason, Comments, Status, DateSubmitted
+    )
+    VALUES
+    (
+        @CurrentUsername, @CurrentRole, @RequestedRole,
+        @Reason, @Comments, 'Pending', GETDATE()
+    );
+
+    DECLARE @Details NVARCHAR(200) =
+        N'From=' + @CurrentRole + N' To=' + @RequestedRole;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'ROLE_REQUESTS';
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @CurrentUsername,
+        'SUBMIT_ROLE_REQUEST',
+        @Details,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+
+---------------------------------------------------------
+-- Get My Role Requests
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_GetMy','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_GetMy;
+GO
+CREATE PROCEDURE dbo.sp_RoleRequest_GetMy
+(
+    @CurrentUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    SELECT
+        RequestID, CurrentRole, RequestedRole,
+        Reason, Comments, Status, DateSubmitted
+    FROM dbo.ROLE_REQUESTS
+    WHERE Username=@CurrentUsername
+    ORDER BY DateSubmitted DESC;
+
+    DECLARE @EntityType NVARCHAR(20), @EntityID INT;
+    SELECT @EntityType = EntityType, @EntityID = EntityID
+    FROM dbo.fn__UserEntity(@CurrentUsername);
+
+    EXEC dbo.sp_LogAction
+        @CurrentUsername,
+        'VIEW_MY_ROLE_REQUESTS',
+        NULL,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+
+---------------------------------------------------------
+-- Admin: View Pending Role Requests
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_GetPending','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_GetPending;
+GO
+CREATE PROCEDURE dbo.sp_RoleRequest_GetPending
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',4,'READ';
+
+    SELECT *
+    FROM dbo.ROLE_REQUESTS
+    WHERE Status='Pending'
+    ORDER BY DateSubmitted;
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'VIEW_PENDING_ROLE_REQUESTS',
+        NULL;
+END
+GO
+
+---------------------------------------------------------
+-- Admin: Role Request Queue (keyset paging)
+--   Next page: @AfterRequestID = last RequestID shown.
+--   Seeks IX_ROLE_REQUESTS_Status_RBAC; only the page's
+--   rows are looked up for Reason / Comments.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_GetPage','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_GetPage;
+GO
+CREATE PROCEDURE dbo.sp_RoleRequest_GetPage
+(
+    @AdminUsername  NVARCHAR(50),
+    @Status         NVARCHAR(20) = 'Pending',
+    @RequestedRole  NVARCHAR(20) = NULL,
+    @UsernamePrefix NVARCHAR(50) = NULL,
+    @AfterRequestID INT = 0,
+    @PageSize       INT = 50
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',4,'READ';
+
+    IF @PageSize IS NULL OR @PageSize < 1 SET @PageSize = 50;
+    IF @PageSize > 500 SET @PageSize = 500;
+
+    SET @UsernamePrefix = NULLIF(LTRIM(RTRIM(@UsernamePrefix)), '');
+
+    SELECT TOP (@PageSize)
+        RequestID, Username, CurrentRole, RequestedRole,
+        Reason, Comments, Status, DateSubmitted
+    FROM dbo.ROLE_REQUESTS
+    WHERE Status = ISNULL(@Status, 'Pending')
+      AND RequestID > ISNULL(@AfterRequestID, 0)
+      AND (@RequestedRole  IS NULL OR RequestedRole = @RequestedRole)
+      AND (@UsernamePrefix IS NULL OR Username LIKE @UsernamePrefix + N'%')
+    ORDER BY RequestID
+    OPTION (RECOMPILE);
+
+    -- One audit row per queue open, not per page
+    IF ISNULL(@AfterRequestID, 0) = 0
+    BEGIN
+        DECLARE @Details NVARCHAR(200) =
+            N'Status=' + ISNULL(@Status, N'Pending') +
+            ISNULL(N' Role=' + @RequestedRole, N'') +
+            ISNULL(N' Prefix=' + @UsernamePrefix, N'');
+
+        EXEC dbo.sp_LogAction
+            @AdminUsername,
+            'VIEW_ROLE_REQUEST_QUEUE',
+            @Details;
+    END
+END
+GO
+
+---------------------------------------------------------
+-- Admin: dbo.sp_RoleRequest_Approve
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_Approve','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_Approve;
+GO
+
+CREATE PROCEDURE dbo.sp_RoleRequest_Approve
+(
+    @AdminUsername NVARCHAR(50),
+    @RequestID INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',4,'WRITE';
+
+    DECLARE
+        @Username NVARCHAR(50),
+        @CurrentRole NVARCHAR(20),
+        @NewRole NVARCHAR(20),
+        @StudentID INT;
+
+    SELECT
+        @Username = Username,
+        @CurrentRole = CurrentRole,
+        @NewRole = RequestedRole
+    FROM dbo.ROLE_REQUESTS
+    WHERE RequestID=@RequestID AND Status='Pending';
+
+    IF @Username IS NULL
+        RAISERROR('Request not found or already processed.',16,1);
+
+    -------------------------------------------------
+    -- Student → TA
+    -------------------------------------------------
+    IF @CurrentRole='Student' AND @NewRole='TA'
+    BEGIN
+        SELECT @StudentID = StudentID
+        FROM dbo.USERS
+        WHERE Username=@Username;
+
+        INSERT INTO dbo.TA (FullName, Email, ClearanceLevel, IsDeleted)
+        SELECT FullName, Email, 3, 0
+        FROM dbo.STUDENT
+        WHERE StudentID=@StudentID;
+
+        UPDATE dbo.USERS
+        SET Role='TA',
+            ClearanceLevel=3,
+            TAID = SCOPE_IDENTITY()
+        WHERE Username=@Username;
+    END
+
+    -------------------------------------------------
+    -- TA → Instructor
+    -------------------------------------------------
+    ELSE IF @CurrentRole='TA' AND @NewRole='Instructor'
+    BEGIN
+        INSERT INTO dbo.INSTRUCTOR (FullName, Email, ClearanceLevel, IsDeleted)
+        SELECT FullName, Email, 4, 0
+        FROM dbo.TA
+        WHERE TAID = (
+            SELECT TAID FROM dbo.USERS WHERE Username=@Username
+        );
+
+        UPDATE dbo.USERS
+        SET Role='Instructor',
+            ClearanceLevel=4,
+            InstructorID = SCOPE_IDENTITY()
+        WHERE Username=@Username;
+    END
+    ELSE
+        RAISERROR('Invalid role transition.',16,1);
+
+    UPDATE dbo.ROLE_REQUESTS
+    SET Status='Approved'
+    WHERE RequestID=@RequestID;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'ROLE_REQUESTS';
+    EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+    IF @NewRole = 'TA'         EXEC dbo.sp__BumpDataVersion @TableName = N'TA';
+    IF @NewRole = 'Instructor' EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR';
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'APPROVE_ROLE_REQUEST',
+        @EntityType = 'ROLE_REQUEST',
+        @EntityID   = @RequestID;
+END
+GO
+
+
+
+
+---------------------------------------------------------
+-- Admin: Deny Role Request
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_Deny','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_Deny;
+GO
+CREATE PROCEDURE dbo.sp_RoleRequest_Deny
+(
+    @AdminUsername NVARCHAR(50),
+    @RequestID INT
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',4,'WRITE';
+
+    DECLARE @Username NVARCHAR(50);
+
+    SELECT @Username = Username
+    FROM dbo.ROLE_REQUESTS
+    WHERE RequestID=@RequestID AND Status='Pending';
+
+    IF @Username IS NULL
+        RAISERROR('Request not found or already processed.',16,1);
+
+    UPDATE dbo.ROLE_REQUESTS
+    SET Status='Denied'
+    WHERE RequestID=@RequestID;
+
+    DECLARE @Details NVARCHAR(200) =
+        N'RequestID=' + CAST(@RequestID AS NVARCHAR(20))
+        + N' User=' + @Username;
+
+    EXEC dbo.sp__BumpDataVersion @TableName = N'ROLE_REQUESTS';
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'DENY_ROLE_REQUEST',
+        @Details,
+        @EntityType = 'ROLE_REQUEST',
+        @EntityID   = @RequestID;
+END
+GO
+
+
+---------------------------------------------------------
+-- Admin: Bulk Approve / Deny (set-based)
+--   @Decision 'Approve' | 'Deny'
+--   Requests that cannot be decided are returned with a
+--   reason; the rest are decided in one transaction:
+--     Student -> TA          new TA rows (from STUDENT)
+--     TA      -> Instructor  new INSTRUCTOR rows (from TA)
+--   MERGE ... OUTPUT maps RequestID -> new profile ID.
+--   One audit row per call. Call with autocommit ON.
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_RoleRequest_DecideBulk','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_RoleRequest_DecideBulk;
+GO
+CREATE PROCEDURE dbo.sp_RoleRequest_DecideBulk
+(
+    @AdminUsername NVARCHAR(50),
+    @Decision      NVARCHAR(10),
+    @RequestIDs    dbo.RequestIDList READONLY
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',4,'WRITE';
+
+    IF @Decision NOT IN ('Approve','Deny')
+    BEGIN
+        RAISERROR('Decision must be Approve or Deny.', 16, 1);
+        RETURN;
+    END
+
+    CREATE TABLE #Req (
+        RequestID     INT PRIMARY KEY,
+        Username      NVARCHAR(50)  NULL,
+        CurrentRole   NVARCHAR(20)  NULL,
+        RequestedRole NVARCHAR(20)  NULL,
+        FullName      NVARCHAR(100) NULL,
+        Email         NVARCHAR(100) NULL,
+        Reason        NVARCHAR(200) NULL
+    );
+
+    CREATE TABLE #Map (
+        RequestID INT PRIMARY KEY,
+        ProfileID INT NOT NULL
+    );
+
+    DECLARE @Decided INT = 0, @Rejected INT, @Details NVARCHAR(4000);
+
+    BEGIN TRY
+        BEGIN TRAN;
+
+        -- Snapshot the selection (locks the requests until commit)
+        INSERT INTO #Req (RequestID, Username, CurrentRole, RequestedRole, FullName, Email)
+        SELECT
+            L.RequestID,
+            R.Username,
+            R.CurrentRole,
+            R.RequestedRole,
+            COALESCE(S.FullName, T.FullName),
+            COALESCE(S.Email, T.Email)
+        FROM @RequestIDs L
+        LEFT JOIN dbo.ROLE_REQUESTS R WITH (UPDLOCK, HOLDLOCK)
+               ON R.RequestID = L.RequestID
+              AND R.Status    = 'Pending'
+        LEFT JOIN dbo.USERS U
+               ON U.Username  = R.Username
+              AND U.IsDeleted = 0
+              AND U.Role      = R.CurrentRole
+        LEFT JOIN dbo.STUDENT S
+               ON R.CurrentRole = 'Student'
+              AND S.StudentID   = U.StudentID
+        LEFT JOIN dbo.TA T
+               ON R.CurrentRole = 'TA'
+              AND T.TAID        = U.TAID;
+
+        -------------------------------------------------
+        -- Reject (one pass)
+        -------------------------------------------------
+        UPDATE Q
+        SET Reason =
+            CASE
+                WHEN Q.Username IS NULL
+                    THEN N'Request not found or already processed.'
+                WHEN @Decision = 'Deny'
+                    THEN NULL
+                WHEN NOT (   (Q.CurrentRole = 'Student' AND Q.RequestedRole = 'TA')
+                          OR (Q.CurrentRole = 'TA'      AND Q.RequestedRole = 'Instructor'))
+                    THEN N'Invalid role transition.'
+                WHEN Q.FullName IS NULL
+                    THEN N'User or source profile no longer active.'
+                WHEN Q.Username IS NOT NULL AND Dup.Occurrence > 1
+                    THEN N'Another selected request for this user.'
+                WHEN T.TAID IS NOT NULL OR I.InstructorID IS NOT NULL
+                    THEN N'Email already used by the target profile.'
+            END
+        FROM #Req Q
+        JOIN (
+            SELECT
+                RequestID,
+                ROW_NUMBER() OVER (PARTITION BY Username ORDER BY RequestID) AS Occurrence
+            FROM #Req
+        ) Dup
+            ON Dup.RequestID = Q.RequestID
+        LEFT JOIN dbo.TA T
+               ON Q.RequestedRole = 'TA' AND T.Email = Q.Email
+        LEFT JOIN dbo.INSTRUCTOR I
+               ON Q.RequestedRole = 'Instructor' AND I.Email = Q.Email;
+
+        SELECT @Rejected = COUNT(*) FROM #Req WHERE Reason IS NOT NULL;
+
+        IF @Decision = 'Approve'
+        BEGIN
+            MERGE dbo.TA AS tgt
+            USING (SELECT * FROM #Req WHERE Reason IS NULL AND RequestedRole = 'TA') AS src
+            ON 1 = 0
+            WHEN NOT MATCHED THEN
+                INSERT (FullName, Email, ClearanceLevel, IsDeleted)
+                VALUES (src.FullName, src.Email, 3, 0)
+            OUTPUT src.RequestID, inserted.TAID INTO #Map (RequestID, ProfileID);
+
+            MERGE dbo.INSTRUCTOR AS tgt
+            USING (SELECT * FROM #Req WHERE Reason IS NULL AND RequestedRole = 'Instructor') AS src
+            ON 1 = 0
+            WHEN NOT MATCHED THEN
+                INSERT (FullName, Email, ClearanceLevel, IsDeleted)
+                VALUES (src.FullName, src.Email, 4, 0)
+            OUTPUT src.RequestID, inserted.InstructorID INTO #Map (RequestID, ProfileID);
+
+            -- Same columns as sp_RoleRequest_Approve
+            UPDATE U
+            SET Role           = Q.RequestedRole,
+                ClearanceLevel = CASE Q.RequestedRole WHEN 'TA' THEN 3 ELSE 4 END,
+                TAID           = CASE WHEN Q.RequestedRole = 'TA'         THEN M.ProfileID ELSE U.TAID END,
+                InstructorID   = CASE WHEN Q.RequestedRole = 'Instructor' THEN M.ProfileID ELSE U.InstructorID END
+            FROM dbo.USERS U
+            JOIN #Req Q ON Q.Username  = U.Username
+            JOIN #Map M ON M.RequestID = Q.RequestID;
+        END
+
+        UPDATE R
+        SET Status = CASE @Decision WHEN 'Approve' THEN 'Approved' ELSE 'Denied' END
+        FROM dbo.ROLE_REQUESTS R
+        JOIN #Req Q ON Q.RequestID = R.RequestID
+        WHERE Q.Reason IS NULL;
+
+        SET @Decided = @@ROWCOUNT;
+
+        IF @Decided > 0
+        BEGIN
+            EXEC dbo.sp__BumpDataVersion @TableName = N'ROLE_REQUESTS';
+
+            IF @Decision = 'Approve'
+            BEGIN
+                EXEC dbo.sp__BumpDataVersion @TableName = N'USERS';
+                EXEC dbo.sp__BumpDataVersion @TableName = N'TA';
+                EXEC dbo.sp__BumpDataVersion @TableName = N'INSTRUCTOR';
+            END
+        END
+
+        SET @Details =
+            N'Decision=' + @Decision +
+            N', Decided=' + CAST(@Decided AS NVARCHAR(20)) +
+            N', Rejected=' + CAST(@Rejected AS NVARCHAR(20));
+
+        EXEC dbo.sp_LogAction
+            @AdminUsername,
+            'BULK_DECIDE_ROLE_REQUESTS',
+            @Details;
+
+        COMMIT;
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0 ROLLBACK;
+        THROW;
+    END CATCH
+
+    SELECT RequestID, Username, Reason
+    FROM #Req
+    WHERE Reason IS NOT NULL
+    ORDER BY RequestID;
+END
+GO
+
+
+/* =========================================================
+   Part 6.3 — AUDIT POLICY (per action class)
+   Admin reads / edits AUDIT_POLICY; writes to the policy
+   itself are always itemized.
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_Admin_GetAuditPolicy','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetAuditPolicy;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetAuditPolicy
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT ActionPattern, AuditLevel, UpdatedAt
+    FROM dbo.AUDIT_POLICY
+    ORDER BY ActionPattern;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_SetAuditLevel','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_SetAuditLevel;
+GO
+CREATE PROCEDURE dbo.sp_Admin_SetAuditLevel
+(
+    @AdminUsername NVARCHAR(50),
+    @ActionPattern NVARCHAR(200),
+    @AuditLevel    NVARCHAR(20)     -- 'ITEMIZED' / 'AGGREGATED' / NULL = remove the rule
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'WRITE';
+
+    SET @ActionPattern = LTRIM(RTRIM(@ActionPattern));
+
+    IF @ActionPattern IS NULL OR @ActionPattern = ''
+    BEGIN
+        RAISERROR('Action pattern is required.', 16, 1);
+        RETURN;
+    END
+
+    IF @AuditLevel IS NOT NULL AND @AuditLevel NOT IN ('ITEMIZED', 'AGGREGATED')
+    BEGIN
+        RAISERROR('Audit level must be ITEMIZED or AGGREGATED.', 16, 1);
+        RETURN;
+    END
+
+    IF @AuditLevel = 'AGGREGATED' AND N'ADMIN_SET_AUDIT_LEVEL' LIKE @ActionPattern
+    BEGIN
+        RAISERROR('Pattern would aggregate audit policy changes; they must stay itemized.', 16, 1);
+        RETURN;
+    END
+
+    IF @AuditLevel IS NULL
+        DELETE FROM dbo.AUDIT_POLICY WHERE ActionPattern = @ActionPattern;
+    ELSE
+        MERGE dbo.AUDIT_POLICY AS tgt
+        USING (SELECT @ActionPattern AS ActionPattern) AS src
+            ON tgt.ActionPattern = src.ActionPattern
+        WHEN MATCHED THEN
+            UPDATE SET AuditLevel = @AuditLevel, UpdatedAt = GETDATE()
+        WHEN NOT MATCHED THEN
+            INSERT (ActionPattern, AuditLevel) VALUES (@ActionPattern, @AuditLevel);
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'Pattern=' + @ActionPattern +
+        N', Level=' + ISNULL(@AuditLevel, N'(removed)');
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'ADMIN_SET_AUDIT_LEVEL',
+        @Details;
+END
+GO
+
+IF OBJECT_ID('dbo.sp_Admin_FlushAuditCounters','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_FlushAuditCounters;
+GO
+CREATE PROCEDURE dbo.sp_Admin_FlushAuditCounters
+(
+    @AdminUsername NVARCHAR(50)
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'WRITE';
+
+    -- Finished minutes only; the running minute keeps counting
+    EXEC dbo.sp__FlushAuditCounters;
+END
+GO
+
+
+/* =========================================================
+   Part 6.4 — ENTITY ACCESS HISTORY (audit investigations)
+   Who touched an entity, from the typed LOGS columns.
+   @EntityType = 'COURSE'  -> every row with that CourseID
+   @EntityType = 'STUDENT' -> rows about the student, plus
+       (@IncludeCourseScope = 1) course-wide reads of courses
+       the student is enrolled in (e.g. grade lists)
+   Unflushed read counters are included (LogID NULL).
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_Admin_GetEntityHistory','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetEntityHistory;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetEntityHistory
+(
+    @AdminUsername      NVARCHAR(50),
+    @EntityType         NVARCHAR(20),
+    @EntityID           INT,
+    @FromTime           DATETIME = NULL,
+    @ToTime             DATETIME = NULL,
+    @IncludeCourseScope BIT = 1,
+    @MaxRows            INT = 1000
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SET @EntityType = UPPER(LTRIM(RTRIM(@EntityType)));
+
+    IF @EntityType IS NULL OR @EntityType = '' OR @EntityID IS NULL
+    BEGIN
+        RAISERROR('Entity type and ID are required.', 16, 1);
+        RETURN;
+    END
+
+    IF @FromTime IS NULL SET @FromTime = '19000101';
+    IF @ToTime   IS NULL SET @ToTime   = '99991231';
+    IF @MaxRows IS NULL OR @MaxRows < 1 SET @MaxRows = 1000;
+    IF @MaxRows > 10000 SET @MaxRows = 10000;
+
+    -- Courses whose course-wide reads expose this student
+    DECLARE @Courses TABLE (CourseID INT PRIMARY KEY);
+
+    IF @EntityType = 'STUDENT' AND @IncludeCourseScope = 1
+        INSERT INTO @Courses (CourseID)
+        SELECT CourseID
+        FROM dbo.COURSE_STUDENT
+        WHERE StudentID = @EntityID;
+
+    ;WITH Hits AS
+    (
+        -- Direct: seek on IX_LOGS_Entity / IX_LOGS_Course
+        SELECT L.LogID, L.LogTime, L.Username, L.Action, L.Details, L.EventCount,
+               L.EntityType, L.EntityID, L.CourseID, CAST('Direct' AS NVARCHAR(10)) AS Scope
+        FROM dbo.LOGS L
+        WHERE @EntityType <> 'COURSE'
+          AND L.EntityType = @EntityType
+          AND L.EntityID   = @EntityID
+          AND L.LogTime BETWEEN @FromTime AND @ToTime
+
+        UNION ALL
+
+        SELECT L.LogID, L.LogTime, L.Username, L.Action, L.Details, L.EventCount,
+               L.EntityType, L.EntityID, L.CourseID, CAST('Direct' AS NVARCHAR(10))
+        FROM dbo.LOGS L
+        WHERE @EntityType = 'COURSE'
+          AND L.CourseID = @EntityID
+          AND L.LogTime BETWEEN @FromTime AND @ToTime
+
+        UNION ALL
+
+        -- Course-wide reads of the student's courses
+        SELECT L.LogID, L.LogTime, L.Username, L.Action, L.Details, L.EventCount,
+               L.EntityType, L.EntityID, L.CourseID, CAST('Course' AS NVARCHAR(10))
+        FROM @Courses C
+        JOIN dbo.LOGS L
+          ON L.CourseID   = C.CourseID
+         AND L.EntityType = 'COURSE'
+        WHERE L.LogTime BETWEEN @FromTime AND @ToTime
+
+        UNION ALL
+
+        -- Read counters not flushed yet (small table)
+        SELECT NULL, R.MinuteStart, NULLIF(R.Username, N''), R.Action, R.Details, R.Hits,
+               R.EntityType, R.EntityID, R.CourseID,
+               CAST(CASE WHEN R.EntityType = 'COURSE' AND @EntityType = 'STUDENT'
+                         THEN 'Course' ELSE 'Direct' END AS NVARCHAR(10))
+        FROM dbo.AUDIT_READ_COUNTER R
+        WHERE R.MinuteStart BETWEEN @FromTime AND @ToTime
+          AND (
+                (@EntityType <> 'COURSE' AND R.EntityType = @EntityType AND R.EntityID = @EntityID)
+             OR (@EntityType =  'COURSE' AND R.CourseID = @EntityID)
+             OR (R.EntityType = 'COURSE' AND R.CourseID IN (SELECT CourseID FROM @Courses))
+          )
+    )
+    SELECT TOP (@MaxRows)
+        LogID, LogTime, Username, Action, Scope, EventCount,
+        EntityType, EntityID, CourseID, Details
+    FROM Hits
+    ORDER BY LogTime DESC, LogID DESC;
+
+    DECLARE @Details NVARCHAR(4000) =
+        N'EntityType=' + @EntityType + N', EntityID=' + CAST(@EntityID AS NVARCHAR(20));
+
+    EXEC dbo.sp_LogAction
+        @AdminUsername,
+        'ADMIN_ENTITY_HISTORY',
+        @Details,
+        @EntityType = @EntityType,
+        @EntityID   = @EntityID;
+END
+GO
+
+
+/* =========================================================
+   Part 6.5 — AUDIT STREAM (security event detector)
+   Incremental read of LOGS by LogID (clustered PK seek):
+   cost is proportional to the rows returned, never to the
+   size of LOGS.
+   @AfterLogID NULL -> start at the last @MaxRows rows
+   (no audit row: polled every few seconds, like
+    sp_GetDataVersions)
+   ========================================================= */
+IF OBJECT_ID('dbo.sp_Admin_GetLogsSince','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetLogsSince;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetLogsSince
+(
+    @AdminUsername NVARCHAR(50),
+    @AfterLogID    INT = NULL,
+    @MaxRows       INT = 5000
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    IF @MaxRows IS NULL OR @MaxRows < 1 SET @MaxRows = 5000;
+    IF @MaxRows > 50000 SET @MaxRows = 50000;
+
+    IF @AfterLogID IS NULL
+        SELECT @AfterLogID = ISNULL(MAX(LogID), 0) - @MaxRows
+        FROM dbo.LOGS;
+
+    SELECT TOP (@MaxRows)
+        LogID, LogTime, Username, Action, EventCount,
+        EntityType, EntityID, CourseID
+    FROM dbo.LOGS
+    WHERE LogID > @AfterLogID
+    ORDER BY LogID;
+END
+GO
+
+
+---------------------------------------------------------
+-- Admin: specific LOGS rows by LogID
+-- (gaps below the monitor's high-water mark: one PK seek
+--  per ID instead of re-reading from the oldest gap)
+---------------------------------------------------------
+IF OBJECT_ID('dbo.sp_Admin_GetLogsByID','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp_Admin_GetLogsByID;
+GO
+CREATE PROCEDURE dbo.sp_Admin_GetLogsByID
+(
+    @AdminUsername NVARCHAR(50),
+    @LogIDs        dbo.LogIDList READONLY
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    EXEC dbo.sp_CheckAccess
+        @AdminUsername,'Admin',5,'READ';
+
+    SELECT
+        L.LogID, L.LogTime, L.Username, L.Action, L.EventCount,
+        L.EntityType, L.EntityID, L.CourseID
+    FROM @LogIDs I
+    JOIN dbo.LOGS L ON L.LogID = I.LogID
+    ORDER BY L.LogID;
+END
+GO
+
+
+---------------------------------------------------------
+-- Security Matrix View
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_Security_Matrix', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_Security_Matrix;
+GO
+CREATE VIEW dbo.vw_Security_Matrix
+AS
+SELECT
+    CAST('Admin' AS NVARCHAR(20)) AS [Role],
+    CAST('Manage users, roles, approvals; CRUD on all entities via stored procedures; audit logs; highest clearance.' AS NVARCHAR(500)) AS Permissions
+UNION ALL
+SELECT
+    'Instructor',
+    'View own courses; view enrolled students; insert/update grades for own courses; view attendance for own courses.'
+UNION ALL
+SELECT
+    'TA',
+    'View assigned courses; manage attendance for assigned courses; view enrolled students (no grades access).'
+UNION ALL
+SELECT
+    'Student',
+    'View own profile; view own courses; view own grades; view own attendance; submit role upgrade request.'
+UNION ALL
+SELECT
+    'Guestrole',
+    'View public course catalog only.';
+GO
+
+
+
+---------------------------------------------------------
+-- MLS Levels View
+---------------------------------------------------------
+IF OBJECT_ID('dbo.vw_MLS_Levels', 'V') IS NOT NULL
+    DROP VIEW dbo.vw_MLS_Levels;
+GO
+CREATE VIEW dbo.vw_MLS_Levels
+AS
+SELECT CAST('COURSE' AS NVARCHAR(30)) AS ObjectName,
+       1 AS ClearanceLevel,
+       'Unclassified public course information.' AS Description
+UNION ALL
+SELECT 'STUDENT', 2, 'Confidential student personal data.'
+UNION ALL
+SELECT 'ROLE_REQUESTS', 2, 'Confidential role upgrade workflow data.'
+UNION ALL
+SELECT 'GRADES', 3, 'Secret academic performance data.'
+UNION ALL
+SELECT 'ATTENDANCE', 3, 'Secret attendance records.'
+UNION ALL
+SELECT 'TA', 3, 'Teaching assistant records.'
+UNION ALL
+SELECT 'INSTRUCTOR', 4, 'Instructor records.'
+UNION ALL
+SELECT 'USERS', 4, 'Authentication and RBAC mapping.'
+UNION ALL
+SELECT 'LOGS', 4, 'Audit trail.';
+GO
+
+
+
+
+
+
+/* =========================================================
+   Part 7.0 — Open Encryption Key (safe)
+   ========================================================= */
+BEGIN TRY
+    EXEC dbo.sp_Key_Open;
+END TRY
+BEGIN CATCH
+END CATCH;
+GO
+
+/* =========================================================
+   Part 7.1 — COURSES (5 Courses)
+   ========================================================= */
+DECLARE @Courses TABLE (Name NVARCHAR(100), Descr NVARCHAR(200));
+
+INSERT INTO @Courses VALUES
+(N'Database Systems', N'Relational DB, SQL'),
+(N'Operating Systems', N'Processes & Memory'),
+(N'Computer Networks', N'Routing & TCP/IP'),
+(N'Software Engineering', N'SDLC & Design'),
+(N'Information Security', N'Crypto & Access Control');
+
+INSERT INTO dbo.COURSE (CourseName, Description, PublicInfo, ClearanceLevel, IsDeleted)
+SELECT Name, Descr, N'Core Course', 1, 0
+FROM @Courses c
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.COURSE WHERE CourseName = c.Name AND IsDeleted = 0
+);
+GO
+
+/* =========================================================
+   Part 7.2 — INSTRUCTORS + USERS (3 Instructors)
+   ========================================================= */
+DECLARE @Instructors TABLE
+(
+    FullName NVARCHAR(100),
+    Email NVARCHAR(100),
+    Username NVARCHAR(50)
+);
+
+INSERT INTO @Instructors VALUES
+(N'Dr. Hassan', N'hassan@uni.edu', N'DrHassan'),
+(N'Dr. Mona',   N'mona@uni.edu',   N'DrMona'),
+(N'Dr. Karim',  N'karim@uni.edu',  N'DrKarim');
+
+INSERT INTO dbo.INSTRUCTOR (FullName, Email, ClearanceLevel, IsDeleted)
+SELECT FullName, Email, 4, 0
+FROM @Instructors i
+WHERE NOT EXISTS (SELECT 1 FROM dbo.INSTRUCTOR WHERE Email=i.Email);
+
+DECLARE @U NVARCHAR(50);
+DECLARE cur_ins CURSOR FOR SELECT Username FROM @Instructors;
+
+OPEN cur_ins;
+FETCH NEXT FROM cur_ins INTO @U;
+
+WHILE @@FETCH_STATUS = 0
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username=@U)
+        EXEC dbo.sp_User_Register
+            @Username=@U,
+            @PasswordPlain=N'1234',
+            @Role=N'Instructor';
+
+    FETCH NEXT FROM cur_ins INTO @U;
+END
+
+CLOSE cur_ins;
+DEALLOCATE cur_ins;
+GO
+
+/* =========================================================
+   Part 7.3 — TAs + USERS (4 TAs)
+   ========================================================= */
+DECLARE @TAs TABLE
+(
+    FullName NVARCHAR(100),
+    Email NVARCHAR(100),
+    Username NVARCHAR(50)
+);
+
+INSERT INTO @TAs VALUES
+(N'Ashraf Hamdy', N'ashraf@uni.edu', N'AshrafTA'),
+(N'Sara Adel',    N'sara@uni.edu',   N'SaraTA'),
+(N'Omar Nabil',   N'omar@uni.edu',   N'OmarTA'),
+(N'Laila Samy',   N'laila@uni.edu',  N'LailaTA');
+
+INSERT INTO dbo.TA (FullName, Email, ClearanceLevel, IsDeleted)
+SELECT FullName, Email, 3, 0
+FROM @TAs t
+WHERE NOT EXISTS (SELECT 1 FROM dbo.TA WHERE Email=t.Email);
+
+DECLARE @TAUser NVARCHAR(50);
+DECLARE cur_ta CURSOR FOR SELECT Username FROM @TAs;
+
+OPEN cur_ta;
+FETCH NEXT FROM cur_ta INTO @TAUser;
+
+WHILE @@FETCH_STATUS = 0
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username=@TAUser)
+        EXEC dbo.sp_User_Register
+            @Username=@TAUser,
+            @PasswordPlain=N'1234',
+            @Role=N'TA';
+
+    FETCH NEXT FROM cur_ta INTO @TAUser;
+END
+
+CLOSE cur_ta;
+DEALLOCATE cur_ta;
+GO
+
+/* =========================================================
+   Part 7.4 — RESET STUDENTS (IMPORTANT)
+   ========================================================= */
+DELETE FROM dbo.USERS WHERE Role = 'Student';
+DELETE FROM dbo.STUDENT;
+GO
+
+/* =========================================================
+   Part 7.5 — STUDENTS + USERS (20 Students)
+   ========================================================= */
+DECLARE @i INT = 1;
+
+WHILE @i <= 20
+BEGIN
+    DECLARE @Email NVARCHAR(100) = CONCAT(N'student', @i, N'@std.edu');
+    DECLARE @Name  NVARCHAR(100) = CONCAT(N'Student ', @i);
+    DECLARE @User  NVARCHAR(50)  = CONCAT(N'student', @i);
+    DECLARE @Phone NVARCHAR(20)  = CONCAT(N'01000000', CAST(@i AS NVARCHAR(10)));
+
+    EXEC dbo.sp_User_Register
+        @Username      = @User,
+        @PasswordPlain = N'1234',
+        @Role          = N'Student',
+        @FullName      = @Name,
+        @Email         = @Email,
+        @Phone         = @Phone,
+        @DOB           = '2002-01-01',
+        @Department    = N'CS';
+
+    SET @i += 1;
+END
+GO
+
+/* =========================================================
+   Part 7.6 — ADMIN + GUEST
+   ========================================================= */
+IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username='IbrahimHamdy')
+    EXEC dbo.sp_User_Register
+        @Username='IbrahimHamdy',
+        @PasswordPlain=N'1234',
+        @Role=N'Admin';
+
+
+IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username='AhmedMostafa')
+    EXEC dbo.sp_User_Register
+        @Username='AhmedMostafa',
+        @PasswordPlain=N'1234',
+        @Role=N'Admin';
+IF NOT EXISTS (SELECT 1 FROM dbo.USERS WHERE Username='Guest1')
+    EXEC dbo.sp_User_Register
+        @Username='Guest1',
+        @PasswordPlain=N'1234',
+        @Role=N'Guestrole';
+GO
+
+/* =========================================================
+   Part 7.7 — ASSIGN INSTRUCTORS + TAs TO COURSES
+   ========================================================= */
+INSERT INTO dbo.INSTRUCTOR_COURSE
+SELECT i.InstructorID, c.CourseID
+FROM dbo.INSTRUCTOR i
+CROSS JOIN dbo.COURSE c
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.INSTRUCTOR_COURSE ic
+    WHERE ic.InstructorID=i.InstructorID AND ic.CourseID=c.CourseID
+);
+
+INSERT INTO dbo.TA_COURSE
+SELECT u.Username, c.CourseID
+FROM dbo.USERS u
+CROSS JOIN dbo.COURSE c
+WHERE u.Role='TA'
+AND NOT EXISTS (
+    SELECT 1 FROM dbo.TA_COURSE tc
+    WHERE tc.TAUsername=u.Username AND tc.CourseID=c.CourseID
+);
+GO
+
+/* =========================================================
+   Part 7.8 — ENROLL STUDENTS
+   ========================================================= */
+INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID, TermID)
+SELECT c.CourseID, s.StudentID, dbo.fn__CurrentTermID()
+FROM dbo.COURSE c
+CROSS JOIN dbo.STUDENT s
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.COURSE_STUDENT cs
+    WHERE cs.CourseID=c.CourseID AND cs.StudentID=s.StudentID
+);
+GO
+
+/* =========================================================
+   Part 7.9 — GRADES (Encrypted)
+   ========================================================= */
+BEGIN TRY
+    EXEC dbo.sp_Key_Open;
+END TRY
+BEGIN CATCH
+END CATCH;
+GO
+
+INSERT INTO dbo.GRADES (StudentID, CourseID, TermID, EncryptedGradeValue, IsDeleted)
+SELECT
+    cs.StudentID,
+    cs.CourseID,
+    cs.TermID,
+    EncryptByKey(Key_GUID('SRMSSymmetricKey'),
+        CAST(60 + (ABS(CHECKSUM(NEWID())) % 41) AS NVARCHAR(5))),
+    0
+FROM dbo.COURSE_STUDENT cs
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.GRADES g
+    WHERE g.StudentID=cs.StudentID AND g.CourseID=cs.CourseID
+);
+GO
+
+/* =========================================================
+   Part 7.10 — ATTENDANCE
+   ========================================================= */
+DECLARE @d INT = 0;
+WHILE @d < 5
+BEGIN
+    INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, TermID, Status, DateRecorded, IsDeleted)
+    SELECT
+        cs.StudentID,
+        cs.CourseID,
+        dbo.fn__TermOfDate(DATEADD(DAY, -@d, CAST(GETDATE() AS DATE))),
+        ABS(CHECKSUM(NEWID())) % 2,
+        DATEADD(DAY, -@d, CAST(GETDATE() AS DATE)),
+        0
+    FROM dbo.COURSE_STUDENT cs
+    WHERE NOT EXISTS (
+        SELECT 1 FROM dbo.ATTENDANCE a
+        WHERE a.StudentID=cs.StudentID
+          AND a.CourseID=cs.CourseID
+          AND a.DateRecorded=DATEADD(DAY, -@d, CAST(GETDATE() AS DATE))
+    );
+    SET @d += 1;
+END
+GO
+
+/* =========================================================
+   Part 7.11 — ROLE REQUESTS
+   ========================================================= */
+INSERT INTO dbo.ROLE_REQUESTS
+(Username, CurrentRole, RequestedRole, Reason, Status)
+SELECT Username, 'Student','TA','Good performance','Pending'
+FROM dbo.USERS
+WHERE Role='Student'
+AND NOT EXISTS (
+    SELECT 1 FROM dbo.ROLE_REQUESTS r
+    WHERE r.Username=dbo.USERS.Username AND r.Status='Pending'
+);
+GO
+
+/* =========================================================
+   Part 7.12 — Close Key
+   ========================================================= */
+BEGIN TRY
+    EXEC dbo.sp_Key_Close;
+END TRY
+BEGIN CATCH
+END CATCH;
+GO
+
@@ -0,0 +1,282 @@
+/* =========================================================
+   SRMS_DB — Index Benchmark (course-first covering indexes)
+
+   Measures per-procedure logical reads for the hot
+   per-course procedures with the course-first indexes
+   DISABLED ("Before") and REBUILT ("After").
+
+   Depends on:
+     - SRMS_DB_FINAL.sql (schema, procedures, seed data)
+     - VIEW SERVER STATE (sys.dm_exec_procedure_stats)
+
+   WARNING:
+     Generates a large data set (default ~2M attendance rows).
+     Run on a scratch instance, then re-run SRMS_DB_FINAL.sql
+     to get back to the seed data.
+
+   Knobs (Part B.0):
+     @Students  — generated students
+     @Courses   — generated courses
+     @PerStudent— courses per student
+     @Days      — attendance days per enrollment
+     @Runs      — executions per procedure per phase (Part B.2)
+
+   SSMS: Query Options > Results > "Discard results after
+   execution", otherwise the grid rendering dominates.
+   ========================================================= */
+
+USE SRMS_DB;
+GO
+
+SET NOCOUNT ON;
+GO
+
+/* =========================================================
+   Part B.0 — Generate data
+   ========================================================= */
+DECLARE @Students   INT = 20000;
+DECLARE @Courses    INT = 200;
+DECLARE @PerStudent INT = 5;
+DECLARE @Days       INT = 20;
+
+BEGIN TRY
+    EXEC dbo.sp_Key_Open;
+END TRY
+BEGIN CATCH
+END CATCH;
+
+-- Numbers 1..N
+IF OBJECT_ID('tempdb..#N') IS NOT NULL DROP TABLE #N;
+SELECT TOP (@Students)
+    ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS n
+INTO #N
+FROM sys.all_objects a CROSS JOIN sys.all_objects b;
+
+INSERT INTO dbo.COURSE (CourseName, Description, PublicInfo, ClearanceLevel, IsDeleted)
+SELECT CONCAT(N'Bench Course ', n), N'Benchmark', N'Benchmark', 1, 0
+FROM #N
+WHERE n <= @Courses
+  AND NOT EXISTS (SELECT 1 FROM dbo.COURSE WHERE CourseName = CONCAT(N'Bench Course ', n));
+
+INSERT INTO dbo.STUDENT (FullName, Email, DOB, Department, ClearanceLevel, IsDeleted)
+SELECT CONCAT(N'Bench Student ', n), CONCAT(N'bench', n, N'@std.edu'), '2002-01-01', N'CS', 2, 0
+FROM #N
+WHERE NOT EXISTS (SELECT 1 FROM dbo.STUDENT WHERE Email = CONCAT(N'bench', n, N'@std.edu'));
+
+IF OBJECT_ID('tempdb..#BenchCourse') IS NOT NULL DROP TABLE #BenchCourse;
+SELECT CourseID, ROW_NUMBER() OVER (ORDER BY CourseID) - 1 AS k
+INTO #BenchCourse
+FROM dbo.COURSE
+WHERE CourseName LIKE N'Bench Course %';
+
+IF OBJECT_ID('tempdb..#BenchStudent') IS NOT NULL DROP TABLE #BenchStudent;
+SELECT StudentID, ROW_NUMBER() OVER (ORDER BY StudentID) - 1 AS k
+INTO #BenchStudent
+FROM dbo.STUDENT
+WHERE Email LIKE N'bench%@std.edu';
+
+-- Each student takes @PerStudent consecutive courses
+INSERT INTO dbo.COURSE_STUDENT (CourseID, StudentID)
+SELECT c.CourseID, s.StudentID
+FROM #BenchStudent s
+JOIN #N o ON o.n <= @PerStudent
+JOIN #BenchCourse c ON c.k = (s.k + o.n) % @Courses
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.COURSE_STUDENT cs
+    WHERE cs.CourseID = c.CourseID AND cs.StudentID = s.StudentID
+);
+
+-- ~10% soft-deleted rows, like a term of corrections
+INSERT INTO dbo.GRADES (StudentID, CourseID, TermID, EncryptedGradeValue, IsDeleted)
+SELECT
+    cs.StudentID,
+    cs.CourseID,
+    cs.TermID,
+    EncryptByKey(Key_GUID('SRMSSymmetricKey'),
+        CAST(50 + (ABS(CHECKSUM(NEWID())) % 51) AS NVARCHAR(5))),
+    CASE WHEN ABS(CHECKSUM(NEWID())) % 10 = 0 THEN 1 ELSE 0 END
+FROM dbo.COURSE_STUDENT cs
+JOIN #BenchCourse c ON c.CourseID = cs.CourseID
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.GRADES g
+    WHERE g.StudentID = cs.StudentID AND g.CourseID = cs.CourseID
+);
+
+-- Each day goes to the term covering it (days before the first term are skipped)
+INSERT INTO dbo.ATTENDANCE (StudentID, CourseID, TermID, Status, DateRecorded, IsDeleted)
+SELECT
+    cs.StudentID,
+    cs.CourseID,
+    t.TermID,
+    ABS(CHECKSUM(NEWID())) % 2,
+    DATEADD(DAY, -d.n, CAST(GETDATE() AS DATE)),
+    CASE WHEN ABS(CHECKSUM(NEWID())) % 10 = 0 THEN 1 ELSE 0 END
+FROM dbo.COURSE_STUDENT cs
+JOIN #BenchCourse c ON c.CourseID = cs.CourseID
+JOIN #N d ON d.n <= @Days
+CROSS APPLY (
+    SELECT TOP (1) TermID
+    FROM dbo.TERM
+    WHERE StartDate <= DATEADD(DAY, -d.n, CAST(GETDATE() AS DATE))
+    ORDER BY StartDate DESC
+) t
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.ATTENDANCE a
+    WHERE a.StudentID = cs.StudentID
+      AND a.CourseID = cs.CourseID
+      AND a.DateRecorded = DATEADD(DAY, -d.n, CAST(GETDATE() AS DATE))
+);
+
+-- Seed staff (Part 7) own one bench course
+DECLARE @BenchCourseID INT = (SELECT CourseID FROM #BenchCourse WHERE k = 0);
+
+INSERT INTO dbo.INSTRUCTOR_COURSE (InstructorID, CourseID)
+SELECT U.InstructorID, @BenchCourseID
+FROM dbo.USERS U
+WHERE U.Username = N'DrHassan'
+  AND NOT EXISTS (
+      SELECT 1 FROM dbo.INSTRUCTOR_COURSE
+      WHERE InstructorID = U.InstructorID AND CourseID = @BenchCourseID
+  );
+
+INSERT INTO dbo.TA_COURSE (TAUsername, CourseID)
+SELECT N'AshrafTA', @BenchCourseID
+WHERE NOT EXISTS (
+    SELECT 1 FROM dbo.TA_COURSE
+    WHERE TAUsername = N'AshrafTA' AND CourseID = @BenchCourseID
+);
+
+BEGIN TRY
+    EXEC dbo.sp_Key_Close;
+END TRY
+BEGIN CATCH
+END CATCH;
+
+UPDATE STATISTICS dbo.GRADES WITH FULLSCAN;
+UPDATE STATISTICS dbo.ATTENDANCE WITH FULLSCAN;
+UPDATE STATISTICS dbo.COURSE_STUDENT WITH FULLSCAN;
+GO
+
+/* =========================================================
+   Part B.1 — Harness
+   ========================================================= */
+
+-- View is measured through a wrapper so it shows up in procedure stats
+IF OBJECT_ID('dbo.sp__Bench_AttendanceAggregate','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp__Bench_AttendanceAggregate;
+GO
+CREATE PROCEDURE dbo.sp__Bench_AttendanceAggregate
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SELECT CourseID, TotalRecords, PresentCount
+    FROM dbo.vw_Attendance_Aggregate_Safe;
+END
+GO
+
+IF OBJECT_ID('dbo.sp__Bench_Run','P') IS NOT NULL
+    DROP PROCEDURE dbo.sp__Bench_Run;
+GO
+CREATE PROCEDURE dbo.sp__Bench_Run
+(
+    @Phase NVARCHAR(10),
+    @Runs  INT = 20
+)
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @CourseID INT = (
+        SELECT MIN(CourseID) FROM dbo.COURSE WHERE CourseName LIKE N'Bench Course %'
+    );
+
+    -- Fresh plans + fresh stats per phase
+    EXEC sp_recompile N'dbo.sp_Instructor_ViewGradesByCourse';
+    EXEC sp_recompile N'dbo.sp_Instructor_ViewAttendanceByCourse';
+    EXEC sp_recompile N'dbo.sp_Get_AvgGrade_Safe';
+    EXEC sp_recompile N'dbo.sp_TA_ViewAttendance';
+    EXEC sp_recompile N'dbo.sp__Bench_AttendanceAggregate';
+
+    DECLARE @i INT = 0;
+    WHILE @i < @Runs
+    BEGIN
+        EXEC dbo.sp_Instructor_ViewGradesByCourse     @CurrentUsername = N'DrHassan', @CourseID = @CourseID;
+        EXEC dbo.sp_Instructor_ViewAttendanceByCourse @CurrentUsername = N'DrHassan', @CourseID = @CourseID;
+        EXEC dbo.sp_Get_AvgGrade_Safe                 @CurrentUsername = N'DrHassan', @CourseID = @CourseID;
+        EXEC dbo.sp_TA_ViewAttendance                 @CurrentUsername = N'AshrafTA';
+        EXEC dbo.sp__Bench_AttendanceAggregate;
+        SET @i += 1;
+    END
+
+    INSERT INTO #BenchResults (Phase, ProcName, Executions, AvgLogicalReads, AvgWorkerMs)
+    SELECT
+        @Phase,
+        OBJECT_NAME(ps.object_id, ps.database_id),
+        ps.execution_count,
+        ps.total_logical_reads / ps.execution_count,
+        ps.total_worker_time / ps.execution_count / 1000.0
+    FROM sys.dm_exec_procedure_stats ps
+    WHERE ps.database_id = DB_ID()
+      AND OBJECT_NAME(ps.object_id, ps.database_id) IN (
+          N'sp_Instructor_ViewGradesByCourse',
+          N'sp_Instructor_ViewAttendanceByCourse',
+          N'sp_Get_AvgGrade_Safe',
+          N'sp_TA_ViewAttendance',
+          N'sp__Bench_AttendanceAggregate'
+      );
+END
+GO
+
+/* =========================================================
+   Part B.2 — Before (course-first indexes disabled) / After
+   ========================================================= */
+IF OBJECT_ID('tempdb..#BenchResults') IS NOT NULL DROP TABLE #BenchResults;
+CREATE TABLE #BenchResults (
+    Phase           NVARCHAR(10),
+    ProcName        SYSNAME,
+    Executions      BIGINT,
+    AvgLogicalReads BIGINT,
+    AvgWorkerMs     DECIMAL(18,3)
+);
+
+ALTER INDEX IX_GRADES_Course_Active ON dbo.GRADES DISABLE;
+ALTER INDEX IX_ATT_Course_Active    ON dbo.ATTENDANCE DISABLE;
+ALTER INDEX IX_ATT_Course_RowVer    ON dbo.ATTENDANCE DISABLE;
+ALTER INDEX IX_TC_Course            ON dbo.TA_COURSE DISABLE;
+ALTER INDEX IX_IC_Course            ON dbo.INSTRUCTOR_COURSE DISABLE;
+
+EXEC dbo.sp__Bench_Run @Phase = N'Before', @Runs = 20;
+
+ALTER INDEX IX_GRADES_Course_Active ON dbo.GRADES REBUILD;
+ALTER INDEX IX_ATT_Course_Active    ON dbo.ATTENDANCE REBUILD;
+ALTER INDEX IX_ATT_Course_RowVer    ON dbo.ATTENDANCE REBUILD;
+ALTER INDEX IX_TC_Course            ON dbo.TA_COURSE REBUILD;
+ALTER INDEX IX_IC_Course            ON dbo.INSTRUCTOR_COURSE REBUILD;
+
+EXEC dbo.sp__Bench_Run @Phase = N'After', @Runs = 20;
+
+/* =========================================================
+   Part B.3 — Report
+   ========================================================= */
+SELECT
+    b.ProcName,
+    b.AvgLogicalReads                                   AS ReadsBefore,
+    a.AvgLogicalReads                                   AS ReadsAfter,
+    CAST(100.0 * (b.AvgLogicalReads - a.AvgLogicalReads)
+         / NULLIF(b.AvgLogicalReads, 0) AS DECIMAL(5,1)) AS ReadsSavedPct,
+    b.AvgWorkerMs                                       AS CpuMsBefore,
+    a.AvgWorkerMs                                       AS CpuMsAfter
+FROM #BenchResults b
+JOIN #BenchResults a
+    ON a.ProcName = b.ProcName
+   AND a.Phase = N'After'
+WHERE b.Phase = N'Before'
+ORDER BY b.AvgLogicalReads DESC;
+GO
+
+/* =========================================================
+   Part B.4 — Cleanup (harness only; data stays)
+   ========================================================= */
+DROP PROCEDURE IF EXISTS dbo.sp__Bench_Run;
+DROP PROCEDURE IF EXISTS dbo.sp__Bench_AttendanceAggregate;
+GO
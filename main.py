@@ -1,20 +1,26 @@
-# =========================================================
-# SRMS - Main Entry Point
-# =========================================================
-# This file launches the login screen.
-# Importing the login module automatically starts the UI.
-# =========================================================
-
-def main():
-    """
-    Entry point of the SRMS system.
-    Importing the login module triggers the Tkinter login UI.
-    """
-    try:
-        import login   # The login module contains the Tkinter mainloop
-    except Exception as e:
-        print(f"Failed to launch SRMS Login UI: {e}")
-
-
-if __name__ == "__main__":
-    main()
+# =========================================================
+# SRMS - Main Entry Point
+# =========================================================
+# This file launches the login screen.
+# Importing the login module automatically starts the UI.
+# =========================================================
+
+def main():
+    """
+    Entry point of the SRMS system.
+    Importing the login module triggers the Tkinter login UI.
+    """
+    try:
+        import ui_instrument
+        ui_instrument.install_from_env()   # SRMS_UI_WATCHDOG=1 → stall watchdog + UI report
+
+        import ui_profile
+        ui_profile.install_from_env()      # SRMS_PROFILE=1 → cProfile/tracemalloc per action
+
+        import login   # The login module contains the Tkinter mainloop
+    except Exception as e:
+        print(f"Failed to launch SRMS Login UI: {e}")
+
+
+if __name__ == "__main__":
+    main()
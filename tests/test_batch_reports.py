@@ -0,0 +1,76 @@
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "Connections_and_Database"))
+
+# No SQL Server here: batch_reports only needs the two call helpers from db,
+# which every test patches with canned result sets.
+if "db" not in sys.modules:
+    try:
+        import db  # noqa: F401
+    except ImportError:
+        _db = types.ModuleType("db")
+        _db.call_sp_rows = _db.call_sp_result_sets = None
+        sys.modules["db"] = _db
+
+import batch_reports  # noqa: E402
+
+
+def _versions(**overrides):
+    versions = {t: 1 for t in batch_reports.SOURCE_TABLES}
+    versions.update(overrides)
+    return [{"TableName": t, "Version": v} for t, v in versions.items()]
+
+
+def _report_data(versions, students):
+    courses = [{"CourseID": 10, "CourseName": "Databases", "Instructors": "Dr. A"}]
+    enrollments = [{"StudentID": s["StudentID"], "CourseID": 10} for s in students]
+    return [versions, students, courses, enrollments, [], []]
+
+
+def _student(sid):
+    return {"StudentID": sid, "FullName": f"Student {sid}", "Email": f"s{sid}@std.edu", "Department": "CS"}
+
+
+class GenerateManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.out_dir, ignore_errors=True)
+
+    def _generate(self, versions, students):
+        with mock.patch.object(batch_reports, "call_sp_rows", return_value=versions) as rows, \
+             mock.patch.object(batch_reports, "call_sp_result_sets",
+                               return_value=_report_data(versions, students)) as data:
+            result = batch_reports.generate("admin", out_dir=self.out_dir)
+        return result, rows, data
+
+    def test_unchanged_versions_skip_the_bulk_fetch(self):
+        self._generate(_versions(), [_student(1)])
+
+        result, _rows, data = self._generate(_versions(), [_student(1)])
+
+        data.assert_not_called()
+        self.assertEqual(result["generated"], 0)
+
+    def test_student_only_version_change_rebuilds_manifest(self):
+        self._generate(_versions(), [_student(1)])
+
+        # e.g. sp_User_Register: only STUDENT (and USERS) bumped
+        result, _rows, data = self._generate(_versions(STUDENT=2), [_student(1), _student(2)])
+
+        data.assert_called_once()
+        self.assertEqual(result["generated"], 2)        # new transcript + course roster
+        manifest = batch_reports.load_manifest(self.out_dir)
+        self.assertEqual(manifest["versions"]["STUDENT"], 2)
+        self.assertIn("students/student_2.html", manifest["reports"])
+        self.assertTrue(os.path.exists(os.path.join(self.out_dir, "students", "student_2.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()